@@ -2,47 +2,33 @@ import streamlit as st
 import os
 import base64
 import textwrap
+from functools import lru_cache
 from dotenv import load_dotenv
 from datetime import datetime
 import sys
+import importlib
 
 
 sys.path.insert(0, os.path.dirname(__file__))
 
 
-# Original imports
-try:
-    from utils.extract import extract_text_from_file, extract_skills, match_job_skills
-    from utils.experience import estimate_experience_years, experience_percentage, classify_experience_level
-    from utils.ranking import calculate_final_score
-    from utils.analyzer import analyze_resume
-    from users_extract import show_resume_tips, show_bonus_videos, recommend_courses_from_resume
-    from courses import resume_videos, interview_videos, softskill_links
-except ImportError as e:
-    st.error(f"Error importing original modules: {e}")
-
-
 # New imports
-from auth import show_auth_page, load_users, hash_password, save_users, get_user_profile
+from auth import show_auth_page, load_users, hash_password, save_users, get_user_profile, get_user_name
+from utils.assets import get_avatar_data_uri, get_logo_data_uri, save_profile_picture
 from profile_page import show_profile_form
 
-# Lazy load dashboard modules with error handling
-show_admin_dashboard = None
-admin_dashboard_error = None
-show_user_dashboard = None
-user_dashboard_error = None
-
-try:
-    from single_screen_admin_old import show_admin_dashboard
-except Exception as e:
-    admin_dashboard_error = str(e)
-    print(f"⚠️ Warning: Admin dashboard import failed: {e}")
-
-try:
-    from single_screen_user_old import show_user_dashboard
-except Exception as e:
-    user_dashboard_error = str(e)
-    print(f"⚠️ Warning: User dashboard import failed: {e}")
+# Lazy load dashboard modules with error handling.
+# The dashboards pull in plotly.express, reportlab, pytube, SKILLS_DB and the
+# predictors, so they are imported when first opened, not before the landing
+# page can render. Check the cost with: python startup_budget.py
+def load_dashboard(module_name, function_name):
+    """Import a dashboard entry point on first use. Returns (function, error)."""
+    try:
+        module = importlib.import_module(module_name)
+        return getattr(module, function_name), None
+    except Exception as e:
+        print(f"⚠️ Warning: {module_name} import failed: {e}")
+        return None, str(e)
 
 from ui_components import set_page_config, show_loading_animation
 
@@ -293,12 +279,10 @@ def show_floating_avatar():
     if not email:
         return
         
-    profile_pic_path = os.path.join("data", "profile_pics", f"{email}.png")
+    # Small cached thumbnail instead of re-encoding the full PNG every rerun
+    avatar_uri = get_avatar_data_uri(email)
     
-    if os.path.exists(profile_pic_path):
-        with open(profile_pic_path, "rb") as f:
-            b64_img = base64.b64encode(f.read()).decode()
-            
+    if avatar_uri:
         st.markdown(f"""
         <style>
             .floating-avatar {{
@@ -308,7 +292,7 @@ def show_floating_avatar():
                 width: 60px;
                 height: 60px;
                 border-radius: 50%;
-                background-image: url(data:image/png;base64,{b64_img});
+                background-image: url({avatar_uri});
                 background-size: cover;
                 background-position: center;
                 border: 3px solid #6366f1;
@@ -341,10 +325,10 @@ def show_navbar():
             if st.session_state.page != "landing":
                 # Show minimized logo with name
                 if os.path.exists(LOGO_PATH):
-                    logo_b64 = get_image_base64(LOGO_PATH)
+                    logo_uri = get_logo_data_uri(LOGO_PATH)
                     st.markdown(f"""
                         <div style='display: flex; align-items: center; gap: 10px;'>
-                            <img src="data:image/png;base64,{logo_b64}" class="logo-img-small" alt="Logo">
+                            <img src="{logo_uri}" class="logo-img-small" alt="Logo">
                             <span style='font-size: 18px; font-weight: 700; color: inherit;'>{PROJECT_NAME}</span>
                         </div>
                     """, unsafe_allow_html=True)
@@ -445,6 +429,7 @@ def main():
     
     elif st.session_state.page == "dashboard":
         if st.session_state.user_mode == "user":
+            show_user_dashboard, user_dashboard_error = load_dashboard("single_screen_user_old", "show_user_dashboard")
             if show_user_dashboard:
                 show_user_dashboard()
             else:
@@ -455,6 +440,7 @@ def main():
         
         elif st.session_state.user_mode == "admin":
             if st.session_state.get("is_admin_verified"):
+                show_admin_dashboard, admin_dashboard_error = load_dashboard("single_screen_admin_old", "show_admin_dashboard")
                 if show_admin_dashboard:
                     show_admin_dashboard()
                 else:
@@ -482,7 +468,13 @@ def init_theme():
 
 
 def get_theme_css():
-    """Get CSS based on current theme - EXACT MOCKUP MATCH"""
+    """Get CSS based on current theme (built once per theme)"""
+    return build_theme_css(st.session_state.app_theme)
+
+
+@lru_cache(maxsize=None)
+def build_theme_css(theme):
+    """Build the CSS for a theme - EXACT MOCKUP MATCH"""
     
     # Common fonts and basics
     base_css = textwrap.dedent("""
@@ -529,7 +521,7 @@ def get_theme_css():
     </style>
     """)
 
-    if st.session_state.app_theme == "dark":
+    if theme == "dark":
         return base_css + textwrap.dedent("""
         <style>
             /* SOLID DARK BACKGROUND (default for all pages) */
@@ -1075,10 +1067,6 @@ if "profile_updated" not in st.session_state:
 init_theme()
 
 
-# Apply theme CSS
-st.markdown(get_theme_css(), unsafe_allow_html=True)
-
-
 # ==================== PROFILE MANAGEMENT ====================
 def get_image_base64(path):
     """Convert image to base64"""
@@ -1094,13 +1082,11 @@ def show_profile_avatar():
     if "user_email" not in st.session_state or not st.session_state.user_email:
         return
 
-    profile_image_path = os.path.join("data", "profile_pics", f"{st.session_state.user_email}.png")
-    os.makedirs(os.path.dirname(profile_image_path), exist_ok=True)
+    avatar_uri = get_avatar_data_uri(st.session_state.user_email)
 
-    if os.path.exists(profile_image_path):
-        # Use the new get_user_profile function
-        profile = get_user_profile(st.session_state.user_email)
-        user_name = profile["name"] or "User"
+    if avatar_uri:
+        # Cached lookup - does not re-read users.json on every rerun
+        user_name = get_user_name(st.session_state.user_email) or "User"
         
         st.markdown(
             """
@@ -1135,7 +1121,7 @@ def show_profile_avatar():
         
         st.markdown(f"""
             <div class="profile-avatar-container">
-                <img src="data:image/png;base64,{get_image_base64(profile_image_path)}" 
+                <img src="{avatar_uri}" 
                      class="profile-avatar" />
                 <p class="profile-name">{user_name}</p>
             </div>
@@ -1158,14 +1144,7 @@ def show_profile_edit_page():
             key="profile_upload"
         )
         if uploaded is not None:
-            from PIL import Image
-            img = Image.open(uploaded).convert("RGB")
-            img = img.resize((256, 256))
-            save_path = os.path.join(
-                "data", "profile_pics", f"{st.session_state.user_email}.png"
-            )
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            img.save(save_path, format="PNG")
+            save_profile_picture(st.session_state.user_email, uploaded, size=(256, 256))
             st.session_state.profile_updated = True
             st.success("✅ Profile photo updated!")
     
@@ -70,6 +70,20 @@ def save_users(users):
     with open(USERS_FILE, 'w') as f:
         json.dump(users, f, indent=2)
 
+# (users.json mtime, {email: name}) - read-only cache for per-rerun lookups
+_user_names_cache = (None, {})
+
+def get_user_name(email):
+    """Get a user's display name, re-reading users.json only when it changes"""
+    global _user_names_cache
+    if not os.path.exists(USERS_FILE):
+        return ""
+
+    mtime = os.path.getmtime(USERS_FILE)
+    if _user_names_cache[0] != mtime:
+        _user_names_cache = (mtime, {e: u.get("name", "") for e, u in load_users().items()})
+    return _user_names_cache[1].get(email, "")
+
 def register_user(name, email, phone, password):
     """Register new user"""
     users = load_users()
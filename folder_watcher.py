@@ -0,0 +1,176 @@
+"""
+Folder Watcher for RecruitNova
+Keeps the ranked results of watched folders (utils/folder_watch.py) current.
+Each new or changed resume is screened once against every JD watching its
+folder and inserted into that watch's leaderboard; unchanged files are never
+re-read. Uses inotify where available and mtime polling otherwise.
+
+Usage:
+    python folder_watcher.py [--poll 5] [--once]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+from utils import folder_watch, screening_history
+from utils.checkpoints import CheckpointStore, STATUS_FAILED, DB_PATH as CHECKPOINT_DB
+
+# Full folder comparison even with inotify, in case events were missed
+RECONCILE_SECONDS = 600
+
+
+def scan_watch(watch, paths=None, settle=True, db_path=folder_watch.DB_PATH, checkpoint_db=CHECKPOINT_DB,
+               history_db=screening_history.DB_PATH):
+    """
+    Screen the new or changed files of one watch into its leaderboard
+
+    Args:
+        watch: Watch dict from folder_watch.list_watches
+        paths: Paths reported by inotify; None compares the whole folder
+
+    Returns:
+        Dictionary of counts: files screened, failed and removed
+    """
+    from utils.screening import (
+        SUPPORTED_FORMATS, ARCHIVE_FORMATS, iter_path_sources, screen_resume_path, screen_checkpointed, source_label
+    )
+
+    counts = {"files": 0, "failed": 0, "removed": 0}
+    if not os.path.isdir(watch["folder"]):
+        folder_watch.finish_scan(watch["id"], f"Folder not found: {watch['folder']}", db_path)
+        return counts
+
+    changed, removed = folder_watch.changed_files(
+        watch["id"], watch["folder"], SUPPORTED_FORMATS + ARCHIVE_FORMATS, paths, settle, db_path
+    )
+    if removed:
+        folder_watch.forget_files(watch["id"], removed, db_path)
+        counts["removed"] = len(removed)
+
+    screened = []
+    # Same profile as the dashboard's folder screen, so checkpoints are shared
+    with CheckpointStore.for_screen(watch["job_desc"], "folder", db_path=checkpoint_db) as checkpoints:
+        for path, mtime_ns, size in changed:
+            results = []
+            for name, content, error, source in iter_path_sources(path):
+                if error is None:
+                    row, status, error = screen_checkpointed(
+                        checkpoints, name, content,
+                        lambda: screen_resume_path(watch["job_desc"], source.get("resume_path", name),
+                                                   file_content=content),
+                        resume_path=source.get("resume_path")
+                    )
+                else:
+                    row, status = None, STATUS_FAILED
+                if row:
+                    row.update({"resume_path": None, **source})
+                    screened.append(row)
+                results.append({
+                    "member": source.get("archive_member"),
+                    "filename": source_label(name, source),
+                    "status": status,
+                    "row": row,
+                    "error": error,
+                })
+                counts["failed"] += status == STATUS_FAILED
+            folder_watch.record_file(watch["id"], path, mtime_ns, size, results, db_path)
+            counts["files"] += 1
+
+    screening_history.record_screening(watch["job_desc"], screened, "watch", db_path=history_db)
+    folder_watch.finish_scan(watch["id"], db_path=db_path)
+    return counts
+
+
+def _report(watch, counts):
+    if counts["files"] or counts["removed"]:
+        print(f"[watch {watch['id']}] {watch['folder']}: {counts['files']} screened "
+              f"({counts['failed']} failed), {counts['removed']} removed", flush=True)
+
+
+def watch_loop(poll_seconds=5.0, once=False, db_path=folder_watch.DB_PATH, checkpoint_db=CHECKPOINT_DB):
+    """
+    Screen arrivals in watched folders until interrupted
+
+    Every active watch is compared in full when first seen (catching up on
+    files that arrived while the watcher was down). After that only inotify
+    events are looked at, with a full comparison every RECONCILE_SECONDS;
+    without inotify every poll is a full comparison.
+    """
+    notifier = None if once else folder_watch.open_notifier()
+    watched_folders = set()
+    reconciled = {}   # watch id -> time of its last full comparison
+
+    try:
+        while True:
+            watches = folder_watch.list_watches(active_only=True, db_path=db_path)
+            now = time.monotonic()
+            for watch in watches:
+                if notifier and watch["folder"] not in watched_folders and os.path.isdir(watch["folder"]):
+                    try:
+                        notifier.add(watch["folder"])
+                    except OSError as e:
+                        # e.g. out of inotify watches; the periodic full comparison still covers it
+                        print(f"[watch {watch['id']}] inotify unavailable for {watch['folder']}: {e}", flush=True)
+                    watched_folders.add(watch["folder"])
+                if notifier and now - reconciled.get(watch["id"], -RECONCILE_SECONDS) < RECONCILE_SECONDS:
+                    continue
+                _report(watch, scan_watch(watch, db_path=db_path, checkpoint_db=checkpoint_db))
+                reconciled[watch["id"]] = now
+
+            if once:
+                return
+            if notifier is None:
+                time.sleep(poll_seconds)
+                continue
+
+            changed = notifier.read(poll_seconds)
+            if notifier.overflowed:
+                notifier.overflowed = False
+                reconciled.clear()
+                continue
+            if not changed:
+                continue
+            for watch in watches:
+                paths = [p for p in changed if os.path.dirname(p) == watch["folder"]]
+                if paths:
+                    _report(watch, scan_watch(watch, paths, settle=False, db_path=db_path,
+                                              checkpoint_db=checkpoint_db))
+    finally:
+        if notifier:
+            notifier.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Auto-screen resumes arriving in watched folders")
+    parser.add_argument("--poll", type=float, default=5.0,
+                        help="Seconds between folder checks (the inotify wait when available)")
+    parser.add_argument("--once", action="store_true", help="Scan every watch once and exit")
+    parser.add_argument("--add", metavar="FOLDER", default=None, help="Watch this folder (needs --jd)")
+    parser.add_argument("--jd", default=None, help="Job description text file for --add")
+    parser.add_argument("--db", default=folder_watch.DB_PATH, help="Watch database path")
+    args = parser.parse_args(argv)
+
+    if args.add:
+        if not args.jd or not os.path.isfile(args.jd):
+            print("❌ --add needs --jd with a job description file", file=sys.stderr)
+            return 2
+        with open(args.jd, "r", encoding="utf-8", errors="ignore") as f:
+            job_desc = f.read()
+        try:
+            watch_id = folder_watch.add_watch(args.add, job_desc, os.path.basename(args.jd), db_path=args.db)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 2
+        print(f"✅ Watching {os.path.abspath(args.add)} (watch #{watch_id})")
+
+    try:
+        watch_loop(args.poll, args.once, args.db)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Background Screening Worker for RecruitNova
+Consumes jobs from the SQLite queue (utils/job_queue.py) and writes progress
+and per-file results back. Runs outside Streamlit; start as many as needed.
+
+Usage:
+    python job_worker.py [--workers 2] [--poll 2] [--once]
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import multiprocessing
+
+from utils import job_queue, screening_history
+from utils.link_prescreen import prescreen_pending
+from utils.checkpoints import CheckpointStore, STATUS_FAILED, DB_PATH as CHECKPOINT_DB
+
+# Upload-link submissions pre-screened per idle poll, so queued jobs are not held up
+PRESCREEN_BATCH = 10
+
+
+def process_job(job, db_path=job_queue.DB_PATH, checkpoint_db=CHECKPOINT_DB, history_db=screening_history.DB_PATH):
+    """
+    Screen every file of a claimed job, recording each result as it finishes
+
+    Per-file results are checkpointed by content hash, so a rerun (or a job
+    taken over from a dead worker) only screens new or previously failed files.
+    Screened rows go to the screening history when the job stops. Writes
+    are tied to the worker that claimed the job: if a slow worker finds the
+    job was taken over meanwhile, it stops without touching it.
+
+    Returns:
+        Final status of the job ("taken over" when another worker owns it)
+    """
+    from utils.screening import (
+        screen_upload, screen_resume_path, list_resume_files, iter_folder_sources, source_label, screen_checkpointed
+    )
+
+    job_id = job["id"]
+    job_desc = job["job_desc"]
+    worker = job["worker"]
+    kind = "upload" if job["kind"] == "bulk" else "folder"
+
+    try:
+        if job["kind"] == "bulk":
+            items = (
+                (name, content, error, {}) for _seq, name, content, error in job_queue.iter_job_files(job_id, db_path)
+            )
+        else:
+            if not job["folder"] or not os.path.isdir(job["folder"]):
+                if not job_queue.finish_job(job_id, "failed", f"Folder not found: {job['folder']}", worker, db_path):
+                    return "taken over"
+                return "failed"
+            # Archives count as one file until their members are read
+            total = len(list_resume_files(job["folder"], include_archives=True))
+            job_queue.set_job_total(job_id, total, worker, db_path)
+            items = iter_folder_sources(job["folder"])
+
+        seq = 0
+        screened = []
+        with CheckpointStore.for_screen(job_desc, kind, db_path=checkpoint_db) as checkpoints:
+            for name, content, error, source in items:
+                if kind == "folder" and seq >= total:
+                    total = seq + 1
+                    job_queue.set_job_total(job_id, total, worker, db_path)
+
+                if error is not None:
+                    row, status = None, STATUS_FAILED
+                elif kind == "folder":
+                    row, status, error = screen_checkpointed(
+                        checkpoints, name, content,
+                        lambda: screen_resume_path(job_desc, source.get("resume_path", name), file_content=content),
+                        resume_path=source.get("resume_path")
+                    )
+                else:
+                    row, status, error = screen_checkpointed(
+                        checkpoints, name, content, lambda: screen_upload(job_desc, name, content)
+                    )
+                if row:
+                    row.update({"resume_path": None, **source} if kind == "folder" else source)
+                    screened.append(row)
+
+                keep_going = job_queue.record_result(
+                    job_id, seq, source_label(name, source), row, error, status,
+                    worker, db_path
+                )
+                seq += 1
+                if not keep_going:
+                    # Cancelled, unless the job was taken over (then the new owner records it)
+                    if not job_queue.finish_job(job_id, "cancelled", worker=worker, db_path=db_path):
+                        return "taken over"
+                    screening_history.record_screening(job_desc, screened, "job", db_path=history_db)
+                    return "cancelled"
+
+        if kind == "folder" and seq != total:
+            job_queue.set_job_total(job_id, seq, worker, db_path)
+        screening_history.record_screening(job_desc, screened, "job", db_path=history_db)
+
+    except Exception as e:
+        if not job_queue.finish_job(job_id, "failed", str(e), worker, db_path):
+            return "taken over"
+        return "failed"
+
+    if not job_queue.finish_job(job_id, "done", worker=worker, db_path=db_path):
+        return "taken over"
+    return "done"
+
+
+def worker_loop(name, poll_seconds=2.0, once=False, db_path=job_queue.DB_PATH):
+    """Claim and process jobs until interrupted (or until the queue is empty with once)"""
+    while True:
+        job = job_queue.claim_next_job(name, db_path)
+        if job is None:
+            # Idle time picks up upload-link submissions the app process did not get to
+            if prescreen_pending(limit=PRESCREEN_BATCH):
+                continue
+            if once:
+                return
+            time.sleep(poll_seconds)
+            continue
+
+        print(f"[{name}] job {job['id']} ({job['kind']}) started", flush=True)
+        status = process_job(job, db_path)
+        print(f"[{name}] job {job['id']} {status}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Process queued RecruitNova screening jobs")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (each runs one job at a time)")
+    parser.add_argument("--poll", type=float, default=2.0, help="Seconds between queue checks when idle")
+    parser.add_argument("--once", action="store_true", help="Exit when no job is due")
+    parser.add_argument("--db", default=job_queue.DB_PATH, help="Queue database path")
+    args = parser.parse_args(argv)
+
+    base_name = f"{socket.gethostname()}:{os.getpid()}"
+    if args.workers <= 1:
+        try:
+            worker_loop(base_name, args.poll, args.once, args.db)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    processes = [
+        multiprocessing.Process(target=worker_loop, args=(f"{base_name}/{i}", args.poll, args.once, args.db))
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import streamlit as st
 from auth import update_profile, get_user_profile
+from utils.assets import save_profile_picture
 import time
 
 def show_profile_form():
@@ -97,17 +98,8 @@ def show_profile_form():
                     # Save Photo if uploaded
                     if uploaded_file:
                         try:
-                            import os
-                            from PIL import Image
-                            img = Image.open(uploaded_file).convert("RGB")
-                            # Resize for avatar usage
-                            img = img.resize((300, 300))
-                            
-                            save_dir = os.path.join("data", "profile_pics")
-                            os.makedirs(save_dir, exist_ok=True)
-                            
-                            save_path = os.path.join(save_dir, f"{st.session_state.user_email}.png")
-                            img.save(save_path, format="PNG")
+                            # Stores the 300x300 photo plus the small avatar thumbnail
+                            save_profile_picture(st.session_state.user_email, uploaded_file)
                         except Exception as e:
                             st.warning(f"Could not save photo: {e}")
 
@@ -0,0 +1,389 @@
+"""
+RecruitNova Command Line
+Headless batch screening for cron jobs and CI. Never imports Streamlit.
+
+Usage:
+    python -m recruitnova screen --jd jd.txt --folder resumes/ --workers 8 --out ranked.xlsx
+    python -m recruitnova bench-extract [--corpus resumes/] [--save]
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Columns written for every screened resume, in output order
+OUTPUT_COLUMNS = [
+    "rank",
+    "candidate_name",
+    "original_filename",
+    "email",
+    "contact",
+    "overall_score",
+    "skill_match",
+    "exp_match",
+    "experience_years",
+    "experience_level",
+    "ats_score",
+    "ats_rating",
+    "fit",
+    "recommendation",
+    "skills",
+    "missing_skills",
+    "hash",
+    "status",
+    "error",
+    "latency_ms",
+]
+
+OUTPUT_FORMATS = (".csv", ".xlsx", ".jsonl")
+
+# Per-file statuses (same values as utils.checkpoints)
+STATUS_SCREENED = "screened"
+STATUS_REUSED = "reused"
+STATUS_FAILED = "failed"
+
+# Checkpoint stores opened by this process: (job_desc, years, db) -> store
+_checkpoint_stores = {}
+
+
+# ==================== WORKER ====================
+
+def _checkpoint_store(job_desc, required_years, checkpoint_db):
+    from utils.checkpoints import CheckpointStore
+
+    key = (job_desc, required_years, checkpoint_db)
+    if key not in _checkpoint_stores:
+        _checkpoint_stores[key] = CheckpointStore.for_screen(job_desc, "cli", required_years, checkpoint_db)
+    return _checkpoint_stores[key]
+
+
+def screen_file(filepath, job_desc, required_years=3, checkpoint_db=None):
+    """
+    Screen one resume file (runs inside a worker process)
+
+    With checkpoint_db, a file whose content was already screened for this
+    JD is taken from its checkpoint, and new outcomes are checkpointed.
+
+    Returns:
+        Flat result row; failures are reported in the row instead of raised
+    """
+    from utils.safe_extract import extract_text_isolated
+    from utils.resume_screener import ResumeScreener
+    from utils.screening import (
+        load_resume_file, calculate_ats_score, extract_contact_from_resume,
+        get_file_hash, classify_fit, candidate_name_from_filename
+    )
+
+    started = time.perf_counter()
+    filename = os.path.basename(filepath)
+    row = {
+        "candidate_name": candidate_name_from_filename(filename),
+        "original_filename": filename,
+        "status": STATUS_FAILED,
+        "error": "",
+    }
+    checkpoints = None
+
+    try:
+        resume_file = load_resume_file(filepath)
+        row["size_bytes"] = len(resume_file.getvalue())
+        row["hash"] = get_file_hash(resume_file.getvalue())
+
+        if checkpoint_db:
+            checkpoints = _checkpoint_store(job_desc, required_years, checkpoint_db)
+            cached = checkpoints.get_done_row(row["hash"])
+            if cached is not None:
+                cached.update({k: row[k] for k in ("candidate_name", "original_filename", "size_bytes", "hash")})
+                cached["status"] = STATUS_REUSED
+                cached["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                return cached
+
+        resume_text = extract_text_isolated(filename, resume_file.getvalue())
+
+        result = ResumeScreener.screen_resume(resume_text, job_desc, required_years=required_years)
+        if not result.get("success"):
+            raise ValueError(result.get("error", "screening failed"))
+
+        contact_info = extract_contact_from_resume(resume_text)
+        ats_data = calculate_ats_score(resume_text, job_desc)
+
+        row.update({
+            "email": contact_info["email"],
+            "contact": contact_info["contact"],
+            "overall_score": result["final_score"],
+            "skill_match": result["skill_match_percentage"],
+            "exp_match": result["experience_match_percentage"],
+            "experience_years": result["experience_years"],
+            "experience_level": result["experience_level"],
+            "ats_score": ats_data["ats_score"],
+            "ats_rating": ats_data["ats_rating"],
+            "fit": classify_fit(result["final_score"]),
+            "recommendation": result["recommendation"],
+            "skills": ", ".join(result["skills"][:5]),
+            "missing_skills": ", ".join(result["missing_skills"]),
+            "status": STATUS_SCREENED,
+        })
+    except Exception as e:
+        row["error"] = str(e) or type(e).__name__
+
+    if checkpoints is not None:
+        checkpoints.put(row["hash"], filename, row if row["status"] == STATUS_SCREENED else None, row["error"] or None)
+
+    row["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return row
+
+
+def _warm_worker(extract_timeout=None):
+    """Import the scoring modules once per worker instead of on the first file"""
+    import utils.resume_screener  # noqa: F401
+    import utils.screening  # noqa: F401
+    from utils.safe_extract import configure_extraction_pool, EXTRACT_TIMEOUT_SECONDS
+
+    # Each screening process gets one isolated extractor of its own
+    configure_extraction_pool(workers=1, timeout=extract_timeout or EXTRACT_TIMEOUT_SECONDS)
+
+
+def iter_screened(files, job_desc, workers=1, required_years=3, checkpoint_db=None, extract_timeout=None):
+    """
+    Screen files in parallel, yielding rows as they complete
+
+    With workers <= 1 everything runs in this process.
+    """
+    if workers <= 1:
+        _warm_worker(extract_timeout)
+        for filepath in files:
+            yield screen_file(filepath, job_desc, required_years, checkpoint_db)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker, initargs=(extract_timeout,)) as pool:
+        futures = [pool.submit(screen_file, filepath, job_desc, required_years, checkpoint_db) for filepath in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+# ==================== OUTPUT ====================
+
+class RowWriter:
+    """Write result rows to .csv, .jsonl or .xlsx as they arrive"""
+
+    def __init__(self, path):
+        self.path = path
+        self.ext = os.path.splitext(path)[1].lower()
+        if self.ext not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format '{self.ext}' (use {', '.join(OUTPUT_FORMATS)})")
+
+        out_dir = os.path.dirname(os.path.abspath(path))
+        os.makedirs(out_dir, exist_ok=True)
+
+        if self.ext == ".xlsx":
+            from openpyxl import Workbook
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet("Ranked")
+            self._sheet.append(OUTPUT_COLUMNS)
+        else:
+            self._file = open(path, "w", newline="", encoding="utf-8")
+            if self.ext == ".csv":
+                self._csv = csv.DictWriter(self._file, fieldnames=OUTPUT_COLUMNS, extrasaction="ignore")
+                self._csv.writeheader()
+
+    def write(self, row):
+        if self.ext == ".xlsx":
+            self._sheet.append([row.get(col, "") for col in OUTPUT_COLUMNS])
+        elif self.ext == ".csv":
+            self._csv.writerow({col: row.get(col, "") for col in OUTPUT_COLUMNS})
+        else:
+            self._file.write(json.dumps({col: row.get(col) for col in OUTPUT_COLUMNS if col in row}) + "\n")
+            self._file.flush()
+
+    def close(self):
+        if self.ext == ".xlsx":
+            self._workbook.save(self.path)
+        else:
+            self._file.close()
+
+
+def rank_rows(rows):
+    """Sort successful rows by score (failures last) and number them"""
+    rows.sort(key=lambda r: (r["status"] == STATUS_FAILED, -(r.get("overall_score") or 0)))
+    for position, row in enumerate(rows, 1):
+        row["rank"] = position if row["status"] != STATUS_FAILED else ""
+    return rows
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def summarize_run(rows, elapsed):
+    """Throughput statistics for a finished run"""
+    latencies = [r["latency_ms"] for r in rows]
+    total_bytes = sum(r.get("size_bytes", 0) for r in rows)
+    return {
+        "files": len(rows),
+        "ok": sum(1 for r in rows if r["status"] != STATUS_FAILED),
+        "reused": sum(1 for r in rows if r["status"] == STATUS_REUSED),
+        "failed": sum(1 for r in rows if r["status"] == STATUS_FAILED),
+        "elapsed_s": elapsed,
+        "files_per_s": len(rows) / elapsed if elapsed > 0 else 0.0,
+        "mb_per_s": total_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+    }
+
+
+# ==================== COMMANDS ====================
+
+def run_screen(args):
+    from utils.screening import list_resume_files
+
+    if not os.path.isfile(args.jd):
+        print(f"❌ Job description file not found: {args.jd}", file=sys.stderr)
+        return 2
+    if not os.path.isdir(args.folder):
+        print(f"❌ Resume folder not found: {args.folder}", file=sys.stderr)
+        return 2
+
+    with open(args.jd, "r", encoding="utf-8", errors="ignore") as f:
+        job_desc = f.read()
+    if not job_desc.strip():
+        print("❌ Job description is empty", file=sys.stderr)
+        return 2
+
+    files = list_resume_files(args.folder)
+    if not files:
+        print(f"⚠️ No .pdf/.docx/.txt resumes in {args.folder}", file=sys.stderr)
+
+    try:
+        writer = RowWriter(args.out)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    rows = []
+    started = time.perf_counter()
+    try:
+        checkpoint_db = args.checkpoint_db if args.resume else None
+        screened = iter_screened(files, job_desc, args.workers, args.required_years, checkpoint_db,
+                                 args.extract_timeout)
+        for done, row in enumerate(screened, 1):
+            rows.append(row)
+            if args.stream:
+                row["rank"] = ""
+                writer.write(row)
+            if not args.quiet and row["status"] == STATUS_FAILED:
+                print(f"⚠️ {row['original_filename']}: {row['error']}", file=sys.stderr)
+            if not args.quiet and done % 100 == 0:
+                print(f"  {done}/{len(files)} screened", file=sys.stderr)
+    finally:
+        elapsed = time.perf_counter() - started
+        if not args.stream:
+            for row in rank_rows(rows):
+                writer.write(row)
+        writer.close()
+
+    stats = summarize_run(rows, elapsed)
+    print(f"Screened {stats['files']} resumes ({stats['ok']} ok, {stats['reused']} from checkpoints, "
+          f"{stats['failed']} failed) "
+          f"in {stats['elapsed_s']:.2f}s with {args.workers} worker(s)")
+    print(f"Throughput: {stats['files_per_s']:.1f} files/s, {stats['mb_per_s']:.2f} MB/s")
+    print(f"Latency per file: p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms")
+
+    if args.top and not args.stream:
+        print()
+        print(f"Top {min(args.top, stats['ok'])} candidates:")
+        for row in rows[:args.top]:
+            if row["status"] == STATUS_FAILED:
+                break
+            print(f"  #{row['rank']:<3} {row['overall_score']:6.1f}%  {row['fit']:<13} {row['candidate_name']}")
+
+    print(f"\n✅ Results written to {args.out}")
+    return 0
+
+
+def run_bench_extract(args):
+    """Time every extraction backend and optionally save the fastest correct ones"""
+    from utils.extract_backends import (
+        build_benchmark_corpus, load_document_corpus, benchmark_backends, save_backend_config
+    )
+
+    text_dir = args.text_corpus
+    text_files = sorted(
+        os.path.join(text_dir, f) for f in os.listdir(text_dir) if f.lower().endswith(".txt")
+    ) if os.path.isdir(text_dir) else []
+    corpus = build_benchmark_corpus(text_files)
+    if args.corpus:
+        if not os.path.isdir(args.corpus):
+            print(f"❌ Folder not found: {args.corpus}", file=sys.stderr)
+            return 2
+        corpus += load_document_corpus(args.corpus)
+    if not corpus:
+        print("❌ No documents to benchmark", file=sys.stderr)
+        return 1
+
+    report = benchmark_backends(corpus, repeats=args.repeats)
+    print(f"{'kind':<5} {'backend':<12} {'files':>5} {'ms/file':>9} {'pages/s':>9} {'recall':>7}  correct")
+    for row in report["results"]:
+        print(f"{row['kind']:<5} {row['backend']:<12} {row['files']:>5} {row['ms_per_file']:>9.2f} "
+              f"{row['pages_per_s']:>9.1f} {row['skill_recall']:>7.3f}  {'yes' if row['correct'] else 'no'}")
+        for error in row["errors"][:3]:
+            print(f"      {error}")
+
+    print()
+    for kind, backend in report["backends"].items():
+        print(f"Fastest correct {kind} backend: {backend}")
+    if args.save:
+        save_backend_config(report["backends"], report["results"])
+        print("✅ Saved backend choice")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="recruitnova", description="RecruitNova headless tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    screen = commands.add_parser("screen", help="Screen a folder of resumes against a job description")
+    screen.add_argument("--jd", required=True, help="Job description text file")
+    screen.add_argument("--folder", required=True, help="Folder with .pdf/.docx/.txt resumes")
+    screen.add_argument("--out", required=True, help="Output file (.csv, .xlsx or .jsonl)")
+    screen.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (1 = run in this process)")
+    screen.add_argument("--required-years", type=int, default=3, help="Required years of experience")
+    screen.add_argument("--stream", action="store_true",
+                        help="Write rows as soon as they finish instead of ranked at the end")
+    screen.add_argument("--top", type=int, default=10, help="Number of top candidates to print")
+    screen.add_argument("--quiet", action="store_true", help="Only print the final summary")
+    screen.add_argument("--extract-timeout", type=float, default=None,
+                        help="Seconds allowed to parse one document before it is quarantined")
+    screen.add_argument("--resume", action="store_true",
+                        help="Checkpoint each file and skip files already screened for this JD")
+    screen.add_argument("--checkpoint-db", default=os.path.join("data", "screening_checkpoints.db"),
+                        help="Checkpoint database used with --resume")
+    screen.set_defaults(func=run_screen)
+
+    bench = commands.add_parser("bench-extract", help="Benchmark the PDF/DOCX text extraction backends")
+    bench.add_argument("--text-corpus", default="test_resumes",
+                       help="Folder of .txt resumes rendered as PDF/DOCX with known text")
+    bench.add_argument("--corpus", default=None, help="Folder of real .pdf/.docx resumes to include")
+    bench.add_argument("--repeats", type=int, default=3, help="Timed passes over the corpus")
+    bench.add_argument("--save", action="store_true",
+                       help="Use the fastest correct backends from now on (data/extract_backends.json)")
+    bench.set_defaults(func=run_bench_extract)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,7 +10,6 @@ from urllib.parse import urlparse, parse_qs
 
 # Directories
 FETCHED_RESUMES_DIR = "fetched_resumes"
-os.makedirs(FETCHED_RESUMES_DIR, exist_ok=True)
 
 # HTTP Headers
 HEADERS = {
@@ -194,6 +193,7 @@ class ResumeFetcher:
     def save_resume(content, filename):
         """Save resume to disk"""
         try:
+            os.makedirs(FETCHED_RESUMES_DIR, exist_ok=True)
             filepath = os.path.join(FETCHED_RESUMES_DIR, filename)
             with open(filepath, 'wb') as f:
                 f.write(content)
@@ -0,0 +1,434 @@
+"""
+Screening Service for RecruitNova
+A local JSON-over-HTTP screening server backed by one warm process pool, so
+every Streamlit session and external tool shares the same workers instead of
+screening inside its own script thread.
+
+Endpoints:
+    GET  /health            pool size, uptime and request counters
+    POST /screen            one resume (text or file) against one JD
+    POST /screen/bulk       many resumes against one JD, ranked
+    POST /screen/multi-jd   many resumes against several JDs
+
+Usage:
+    python screening_service.py serve [--host 127.0.0.1] [--port 8765] [--workers 4]
+    python screening_service.py bench [--clients 8] [--requests 25]
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.shared_spool import SpoolBatch
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 200 * 1024 * 1024
+
+
+# ==================== WORKER TASKS ====================
+# Run inside the pool processes; module-level so they can be pickled
+
+def _warm_worker():
+    """Load SKILLS_DB, the scorers and the predictors once per worker process"""
+    from utils.extract import SKILLS_DB, extract_skills  # noqa: F401
+    import utils.resume_screener  # noqa: F401
+    import utils.screening  # noqa: F401
+    import utils.timeline_generator  # noqa: F401
+    from utils.growth_predictor import predict_growth
+    from utils.performance_predictor import predict_performance
+
+    # One tiny run primes the regexes and lazy tables on the scoring path
+    sample = "Python developer with 3 years of experience in SQL and AWS"
+    extract_skills(sample)
+    predict_growth(sample, 3, ["python"])
+    predict_performance(sample, 3, ["python"])
+
+
+def _resume_text(name, content):
+    from utils.safe_extract import extract_text_isolated
+
+    return extract_text_isolated(name, content)
+
+
+def task_screen(resume_text, job_description, job_title="", required_years=3, predictions=False):
+    """ResumeScreener result plus the ATS score (and optionally the predictors)"""
+    from utils.resume_screener import ResumeScreener
+    from utils.screening import calculate_ats_score
+
+    result = ResumeScreener.screen_resume(resume_text, job_description, job_title, required_years)
+    if result.get("success"):
+        result["ats"] = calculate_ats_score(resume_text, job_description)
+        if predictions:
+            from utils.growth_predictor import predict_growth
+            from utils.performance_predictor import predict_performance
+            result["growth"] = predict_growth(resume_text, result["experience_years"], result["skills"])
+            result["performance"] = predict_performance(resume_text, result["experience_years"], result["skills"])
+    return result
+
+
+def task_screen_file(name, content, job_description, job_title="", required_years=3, predictions=False):
+    return task_screen(_resume_text(name, content), job_description, job_title, required_years, predictions)
+
+
+def task_bulk_row(job_description, name, content):
+    """Ranked-table row for one upload (bytes or spool reference)"""
+    from utils.screening import screen_upload
+
+    return screen_upload(job_description, name, content)
+
+
+def task_multi_jd(name, content, job_descriptions, required_years=3):
+    """Score one resume against every JD, extracting its text and skills once"""
+    from utils.extract import extract_skills, match_job_skills
+    from utils.experience import estimate_experience_years, experience_percentage
+    from utils.ranking import calculate_final_score
+    from utils.screening import calculate_ats_score, candidate_name_from_filename, classify_fit
+
+    text = _resume_text(name, content)
+    skills = extract_skills(text)
+    exp_years = estimate_experience_years(text)
+    exp_match = experience_percentage(exp_years, required_years)
+
+    scores = []
+    for jd in job_descriptions:
+        skill_match = match_job_skills(skills, jd["text"])
+        final_score = calculate_final_score(skill_match, exp_match)
+        scores.append({
+            "title": jd.get("title", ""),
+            "skill_match": round(skill_match, 2),
+            "exp_match": round(exp_match, 2),
+            "overall_score": round(final_score, 2),
+            "ats_score": calculate_ats_score(text, jd["text"])["ats_score"],
+            "fit": classify_fit(final_score),
+        })
+
+    best = max(scores, key=lambda s: s["overall_score"]) if scores else None
+    return {
+        "candidate_name": candidate_name_from_filename(name),
+        "original_filename": name,
+        "experience_years": exp_years,
+        "skills": skills[:10],
+        "scores": scores,
+        "best_match": best["title"] if best else None,
+    }
+
+
+# ==================== HTTP SERVER ====================
+
+class ServiceError(Exception):
+    """Request error reported to the client with an HTTP status"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _spool_resumes(payload, batch):
+    """
+    [{"name", "content_b64"} or {"name", "ref"}] -> [(name, spool reference)]
+
+    Uploaded bytes are decoded straight into the request's spool batch, so
+    workers get small references instead of pickled copies. Local clients
+    can skip the upload entirely by sending references into the shared
+    spool directory.
+    """
+    from utils.shared_spool import is_blob_ref, is_spooled, spool_dir
+    from utils.upload_spool import upload_spool_dir
+
+    resumes = payload.get("resumes")
+    if not isinstance(resumes, list) or not resumes:
+        raise ServiceError("'resumes' must be a non-empty list of {name, content_b64} or {name, ref}")
+    spooled = []
+    for item in resumes:
+        try:
+            name = os.path.basename(item["name"])
+            ref = item.get("ref")
+            if ref is not None:
+                if not is_blob_ref(ref) or not is_spooled(ref, [spool_dir(), upload_spool_dir()]):
+                    raise ServiceError(f"'{name}': ref must point into the shared spool directory")
+                spooled.append((name, dict(ref, name=name)))
+            else:
+                spooled.append((name, batch.add(name, base64.b64decode(item["content_b64"]))))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise ServiceError("each resume needs 'name' and base64 'content_b64' (or a spool 'ref')")
+    return spooled
+
+
+def _require_text(payload, key):
+    value = payload.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise ServiceError(f"'{key}' is required")
+    return value
+
+
+class ScreeningServer(ThreadingHTTPServer):
+    """HTTP server owning the shared worker pool"""
+
+    daemon_threads = True
+
+    def __init__(self, address, workers):
+        super().__init__(address, ScreeningRequestHandler)
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker)
+        self.started_at = time.time()
+        self.counters = {"requests": 0, "resumes": 0, "errors": 0}
+        self._counter_lock = threading.Lock()
+
+        # Start and warm every worker now rather than on the first request
+        list(self.pool.map(time.sleep, [0.05] * workers))
+
+    def count(self, **increments):
+        with self._counter_lock:
+            for key, value in increments.items():
+                self.counters[key] += value
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+    # ---------- endpoint handlers ----------
+
+    def health(self, _payload):
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            **self.counters,
+        }
+
+    def screen(self, payload):
+        job_description = _require_text(payload, "job_description")
+        args = (job_description, payload.get("job_title", ""),
+                int(payload.get("required_years", 3)), bool(payload.get("predictions", False)))
+
+        with SpoolBatch() as batch:
+            if payload.get("resume_text"):
+                future = self.pool.submit(task_screen, payload["resume_text"], *args)
+            elif payload.get("resume"):
+                name, ref = _spool_resumes({"resumes": [payload["resume"]]}, batch)[0]
+                future = self.pool.submit(task_screen_file, name, ref, *args)
+            else:
+                raise ServiceError("'resume_text' or 'resume' {name, content_b64} is required")
+            result = future.result()
+
+        self.count(resumes=1)
+        return {"status": "success", "result": result}
+
+    def screen_bulk(self, payload):
+        from utils.screening import detect_duplicates
+
+        job_description = _require_text(payload, "job_description")
+
+        results, failed = [], []
+        with SpoolBatch() as batch:
+            resumes = _spool_resumes(payload, batch)
+            futures = [(name, self.pool.submit(task_bulk_row, job_description, name, ref))
+                       for name, ref in resumes]
+            for name, future in futures:
+                try:
+                    row = future.result()
+                except Exception as e:
+                    row, reason = None, str(e)
+                else:
+                    reason = "screening failed"
+                if row:
+                    results.append(row)
+                else:
+                    failed.append({"name": name, "error": reason})
+
+        results.sort(key=lambda x: x["overall_score"], reverse=True)
+        self.count(resumes=len(resumes))
+        return {"status": "success", "results": detect_duplicates(results), "failed": failed}
+
+    def screen_multi_jd(self, payload):
+        job_descriptions = payload.get("job_descriptions")
+        if not isinstance(job_descriptions, list) or not job_descriptions \
+                or not all(isinstance(jd, dict) and str(jd.get("text", "")).strip() for jd in job_descriptions):
+            raise ServiceError("'job_descriptions' must be a non-empty list of {title, text}")
+        required_years = int(payload.get("required_years", 3))
+
+        with SpoolBatch() as batch:
+            resumes = _spool_resumes(payload, batch)
+            futures = [self.pool.submit(task_multi_jd, name, ref, job_descriptions, required_years)
+                       for name, ref in resumes]
+            results = [future.result() for future in futures]
+        self.count(resumes=len(resumes))
+        return {"status": "success", "results": results}
+
+
+ROUTES = {
+    ("GET", "/health"): ScreeningServer.health,
+    ("POST", "/screen"): ScreeningServer.screen,
+    ("POST", "/screen/bulk"): ScreeningServer.screen_bulk,
+    ("POST", "/screen/multi-jd"): ScreeningServer.screen_multi_jd,
+}
+
+
+class ScreeningRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, method):
+        route = ROUTES.get((method, self.path.split("?", 1)[0].rstrip("/") or "/"))
+        if route is None:
+            self._send_json(404, {"status": "error", "message": f"No route for {method} {self.path}"})
+            return
+
+        self.server.count(requests=1)
+        try:
+            payload = {}
+            if method == "POST":
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_BODY_BYTES:
+                    raise ServiceError("Request body too large", status=413)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(payload, dict):
+                    raise ServiceError("Request body must be a JSON object")
+            self._send_json(200, route(self.server, payload))
+        except ServiceError as e:
+            self.server.count(errors=1)
+            self._send_json(e.status, {"status": "error", "message": str(e)})
+        except ValueError as e:
+            self.server.count(errors=1)
+            self._send_json(400, {"status": "error", "message": f"Invalid request: {e}"})
+        except Exception as e:
+            self.server.count(errors=1)
+            self._send_json(500, {"status": "error", "message": str(e)})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, "quiet", False):
+            super().log_message(format, *args)
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, quiet=False):
+    server = ScreeningServer((host, port), workers or os.cpu_count() or 1)
+    server.quiet = quiet
+    return server
+
+
+# ==================== BENCHMARK ====================
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_benchmark(base_url, clients=8, requests_per_client=25, endpoint="screen", resume_text=None, job_description=None):
+    """
+    Hit the service from concurrent clients and measure throughput and latency
+
+    Returns:
+        Dictionary with request count, errors, requests/s and latency percentiles (ms)
+    """
+    from utils.screening_client import ScreeningClient, ScreeningServiceError
+
+    sample_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_resumes")
+    if resume_text is None:
+        with open(os.path.join(sample_dir, "senior_level.txt"), "r", encoding="utf-8") as f:
+            resume_text = f.read()
+    job_description = job_description or "Python developer with Django, SQL, AWS and Docker. 3+ years experience."
+    files = [{"name": f"bench_{i}.txt", "content": resume_text.encode("utf-8")} for i in range(10)]
+
+    client = ScreeningClient(base_url, timeout=120)
+
+    def one_client(_):
+        latencies, errors = [], 0
+        for _ in range(requests_per_client):
+            started = time.perf_counter()
+            try:
+                if endpoint == "bulk":
+                    client.screen_bulk(job_description, files)
+                else:
+                    client.screen(resume_text, job_description)
+            except ScreeningServiceError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        outcomes = list(executor.map(one_client, range(clients)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [ms for lat, _ in outcomes for ms in lat]
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": sum(err for _, err in outcomes),
+        "elapsed_s": elapsed,
+        "requests_per_s": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+    }
+
+
+# ==================== CLI ====================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RecruitNova screening service")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the screening service")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes in the pool")
+    serve.add_argument("--quiet", action="store_true", help="Do not log each request")
+
+    bench = commands.add_parser("bench", help="Benchmark a running service with concurrent clients")
+    bench.add_argument("--url", default=None, help="Service URL (default: RECRUITNOVA_SCREENING_URL or local)")
+    bench.add_argument("--clients", type=int, default=8)
+    bench.add_argument("--requests", type=int, default=25, help="Requests per client")
+    bench.add_argument("--endpoint", choices=["screen", "bulk"], default="screen")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        server = create_server(args.host, args.port, args.workers, args.quiet)
+        print(f"✅ Screening service on http://{args.host}:{args.port} with {args.workers} warm worker(s)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+
+    from utils.screening_client import ScreeningClient
+    url = ScreeningClient(args.url).base_url
+    if not ScreeningClient(url).is_available():
+        print(f"❌ No screening service at {url}", file=sys.stderr)
+        return 1
+
+    stats = run_benchmark(url, args.clients, args.requests, args.endpoint)
+    print(f"{stats['requests']} /{args.endpoint} requests from {stats['clients']} clients "
+          f"in {stats['elapsed_s']:.2f}s ({stats['errors']} errors)")
+    print(f"Throughput: {stats['requests_per_s']:.1f} req/s")
+    print(f"Latency: p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,59 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import os
-import hashlib
 from datetime import datetime as dtime
 import time
-from io import BytesIO
 import tempfile
 import random
+from collections import Counter
 from resume_fetcher import ResumeFetcher, FETCHED_RESUMES_DIR
 from resume_ui import show_fetch_and_screen_page
 
 
 # YOUR ORIGINAL IMPORTS
-from utils.extract import extract_text_from_file, extract_skills, match_job_skills
-from utils.experience import estimate_experience_years, experience_percentage, classify_experience_level
-from utils.ranking import calculate_final_score
-from utils.analyzer import analyze_resume
+from utils.extract import extract_text_from_file, extract_skills
+from utils.experience import estimate_experience_years
 from utils.growth_predictor import predict_growth
-from utils.comparison_engine import prepare_comparison_data, create_comparison_metrics_chart, get_comparison_insights, create_skills_comparison_radar
+from utils.comparison_engine import (
+    prepare_comparison_data, create_comparison_metrics_chart, get_comparison_insights, create_skills_comparison_radar,
+    MATRIX_COLUMNS, build_table_matrix, order_matrix, create_comparison_heatmap, create_parallel_coordinates
+)
 from utils.pdf_report import generate_candidate_report_pdf, generate_comparison_report_pdf
 from utils.radar_chart import parse_skills_to_dimensions, create_radar_chart, calculate_dimensions_from_text
 from utils.timeline_generator import extract_timeline_from_resume, create_career_timeline, create_vertical_timeline_html
+from utils.screening import (
+    get_file_hash, screen_single_resume, screen_uploads, screen_folder, screen_mailbox,
+    classify_fit, candidate_name_from_filename
+)
+from utils.mailbox_ingest import is_mailbox, read_attachment
+from utils.checkpoints import CheckpointStore, STATUS_SCREENED, STATUS_REUSED, STATUS_FAILED
+from utils.safe_extract import load_quarantine, release_from_quarantine
+from utils.upload_spool import (
+    spool_upload, spooled_files, iter_spooled, iter_expanded_files, read_spooled, prune_upload_spool_once
+)
+from utils.archive_ingest import is_archive
+from utils.screening_client import ScreeningClient, ScreeningServiceError
+from utils.job_queue import (
+    ACTIVE_STATUSES, enqueue_job, list_jobs, cancel_job, requeue_job,
+    get_job_results, get_job_failures, get_job_file_counts
+)
+from utils.folder_watch import add_watch, list_watches, set_watch_active, delete_watch, get_leaderboard
+from utils.upload_links import (
+    list_links, link_status, get_ranked_submissions, get_submission_counts, STATUS_PENDING, STATUS_SCREENING
+)
+from utils.link_prescreen import prescreen_async
+from utils.staged_ranking import DEFAULT_STAGES, STAGE_LABELS, ensure_stages
+from utils.shortlist import shortlist_rows, row_skill_mask
+from utils.pool_clustering import cluster_pool, row_dimensions
+from utils.candidate_table import CandidateTable, as_table
+from utils.screening_history import (
+    record_screening, import_excel_reports, clear_history, period_start,
+    get_totals, get_daily_summary, get_jd_summary, get_skill_gaps, get_skill_trends, get_recent_screenings
+)
+from utils.similarity_index import add_rows as index_similar_rows, add_stored_resumes, query_similar
+from utils.resume_index import SORT_FIELDS, refresh_index, query_index, record_scores, read_resume_bytes, delete_resume
 
 
 
@@ -44,334 +76,193 @@ if "auto_download_data" not in st.session_state:
 if "auto_download_filename" not in st.session_state:
     st.session_state.auto_download_filename = None
 
-# ==================== ATS SCORE CALCULATION ====================
-def calculate_ats_score(resume_text, job_desc):
-    """
-    Calculate ATS (Applicant Tracking System) score
-    ATS evaluates resume format, keywords, and structure
-    """
-    ats_score = 0
-    ats_details = {
-        "format_score": 0,
-        "keyword_score": 0,
-        "structure_score": 0,
-        "content_score": 0,
-        "issues": []
-    }
-    
-    # 1. FORMAT SCORE (25 points max)
-    format_score = 0
-    if len(resume_text) < 500:
-        ats_details["issues"].append("❗️ Resume too short (ATS may not parse)")
-    else:
-        format_score += 10
-    
-    if '\n' in resume_text and len(resume_text.split('\n')) > 20:
-        format_score += 10
-    else:
-        ats_details["issues"].append("❗️ Poor formatting/structure")
-    
-    if not any(char in resume_text for char in ['@', '.']):
-        ats_details["issues"].append("❗️ No contact information found")
-    else:
-        format_score += 5
-    
-    ats_details["format_score"] = format_score
-    ats_score += format_score
-    
-    # 2. KEYWORD SCORE (35 points max)
-    keyword_score = 0
-    resume_lower = resume_text.lower()
-    jd_lower = job_desc.lower()
-    
-    # Extract keywords from JD
-    jd_keywords = set(jd_lower.split())
-    jd_keywords = {kw for kw in jd_keywords if len(kw) > 3}  # Only words > 3 chars
-    
-    # Count matching keywords
-    matching_keywords = 0
-    for keyword in jd_keywords:
-        if keyword in resume_lower:
-            matching_keywords += 1
-    
-    if jd_keywords:
-        keyword_match_percent = (matching_keywords / len(jd_keywords)) * 100
-        keyword_score = min(35, int(keyword_match_percent * 0.35))  # Max 35 points
-    else:
-        keyword_score = 20
-    
-    if matching_keywords == 0:
-        ats_details["issues"].append("❗️ Very few keywords match job description")
-    
-    ats_details["keyword_score"] = keyword_score
-    ats_score += keyword_score
-    
-    # 3. STRUCTURE SCORE (20 points max)
-    structure_score = 0
-    sections = ["experience", "education", "skill", "project", "summary"]
-    found_sections = sum(1 for section in sections if section in resume_lower)
-    
-    structure_score = min(20, found_sections * 4)
-    
-    if found_sections < 2:
-        ats_details["issues"].append("âš ï¸ Missing important sections (Experience/Education)")
-    
-    ats_details["structure_score"] = structure_score
-    ats_score += structure_score
-    
-    # 4. CONTENT SCORE (20 points max)
-    content_score = 0
-    
-    # Check for numbers/metrics (indicates quantified achievements)
-    if any(char.isdigit() for char in resume_text):
-        content_score += 7
-    else:
-        ats_details["issues"].append("âš ï¸ No quantified achievements/metrics")
-    
-    # Check for action verbs
-    action_verbs = ["developed", "managed", "led", "created", "implemented", "designed", 
-                    "achieved", "increased", "improved", "reduced", "built"]
-    action_count = sum(1 for verb in action_verbs if verb in resume_lower)
-    content_score += min(8, action_count)
-    
-    # Check for relevant experience keywords
-    if "year" in resume_lower or "month" in resume_lower:
-        content_score += 5
-    else:
-        ats_details["issues"].append("❗️ Duration of experience not clearly mentioned")
-    
-    ats_details["content_score"] = content_score
-    ats_score += content_score
-    
-    # Final ATS Score (0-100)
-    ats_score = min(100, ats_score)
-    
-    # Determine ATS Rating
-    if ats_score >= 80:
-        ats_rating = "👏 Excellent"
-    elif ats_score >= 60:
-        ats_rating = "👌 Good"
-    elif ats_score >= 40:
-        ats_rating = "👍🏻  Fair"
-    else:
-        ats_rating = "👎🏻 Poor"
-    
-    return {
-        "ats_score": round(ats_score, 2),
-        "ats_rating": ats_rating,
-        "format_score": format_score,
-        "keyword_score": keyword_score,
-        "structure_score": structure_score,
-        "content_score": content_score,
-        "issues": ats_details["issues"]
-    }
+# Widget keys whose values must survive switching dashboard sections.
+# Streamlit drops the state of widgets that are not rendered in a run, so
+# hidden sections would otherwise lose their inputs.
+SECTION_STATE_KEYS = [
+    "single_jd",
+    "bulk_jd",
+    "auto_jd",
+    "auto_folder",
+    "fetch_jd",
+    "fetch_method",
+    "paste_urls",
+    "compare_selection",
+    "analytics_candidate",
+    "analytics_view",
+    "stored_search",
+    "stored_skill",
+    "stored_sort",
+    "stored_order",
+    "stored_page_size",
+]
+
+
+def keep_section_state():
+    """Re-save section widget values so they persist while the section is hidden"""
+    for key in SECTION_STATE_KEYS:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
 
+# ==================== SCREENING ====================
+# Scoring lives in utils.screening so it can run without Streamlit (see recruitnova.py)
 
-def get_file_hash(file_content):
-    """Get hash of file for duplicate detection"""
-    return hashlib.md5(file_content).hexdigest()
+def screen_with_jd(job_desc, resume_folder_path=None):
+    """Auto-screen all resumes against JD without manual upload"""
+    # Checkpoints let a rerun of the same JD skip files that already finished
+    if is_mailbox(resume_folder_path):
+        # Mail exports: only messages that arrived since the last scan are read
+        with CheckpointStore.for_screen(job_desc, "mailbox") as checkpoints:
+            return screen_mailbox(
+                job_desc,
+                resume_folder_path,
+                on_error=lambda label, e: st.warning(f"Error processing {label}: {str(e)}"),
+                checkpoints=checkpoints
+            )
+    with CheckpointStore.for_screen(job_desc, "folder") as checkpoints:
+        return screen_folder(
+            job_desc,
+            resume_folder_path,
+            on_error=lambda filename, e: st.warning(f"Error processing {filename}: {str(e)}"),
+            checkpoints=checkpoints
+        )
 
-def detect_duplicates(resumes_data):
-    """Detect duplicate resumes"""
-    hashes = {}
-    duplicates = []
-    
-    for idx, resume in enumerate(resumes_data):
-        file_hash = resume.get("hash")
-        if file_hash in hashes:
-            duplicates.append((idx, hashes[file_hash]))
-            resume["is_duplicate"] = True
-        else:
-            hashes[file_hash] = idx
-            resume["is_duplicate"] = False
-    
-    return resumes_data
 
-def extract_contact_from_resume(resume_text):
-    """Extract email and contact from resume"""
-    import re
-    
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    phone_pattern = r'(\+\d{1,3}[-.\\s]?)?\d{3}[-.\\s]?\d{3}[-.\\s]?\d{4}'
-    
-    email = re.search(email_pattern, resume_text)
-    phone = re.search(phone_pattern, resume_text)
-    
-    return {
-        "email": email.group(0) if email else "Not provided",
-        "contact": phone.group(0) if phone else "Not provided"
-    }
+def show_file_status_summary(counts):
+    """One line summarising how the files of a screening run were handled"""
+    if not counts:
+        return
+    st.caption(
+        f"🧾 {counts.get(STATUS_SCREENED, 0)} screened · "
+        f"{counts.get(STATUS_REUSED, 0)} reused from checkpoints · "
+        f"{counts.get(STATUS_FAILED, 0)} failed"
+    )
 
-def screen_single_resume(job_desc, resume_file):
-    """Screen a single resume against JD - USES YOUR ORIGINAL LOGIC + ATS"""
+def read_spooled_row(row):
+    """Bytes of an uploaded resume from the spool, or None once pruned"""
+    if not row.get("hash"):
+        return None
     try:
-        resume_text = extract_text_from_file(resume_file)
-        skills = extract_skills(resume_text)
-        exp_years = estimate_experience_years(resume_text)
-        skill_match = match_job_skills(skills, job_desc)
-        exp_match = experience_percentage(exp_years, 3)
-        final_score = calculate_final_score(skill_match, exp_match)
-        exp_label = classify_experience_level(exp_years)
-        analysis = analyze_resume(resume_text, job_desc)
-        contact_info = extract_contact_from_resume(resume_text)
-        
-        # NEW: Calculate ATS Score
-        ats_data = calculate_ats_score(resume_text, job_desc)
-        
-        return {
-            "status": "success",
-            "text": resume_text,
-            "skills": skills,
-            "exp_years": exp_years,
-            "skill_match": skill_match,
-            "exp_match": exp_match,
-            "final_score": final_score,
-            "exp_label": exp_label,
-            "analysis": analysis,
-            "email": contact_info["email"],
-            "contact": contact_info["contact"],
-            "ats_score": ats_data["ats_score"],
-            "ats_rating": ats_data["ats_rating"],
-            "ats_details": ats_data
-        }
-    
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
-
-def screen_bulk_resumes(job_desc, resume_files):
-    """Screen multiple resumes and return ranked results"""
-    results = []
-    
-    for resume_file in resume_files:
-        result = screen_single_resume(job_desc, resume_file)
-        
-        if result["status"] == "success":
-            score = result["final_score"]
-            
-            if score >= 75:
-                fit = "Strongly Fit"
-            elif score >= 50:
-                fit = "Mid Fit"
-            else:
-                fit = "Low Fit"
-            
-            file_content = resume_file.read()
-            file_hash = get_file_hash(file_content)
-            resume_file.seek(0)
-            
-            # Extract timeline events
-            timeline_events = extract_timeline_from_resume(result.get("text", ""))
-            
-            results.append({
-                "candidate_name": resume_file.name.replace('.pdf', '').replace('.docx', '').replace('.txt', ''),
-                "email": result.get("email", "Not provided"),
-                "contact": result.get("contact", "Not provided"),
-                "skills": ", ".join(result["skills"][:5]),
-                "experience_level": result["exp_label"],
-                "skill_match": round(result["skill_match"], 2),
-                "exp_match": round(result["exp_match"], 2),
-                "overall_score": round(result["final_score"], 2),
-                "ats_score": result.get("ats_score", 0),
-                "ats_rating": result.get("ats_rating", "N/A"),
-                "fit": fit,
-                "hash": file_hash,
-                "resume_path": None,
-                "file_content": file_content,
-                "original_filename": resume_file.name,
-                "ats_details": result.get("ats_details", {}),
-                "resume_text": result.get("text", ""),  # Store full text
-                "timeline_events": timeline_events      # Store extracted timeline
-            })
-    
-    results.sort(key=lambda x: x["overall_score"], reverse=True)
-    return detect_duplicates(results)
-
-def screen_with_jd(job_desc, resume_folder_path=None):
-    """Auto-screen all resumes against JD without manual upload"""
-    results = []
-    
-    if not resume_folder_path or not os.path.exists(resume_folder_path):
-        return {"status": "error", "message": "Invalid folder path"}
-    
-    supported_formats = ('.pdf', '.docx', '.txt')
-    
-    for filename in os.listdir(resume_folder_path):
-        if filename.lower().endswith(supported_formats):
-            filepath = os.path.join(resume_folder_path, filename)
-            
-            try:
-                with open(filepath, 'rb') as f:
-                    resume_text = extract_text_from_file(f)
-                
-                skills = extract_skills(resume_text)
-                exp_years = estimate_experience_years(resume_text)
-                skill_match = match_job_skills(skills, job_desc)
-                exp_match = experience_percentage(exp_years, 3)
-                final_score = calculate_final_score(skill_match, exp_match)
-                exp_label = classify_experience_level(exp_years)
-                contact_info = extract_contact_from_resume(resume_text)
-                
-                # NEW: Calculate ATS Score
-                ats_data = calculate_ats_score(resume_text, job_desc)
-                
-                if final_score >= 75:
-                    fit = "Strongly Fit"
-                elif final_score >= 50:
-                    fit = "Mid Fit"
-                else:
-                    fit = "Low Fit"
-                
-                file_content = open(filepath, 'rb').read()
-                file_hash = get_file_hash(file_content)
-                
-                results.append({
-                    "candidate_name": filename.replace('.pdf', '').replace('.docx', '').replace('.txt', ''),
-                    "email": contact_info.get("email", "Not provided"),
-                    "contact": contact_info.get("contact", "Not provided"),
-                    "skills": ", ".join(skills[:5]) if skills else "None",
-                    "experience_level": exp_label,
-                    "skill_match": round(skill_match, 2),
-                    "exp_match": round(exp_match, 2),
-                    "overall_score": round(final_score, 2),
-                    "ats_score": ats_data["ats_score"],
-                    "ats_rating": ats_data["ats_rating"],
-                    "fit": fit,
-                    "hash": file_hash,
-                    "resume_path": filepath,
-                    "file_content": file_content,
-                    "original_filename": filename,
-                    "ats_details": ats_data
-                })
-            
-            except Exception as e:
-                st.warning(f"Error processing {filename}: {str(e)}")
-    
-    results.sort(key=lambda x: x["overall_score"], reverse=True)
-    return {"status": "success", "results": detect_duplicates(results)}
+        return read_spooled({"hash": row["hash"]})
+    except OSError:
+        return None
+
+def read_mail_row(row):
+    """Bytes of a resume attached to an email, re-read from the mailbox"""
+    if not row.get("source_mailbox"):
+        return None
+    return read_attachment(row["source_mailbox"], row["mail_location"], row["original_filename"])
+
+def show_file_failures(file_status):
+    """Per-file reasons for the files a screening run could not read"""
+    failures = [f for f in file_status if f["status"] == STATUS_FAILED]
+    if not failures:
+        return
+    with st.expander(f"⚠️ {len(failures)} file(s) could not be screened"):
+        for f in failures:
+            st.markdown(f"- **{f['filename']}**: {f['error']}")
+
+def show_quarantined_files():
+    """Files that hung or crashed the extractor, with a way to retry them"""
+    entries = load_quarantine()
+    if not entries:
+        return
+    with st.expander(f"🧪 Quarantined files ({len(entries)})"):
+        st.caption("These documents timed out or crashed the text extractor and are skipped until released.")
+        for content_hash, entry in entries.items():
+            q1, q2 = st.columns([4, 1])
+            with q1:
+                st.markdown(f"**{entry['filename']}** · {entry['reason']} · {entry['quarantined_at'].replace('T', ' ')}")
+            with q2:
+                if st.button("Release", key=f"quarantine_release_{content_hash}", use_container_width=True):
+                    release_from_quarantine(content_hash)
+                    st.rerun()
+
+def show_folder_watches():
+    """Watched folders with their live leaderboards"""
+    watches = list_watches()
+    if not watches:
+        return
+    st.subheader("👁️ Watched Folders")
+    for watch in watches:
+        title = watch["title"] or os.path.basename(watch["folder"])
+        state = "active" if watch["active"] else "paused"
+        last_scan = (watch["last_scan_at"] or "never").replace("T", " ")
+        with st.expander(f"#{watch['id']} {title} · {watch['ranked']} ranked · {state}"):
+            st.caption(f"📂 {watch['folder']} · last scan {last_scan} · {watch['failed']} failed")
+            if watch["error"]:
+                st.warning(watch["error"])
+            top = get_leaderboard(watch["id"], limit=10)
+            if top:
+                st.table(pd.DataFrame([{
+                    "Rank": rank,
+                    "Candidate": r["candidate_name"],
+                    "Email": r["email"],
+                    "Overall Score": r["overall_score"],
+                    "ATS Score": r["ats_score"],
+                    "Fit Level": r["fit"],
+                } for rank, r in enumerate(top, 1)]))
+            w1, w2 = st.columns(2)
+            with w1:
+                if st.button("⏸️ Pause" if watch["active"] else "▶️ Resume", key=f"watch_toggle_{watch['id']}",
+                             use_container_width=True):
+                    set_watch_active(watch["id"], not watch["active"])
+                    st.rerun()
+            with w2:
+                if st.button("🗑️ Stop Watching", key=f"watch_delete_{watch['id']}", use_container_width=True):
+                    delete_watch(watch["id"])
+                    st.rerun()
+
+# Result column -> Excel report header
+EXPORT_COLUMNS = {
+    "candidate_name": "Candidate Name",
+    "email": "Email",
+    "contact": "Contact",
+    "experience_level": "Experience Level",
+    "skill_match": "Skill Match %",
+    "exp_match": "Experience Match %",
+    "overall_score": "Overall Score",
+    "ats_score": "ATS Score",
+    "ats_rating": "ATS Rating",
+    "fit": "Fit Level",
+}
+# Result column -> ranking table header
+RANKING_COLUMNS = {
+    "candidate_name": "Candidate",
+    "email": "Email",
+    "contact": "Contact",
+    "experience_level": "Experience",
+    "skill_match": "Skill %",
+    "exp_match": "Exp %",
+    "overall_score": "Overall Score",
+    "ats_score": "ATS Score",
+    "fit": "Fit Level",
+    "growth_score": "Growth",
+    "performance_score": "Performance",
+}
+
+def show_ranking_table(results, key):
+    """Ranked results table, optionally filtered by fit level"""
+    fit_filter = st.multiselect("Filter by fit level", results.categories("fit"), key=key)
+    shown, ranks = results, np.arange(1, len(results) + 1)
+    if fit_filter:
+        keep = results.is_in("fit", fit_filter)
+        shown, ranks = results.where(keep), ranks[keep]
+    # Growth / Performance are present once the prediction stage ran on someone
+    columns = [c for c in RANKING_COLUMNS if c not in ("growth_score", "performance_score") or results.has_values(c)]
+    display_df = shown.frame(columns, rename=RANKING_COLUMNS)
+    display_df.insert(0, "Rank", ranks)
+    # Use st.table for proper HTML rendering and text visibility
+    st.table(display_df)
 
 def save_bulk_report(results, job_desc, mode="bulk"):
     """Save bulk screening results to Excel - ENHANCED with validation"""
     try:
-        # Prepare data
-        export_results = []
-        
-        for r in results:
-            export_results.append({
-                "Rank": results.index(r) + 1,
-                "Candidate Name": r.get("candidate_name", ""),
-                "Email": r.get("email", ""),
-                "Contact": r.get("contact", ""),
-                "Experience Level": r.get("experience_level", ""),
-                "Skill Match %": r.get("skill_match", 0),
-                "Experience Match %": r.get("exp_match", 0),
-                "Overall Score": r.get("overall_score", 0),
-                "ATS Score": r.get("ats_score", 0),
-                "ATS Rating": r.get("ats_rating", ""),
-                "Fit Level": r.get("fit", ""),
-                "Is Duplicate": "Yes" if r.get("is_duplicate") else "No"
-            })
-        
-        df = pd.DataFrame(export_results)
+        # Prepare data straight from the result columns
+        table = as_table(results)
+        df = table.frame(EXPORT_COLUMNS, rename=EXPORT_COLUMNS)
+        df.insert(0, "Rank", range(1, len(df) + 1))
+        df["Is Duplicate"] = ["Yes" if r.get("is_duplicate") else "No" for r in table]
         
         # Create temporary file (more reliable than BytesIO)
         with tempfile.NamedTemporaryFile(mode='wb', suffix='.xlsx', delete=False) as tmp:
@@ -434,20 +325,13 @@ def get_admin_statistics():
         total_reports = len([f for f in os.listdir(REPORTS_DIR) if f.endswith(('.csv', '.xlsx'))])
         total_resumes = len([f for f in os.listdir(RESUMES_DIR)])
         
-        fit_counts = {"Strongly Fit": 0, "Mid Fit": 0, "Low Fit": 0}
-        
-        for report_file in os.listdir(REPORTS_DIR):
-            if report_file.endswith('.xlsx'):
-                filepath = os.path.join(REPORTS_DIR, report_file)
-                df = pd.read_excel(filepath)
-                fit_counts["Strongly Fit"] += len(df[df['Fit Level'] == 'Strongly Fit'])
-                fit_counts["Mid Fit"] += len(df[df['Fit Level'] == 'Mid Fit'])
-                fit_counts["Low Fit"] += len(df[df['Fit Level'] == 'Low Fit'])
+        # Reports from before the screening history are folded into it once
+        import_excel_reports(REPORTS_DIR)
         
         return {
             "total_reports": total_reports,
             "total_resumes": total_resumes,
-            "fit_distribution": fit_counts
+            "fit_distribution": get_totals()["fit_distribution"]
         }
     
     except:
@@ -464,155 +348,143 @@ def show_admin_dashboard():
             🧑🏻‍💻 Recruiter Dashboard
         </h1>
     """, unsafe_allow_html=True)
-    # Tabs for clearer navigation
-    tab_single, tab_bulk, tab_jd, tab_fetch, tab_compare, tab_analytics, tab_stats, tab_stored, tab_growth = st.tabs([
-        "📝 Single Screening", 
-        "📑 Bulk Screening", 
-        "📃 JD Auto-Screen", 
-        "🔄 Fetch & Screen",
-        "🔍 Candidate Comparison",
-        "📊 Analytics & Reports",
-        "📈 Statistics", 
-        "📂 Stored Resumes",
-        "📈 Growth Predictor"
-    ])
-
-    with tab_single:
-        show_single_screening()
-        
-    with tab_bulk:
-        show_bulk_screening()
-        
-    with tab_jd:
-        show_jd_auto_screening()
-        
-    with tab_fetch:
-        show_fetch_and_screen_page()
+    # Section navigation: unlike st.tabs, only the selected section's code runs on a rerun
+    sections = {
+        "📝 Single Screening": show_single_screening,
+        "📑 Bulk Screening": show_bulk_screening,
+        "📃 JD Auto-Screen": show_jd_auto_screening,
+        "🔄 Fetch & Screen": show_fetch_and_screen_page,
+        "🔍 Candidate Comparison": show_candidate_comparison,
+        "📊 Analytics & Reports": show_analytics_and_reports,
+        "📈 Statistics": show_admin_statistics_page,
+        "📂 Stored Resumes": show_stored_resumes,
+        "🧵 Background Jobs": show_background_jobs,
+        "🔗 Upload Links": show_upload_links,
+        "📈 Growth Predictor": show_growth_predictor,
+    }
+
+    keep_section_state()
+
+    selected_section = st.radio(
+        "Dashboard section",
+        list(sections.keys()),
+        horizontal=True,
+        key="admin_section",
+        label_visibility="collapsed"
+    )
+    st.markdown("---")
+
+    sections[selected_section]()
+
+
+def show_growth_predictor():
+    """Future growth predictor section"""
+    st.markdown("""
+    <div style="text-align: center; padding: 2rem 0;">
+        <h2 style="font-size: 2.5rem; margin: 0;">📈 Future Growth Predictor</h2>
+        <p style="opacity: 0.8; font-size: 1.1rem;">Predict career growth potential and trajectory</p>
+    </div>
+    """, unsafe_allow_html=True)
     
-    with tab_compare:
-        show_candidate_comparison()
+    st.markdown("---")
     
-    with tab_analytics:
-        show_analytics_and_reports()
-        
-    with tab_stats:
-        # Check if function exists locally or needs import, assuming it's available since it was called previously
-        if 'show_admin_statistics_page' in globals():
-             show_admin_statistics_page()
-        else:
-             # Fallback if the function definition was missed in previous reads/imports
-             st.warning("Statistics module not loaded.")
-             
-    with tab_stored:
-        show_stored_resumes()
+    growth_resume = st.file_uploader("📄 Upload Resume for Growth Analysis", type=["pdf", "docx", "txt"], key="growth_upload")
     
-    with tab_growth:
-        st.markdown("""
-        <div style="text-align: center; padding: 2rem 0;">
-            <h2 style="font-size: 2.5rem; margin: 0;">📈 Future Growth Predictor</h2>
-            <p style="opacity: 0.8; font-size: 1.1rem;">Predict career growth potential and trajectory</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        growth_resume = st.file_uploader("📄 Upload Resume for Growth Analysis", type=["pdf", "docx", "txt"], key="growth_upload")
-        
-        if growth_resume:
-            try:
-                with st.spinner("🔮 Analyzing growth potential..."):
-                    # Extract directly from file object (like other tabs do)
-                    resume_text = extract_text_from_file(growth_resume)
-                    skills_list = extract_skills(resume_text)
-                    years_exp = estimate_experience_years(resume_text)
-                    
-                    # Show extraction summary
-                    with st.expander("📊 Extraction Summary", expanded=False):
-                        col1, col2, col3 = st.columns(3)
-                        col1.metric("Resume Length", f"{len(resume_text)} chars")
-                        col2.metric("Skills Found", len(skills_list))
-                        col3.metric("Years Experience", years_exp)
-                        if skills_list:
-                            st.write("**Skills:**", ", ".join(skills_list[:15]))
-                    
-                    # Predict growth
-                    growth_data = predict_growth(resume_text, years_exp, skills_list)
-                    
-                    st.success("✅ Growth Analysis Complete!")
-                    
-                    # Overall Score
-                    st.markdown(f"""
-                    <div style="text-align: center; background: linear-gradient(135deg, rgba(16, 185, 129, 0.1), rgba(139, 92, 246, 0.1)); padding: 2.5rem; border-radius: 20px; margin: 1.5rem 0;">
-                        <div style="font-size: 0.9rem; opacity: 0.8;">Overall Growth Score</div>
-                        <div style="font-size: 4rem; font-weight: 900; color: {growth_data['rating_color']};">{int(growth_data['overall_score'])}</div>
-                        <div style="font-size: 1rem; opacity: 0.7;">/100</div>
-                        <div style="font-size: 1.5rem; font-weight: 700; color: {growth_data['rating_color']}; margin-top: 1rem;">{growth_data['rating']}</div>
-                        <div style="font-size: 0.9rem; opacity: 0.8; margin-top: 0.8rem;">⏱️ Time to Next Level: <strong>{growth_data['time_to_next_level']}</strong></div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # 5 Dimensions
-                    st.markdown("### 📊 Growth Dimensions")
-                    dims = growth_data['dimension_scores']
-                    col1, col2, col3, col4, col5 = st.columns(5)
-                    
-                    for col, (icon, name, key) in zip([col1, col2, col3, col4, col5], [
-                        ('🎓', 'Learning', 'learning_velocity'),
-                        ('📈', 'Career', 'career_trajectory'),
-                        ('🔄', 'Adaptability', 'adaptability'),
-                        ('👑', 'Leadership', 'leadership_evolution'),
-                        ('⚡', 'Impact', 'impact_magnitude')
-                    ]):
-                        score = int(dims[key])
-                        color = "#10b981" if score >= 75 else "#f59e0b" if score >= 60 else "#ef4444"
-                        with col:
-                            st.markdown(f"""
-                            <div style="text-align: center; background: rgba(255,255,255,0.03); padding: 1.2rem 0.5rem; border-radius: 12px;">
-                                <div style="font-size: 2rem;">{icon}</div>
-                                <div style="font-size: 1.8rem; font-weight: 800; color: {color};">{score}</div>
-                                <div style="font-size: 0.7rem; opacity: 0.8;">{name}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    
-                    st.markdown("")
-                    
-                    # Insights
-                    st.markdown("### 💡 Growth Insights")
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown("**🎯 Optimal Roles:**")
-                        for role in growth_data['recommendations']['optimal_roles'][:3]:
-                            st.write(f"• {role}")
-                        st.markdown(f"**📊 Success Probability:** {growth_data['recommendations']['success_probability']}")
-                    
-                    with col2:
-                        st.markdown("**🚀 Growth Accelerators:**")
-                        for action in growth_data['recommendations']['recommended_actions']:
-                            st.write(f"✅ {action}")
+    if growth_resume:
+        try:
+            with st.spinner("🔮 Analyzing growth potential..."):
+                # Extract directly from file object (like other tabs do)
+                resume_text = extract_text_from_file(growth_resume)
+                skills_list = extract_skills(resume_text)
+                years_exp = estimate_experience_years(resume_text)
+                
+                # Show extraction summary
+                with st.expander("📊 Extraction Summary", expanded=False):
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("Resume Length", f"{len(resume_text)} chars")
+                    col2.metric("Skills Found", len(skills_list))
+                    col3.metric("Years Experience", years_exp)
+                    if skills_list:
+                        st.write("**Skills:**", ", ".join(skills_list[:15]))
+                
+                # Predict growth
+                growth_data = predict_growth(resume_text, years_exp, skills_list)
+                
+                st.success("✅ Growth Analysis Complete!")
+                
+                # Overall Score
+                st.markdown(f"""
+                <div style="text-align: center; background: linear-gradient(135deg, rgba(16, 185, 129, 0.1), rgba(139, 92, 246, 0.1)); padding: 2.5rem; border-radius: 20px; margin: 1.5rem 0;">
+                    <div style="font-size: 0.9rem; opacity: 0.8;">Overall Growth Score</div>
+                    <div style="font-size: 4rem; font-weight: 900; color: {growth_data['rating_color']};">{int(growth_data['overall_score'])}</div>
+                    <div style="font-size: 1rem; opacity: 0.7;">/100</div>
+                    <div style="font-size: 1.5rem; font-weight: 700; color: {growth_data['rating_color']}; margin-top: 1rem;">{growth_data['rating']}</div>
+                    <div style="font-size: 0.9rem; opacity: 0.8; margin-top: 0.8rem;">⏱️ Time to Next Level: <strong>{growth_data['time_to_next_level']}</strong></div>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                # 5 Dimensions
+                st.markdown("### 📊 Growth Dimensions")
+                dims = growth_data['dimension_scores']
+                col1, col2, col3, col4, col5 = st.columns(5)
+                
+                for col, (icon, name, key) in zip([col1, col2, col3, col4, col5], [
+                    ('🎓', 'Learning', 'learning_velocity'),
+                    ('📈', 'Career', 'career_trajectory'),
+                    ('🔄', 'Adaptability', 'adaptability'),
+                    ('👑', 'Leadership', 'leadership_evolution'),
+                    ('⚡', 'Impact', 'impact_magnitude')
+                ]):
+                    score = int(dims[key])
+                    color = "#10b981" if score >= 75 else "#f59e0b" if score >= 60 else "#ef4444"
+                    with col:
+                        st.markdown(f"""
+                        <div style="text-align: center; background: rgba(255,255,255,0.03); padding: 1.2rem 0.5rem; border-radius: 12px;">
+                            <div style="font-size: 2rem;">{icon}</div>
+                            <div style="font-size: 1.8rem; font-weight: 800; color: {color};">{score}</div>
+                            <div style="font-size: 0.7rem; opacity: 0.8;">{name}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
+                
+                st.markdown("")
+                
+                # Insights
+                st.markdown("### 💡 Growth Insights")
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.markdown("**🎯 Optimal Roles:**")
+                    for role in growth_data['recommendations']['optimal_roles'][:3]:
+                        st.write(f"• {role}")
+                    st.markdown(f"**📊 Success Probability:** {growth_data['recommendations']['success_probability']}")
+                
+                with col2:
+                    st.markdown("**🚀 Growth Accelerators:**")
+                    for action in growth_data['recommendations']['recommended_actions']:
+                        st.write(f"✅ {action}")
+                
+                # Blockers
+                if growth_data['growth_blockers'][0] != "No significant blockers identified":
+                    with st.expander("⚠️ Potential Blockers"):
+                        for blocker in growth_data['growth_blockers']:
+                            st.warning(blocker)
+                else:
+                    st.success("✅ No significant growth blockers!")
                     
-                    # Blockers
-                    if growth_data['growth_blockers'][0] != "No significant blockers identified":
-                        with st.expander("⚠️ Potential Blockers"):
-                            for blocker in growth_data['growth_blockers']:
-                                st.warning(blocker)
-                    else:
-                        st.success("✅ No significant growth blockers!")
-                        
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-                import traceback
-                st.code(traceback.format_exc())
-        else:
-            st.info("👆 Upload a resume to unlock growth analysis")
-            st.markdown("### ✨ What We Analyze")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.markdown("**🎓 Learning Velocity**\nModern tech, certifications, continuous learning")
-            with col2:
-                st.markdown("**📈 Career Trajectory**\nJob progression, promotions, company tier")
-            with col3:
-                st.markdown("**🔄 Adaptability**\nSkill diversity, tech breadth, flexibility")
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
+            import traceback
+            st.code(traceback.format_exc())
+    else:
+        st.info("👆 Upload a resume to unlock growth analysis")
+        st.markdown("### ✨ What We Analyze")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown("**🎓 Learning Velocity**\nModern tech, certifications, continuous learning")
+        with col2:
+            st.markdown("**📈 Career Trajectory**\nJob progression, promotions, company tier")
+        with col3:
+            st.markdown("**🔄 Adaptability**\nSkill diversity, tech breadth, flexibility")
 
     
 def show_single_screening():
@@ -628,7 +500,7 @@ def show_single_screening():
             "Paste job requirements:",
             height=150,
             placeholder="Python, SQL, AWS, 3+ years experience, Machine Learning...",
-           
+            key="single_jd"
         )
     
     with col2:
@@ -636,7 +508,7 @@ def show_single_screening():
         resume_file = st.file_uploader(
             "Upload Resume (PDF/DOCX/TXT):",
             type=['pdf', 'docx', 'txt'],
-           
+            key="single_resume_upload"
         )
 
    
@@ -651,6 +523,18 @@ def show_single_screening():
                 
                 if result["status"] == "success":
                     st.success("✔️ Analysis complete!")
+                    record_screening(job_desc, [{
+                        "candidate_name": candidate_name_from_filename(resume_file.name),
+                        "email": result["email"],
+                        "hash": get_file_hash(resume_file.getvalue()),
+                        "overall_score": result["final_score"],
+                        "ats_score": result["ats_score"],
+                        "skill_match": result["skill_match"],
+                        "exp_match": result["exp_match"],
+                        "fit": classify_fit(result["final_score"]),
+                        "experience_level": result["exp_label"],
+                        "skill_list": result["skills"],
+                    }], "single")
                     
                     # Main Scores Row
                     col1, col2, col3, col4 = st.columns(4)
@@ -751,7 +635,10 @@ def show_bulk_screening():
 
     # Ensure session state keys exist
     if "bulk_uploaded_files" not in st.session_state:
-        st.session_state.bulk_uploaded_files = []  # list of dicts: {"name":..., "content": bytes}
+        st.session_state.bulk_uploaded_files = []  # spool handles: {"name", "hash", "size"}
+    if "bulk_uploader_round" not in st.session_state:
+        st.session_state.bulk_uploader_round = 0
+    prune_upload_spool_once()
     if "bulk_results" not in st.session_state:
         st.session_state.bulk_results = None
     if "bulk_jd_text" not in st.session_state:
@@ -776,39 +663,98 @@ def show_bulk_screening():
     with col2:
         st.subheader("📑 Upload Resumes")
         uploaded = st.file_uploader(
-            "Upload multiple resumes (PDF/DOCX/TXT):",
-            type=['pdf', 'docx', 'txt'],
+            "Upload multiple resumes (PDF/DOCX/TXT, or ZIP/TAR.GZ archives of them):",
+            type=['pdf', 'docx', 'txt', 'zip', 'gz', 'tgz'],
             accept_multiple_files=True,
-            key="bulk_uploader_widget"
+            key=f"bulk_uploader_widget_{st.session_state.bulk_uploader_round}"
         )
 
-        # If new files are uploaded via the widget, store their bytes+name into session state
+        # Stream new uploads to the disk spool; session state keeps only handles
         if uploaded:
-            # maintain uniqueness by filename+size to avoid duplicates in session list
-            existing_keys = {f"{f['name']}|{len(f['content'])}" for f in st.session_state.bulk_uploaded_files}
-            added = 0
+            existing_hashes = {f["hash"] for f in st.session_state.bulk_uploaded_files}
+            notes = {"added": 0, "duplicates": 0, "failed": []}
             for up in uploaded:
                 try:
-                    up_bytes = up.read()
-                    key = f"{up.name}|{len(up_bytes)}"
-                    if key not in existing_keys:
-                        st.session_state.bulk_uploaded_files.append({"name": up.name, "content": up_bytes})
-                        existing_keys.add(key)
-                        added += 1
+                    handle = spool_upload(up)
                 except Exception as e:
-                    st.warning(f"Failed to read {up.name}: {e}")
-            if added:
-                st.success(f"Added {added} file(s) to upload list (stored in session).")
+                    notes["failed"].append(f"{up.name}: {e}")
+                    continue
+                if handle["hash"] in existing_hashes:
+                    notes["duplicates"] += 1
+                else:
+                    st.session_state.bulk_uploaded_files.append(handle)
+                    existing_hashes.add(handle["hash"])
+                    notes["added"] += 1
 
-       
+            # A fresh uploader lets Streamlit drop its in-memory copies
+            st.session_state.bulk_uploader_round += 1
+            st.session_state.bulk_upload_notes = notes
+            st.rerun()
+
+        notes = st.session_state.pop("bulk_upload_notes", None)
+        if notes:
+            if notes["added"]:
+                st.success(f"Added {notes['added']} file(s) to upload list.")
+            if notes["duplicates"]:
+                st.info(f"Skipped {notes['duplicates']} file(s) already in the list (same content).")
+            for failure in notes["failed"]:
+                st.warning(f"Failed to read {failure}")
+
+        if st.session_state.bulk_uploaded_files:
+            total_mb = sum(f["size"] for f in st.session_state.bulk_uploaded_files) / (1024 * 1024)
+            st.caption(f"📁 {len(st.session_state.bulk_uploaded_files)} resume(s) ready · {total_mb:.1f} MB")
+            if st.button("🗑️ Clear upload list", key="bulk_clear_uploads"):
+                st.session_state.bulk_uploaded_files = []
+                st.rerun()
         else:
             st.info("No files uploaded yet. Use the uploader above to add resumes (they will persist).")
 
     st.markdown("---")
 
+    with st.expander("⚙️ Ranking stages"):
+        full_screen = st.checkbox(
+            "Analyse every resume fully", value=False, key="bulk_full_screen",
+            help="Runs ATS and timeline on every resume (and uses the screening service when it is up)"
+        )
+        st.caption("Everyone gets the skill/experience score. Each later stage runs on the top K "
+                   "plus anyone at or above its score threshold; other candidates get it when opened.")
+        stages = {}
+        for name, defaults in DEFAULT_STAGES.items():
+            k_col, t_col = st.columns(2)
+            with k_col:
+                top_k = st.number_input(f"{STAGE_LABELS[name]}: top K", min_value=0, step=10,
+                                        value=defaults["top_k"], key=f"bulk_stage_k_{name}", disabled=full_screen)
+            with t_col:
+                min_score = st.number_input(f"{STAGE_LABELS[name]}: score threshold (0 = off)",
+                                            min_value=0, max_value=100, step=5,
+                                            value=defaults["min_score"] or 0, key=f"bulk_stage_min_{name}",
+                                            disabled=full_screen)
+            stages[name] = dict(defaults, top_k=int(top_k), min_score=min_score or None)
+        budget_seconds = st.number_input("Time budget for the later stages, seconds (0 = none)", min_value=0.0,
+                                         step=1.0, value=0.0, key="bulk_stage_budget", disabled=full_screen,
+                                         help="Measured while the stages run; no new candidate is started "
+                                              "once it is used up")
+    if full_screen:
+        stages = None
+
     # Action buttons: Screen and (separately) Generate Report
     actions_col1, actions_col2, actions_col3 = st.columns([1, 1, 1])
 
+    with actions_col2:
+        if st.button("🕒 Run in Background", use_container_width=True, key="bulk_enqueue"):
+            job_desc = st.session_state.bulk_jd_text or ""
+            if not job_desc.strip():
+                st.error("❌ Please enter job description before screening")
+            elif not st.session_state.bulk_uploaded_files:
+                st.error("❌ Please upload resumes before screening")
+            else:
+                job_id = enqueue_job(
+                    job_desc,
+                    files=iter_expanded_files(st.session_state.bulk_uploaded_files),
+                    created_by=st.session_state.get("user_email", "")
+                )
+                st.success(f"✅ Queued job #{job_id}. Follow it under 🧵 Background Jobs.")
+
     with actions_col1:
         if st.button("🚀 Screen All Resumes", type="primary", use_container_width=True):
             job_desc = st.session_state.bulk_jd_text or ""
@@ -817,20 +763,54 @@ def show_bulk_screening():
             elif not st.session_state.bulk_uploaded_files:
                 st.error("❌ Please upload resumes before screening")
             else:
-                # Recreate file-like objects for screen_bulk_resumes
-                from io import BytesIO
-                temp_files = []
-                for f in st.session_state.bulk_uploaded_files:
-                    bio = BytesIO(f["content"])
-                    bio.name = f["name"]
-                    bio.seek(0)
-                    temp_files.append(bio)
-
-                with st.spinner(f"Screening {len(temp_files)} resumes..."):
+                handles = st.session_state.bulk_uploaded_files
+
+                # Prefer the shared screening service; fall back to this session.
+                # Archives are streamed member by member here instead.
+                client = ScreeningClient()
+                use_service = (stages is None and not any(is_archive(h["name"]) for h in handles)
+                               and client.is_available())
+
+                with st.spinner(f"Screening {len(handles)} resumes..."):
                     try:
-                        results = screen_bulk_resumes(job_desc, temp_files)
+                        results = None
+                        if use_service:
+                            try:
+                                response = client.screen_bulk(job_desc, spooled_files(handles))
+                                results = response["results"]
+                                file_status = [{"filename": f["name"], "status": STATUS_FAILED, "error": f["error"]}
+                                               for f in response["failed"]]
+                                show_file_status_summary({STATUS_SCREENED: len(results),
+                                                          STATUS_FAILED: len(file_status)})
+                                show_file_failures(file_status)
+                            except ScreeningServiceError as e:
+                                st.warning(f"Screening service failed ({e}); screening locally instead")
+                        if results is None:
+                            # Files are read from the spool one at a time
+                            kind = "upload" if stages is None else "quick"
+                            with CheckpointStore.for_screen(job_desc, kind) as checkpoints:
+                                response = screen_uploads(job_desc, iter_spooled(handles), checkpoints,
+                                                          stages, budget_seconds or None)
+                            results = response["results"]
+                            show_file_status_summary(Counter(f["status"] for f in response["file_status"]))
+                            show_file_failures(response["file_status"])
+                            if stages is not None:
+                                stage_summary = response["stage_summary"]
+                                st.caption("Stages: " + " · ".join(
+                                    f"{STAGE_LABELS[name]} {counts['run']} run / {counts['admitted']} admitted "
+                                    f"({counts['seconds']:.1f}s)"
+                                    for name, counts in stage_summary["stages"].items()
+                                ))
+                                if stage_summary["out_of_time"]:
+                                    st.warning(f"⏱️ Time budget used up after {stage_summary['seconds']:.1f}s; "
+                                               "remaining candidates get the later stages when opened.")
                         # save results in session state for later report generation/download
-                        st.session_state.bulk_results = results
+                        st.session_state.bulk_results = CandidateTable.from_rows(results)
+                        st.session_state.shortlist = None
+                        st.session_state.pool_clusters = None
+                        record_scores(RESUMES_DIR, results)
+                        index_similar_rows(results)
+                        record_screening(job_desc, results, "bulk")
                         st.success(f"✅ Screened {len(results)} resumes!")
                     except Exception as e:
                         st.error(f"⚠️ Error during screening: {e}")
@@ -840,15 +820,16 @@ def show_bulk_screening():
         results = st.session_state.bulk_results
 
         st.markdown("---")
+        fit_counts = results.counts("fit")
         colA, colB, colC, colD = st.columns(4)
         with colA:
             st.metric("Total Resumes", len(results))
         with colB:
-            st.metric("Strongly Fit", len([r for r in results if r["fit"] == "Strongly Fit"]))
+            st.metric("Strongly Fit", fit_counts["Strongly Fit"])
         with colC:
-            st.metric("Mid Fit", len([r for r in results if r["fit"] == "Mid Fit"]))
+            st.metric("Mid Fit", fit_counts["Mid Fit"])
         with colD:
-            st.metric("Low Fit", len([r for r in results if r["fit"] == "Low Fit"]))
+            st.metric("Low Fit", fit_counts["Low Fit"])
 
         st.markdown("---")
         st.subheader("🥇🥈🥉 Top 3 Candidates")
@@ -863,12 +844,14 @@ def show_bulk_screening():
                 with c3:
                     st.write(f"📞 {candidate['contact']}")
                 with c4:
-                    st.write(f"**Score: {candidate['overall_score']}%** | **ATS: {candidate['ats_score']}%** ({candidate['fit']})")
+                    ats = "—" if candidate['ats_score'] is None else f"{candidate['ats_score']}%"
+                    st.write(f"**Score: {candidate['overall_score']}%** | **ATS: {ats}** ({candidate['fit']})")
                 with c5:
-                    if candidate.get('file_content'):
+                    file_bytes = read_spooled_row(candidate)
+                    if file_bytes:
                         st.download_button(
                             "⬇️ ",
-                            candidate['file_content'],
+                            file_bytes,
                             file_name=candidate['original_filename'],
                             key=f"download_top_{idx}"
                         )
@@ -876,34 +859,14 @@ def show_bulk_screening():
 
         st.markdown("---")
         st.subheader("📶 All Ranking Results")
-        df = pd.DataFrame(results)
-        display_df = df[["candidate_name", "email", "contact", "experience_level", "skill_match", "exp_match", "overall_score", "ats_score", "fit"]].copy()
-        display_df.insert(0, "Rank", range(1, len(display_df) + 1))
-        display_df = display_df.rename(columns={
-            "candidate_name": "Candidate",
-            "email": "Email",
-            "contact": "Contact",
-            "experience_level": "Experience",
-            "skill_match": "Skill %",
-            "exp_match": "Exp %",
-            "overall_score": "Overall Score",
-            "ats_score": "ATS Score",
-            "fit": "Fit Level"
-        })
-        # Use st.table for proper HTML rendering and text visibility
-        st.table(display_df)
+        show_ranking_table(results, "bulk_fit_filter")
 
 
         # Pie chart for fit distribution (safe fallback if no results)
         try:
-            fit_counts = pd.Series({
-                "Strongly Fit": len([r for r in results if r["fit"] == "Strongly Fit"]),
-                "Mid Fit": len([r for r in results if r["fit"] == "Mid Fit"]),
-                "Low Fit": len([r for r in results if r["fit"] == "Low Fit"])
-            })
             fig = px.pie(
-                values=fit_counts.values,
-                names=fit_counts.index,
+                values=list(fit_counts.values()),
+                names=list(fit_counts),
                 title="Candidate Fit Distribution",
             )
             st.plotly_chart(fig, use_container_width=True)
@@ -973,8 +936,9 @@ def show_jd_auto_screening():
     with col2:
         st.subheader("🗂️ Folder Path")
         folder_path = st.text_input(
-            "Enter folder path with resumes:",
-            placeholder="/path/to/resumes/folder"
+            "Enter folder path with resumes (or an mbox file / Maildir):",
+            placeholder="/path/to/resumes/folder",
+            key="auto_folder"
         )
 
     # ---------------------------
@@ -997,11 +961,60 @@ def show_jd_auto_screening():
             return
 
         # Save results to session state
-        st.session_state.auto_results = response["results"]
+        st.session_state.auto_results = CandidateTable.from_rows(response["results"])
+        record_scores(RESUMES_DIR, response["results"])
+        index_similar_rows(response["results"])
+        record_screening(job_desc, response["results"], "folder")
         st.session_state.auto_download_data = None   # Clear previous download
         st.session_state.auto_download_filename = None
 
         st.success(f"✅ Auto-screened {len(st.session_state.auto_results)} resumes!")
+        if "messages" in response:
+            st.caption(f"📬 {response['messages']} new message(s) read since the last scan")
+        show_file_status_summary(Counter(f["status"] for f in response["file_status"]))
+
+    with st.expander("🕒 Queue as a background job"):
+        st.caption("Large folders can run in a worker process, now or off-hours. Results appear under 🧵 Background Jobs.")
+        schedule_later = st.checkbox("Schedule for later", key="auto_schedule_later")
+        run_at = None
+        if schedule_later:
+            sc1, sc2 = st.columns(2)
+            with sc1:
+                run_date = st.date_input("Start date", key="auto_schedule_date")
+            with sc2:
+                run_time = st.time_input("Start time", value=dtime.strptime("22:00", "%H:%M").time(), key="auto_schedule_time")
+            run_at = dtime.combine(run_date, run_time)
+
+        if st.button("🕒 Queue Folder Screen", key="auto_enqueue", use_container_width=True):
+            if not job_desc.strip():
+                st.error("❌ Please enter job description")
+            elif not folder_path.strip() or not os.path.isdir(folder_path):
+                st.error("❌ Please enter a valid folder path")
+            else:
+                job_id = enqueue_job(
+                    job_desc,
+                    folder=os.path.abspath(folder_path),
+                    scheduled_at=run_at,
+                    created_by=st.session_state.get("user_email", "")
+                )
+                when = run_at.strftime("%Y-%m-%d %H:%M") if run_at else "as soon as a worker is free"
+                st.success(f"✅ Queued job #{job_id} to start {when}.")
+
+    with st.expander("👁️ Watch this folder"):
+        st.caption("New or changed resumes are screened as they land and added to a ranked leaderboard. "
+                   "Needs `python folder_watcher.py` running.")
+        watch_title = st.text_input("Watch name (e.g. the role):", key="auto_watch_title")
+        if st.button("👁️ Watch Folder", key="auto_watch", use_container_width=True):
+            try:
+                watch_id = add_watch(
+                    folder_path.strip(), job_desc, watch_title,
+                    created_by=st.session_state.get("user_email", "")
+                )
+                st.success(f"✅ Watching {os.path.abspath(folder_path.strip())} (watch #{watch_id}).")
+            except ValueError as e:
+                st.error(f"❌ {e}")
+
+    show_folder_watches()
 
     # ------------------------------------------------
     # SHOW RESULTS ONLY IF AUTO-SCREENING WAS COMPLETED
@@ -1009,16 +1022,17 @@ def show_jd_auto_screening():
     if st.session_state.auto_results:
         results = st.session_state.auto_results
 
+        fit_counts = results.counts("fit")
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
             st.metric("Total Resumes", len(results))
         with col2:
-            st.metric("Strongly Fit", len([r for r in results if r["fit"] == "Strongly Fit"]))
+            st.metric("Strongly Fit", fit_counts["Strongly Fit"])
         with col3:
-            st.metric("Mid Fit", len([r for r in results if r["fit"] == "Mid Fit"]))
+            st.metric("Mid Fit", fit_counts["Mid Fit"])
         with col4:
-            st.metric("Low Fit", len([r for r in results if r["fit"] == "Low Fit"]))
+            st.metric("Low Fit", fit_counts["Low Fit"])
 
         st.markdown("---")
 
@@ -1044,10 +1058,11 @@ def show_jd_auto_screening():
                         f"**ATS: {candidate['ats_score']}%** ({candidate['fit']})"
                     )
                 with c5:
-                    if candidate.get("file_content"):
+                    file_bytes = read_mail_row(candidate)
+                    if file_bytes:
                         st.download_button(
                             "⬇️",
-                            candidate["file_content"],
+                            file_bytes,
                             file_name=candidate["original_filename"],
                             key=f"auto_download_{idx}"
                         )
@@ -1060,29 +1075,7 @@ def show_jd_auto_screening():
         # Full Data Table
         # ---------------------------
         st.subheader("👤 All Candidates")
-
-        df = pd.DataFrame(results)
-        display_df = df[[
-            "candidate_name", "email", "contact", 
-            "experience_level", "skill_match", "exp_match",
-            "overall_score", "ats_score", "fit"
-        ]].copy()
-
-        display_df.insert(0, "Rank", range(1, len(display_df) + 1))
-        display_df = display_df.rename(columns={
-            "candidate_name": "Candidate",
-            "email": "Email",
-            "contact": "Contact",
-            "experience_level": "Experience",
-            "skill_match": "Skill %",
-            "exp_match": "Exp %",
-            "overall_score": "Overall Score",
-            "ats_score": "ATS Score",
-            "fit": "Fit Level"
-        })
-
-        # Use st.table for proper HTML rendering and text visibility
-        st.table(display_df)
+        show_ranking_table(results, "auto_fit_filter")
 
 
         st.markdown("---")
@@ -1138,7 +1131,10 @@ def reset_admin_statistics():
                 except Exception:
                     pass
 
-    # 4) Clear cached results in memory
+    # 4) Clear the screening history and its aggregates
+    clear_history()
+
+    # 5) Clear cached results in memory
     for key in [
         "bulkresults",
         "autoresults",
@@ -1169,7 +1165,7 @@ def show_admin_statistics_page():
     st.markdown("---")
     with st.expander("Reset statistics", expanded=False):
         st.info("This will clear counters and cached statistics. It will not delete stored reports or resumes.")
-        confirm = st.checkbox("I understand and want to reset all statistics")
+        confirm = st.checkbox("I understand and want to reset all statistics", key="stats_reset_confirm")
         if st.button("Reset statistics now", type="primary", use_container_width=True, disabled=not confirm):
             reset_admin_statistics()
             st.success("Statistics have been reset.")
@@ -1193,9 +1189,233 @@ def show_admin_statistics_page():
     else:
         st.info(" No screening data available yet")
 
+    st.markdown("---")
+    show_screening_history()
+
+# Period label -> number of days (None = all time)
+HISTORY_PERIODS = {"Last 7 days": 7, "Last 30 days": 30, "Last quarter": 91, "Last year": 365, "All time": None}
+
+def show_screening_history():
+    """Screening history over a period: daily trend, per-JD averages and skill demand vs supply"""
+    st.subheader("📚 Screening History")
+    h1, h2 = st.columns([1, 2])
+    with h1:
+        period = st.selectbox("Period", list(HISTORY_PERIODS), index=1, key="history_period")
+    since = period_start(HISTORY_PERIODS[period])
+
+    totals = get_totals(since)
+    if not totals["candidates"]:
+        st.info("No screenings recorded in this period yet.")
+        return
+    jds = get_jd_summary(since)
+    with h2:
+        jd_titles = {"All JDs": None, **{f"{jd['title']} (#{jd['jd_id']})": jd["jd_id"] for jd in jds}}
+        jd_choice = st.selectbox("Role / JD", list(jd_titles), key="history_jd")
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Candidates Screened", totals["candidates"])
+    m2.metric("Average Score", totals["avg_score"])
+    m3.metric("Average ATS", totals["avg_ats"] if totals["avg_ats"] is not None else "—")
+    m4.metric("JDs Screened", totals["jds"])
+
+    daily = pd.DataFrame(get_daily_summary(since, jd_id=jd_titles[jd_choice]))
+    if not daily.empty:
+        c1, c2 = st.columns(2)
+        with c1:
+            st.plotly_chart(px.bar(daily, x="day", y="candidates", title="Candidates per Day"),
+                            use_container_width=True)
+        with c2:
+            st.plotly_chart(px.line(daily, x="day", y=["avg_score", "avg_ats"], markers=True,
+                                    title="Average Score per Day"), use_container_width=True)
+
+    st.markdown("**By role / JD**")
+    st.table(pd.DataFrame([{
+        "JD": jd["title"],
+        "Candidates": jd["candidates"],
+        "Avg Score": jd["avg_score"],
+        "Avg ATS": jd["avg_ats"],
+        "Strongly Fit": jd["fit_distribution"]["Strongly Fit"],
+        "Screened": jd["first_day"] if jd["first_day"] == jd["last_day"] else f"{jd['first_day']} – {jd['last_day']}",
+    } for jd in jds]))
+
+    show_skill_trends(since)
+
+    with st.expander("🕑 Latest screenings"):
+        st.table(pd.DataFrame(get_recent_screenings(limit=25, jd_id=jd_titles[jd_choice])))
+
+
+TREND_BUCKETS = {"Daily": "day", "Weekly": "week", "Monthly": "month"}
+TREND_MEASURES = {
+    "Unmet demand %": "missing_rate",
+    "Demanded": "demanded",
+    "Supplied": "supplied",
+    "Missing": "missing",
+}
+
+def show_skill_trends(since):
+    """Skill demand vs supply over a period: largest gaps and per-skill trends (all JDs)"""
+    gaps = get_skill_gaps(since)
+    if not gaps:
+        return
+    st.markdown("**Skill demand vs supply**")
+    st.caption("Demanded: candidates screened against a JD asking for the skill. "
+               "Supplied: those of them who have it. Missing: those who don't.")
+    gap_df = pd.DataFrame(gaps)
+    st.plotly_chart(px.bar(gap_df, x="skill", y=["demanded", "supplied", "missing"], barmode="group",
+                           hover_data=["jds", "missing_rate"], title="Largest Supply / Demand Gaps"),
+                    use_container_width=True)
+
+    t1, t2, t3 = st.columns([2, 1, 1])
+    with t1:
+        chosen = st.multiselect("Skills", gap_df["skill"].tolist(), default=gap_df["skill"].tolist()[:5],
+                                key="skill_trend_skills")
+    with t2:
+        bucket = st.selectbox("Bucket", list(TREND_BUCKETS), index=1, key="skill_trend_bucket")
+    with t3:
+        measure = st.selectbox("Measure", list(TREND_MEASURES), key="skill_trend_measure")
+    if not chosen:
+        return
+    trends = pd.DataFrame(get_skill_trends(chosen, since, bucket=TREND_BUCKETS[bucket]))
+    if not trends.empty:
+        st.plotly_chart(px.line(trends, x="bucket", y=TREND_MEASURES[measure], color="skill", markers=True,
+                                title=f"{measure} per {TREND_BUCKETS[bucket]}"),
+                        use_container_width=True)
+
+def show_background_jobs():
+    """Queued, running and finished background screening jobs"""
+    st.markdown("## 🧵 Background Jobs")
+    st.info("💡 Jobs are processed by worker processes: `python job_worker.py --workers 2`")
+
+    top1, top2 = st.columns([1, 1])
+    with top1:
+        auto_refresh = st.checkbox("Auto-refresh while jobs are active", value=True, key="jobs_auto_refresh")
+    with top2:
+        if st.button("🔄 Refresh", key="jobs_refresh", use_container_width=True):
+            st.rerun()
+
+    show_quarantined_files()
+
+    jobs = list_jobs(limit=20)
+    if not jobs:
+        st.info("No background jobs yet. Queue one from Bulk Screening or JD Auto-Screen.")
+        return
+
+    status_icons = {"queued": "⏳", "running": "⚙️", "done": "✅", "failed": "❌", "cancelled": "🚫"}
+
+    for job in jobs:
+        source = f"{job['total']} uploaded file(s)" if job["kind"] == "bulk" else f"folder `{job['folder']}`"
+        with st.container():
+            st.markdown(f"**{status_icons.get(job['status'], '')} Job #{job['id']}** · {job['status'].title()} · {source}")
+            st.caption(
+                f"Queued {job['created_at'].replace('T', ' ')}"
+                + (f" · scheduled {job['scheduled_at'].replace('T', ' ')}" if job["scheduled_at"] > job["created_at"] else "")
+                + (f" · by {job['created_by']}" if job["created_by"] else "")
+                + f" · JD: {job['job_desc'][:80]}{'...' if len(job['job_desc']) > 80 else ''}"
+            )
+
+            if job["total"]:
+                st.progress(
+                    min(1.0, job["processed"] / job["total"]),
+                    text=f"{job['processed']}/{job['total']} screened ({job['failed']} failed)"
+                )
+            if job["error"]:
+                st.error(job["error"])
+            if job["processed"]:
+                show_file_status_summary(get_job_file_counts(job["id"]))
+
+            c1, c2, c3 = st.columns([1, 1, 2])
+            with c1:
+                if job["status"] in ACTIVE_STATUSES and not job["cancel_requested"]:
+                    if st.button("🚫 Cancel", key=f"job_cancel_{job['id']}", use_container_width=True):
+                        cancel_job(job["id"])
+                        st.rerun()
+                elif job["status"] in ACTIVE_STATUSES:
+                    st.caption("Cancelling...")
+                elif st.button("🔁 Rerun", key=f"job_rerun_{job['id']}", use_container_width=True,
+                               help="Skips files that already finished; retries failed and new ones"):
+                    requeue_job(job["id"])
+                    st.rerun()
+            with c2:
+                if job["processed"] and st.button("📥 Load Results", key=f"job_load_{job['id']}", use_container_width=True):
+                    results = get_job_results(job["id"], with_content=True)
+                    record_scores(RESUMES_DIR, results)
+                    index_similar_rows(results)
+                    if job["kind"] == "bulk":
+                        st.session_state.bulk_results = CandidateTable.from_rows(results)
+                        st.session_state.shortlist = None
+                        st.session_state.pool_clusters = None
+                        st.session_state.bulk_jd_text = job["job_desc"]
+                        st.session_state.bulk_download_data = None
+                        target = "📑 Bulk Screening"
+                    else:
+                        st.session_state.auto_results = CandidateTable.from_rows(results)
+                        st.session_state.auto_download_data = None
+                        target = "📃 JD Auto-Screen"
+                    st.success(f"✅ Loaded {len(results)} results into {target}")
+            with c3:
+                if job["status"] == "running" and job["processed"]:
+                    best = get_job_results(job["id"], limit=3)
+                    if best:
+                        st.caption("Best so far: " + ", ".join(f"{r['candidate_name']} ({r['overall_score']}%)" for r in best))
+
+            if job["failed"]:
+                with st.expander(f"⚠️ {job['failed']} file(s) failed"):
+                    for failure in get_job_failures(job["id"]):
+                        st.write(f"• {failure['filename']}: {failure['error']}")
+
+        st.divider()
+
+    # Poll while anything is still queued or running
+    if auto_refresh and any(job["status"] in ACTIVE_STATUSES for job in jobs):
+        time.sleep(3)
+        st.rerun()
+
+
+def show_upload_links():
+    """Upload links with their submissions, ranked by the pre-screen done on arrival"""
+    st.markdown("## 🔗 Upload Links")
+    st.info("💡 Submissions are screened against the link's JD as they arrive; idle workers pick up any left over.")
+
+    links = list_links()
+    if not links:
+        st.info("No upload links yet.")
+        return
+
+    waiting = False
+    for link in links:
+        counts = get_submission_counts(link["id"])
+        pending = counts.get(STATUS_PENDING, 0) + counts.get(STATUS_SCREENING, 0)
+        waiting = waiting or pending > 0
+        with st.expander(f"{link['job_title']} · {link['company_name']} · "
+                         f"{link['resume_count']}/{link['max_resumes']} · {link_status(link)}"):
+            st.caption(
+                f"By {link['recruiter_name']} ({link['recruiter_email']})"
+                f" · expires {link['expires_at'][:16].replace('T', ' ')}"
+                + (f" · {pending} being screened" if pending else "")
+                + (f" · {counts[STATUS_FAILED]} failed" if counts.get(STATUS_FAILED) else "")
+            )
+            ranked = get_ranked_submissions(link["id"], limit=25)
+            if ranked:
+                st.table(pd.DataFrame([{
+                    "Rank": rank,
+                    "Candidate": s["row"]["candidate_name"],
+                    "Email": s["row"]["email"],
+                    "Overall Score": s["row"]["overall_score"],
+                    "ATS Score": s["row"]["ats_score"],
+                    "Fit Level": s["row"]["fit"],
+                    "Submitted": s["submitted_at"][:16].replace("T", " "),
+                } for rank, s in enumerate(ranked, 1)]))
+            elif not pending:
+                st.caption("No submissions yet.")
+
+    # Normally screened by the time anyone looks; restart anything this process lost
+    if waiting:
+        prescreen_async()
+
+
 def show_stored_resumes():
-    """Show stored resumes"""
-    st.markdown("## 📁 Stored Resumes")
+    """Show stored resumes - paginated view over the metadata index"""
+    st.markdown("## 📁 Stored Resumes")
     st.markdown("---")
     st.info("Resumes are only saved when you manually click **Save Report**. No automatic saving.")
 
@@ -1203,47 +1423,270 @@ def show_stored_resumes():
         st.warning("Resumes directory not found.")
         return
 
-    resumes = [f for f in os.listdir(RESUMES_DIR) if f.lower().endswith((".pdf", ".docx", ".txt"))]
-
-    if not resumes:
+    if "stored_page" not in st.session_state:
+        st.session_state.stored_page = 1
+    if "stored_download" not in st.session_state:
+        st.session_state.stored_download = None  # (filename, bytes) of the one prepared download
+
+    col_search, col_skill, col_sort, col_order, col_size = st.columns([3, 2, 2, 1.5, 1.5])
+    with col_search:
+        search = st.text_input("Search by filename", key="stored_search")
+    with col_skill:
+        skill = st.text_input("Has skill", placeholder="e.g. python", key="stored_skill")
+    with col_sort:
+        sort_label = st.selectbox("Sort by", list(SORT_FIELDS.keys()), key="stored_sort")
+    with col_order:
+        descending = st.selectbox("Order", ["Descending", "Ascending"], key="stored_order") == "Descending"
+    with col_size:
+        page_size = st.selectbox("Per page", [10, 25, 50, 100], index=1, key="stored_page_size")
+
+    force_rescan = st.button("🔄 Rescan folder", key="stored_rescan")
+    entries = refresh_index(RESUMES_DIR, force=force_rescan)
+
+    if not entries:
         st.info("No resumes stored yet.")
         return
 
-    st.success(f"Found {len(resumes)} stored resumes")
+    # Filters changed -> back to the first page
+    filter_state = (search, skill, sort_label, descending, page_size)
+    if st.session_state.get("stored_filter_state") != filter_state:
+        st.session_state.stored_filter_state = filter_state
+        st.session_state.stored_page = 1
+
+    rows, total = query_index(
+        entries,
+        search=search,
+        skill=skill,
+        sort_by=SORT_FIELDS[sort_label],
+        descending=descending,
+        page=st.session_state.stored_page,
+        page_size=page_size
+    )
+    total_pages = max(1, -(-total // page_size))
+    st.session_state.stored_page = min(st.session_state.stored_page, total_pages)
 
-    for idx, resume in enumerate(resumes):
-        filepath = os.path.join(RESUMES_DIR, resume)
-        col1, col2, col3 = st.columns([4, 2, 2])
+    st.success(f"Found {total} of {len(entries)} stored resumes")
+
+    if not rows:
+        st.info("No stored resumes match the current filters.")
+        return
+
+    for row in rows:
+        resume = row["name"]
+        col1, col2, col3, col4, col5 = st.columns([4, 3, 1.5, 2, 2])
 
         with col1:
-            st.write(resume)
+            st.write(f"**{resume}**")
+            st.caption(f"{row['size'] / 1024:.1f} KB · uploaded {row['uploaded_at'].replace('T', ' ')}")
 
         with col2:
-            with open(filepath, "rb") as f:
+            st.write(", ".join(row.get("top_skills", [])) or "No skills detected")
+
+        with col3:
+            last_score = row.get("last_score")
+            st.write(f"{last_score}%" if last_score is not None else "—")
+
+        with col4:
+            # Bytes are read only for the resume whose download was requested
+            prepared = st.session_state.stored_download
+            if prepared and prepared[0] == resume:
                 st.download_button(
-                    "Download",
-                    f,
+                    "⬇️ Save file",
+                    prepared[1],
                     file_name=resume,
-                    key=f"stored_download_{idx}",
+                    key=f"stored_download_{resume}",
                     use_container_width=True,
                 )
+            elif st.button("Download", key=f"stored_prepare_{resume}", use_container_width=True):
+                try:
+                    st.session_state.stored_download = (resume, read_resume_bytes(RESUMES_DIR, resume))
+                    st.rerun()
+                except OSError as e:
+                    st.error(f"Error reading {resume}: {e}")
 
-        with col3:
-            if st.button("Delete", key=f"stored_delete_{idx}", use_container_width=True):
+        with col5:
+            if st.button("Delete", key=f"stored_delete_{resume}", use_container_width=True):
                 try:
-                    os.remove(filepath)
+                    delete_resume(RESUMES_DIR, resume)
+                    if prepared and prepared[0] == resume:
+                        st.session_state.stored_download = None
                     st.success(f"Deleted {resume}")
-                    st.experimental_rerun()
+                    st.rerun()
                 except Exception as e:
                     st.error(f"Error deleting {resume}: {e}")
 
+    # Pagination controls
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("⬅️ Previous", key="stored_prev", disabled=st.session_state.stored_page <= 1, use_container_width=True):
+            st.session_state.stored_page -= 1
+            st.rerun()
+    with col_info:
+        st.markdown(
+            f"<p style='text-align: center;'>Page {st.session_state.stored_page} of {total_pages}</p>",
+            unsafe_allow_html=True
+        )
+    with col_next:
+        if st.button("Next ➡️", key="stored_next", disabled=st.session_state.stored_page >= total_pages, use_container_width=True):
+            st.session_state.stored_page += 1
+            st.rerun()
+
     
 
 # ==================== CANDIDATE COMPARISON ====================
+def show_covering_shortlist(results, candidate_names):
+    """Smallest slate of screened candidates that together covers the JD's skills"""
+    st.subheader("🧩 Shortlist Covering the JD")
+    job_desc = st.session_state.get("bulk_jd_text") or ""
+    s1, s2 = st.columns([1, 1])
+    with s1:
+        max_size = st.number_input("Slate size (0 = as many as needed)", min_value=0, max_value=50, value=0,
+                                   key="shortlist_size")
+    with s2:
+        st.write("")
+        build = st.button("🧩 Build Shortlist", key="shortlist_build", use_container_width=True)
+    if build:
+        st.session_state.shortlist = shortlist_rows(results, job_desc, max_size or None)
+
+    shortlist = st.session_state.get("shortlist")
+    if not shortlist:
+        st.caption("Picks candidates one by one by the JD skills they add, breaking ties on overall score.")
+        return
+    slate = [entry for entry in shortlist["slate"] if entry["row"]["candidate_name"] in candidate_names]
+    if not shortlist["jd_skills"]:
+        st.info("No known skills found in the job description.")
+        return
+
+    st.caption(f"Covers {len(shortlist['covered_skills'])}/{len(shortlist['jd_skills'])} JD skills "
+               f"with {len(slate)} candidate(s)")
+    if slate:
+        st.table(pd.DataFrame([{
+            "Pick": pick,
+            "Candidate": entry["row"]["candidate_name"],
+            "Overall Score": entry["row"]["overall_score"],
+            "Adds Skills": ", ".join(entry["new_skills"]),
+        } for pick, entry in enumerate(slate, 1)]))
+    if shortlist["missing_skills"]:
+        st.warning("Not covered by anyone: " + ", ".join(shortlist["missing_skills"]))
+    if len(slate) >= 2 and st.button("🔍 Compare the first 5", key="shortlist_compare"):
+        st.session_state.compare_selection = [entry["row"]["candidate_name"] for entry in slate[:5]]
+    st.markdown("---")
+
+
+def show_pool_segments(results):
+    """Profile segments of the whole screened pool, with their skills and score ranges"""
+    st.subheader("🗺️ Pool Segments")
+    g1, g2 = st.columns([1, 1])
+    with g1:
+        n_clusters = st.number_input("Segments (0 = automatic)", min_value=0, max_value=30, value=0,
+                                     key="segments_k")
+    with g2:
+        st.write("")
+        if st.button("🗺️ Segment Pool", key="segments_build", use_container_width=True,
+                     disabled=len(results) < 2):
+            with st.spinner(f"Clustering {len(results)} candidates..."):
+                st.session_state.pool_clusters = cluster_pool(results, n_clusters or None)
+
+    clustering = st.session_state.get("pool_clusters")
+    if not clustering or len(clustering["labels"]) != len(results):
+        st.caption("Groups candidates by their skills and profile dimensions (technical, leadership, ...).")
+        return
+
+    st.table(pd.DataFrame([{
+        "Segment": cluster["label"],
+        "Candidates": cluster["size"],
+        "Leans": cluster["lean"],
+        "Score Range": f"{cluster['score_min']:.0f}–{cluster['score_max']:.0f} (median {cluster['score_median']:.0f})",
+        "Strongly Fit": cluster["fit_counts"].get("Strongly Fit", 0),
+        "Best": ", ".join(cluster["top_members"][:3]),
+    } for cluster in clustering["clusters"]]))
+    for cluster in clustering["clusters"]:
+        with st.expander(f"{cluster['label']} · {cluster['size']} candidate(s)"):
+            if cluster["skills"]:
+                st.caption("Skills: " + ", ".join(f"{name} ({share}%)" for name, share in cluster["skills"]))
+            st.caption("Dimensions: " + ", ".join(f"{name} {score}" for name, score in cluster["dimensions"].items()))
+            st.write("Top: " + ", ".join(cluster["top_members"]))
+    st.markdown("---")
+
+
+def _comparison_candidate(r):
+    """Map a result row to the comparison engine's candidate format"""
+    # Candidates ranked below the ATS stage get it now
+    ensure_stages(r, st.session_state.get("bulk_jd_text") or "", ["ats"])
+    return {
+        'name': r['candidate_name'],
+        'ats_score': r.get('ats_score', 0),
+        'match_percentage': r.get('skill_match', 0),
+        'experience': r.get('experience_level', 'N/A'),
+        'skills': r.get('skills', '').split(', ') if isinstance(r.get('skills'), str) else [],
+        'skill_mask': r.get('skill_mask'),
+        'education': 'N/A',  # Not in current structure
+        'overall_score': r.get('overall_score', 0),
+        'email': r.get('email', 'N/A'),
+        'resume_text': r.get('resume_text', '')  # Add resume text for accurate scoring
+    }
+
+
+def show_comparison_matrix(results, candidate_names):
+    """Compare any number of candidates as one candidate x dimension matrix"""
+    st.subheader("🧮 Candidate Matrix")
+    by_score = results.order_by("overall_score")
+
+    m1, m2 = st.columns([1, 2])
+    with m1:
+        top_n = st.number_input("Top candidates by score", min_value=2, max_value=len(results),
+                                value=min(50, len(results)), key="compare_top_n")
+    with m2:
+        extra = st.multiselect("Also include", candidate_names, key="compare_extra",
+                               help="Candidates outside the top N to add to the matrix")
+    picked = by_score[:top_n]
+    extra_picks = np.flatnonzero(np.isin(results.column("candidate_name"), extra))
+    included = results.take(np.concatenate([picked, extra_picks[~np.isin(extra_picks, picked)]]))
+    names = included.column("candidate_name").tolist()
+
+    if "compare_pinned" in st.session_state:
+        st.session_state.compare_pinned = [name for name in st.session_state.compare_pinned if name in names]
+    m3, m4, m5 = st.columns([2, 1, 1])
+    with m3:
+        pinned_names = st.multiselect("📌 Pin to top", names, key="compare_pinned")
+    with m4:
+        sort_by = st.selectbox("Sort by", MATRIX_COLUMNS, key="compare_sort")
+    with m5:
+        chart = st.radio("Chart", ["Heatmap", "Parallel coordinates"], key="compare_chart")
+
+    jd_text = st.session_state.get("bulk_jd_text") or ""
+    for r in included:
+        # Candidates ranked below the ATS stage get it now
+        ensure_stages(r, jd_text, ["ats"])
+        row_skill_mask(r)
+    comparison = build_table_matrix(included, [row_dimensions(r) for r in included])
+    pinned = [names.index(name) for name in pinned_names]
+    order = order_matrix(comparison['matrix'], comparison['columns'].index(sort_by), pinned)
+
+    if chart == "Heatmap":
+        st.plotly_chart(create_comparison_heatmap(comparison, order, pinned), use_container_width=True)
+    else:
+        st.plotly_chart(create_parallel_coordinates(comparison, order), use_container_width=True)
+
+    st.subheader("💡 Matrix Insights")
+    insights = get_comparison_insights(included, comparison)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Top Candidate", insights['top_candidate'], f"Score: {insights['top_score']}")
+    col2.metric("Most Skilled", insights['most_skilled'], f"{insights['skill_count']} skills")
+    col3.metric("Best ATS", insights['best_ats'], f"{insights['best_ats_score']}/100")
+    col4.metric("Average Match", f"{insights['avg_match']}%", f"ATS avg {insights['avg_ats']}")
+    st.caption("Leaders: " + ", ".join(f"{dim}: {name}" for dim, name in insights['dimension_leaders'].items()))
+
+    with st.expander("📋 Matrix values"):
+        table = pd.DataFrame(comparison['matrix'][order].round(0), columns=comparison['columns'])
+        table.insert(0, 'Name', [comparison['names'][i] for i in order.tolist()])
+        st.dataframe(table, use_container_width=True, hide_index=True)
+
+
 def show_candidate_comparison():
-    """Compare multiple candidates side-by-side with radar charts"""
+    """Compare multiple candidates side-by-side with radar charts, or any number as a matrix"""
     st.markdown("<h2 style='text-align: center;'>🔍 Candidate Comparison Tool</h2>", unsafe_allow_html=True)
-    st.markdown("<p style='text-align: center; color: #94a3b8;'>Compare up to 5 candidates side-by-side</p>", unsafe_allow_html=True)
+    st.markdown("<p style='text-align: center; color: #94a3b8;'>Compare up to 5 candidates side-by-side, or the whole pool as a matrix</p>", unsafe_allow_html=True)
     st.markdown("---")
     
     # Check if we have bulk screening results
@@ -1253,16 +1696,34 @@ def show_candidate_comparison():
         return
     
     results = st.session_state.bulk_results
+    candidate_names = results.column('candidate_name').tolist()
+
+    show_covering_shortlist(results, candidate_names)
+    show_pool_segments(results)
+
+    compare_mode = st.radio("Comparison mode", ["Side by side (2–5)", "Matrix (any number)"],
+                            horizontal=True, key="compare_mode")
+    if compare_mode == "Matrix (any number)":
+        if len(results) < 2:
+            st.info("The matrix needs at least 2 screened candidates.")
+        else:
+            show_comparison_matrix(results, candidate_names)
+        return
     
     # Create candidate selection
     st.subheader("📋 Select Candidates to Compare")
     
-    candidate_names = [r['candidate_name'] for r in results]
+    # Drop kept selections that are not in the current results (e.g. after a re-screen)
+    if "compare_selection" in st.session_state:
+        st.session_state.compare_selection = [
+            name for name in st.session_state.compare_selection if name in candidate_names
+        ][:5]
     selected_candidates = st.multiselect(
         "Choose 2-5 candidates",
         candidate_names,
         max_selections=5,
-        help="Select between 2 and 5 candidates for comparison"
+        help="Select between 2 and 5 candidates for comparison",
+        key="compare_selection"
     )
     
     if len(selected_candidates) < 2:
@@ -1270,21 +1731,7 @@ def show_candidate_comparison():
         return
     
     # Filter selected candidates and prepare data
-    comparison_candidates = []
-    for r in results:
-        if r['candidate_name'] in selected_candidates:
-            # Map to expected format for comparison engine
-            comparison_candidates.append({
-                'name': r['candidate_name'],
-                'ats_score': r.get('ats_score', 0),
-                'match_percentage': r.get('skill_match', 0),
-                'experience': r.get('experience_level', 'N/A'),
-                'skills': r.get('skills', '').split(', ') if isinstance(r.get('skills'), str) else [],
-                'education': 'N/A',  # Not in current structure
-                'overall_score': r.get('overall_score', 0),
-                'email': r.get('email', 'N/A'),
-                'resume_text': r.get('resume_text', '') # Add resume text for accurate scoring
-            })
+    comparison_candidates = [_comparison_candidate(r) for r in results if r['candidate_name'] in selected_candidates]
     
     st.markdown("---")
     
@@ -1378,14 +1825,17 @@ def show_analytics_and_reports():
     # Candidate Selection
     st.subheader("👤 Select Candidate for Detailed Analysis")
     
-    candidate_names = [r['candidate_name'] for r in results]
-    selected_candidate_name = st.selectbox("Choose a candidate", candidate_names)
+    candidate_names = results.column('candidate_name').tolist()
+    if st.session_state.get("analytics_candidate") not in candidate_names:
+        st.session_state.pop("analytics_candidate", None)
+    selected_candidate_name = st.selectbox("Choose a candidate", candidate_names, key="analytics_candidate")
     
     # Find selected candidate and map to expected format
     selected_result = next((r for r in results if r['candidate_name'] == selected_candidate_name), None)
     
     if not selected_result:
         return
+    ensure_stages(selected_result, st.session_state.get("bulk_jd_text") or "", ["ats", "timeline"])
     
     # Map to expected format
     selected_candidate = {
@@ -1407,11 +1857,17 @@ def show_analytics_and_reports():
     
     st.markdown("---")
     
-    # Tabs for different analytics
-    analytics_tabs = st.tabs(["📈 Career Timeline", "🎯 Skills Radar", "📄 Generate Report"])
+    # Only the selected view is built (timeline HTML, radar figure or PDF form)
+    analytics_view = st.radio(
+        "Analytics view",
+        ["📈 Career Timeline", "🎯 Skills Radar", "🧲 More Like This", "📄 Generate Report"],
+        horizontal=True,
+        key="analytics_view",
+        label_visibility="collapsed"
+    )
     
-    # Career Timeline Tab
-    with analytics_tabs[0]:
+    # Career Timeline View
+    if analytics_view == "📈 Career Timeline":
         st.subheader(f"📈 {selected_candidate_name}'s Career Timeline")
         
         timeline_events = selected_candidate.get('timeline_events', [])
@@ -1432,8 +1888,8 @@ def show_analytics_and_reports():
             st.info("No timeline data could be extracted from the resume.")
             st.markdown("This usually happens if the resume doesn't have clear date patterns (e.g. '2020 - 2023').")
     
-    # Skills Radar Tab
-    with analytics_tabs[1]:
+    # Skills Radar View
+    elif analytics_view == "🎯 Skills Radar":
         st.subheader(f"🎯 {selected_candidate_name}'s Skills Profile")
         
         skills = selected_candidate.get('skills', [])
@@ -1462,9 +1918,40 @@ def show_analytics_and_reports():
                     st.metric(dimension, f"{score:.0f}/100")
         else:
             st.info("No skills data available for this candidate.")
+
+    # Similar candidates across everything screened or stored
+    elif analytics_view == "🧲 More Like This":
+        st.subheader(f"🧲 Candidates Similar to {selected_candidate_name}")
+        m1, m2 = st.columns([1, 1])
+        with m1:
+            k = st.number_input("How many", min_value=1, max_value=100, value=10, key="similar_k")
+        with m2:
+            st.write("")
+            if st.button("📂 Include Stored Resumes", key="similar_add_stored", use_container_width=True,
+                         help="Indexes stored resumes not indexed yet"):
+                with st.spinner("Indexing stored resumes..."):
+                    st.caption(f"Indexed {add_stored_resumes(RESUMES_DIR)} new stored resume(s)")
+
+        if not selected_result.get("resume_text"):
+            st.info("No resume text stored for this candidate.")
+        else:
+            similar = query_similar(selected_result["resume_text"], selected_result.get("skill_mask"), int(k),
+                                    exclude_id=selected_result.get("hash"))
+            if similar:
+                st.table(pd.DataFrame([{
+                    "Candidate": doc["name"],
+                    "File": doc["filename"],
+                    "Similarity %": doc["similarity"],
+                    "Text %": doc["text_similarity"],
+                    "Skills %": doc["skill_similarity"],
+                    "Source": doc["source"].title(),
+                    "Indexed": doc["added_at"].replace("T", " "),
+                } for doc in similar]))
+            else:
+                st.info("No other resumes indexed yet.")
     
-    # Generate Report Tab
-    with analytics_tabs[2]:
+    # Generate Report View
+    else:
         st.subheader("📄 Generate Comprehensive Report")
         
         st.markdown("""
@@ -0,0 +1,151 @@
+"""
+Startup Import Budget for RecruitNova
+Imports app.py in a fresh interpreter with `python -X importtime` and checks
+the cost of reaching the landing page against a budget.
+
+Streamlit's own import time is reported but not counted: it is paid by every
+Streamlit app. The budget covers what app.py adds on top of it, and the heavy
+dashboard dependencies must not be imported at all before a dashboard opens.
+
+Usage:
+    python startup_budget.py [--budget-ms 150] [--top 15]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_BUDGET_MS = 150
+
+# Modules that belong to dashboards and must be loaded lazily
+DEFERRED_MODULES = [
+    "single_screen_admin_old",
+    "single_screen_user_old",
+    "resume_fetcher",
+    "users_extract",
+    "utils.extract",
+    "utils.growth_predictor",
+    "utils.performance_predictor",
+    "utils.pdf_report",
+    "plotly.express",
+    "reportlab",
+    "pytube",
+    "PyPDF2",
+    "docx",
+    "sklearn",
+]
+
+_PROBE = (
+    "import sys, json; import app; "
+    "print(json.dumps([m for m in {modules!r} if m in sys.modules]))"
+)
+
+
+def parse_importtime(stderr: str):
+    """
+    Parse `-X importtime` output
+
+    Returns:
+        List of (module, self_us, cumulative_us, depth) in output order
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header row
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return rows
+
+
+def measure_startup():
+    """
+    Import app.py in a subprocess and summarise the import cost
+
+    Returns:
+        Dictionary with total/streamlit/app times (ms), the top app imports
+        and any deferred modules that were loaded eagerly
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(modules=DEFERRED_MODULES)],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing app.py failed:\n{result.stderr[-2000:]}")
+
+    rows = parse_importtime(result.stderr)
+    cumulative = {name: cum for name, _, cum, depth in rows if depth <= 1}
+
+    total_us = cumulative.get("app", 0)
+    streamlit_us = cumulative.get("streamlit", 0)
+
+    # importtime prints children before their parent, so app.py's direct
+    # imports are the depth-1 rows between the previous top-level row and "app"
+    app_pos = next(i for i, row in enumerate(rows) if row[0] == "app" and row[3] == 0)
+    first_child = app_pos
+    while first_child > 0 and rows[first_child - 1][3] > 0:
+        first_child -= 1
+    app_imports = sorted(
+        ((name, cum) for name, _, cum, depth in rows[first_child:app_pos] if depth == 1 and name != "streamlit"),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+
+    return {
+        "total_ms": total_us / 1000,
+        "streamlit_ms": streamlit_us / 1000,
+        "app_ms": (total_us - streamlit_us) / 1000,
+        "app_imports": [(name, cum / 1000) for name, cum in app_imports],
+        "eager_deferred": json.loads(result.stdout.strip().splitlines()[-1]),
+    }
+
+
+def check_budget(report, budget_ms: float = DEFAULT_BUDGET_MS):
+    """Return a list of budget violations (empty when within budget)"""
+    problems = []
+    if report["app_ms"] > budget_ms:
+        problems.append(f"app.py import cost {report['app_ms']:.1f} ms exceeds budget of {budget_ms:.0f} ms")
+    for module in report["eager_deferred"]:
+        problems.append(f"{module} is imported at startup (should load with its dashboard)")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check app.py startup import time against a budget")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Allowed import time on top of Streamlit, in milliseconds")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest app imports to list")
+    args = parser.parse_args(argv)
+
+    report = measure_startup()
+
+    print(f"Total import of app.py : {report['total_ms']:8.1f} ms")
+    print(f"  streamlit (framework): {report['streamlit_ms']:8.1f} ms")
+    print(f"  app.py on top        : {report['app_ms']:8.1f} ms  (budget {args.budget_ms:.0f} ms)")
+    print()
+    print("Slowest direct imports of app.py (cumulative ms):")
+    for name, ms in report["app_imports"][:args.top]:
+        print(f"  {ms:8.1f}  {name}")
+
+    problems = check_budget(report, args.budget_ms)
+    print()
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        return 1
+
+    print("✅ Startup within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Test streaming resume ingestion from .zip and .tar.gz archives
+"""
+
+import os
+import sys
+import tarfile
+import zipfile
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from utils.archive_ingest import ArchiveError, iter_archive_members
+from utils.screening import screen_folder, screen_uploads
+
+TEST_RESUMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_resumes")
+JD = "Senior Python developer with Django, SQL, AWS and Docker. 5+ years experience."
+
+
+def _resumes():
+    resumes = {}
+    for name in ("entry_level.txt", "senior_level.txt"):
+        with open(os.path.join(TEST_RESUMES, name), "rb") as f:
+            resumes[name] = f.read()
+    return resumes
+
+
+def _zip(members):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+def _tar_gz(members):
+    buffer = BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, BytesIO(content))
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.parametrize("build, archive_name", [(_zip, "dump.zip"), (_tar_gz, "dump.tar.gz")])
+def test_members_stream_with_limits(build, archive_name):
+    members = {f"batch/{name}": content for name, content in _resumes().items()}
+    members["batch/photo.png"] = b"not a resume"
+    members["__MACOSX/batch/._entry_level.txt"] = b"resource fork"
+    members["batch/huge.pdf"] = b"%PDF" + b"0" * 2048
+
+    items = list(iter_archive_members(build(members), archive_name))
+    assert [(i["member"], i["error"]) for i in items] == [
+        ("batch/entry_level.txt", None),
+        ("batch/senior_level.txt", None),
+        ("batch/huge.pdf", None),
+    ]
+    assert items[1]["content"] == _resumes()["senior_level.txt"]
+
+    limited = list(iter_archive_members(build(members), archive_name, max_member_bytes=2048))
+    assert [i["name"] for i in limited if i["error"]] == ["senior_level.txt", "huge.pdf"]
+    assert all("larger than" in i["error"] for i in limited if i["error"])
+
+    capped = list(iter_archive_members(build(members), archive_name, max_members=1))
+    assert capped[0]["name"] == "entry_level.txt" and "more than 1 resumes" in capped[1]["error"]
+
+
+def test_corrupt_archive_is_reported():
+    with pytest.raises(ArchiveError):
+        list(iter_archive_members(BytesIO(b"not a zip"), "broken.zip"))
+
+    upload = BytesIO(b"not a zip")
+    upload.name = "broken.zip"
+    response = screen_uploads(JD, [upload])
+    assert response["results"] == []
+    assert response["file_status"][0]["status"] == "failed"
+
+
+def test_bulk_and_folder_screening_expand_archives(tmp_path):
+    upload = _zip({f"cvs/{name}": content for name, content in _resumes().items()})
+    upload.name = "board_export.zip"
+    response = screen_uploads(JD, [upload])
+    assert [r["original_filename"] for r in response["results"]] == ["senior_level.txt", "entry_level.txt"]
+    assert response["results"][0]["archive_member"] == "cvs/senior_level.txt"
+    assert [f["filename"] for f in response["file_status"]] == [
+        "board_export.zip/cvs/entry_level.txt", "board_export.zip/cvs/senior_level.txt"
+    ]
+
+    (tmp_path / "dump.tar.gz").write_bytes(_tar_gz({"senior_level.txt": _resumes()["senior_level.txt"]}).getvalue())
+    (tmp_path / "entry_level.txt").write_bytes(_resumes()["entry_level.txt"])
+    folder = screen_folder(JD, str(tmp_path))
+    rows = {r["original_filename"]: r for r in folder["results"]}
+    assert rows["senior_level.txt"]["source_archive"] == str(tmp_path / "dump.tar.gz")
+    assert rows["senior_level.txt"]["resume_path"] is None
+    assert rows["entry_level.txt"]["resume_path"] == str(tmp_path / "entry_level.txt")
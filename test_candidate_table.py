@@ -0,0 +1,85 @@
+"""
+Test the columnar candidate table
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from utils.candidate_table import CandidateTable, as_table
+from utils.extract import SKILLS_DB
+from utils.comparison_engine import build_table_matrix, get_comparison_insights
+
+TEST_RESUMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_resumes")
+
+
+def make_rows(n):
+    return [{
+        "candidate_name": f"c{i}",
+        "email": "Not provided",
+        "overall_score": round(90 - i * 1.25, 2),
+        "skill_match": 66.67,
+        "ats_score": None if i == 2 else 80 + i,
+        "fit": ["Strongly Fit", "Mid Fit", "Low Fit"][i % 3],
+        "experience_level": "Mid-level",
+        "skill_mask": 0b1011,
+        "resume_text": f"resume {i}",
+        "timeline_events": [],
+    } for i in range(n)]
+
+
+def test_rows_round_trip_and_write_through():
+    rows = make_rows(6)
+    rows[4]["ats_score"] = "n/a"          # unexpected type is kept as-is
+    table = CandidateTable.from_rows(rows)
+    assert table.to_rows() == rows and len(table) == 6
+    assert table.column("email")[0] is table.column("email")[5]   # interned
+
+    row = table[2]
+    assert row["ats_score"] is None and "growth_score" not in row
+    row.update({"ats_score": 71, "growth_score": 64.5})
+    row.pop("timeline_events")
+    assert table.column("ats_score")[2] == 71 and table[2]["growth_score"] == 64.5
+    assert "timeline_events" not in dict(table[2]) and table.has_values("growth_score")
+
+    # Masks are packed bits, so every skill fits however long SKILLS_DB gets
+    every_skill = (1 << len(SKILLS_DB)) - 1
+    row["skill_mask"] = every_skill
+    assert table[2]["skill_mask"] == every_skill and table[3]["skill_mask"] == 0b1011
+    assert build_table_matrix(table)["matrix"][2, 3] == len(SKILLS_DB)
+
+
+def test_views_filters_and_frames_share_storage():
+    table = CandidateTable.from_rows(make_rows(9))
+    top = table[:4]
+    assert np.shares_memory(top.column("overall_score"), table.column("overall_score"))
+    assert [r["candidate_name"] for r in top[::-1]] == ["c3", "c2", "c1", "c0"]
+
+    assert table.counts("fit") == {"Strongly Fit": 3, "Mid Fit": 3, "Low Fit": 3}
+    strong = table.where(table.is_in("fit", ["Strongly Fit"]))
+    assert strong.column("candidate_name").tolist() == ["c0", "c3", "c6"]
+    assert table.take(table.order_by("ats_score"))[0]["candidate_name"] == "c8"
+
+    frame = table.frame(["candidate_name", "overall_score", "fit"], rename={"fit": "Fit Level"})
+    assert list(frame.columns) == ["candidate_name", "overall_score", "Fit Level"]
+    assert frame["Fit Level"].tolist()[:2] == ["Strongly Fit", "Mid Fit"]
+    assert as_table(table) is table
+
+
+def test_comparison_matrix_from_columns():
+    table = CandidateTable.from_rows(make_rows(5))
+    comparison = build_table_matrix(table)
+    assert comparison["matrix"][:, 3].tolist() == [3] * 5
+    insights = get_comparison_insights(table, comparison)
+    assert insights["top_candidate"] == "c0" and insights["best_ats"] == "c4"
+
+
+def test_screened_rows_fit_the_table():
+    from utils.screening import screen_resume_path
+
+    rows = [screen_resume_path("Python developer", os.path.join(TEST_RESUMES, name))
+            for name in ("entry_level.txt", "senior_level.txt")]
+    assert CandidateTable.from_rows(rows).to_rows() == rows
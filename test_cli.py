@@ -0,0 +1,67 @@
+"""
+Test the headless screening CLI
+"""
+
+import os
+import sys
+import csv
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_RESUMES = os.path.join(APP_DIR, "test_resumes")
+
+
+def test_screen_writes_ranked_csv_without_streamlit(tmp_path):
+    jd_path = tmp_path / "jd.txt"
+    jd_path.write_text("Senior Python developer with Django, SQL, AWS and Docker. 5+ years experience.")
+    out_path = tmp_path / "ranked.csv"
+
+    probe = (
+        "import sys, recruitnova; "
+        f"code = recruitnova.main(['screen', '--jd', {str(jd_path)!r}, '--folder', {TEST_RESUMES!r}, "
+        f"'--workers', '2', '--out', {str(out_path)!r}, '--quiet']); "
+        "assert 'streamlit' not in sys.modules, 'CLI imported streamlit'; "
+        "sys.exit(code)"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], cwd=APP_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+    with open(out_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    assert [row["original_filename"] for row in rows] == ["senior_level.txt", "entry_level.txt"]
+    assert rows[0]["rank"] == "1"
+    assert all(row["status"] == "screened" for row in rows)
+    assert float(rows[0]["overall_score"]) >= float(rows[1]["overall_score"])
+
+
+def test_resume_skips_checkpointed_files(tmp_path):
+    import recruitnova
+
+    jd_path = tmp_path / "jd.txt"
+    jd_path.write_text("Python developer with SQL and AWS. 3+ years experience.")
+    folder = tmp_path / "resumes"
+    folder.mkdir()
+    for name in ("entry_level.txt", "senior_level.txt"):
+        (folder / name).write_bytes(open(os.path.join(TEST_RESUMES, name), "rb").read())
+
+    args = ["screen", "--jd", str(jd_path), "--folder", str(folder), "--workers", "1", "--quiet",
+            "--resume", "--checkpoint-db", str(tmp_path / "checkpoints.db")]
+
+    def statuses(out_name):
+        with open(tmp_path / out_name, newline="", encoding="utf-8") as f:
+            return {row["original_filename"]: row["status"] for row in csv.DictReader(f)}
+
+    assert recruitnova.main(args + ["--out", str(tmp_path / "first.csv")]) == 0
+    assert set(statuses("first.csv").values()) == {"screened"}
+
+    # A new file arrives; only it is screened on the rerun
+    (folder / "analyst.txt").write_text("Data analyst with Excel and Tableau, 2 years experience.")
+    assert recruitnova.main(args + ["--out", str(tmp_path / "second.csv")]) == 0
+    assert statuses("second.csv") == {
+        "entry_level.txt": "reused",
+        "senior_level.txt": "reused",
+        "analyst.txt": "screened",
+    }
@@ -0,0 +1,63 @@
+"""
+Test the matrix comparison mode of the comparison engine
+"""
+
+import os
+import sys
+import math
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from utils.comparison_engine import (
+    MATRIX_COLUMNS, build_comparison_matrix, order_matrix, get_comparison_insights,
+    create_comparison_heatmap, create_parallel_coordinates
+)
+
+
+def make_candidates(n, seed=3):
+    rng = random.Random(seed)
+    return [{
+        "name": f"c{i}",
+        "overall_score": rng.randint(0, 100),
+        "match_percentage": rng.randint(0, 100),
+        "ats_score": rng.randint(0, 100),
+        "skills": ["python", "sql", "react"][:rng.randint(1, 3)],
+        "resume_text": rng.choice(["Led a team; mentoring and communication.", "Python SQL analysis and research."]),
+    } for i in range(n)]
+
+
+def test_matrix_shape_and_insights_match_dict_loop():
+    candidates = make_candidates(60)
+    candidates[5]["ats_score"] = None
+    comparison = build_comparison_matrix(candidates)
+    assert comparison["matrix"].shape == (60, len(MATRIX_COLUMNS))
+    assert math.isnan(comparison["matrix"][5, 2])
+
+    insights = get_comparison_insights(candidates, comparison)
+    top = max(candidates, key=lambda c: c["overall_score"])
+    rated = [c for c in candidates if c["ats_score"] is not None]
+    assert insights["top_candidate"] == top["name"] and insights["total_candidates"] == 60
+    assert insights["best_ats"] == max(rated, key=lambda c: c["ats_score"])["name"]
+    assert insights["avg_ats"] == round(sum(c["ats_score"] for c in rated) / len(rated), 1)
+    assert insights["skill_count"] == 3
+    assert set(insights["dimension_leaders"]) == set(MATRIX_COLUMNS[4:])
+
+    # Without a prebuilt matrix only the score columns are computed
+    assert "dimension_leaders" not in get_comparison_insights(candidates)
+    assert get_comparison_insights([]) == {}
+
+
+def test_sorting_pinning_and_figures():
+    candidates = make_candidates(8)
+    comparison = build_comparison_matrix(candidates)
+    order = order_matrix(comparison["matrix"], sort_column=1, pinned=[6, 2])
+    assert order[:2].tolist() == [6, 2] and sorted(order.tolist()) == list(range(8))
+    rest = comparison["matrix"][order[2:], 1]
+    assert np.all(rest[:-1] >= rest[1:])
+
+    heatmap = create_comparison_heatmap(comparison, order, pinned=[6, 2])
+    assert heatmap.data[0].y[0].startswith("📌") and len(heatmap.data[0].y) == 8
+    assert len(create_parallel_coordinates(comparison, order).data[0].dimensions) == len(MATRIX_COLUMNS)
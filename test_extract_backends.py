@@ -0,0 +1,59 @@
+"""
+Test the PDF/DOCX extraction backends and page-range extraction
+"""
+
+import os
+import re
+import sys
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import docx
+import pytest
+
+from utils import safe_extract
+from utils.extract_backends import PDF_BACKENDS, extract_docx_xml, benchmark_backends, build_benchmark_corpus
+from test_safe_extract import _pdf
+
+TEST_RESUMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_resumes")
+
+
+def test_docx_xml_reads_headers_and_tables():
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "jane@example.com"
+    document.add_paragraph("Senior engineer")
+    document.add_table(rows=1, cols=2).rows[0].cells[1].text = "Kubernetes"
+    buffer = BytesIO()
+    document.save(buffer)
+
+    text = extract_docx_xml(buffer.getvalue())
+    assert "jane@example.com" in text and "Senior engineer" in text and "Kubernetes" in text
+
+
+@pytest.mark.parametrize("backend", sorted(PDF_BACKENDS))
+def test_pdf_backends_read_page_ranges(backend):
+    text, pages = PDF_BACKENDS[backend](_pdf(6), 2, 3)
+    assert pages == 6
+    assert re.findall(r"Page (\d+)", text) == ["3", "4", "5"]
+
+
+def test_pool_splits_long_pdfs_in_page_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(safe_extract, "_CPU_COUNT", 2)
+    pool = safe_extract.ExtractionPool(workers=2, max_pages=12, quarantine_path=str(tmp_path / "q.json"))
+    try:
+        result = pool.extract("long.pdf", _pdf(20))
+    finally:
+        pool.close()
+
+    assert result["status"] == "ok" and result["truncated"] and result["pages"] == 20
+    assert [int(p) for p in re.findall(r"Page (\d+)", result["text"])] == list(range(1, 13))
+
+
+def test_benchmark_rejects_paragraph_only_docx():
+    corpus = build_benchmark_corpus([os.path.join(TEST_RESUMES, "senior_level.txt")])
+    report = benchmark_backends(corpus, repeats=1)
+
+    correct = {row["backend"]: row["correct"] for row in report["results"]}
+    assert correct["docx-xml"] and not correct["python-docx"]
+    assert report["backends"]["docx"] == "docx-xml"
@@ -0,0 +1,61 @@
+"""
+Test incremental folder watching and the persisted leaderboard
+"""
+
+import os
+import sys
+import shutil
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from utils import folder_watch, screening_history
+from folder_watcher import scan_watch
+
+TEST_RESUMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_resumes")
+JD = "Senior Python developer with Django, SQL, AWS and Docker. 5+ years experience."
+
+
+@pytest.fixture
+def watch(tmp_path, monkeypatch):
+    monkeypatch.setattr(folder_watch, "SETTLE_SECONDS", 0)
+    folder = tmp_path / "incoming"
+    folder.mkdir()
+    db = str(tmp_path / "watches.db")
+    folder_watch.add_watch(str(folder), JD, "Backend", db_path=db)
+    return folder_watch.list_watches(db_path=db)[0], db, str(tmp_path / "ck.db"), str(tmp_path / "history.db")
+
+
+def test_only_new_or_changed_files_are_screened(watch):
+    watch, db, ck, history = watch
+    shutil.copy(os.path.join(TEST_RESUMES, "entry_level.txt"), watch["folder"])
+    assert scan_watch(watch, db_path=db, checkpoint_db=ck, history_db=history)["files"] == 1
+    assert scan_watch(watch, db_path=db, checkpoint_db=ck, history_db=history)["files"] == 0
+
+    shutil.copy(os.path.join(TEST_RESUMES, "senior_level.txt"), watch["folder"])
+    with open(os.path.join(watch["folder"], "notes.md"), "w") as f:
+        f.write("ignored")
+    assert scan_watch(watch, db_path=db, checkpoint_db=ck, history_db=history)["files"] == 1
+
+    board = folder_watch.get_leaderboard(watch["id"], db_path=db)
+    assert [r["original_filename"] for r in board] == ["senior_level.txt", "entry_level.txt"]
+    assert board[0]["overall_score"] >= board[1]["overall_score"]
+    assert screening_history.get_totals(db_path=history)["candidates"] == 2
+
+    os.remove(os.path.join(watch["folder"], "senior_level.txt"))
+    counts = scan_watch(watch, [os.path.join(watch["folder"], "senior_level.txt")], db_path=db, checkpoint_db=ck, history_db=history)
+    assert counts["removed"] == 1
+    assert [r["original_filename"] for r in folder_watch.get_leaderboard(watch["id"], db_path=db)] == ["entry_level.txt"]
+
+
+@pytest.mark.skipif(folder_watch.open_notifier() is None, reason="inotify not available")
+def test_inotify_reports_closed_files(tmp_path):
+    notifier = folder_watch.open_notifier()
+    try:
+        notifier.add(str(tmp_path))
+        with open(tmp_path / "cv.txt", "w") as f:
+            f.write("Python")
+        assert notifier.read(timeout=2.0) == [str(tmp_path / "cv.txt")]
+    finally:
+        notifier.close()
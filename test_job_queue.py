@@ -0,0 +1,111 @@
+"""
+Test the background screening job queue and worker
+"""
+
+import os
+import sys
+import zipfile
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import job_queue, screening_history
+from job_worker import process_job
+from utils.upload_spool import spool_upload, iter_expanded_files
+
+TEST_RESUMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_resumes")
+JD = "Senior Python developer with Django, SQL, AWS and Docker. 5+ years experience."
+
+
+def _files():
+    files = []
+    for name in ("entry_level.txt", "senior_level.txt"):
+        with open(os.path.join(TEST_RESUMES, name), "rb") as f:
+            files.append({"name": name, "content": f.read()})
+    return files
+
+
+def test_bulk_job_runs_to_completion(tmp_path):
+    db = str(tmp_path / "jobs.db")
+    job_id = job_queue.enqueue_job(JD, files=_files(), db_path=db)
+
+    job = job_queue.claim_next_job("test-worker", db)
+    assert job["id"] == job_id
+    assert job_queue.claim_next_job("other-worker", db) is None
+
+    history = str(tmp_path / "history.db")
+    assert process_job(job, db, str(tmp_path / "checkpoints.db"), history) == "done"
+    done = job_queue.get_job(job_id, db)
+    assert (done["status"], done["processed"], done["total"]) == ("done", 2, 2)
+
+    rows = job_queue.get_job_results(job_id, with_content=True, db_path=db)
+    assert [r["original_filename"] for r in rows] == ["senior_level.txt", "entry_level.txt"]
+    assert rows[0]["file_content"] == _files()[1]["content"]
+    assert screening_history.get_totals(db_path=history)["candidates"] == 2
+
+
+def test_cancel_and_stale_requeue(tmp_path):
+    db = str(tmp_path / "jobs.db")
+    job_id = job_queue.enqueue_job(JD, folder=TEST_RESUMES, db_path=db)
+    job_queue.claim_next_job("dead-worker", db)
+
+    # The worker died: once its heartbeat is stale another worker takes over
+    conn = job_queue.connect(db)
+    conn.execute("UPDATE jobs SET heartbeat_at = '2000-01-01T00:00:00' WHERE id = ?", (job_id,))
+    conn.close()
+    job = job_queue.claim_next_job("new-worker", db)
+    assert job["id"] == job_id and job["worker"] == "new-worker"
+
+    assert job_queue.cancel_job(job_id, db)
+    assert process_job(job, db, str(tmp_path / "checkpoints.db"), str(tmp_path / "history.db")) == "cancelled"
+    cancelled = job_queue.get_job(job_id, db)
+    assert cancelled["status"] == "cancelled" and cancelled["processed"] == 1
+
+
+def test_unreadable_archive_members_are_reported(tmp_path):
+    db, spool = str(tmp_path / "jobs.db"), str(tmp_path / "spool")
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("cvs/senior_level.txt", _files()[1]["content"])
+        z.writestr("cvs/bomb.txt", b"a" * 200000)
+    archive.seek(0)
+    archive.name = "export.zip"
+    broken = BytesIO(b"not a zip")
+    broken.name = "broken.zip"
+    handles = [spool_upload(archive, spool), spool_upload(broken, spool)]
+
+    job_id = job_queue.enqueue_job(JD, files=iter_expanded_files(handles, spool), db_path=db)
+    job = job_queue.claim_next_job("test-worker", db)
+    assert process_job(job, db, str(tmp_path / "checkpoints.db"), str(tmp_path / "history.db")) == "done"
+
+    done = job_queue.get_job(job_id, db)
+    assert (done["total"], done["processed"], done["failed"]) == (3, 3, 2)
+    failures = job_queue.get_job_failures(job_id, db)
+    assert [f["filename"] for f in failures] == ["bomb.txt", "broken.zip"]
+    assert "compression ratio" in failures[0]["error"] and "zip" in failures[1]["error"]
+
+
+def test_taken_over_worker_stops_writing(tmp_path):
+    db = str(tmp_path / "jobs.db")
+    job_id = job_queue.enqueue_job(JD, files=_files(), db_path=db)
+    slow = job_queue.claim_next_job("slow-worker", db)
+    assert job_queue.record_result(job_id, 0, "entry_level.txt", {"overall_score": 40}, worker="slow-worker", db_path=db)
+
+    # The slow worker missed its heartbeat and the job was handed over
+    conn = job_queue.connect(db)
+    conn.execute("UPDATE jobs SET heartbeat_at = '2000-01-01T00:00:00' WHERE id = ?", (job_id,))
+    conn.close()
+    job = job_queue.claim_next_job("new-worker", db)
+    assert job["worker"] == "new-worker" and job_queue.get_job(job_id, db)["processed"] == 0
+
+    # Its late writes are refused and it stops without finishing the job
+    assert not job_queue.record_result(job_id, 1, "senior_level.txt", error="late", worker="slow-worker", db_path=db)
+    assert not job_queue.finish_job(job_id, "failed", "late", worker="slow-worker", db_path=db)
+    assert process_job(slow, db, str(tmp_path / "checkpoints.db"), str(tmp_path / "history.db")) == "taken over"
+    current = job_queue.get_job(job_id, db)
+    assert (current["status"], current["processed"], current["failed"]) == ("running", 0, 0)
+    assert job_queue.get_job_file_counts(job_id, db) == {}
+
+    assert process_job(job, db, str(tmp_path / "checkpoints.db"), str(tmp_path / "history.db")) == "done"
+    done = job_queue.get_job(job_id, db)
+    assert (done["status"], done["processed"], done["failed"]) == ("done", 2, 0)
@@ -0,0 +1,89 @@
+"""
+Test pre-screening of upload-link submissions
+"""
+
+import os
+import sys
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import upload_links, link_prescreen, screening_history
+from utils.checkpoints import STATUS_SCREENED, STATUS_FAILED
+from utils.screening import screen_resume_path, build_job_profile
+
+TEST_RESUMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_resumes")
+JD = "Senior Python developer with Django, SQL, AWS and Docker. 5+ years experience."
+
+
+def read_resume(name):
+    with open(os.path.join(TEST_RESUMES, name), "rb") as f:
+        return f.read()
+
+
+def test_profile_screen_matches_plain_screen():
+    path = os.path.join(TEST_RESUMES, "senior_level.txt")
+    plain = screen_resume_path(JD, path, required_years=5)
+    profiled = screen_resume_path(JD, path, profile=build_job_profile(JD, 5))
+    assert profiled["overall_score"] == plain["overall_score"]
+    assert profiled["ats_details"] == plain["ats_details"]
+
+
+def test_submissions_are_ranked_after_prescreen(tmp_path, monkeypatch):
+    monkeypatch.setattr(link_prescreen, "_profiles", {})
+    db, ck = str(tmp_path / "links.db"), str(tmp_path / "ck.db")
+    link, token = upload_links.create_link("rec@example.com", "Backend", JD, required_years=5, db_path=db)
+
+    for i, name in enumerate(["entry_level.txt", "senior_level.txt", "senior_level.txt"]):
+        fields = {"name": f"Candidate {i}", "email": f"c{i}@example.com", "phone": "555-0100"}
+        upload_links.submit_resume(token, fields, name, read_resume(name), db)
+    upload_links.submit_resume(token, {"name": "X", "email": "x@example.com", "phone": "1"}, "cv.pdf", b"junk", db)
+    assert upload_links.get_submission_counts(link["id"], db) == {upload_links.STATUS_PENDING: 4}
+
+    history = str(tmp_path / "history.db")
+    assert link_prescreen.prescreen_pending(db_path=db, checkpoint_db=ck, history_db=history) == 4
+    assert link_prescreen.prescreen_pending(db_path=db, checkpoint_db=ck, history_db=history) == 0
+    assert upload_links.get_submission_counts(link["id"], db) == {STATUS_SCREENED: 3, STATUS_FAILED: 1}
+    # The same file sent twice on a day is one history record
+    assert screening_history.get_totals(db_path=history)["candidates"] == 2
+
+    ranked = upload_links.get_ranked_submissions(link["id"], db_path=db)
+    scores = [s["overall_score"] for s in ranked]
+    assert scores == sorted(scores, reverse=True) and scores[0] > scores[-1]
+    # Form values win over what was read from the file
+    assert ranked[-1]["row"]["candidate_name"] == "Candidate 0"
+    assert ranked[-1]["row"]["email"] == "c0@example.com"
+
+    # The parsed JD is kept on the link for later submissions and processes
+    assert upload_links.get_link_by_id(link["id"], db)["job_profile"] == build_job_profile(JD, 5)
+
+
+def test_stale_claims_are_taken_over(tmp_path):
+    db = str(tmp_path / "links.db")
+    _link, token = upload_links.create_link("rec@example.com", "Backend", JD, required_fields=[], db_path=db)
+    upload_links.submit_resume(token, {}, "cv.txt", b"Python", db)
+
+    claimed = upload_links.claim_submission(db_path=db)
+    assert claimed["status"] == upload_links.STATUS_SCREENING
+    assert upload_links.claim_submission(db_path=db) is None
+
+    conn = upload_links.connect(db)
+    conn.execute("UPDATE submissions SET claimed_at = '2000-01-01T00:00:00'")
+    conn.close()
+    assert upload_links.claim_submission(db_path=db)["id"] == claimed["id"]
+
+
+def test_stores_from_before_prescreening_are_upgraded(tmp_path):
+    db = str(tmp_path / "links.db")
+    added = {column for columns in upload_links._ADDED_COLUMNS.values() for column, _ in columns}
+    old_schema = "\n".join(line for line in upload_links._SCHEMA.splitlines()
+                           if line.strip().split(" ")[0] not in added)
+    conn = sqlite3.connect(db)
+    conn.executescript(old_schema.replace("uploads_folder TEXT NOT NULL,", "uploads_folder TEXT NOT NULL")
+                       .replace("submitted_at TEXT NOT NULL,", "submitted_at TEXT NOT NULL"))
+    conn.close()
+
+    link, token = upload_links.create_link("rec@example.com", "Backend", JD, required_fields=[], db_path=db)
+    assert link["job_profile"] is None
+    upload_links.submit_resume(token, {}, "cv.txt", b"Python", db)
+    assert upload_links.claim_submission(db_path=db)["status"] == upload_links.STATUS_SCREENING
@@ -0,0 +1,113 @@
+"""
+Test incremental resume ingestion from mbox files and Maildir folders
+"""
+
+import os
+import sys
+import mailbox
+from email.message import EmailMessage
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from utils import screening
+from utils.checkpoints import CheckpointStore
+from utils.mailbox_ingest import read_attachment
+from utils.screening import screen_mailbox
+
+TEST_RESUMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_resumes")
+JD = "Senior Python developer with Django, SQL, AWS and Docker. 5+ years experience."
+
+
+def _resume(name):
+    with open(os.path.join(TEST_RESUMES, name), "rb") as f:
+        return f.read()
+
+
+def _message(sender, attachments, subject="Application"):
+    msg = EmailMessage()
+    msg["From"] = sender
+    msg["To"] = "jobs@example.com"
+    msg["Subject"] = subject
+    msg["Message-ID"] = f"<{abs(hash((sender, subject)))}@example.com>"
+    msg.set_content("Please find my resume attached.")
+    for filename, content in attachments:
+        msg.add_attachment(content, maintype="text", subtype="plain", filename=filename)
+    return msg
+
+
+def _screen(tmp_path, path):
+    with CheckpointStore.for_screen(JD, "mailbox", db_path=str(tmp_path / "ck.db")) as checkpoints:
+        return screen_mailbox(JD, path, checkpoints=checkpoints, state_db=str(tmp_path / "mail.db"))
+
+
+def test_mbox_scans_are_incremental_and_keyed_by_sender(tmp_path):
+    path = str(tmp_path / "applications.mbox")
+    box = mailbox.mbox(path)
+    box.add(_message("Sarah Johnson <Sarah@Example.com>", [("resume.txt", _resume("senior_level.txt"))]))
+    box.add(_message("Jo Lee <jo@example.com>", [("cv.txt", _resume("entry_level.txt")), ("photo.png", b"x")]))
+    box.flush()
+
+    first = _screen(tmp_path, path)
+    assert first["messages"] == 2
+    assert [r["candidate_key"] for r in first["results"]] == ["sarah@example.com", "jo@example.com"]
+    assert first["results"][0]["candidate_name"] == "Sarah Johnson"
+    top = first["results"][0]
+    assert read_attachment(path, top["mail_location"], top["original_filename"]) == _resume("senior_level.txt")
+
+    # Nothing new: no message is read, earlier candidates come from checkpoints
+    again = _screen(tmp_path, path)
+    assert again["messages"] == 0 and again["file_status"] == []
+    assert [r["candidate_key"] for r in again["results"]] == ["sarah@example.com", "jo@example.com"]
+
+    # A newer message from the same sender replaces their earlier resume
+    box.add(_message("jo@example.com", [("cv_v2.txt", _resume("senior_level.txt") + b"\nKubernetes")], "Update"))
+    box.flush()
+    latest = _screen(tmp_path, path)
+    assert latest["messages"] == 1
+    jo = [r for r in latest["results"] if r["candidate_key"] == "jo@example.com"]
+    assert len(latest["results"]) == 2 and jo[0]["original_filename"] == "cv_v2.txt"
+
+
+def test_maildir_marks_messages_as_seen(tmp_path):
+    path = str(tmp_path / "Maildir")
+    box = mailbox.Maildir(path)
+    box.add(_message("sarah@example.com", [("resume.txt", _resume("senior_level.txt"))]))
+
+    assert _screen(tmp_path, path)["messages"] == 1
+    box.add(_message("jo@example.com", [("cv.txt", _resume("entry_level.txt"))]))
+    second = _screen(tmp_path, path)
+    assert second["messages"] == 1
+    assert {r["candidate_key"] for r in second["results"]} == {"sarah@example.com", "jo@example.com"}
+
+
+
+@pytest.mark.parametrize("kind", ["mbox", "maildir"])
+def test_failed_attachments_are_retried(tmp_path, monkeypatch, kind):
+    path = str(tmp_path / kind)
+    box = mailbox.mbox(path) if kind == "mbox" else mailbox.Maildir(path)
+    box.add(_message("sarah@example.com", [("resume.txt", _resume("senior_level.txt"))]))
+    box.add(_message("jo@example.com", [("cv.txt", _resume("entry_level.txt"))]))
+    box.flush()
+
+    # Extraction times out for one attachment; the mark still moves past its message
+    screen_upload = screening.screen_upload
+    def flaky(job_desc, name, content):
+        if name == "cv.txt":
+            raise TimeoutError("extraction timed out")
+        return screen_upload(job_desc, name, content)
+    monkeypatch.setattr(screening, "screen_upload", flaky)
+    first = _screen(tmp_path, path)
+    assert first["messages"] == 2 and [r["candidate_key"] for r in first["results"]] == ["sarah@example.com"]
+
+    # The next scan reads no new mail but retries the failed attachment
+    monkeypatch.setattr(screening, "screen_upload", screen_upload)
+    second = _screen(tmp_path, path)
+    assert second["messages"] == 0
+    assert [f["filename"] for f in second["file_status"]] == ["jo@example.com/cv.txt"]
+    assert {r["candidate_key"] for r in second["results"]} == {"sarah@example.com", "jo@example.com"}
+
+    # Once it succeeded it is not retried again
+    third = _screen(tmp_path, path)
+    assert third["file_status"] == [] and len(third["results"]) == 2
@@ -0,0 +1,61 @@
+"""
+Test clustering a screened pool into profile segments
+"""
+
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from utils.extract import skills_to_mask
+from utils.pool_clustering import cluster_pool, candidate_features, auto_cluster_count
+
+PROFILES = {
+    "frontend": (["javascript", "react", "html", "css"], "Built responsive UIs; collaboration and communication."),
+    "data": (["python", "sql", "machine learning"], "Analytical problem solving, research and analysis."),
+    "devops": (["devops", "jenkins", "shell scripting"], "Troubleshooting and automation; team lead and mentoring."),
+}
+
+
+def make_pool(per_profile, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    for profile, (skills, text) in PROFILES.items():
+        for i in range(per_profile):
+            rows.append({
+                "candidate_name": f"{profile}-{i}",
+                "overall_score": rng.randint(20, 95),
+                "fit": "Mid Fit",
+                "skill_mask": skills_to_mask(skills if i % 4 else skills[:-1]),
+                "resume_text": text,
+                "profile": profile,
+            })
+    rng.shuffle(rows)
+    return rows
+
+
+def test_segments_recover_profiles():
+    rows = make_pool(20)
+    result = cluster_pool(rows, n_clusters=3)
+    assert sorted(c["size"] for c in result["clusters"]) == [20, 20, 20]
+    for cluster in result["clusters"]:
+        profiles = {rows[i]["profile"] for i in cluster["members"]}
+        assert len(profiles) == 1
+        expected = PROFILES[profiles.pop()][0]
+        assert {name for name, _ in cluster["skills"]} == set(expected)
+        scores = [rows[i]["overall_score"] for i in cluster["members"]]
+        assert scores == sorted(scores, reverse=True)
+        assert cluster["score_max"] == scores[0] and cluster["score_min"] == scores[-1]
+
+
+def test_features_and_limits():
+    rows = make_pool(2)
+    features = candidate_features(rows)
+    assert features.shape[0] == 6 and features.max() <= 1
+    assert auto_cluster_count(10) == 2 and auto_cluster_count(100000) == 10
+    with pytest.raises(ValueError):
+        cluster_pool(rows[:1])
+    assert len(cluster_pool(rows[:2], n_clusters=5)["clusters"]) <= 2
@@ -0,0 +1,91 @@
+"""
+Test the stored resume metadata index
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from utils import resume_index
+from utils.resume_index import refresh_index, query_index, record_scores, delete_resume, load_index
+
+TEST_RESUMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_resumes")
+
+
+@pytest.fixture
+def resumes(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_index, "INDEX_DIR", str(tmp_path / "data"))
+    resume_index._index_cache.clear()
+    folder = tmp_path / "resumes"
+    folder.mkdir()
+    for name in ("entry_level.txt", "senior_level.txt"):
+        with open(os.path.join(TEST_RESUMES, name), "rb") as f:
+            (folder / name).write_bytes(f.read())
+    # An identical copy under another name
+    (folder / "senior_copy.txt").write_bytes((folder / "senior_level.txt").read_bytes())
+    (folder / "notes.md").write_text("not a resume")
+    yield str(folder)
+    resume_index._index_cache.clear()
+
+
+def test_refresh_and_query(resumes):
+    entries = refresh_index(resumes)
+    assert sorted(entries) == ["entry_level.txt", "senior_copy.txt", "senior_level.txt"]
+    assert entries["senior_copy.txt"]["hash"] == entries["senior_level.txt"]["hash"]
+    skills = entries["senior_level.txt"]["top_skills"]
+    assert 0 < len(skills) <= resume_index.TOP_SKILLS_COUNT
+    assert query_index(entries, skill=skills[0].upper())[1] >= 2
+
+    rows, total = query_index(entries, search="SENIOR", sort_by="name", descending=False)
+    assert total == 2 and [r["name"] for r in rows] == ["senior_copy.txt", "senior_level.txt"]
+    rows, total = query_index(entries, sort_by="name", descending=False, page=2, page_size=2)
+    assert total == 3 and [r["name"] for r in rows] == ["senior_level.txt"]
+
+    # A new file is picked up on the next scan
+    with open(os.path.join(resumes, "new.txt"), "w") as f:
+        f.write("Python and SQL developer")
+    assert "new.txt" in refresh_index(resumes)
+
+
+def test_file_overwritten_in_place(resumes, monkeypatch):
+    entries = refresh_index(resumes)
+    record_scores(resumes, [{"hash": entries["entry_level.txt"]["hash"], "overall_score": 55}])
+    folder_mtime = os.stat(resumes).st_mtime_ns
+
+    # Unchanged files are not read again
+    reads = []
+    top_skills = resume_index._top_skills
+    monkeypatch.setattr(resume_index, "_top_skills", lambda path, name: reads.append(name) or top_skills(path, name))
+    assert refresh_index(resumes) == refresh_index(resumes) and reads == []
+
+    # Rewriting a file does not touch the folder mtime, but the entry is refreshed
+    path = os.path.join(resumes, "entry_level.txt")
+    with open(path, "w") as f:
+        f.write("Rust engineer")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+    assert os.stat(resumes).st_mtime_ns == folder_mtime
+
+    entry = refresh_index(resumes)["entry_level.txt"]
+    assert reads == ["entry_level.txt"]
+    assert entry["hash"] != entries["entry_level.txt"]["hash"] and entry["size"] == len("Rust engineer")
+    assert entry["last_score"] is None
+
+
+def test_scores_and_delete(resumes):
+    entries = refresh_index(resumes)
+    senior_hash = entries["senior_level.txt"]["hash"]
+    assert record_scores(resumes, [{"hash": senior_hash, "overall_score": 81.5}, {"hash": "other"}]) == 2
+
+    entries = refresh_index(resumes)
+    rows, _ = query_index(entries, sort_by="last_score")
+    assert [r["last_score"] for r in rows] == [81.5, 81.5, None]
+
+    delete_resume(resumes, "senior_copy.txt")
+    assert not os.path.exists(os.path.join(resumes, "senior_copy.txt"))
+    assert "senior_copy.txt" not in load_index(resumes)["entries"]
+    # The index stays in step with the folder, so the next refresh does not rescan
+    assert sorted(refresh_index(resumes)) == ["entry_level.txt", "senior_level.txt"]
+    assert refresh_index(resumes)["senior_level.txt"]["last_score"] == 81.5
@@ -0,0 +1,73 @@
+"""
+Test isolated resume extraction: page cap, failure reasons and quarantine
+"""
+
+import os
+import sys
+import threading
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from reportlab.pdfgen import canvas
+
+from utils.safe_extract import ExtractionPool, ExtractionError, extract_text_isolated, load_quarantine
+
+
+def _pdf(pages):
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for page in range(pages):
+        pdf.drawString(72, 720, f"Page {page + 1} Python developer")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ExtractionPool(workers=1, max_pages=3, quarantine_path=str(tmp_path / "quarantine.json"))
+    yield pool
+    pool.close()
+
+
+def test_long_pdf_is_truncated(pool):
+    result = pool.extract("long.pdf", _pdf(10))
+    assert result["status"] == "ok" and result["truncated"]
+    assert "Page 3" in result["text"] and "Page 4" not in result["text"]
+
+
+def test_unreadable_file_reports_reason(pool):
+    with pytest.raises(ExtractionError) as excinfo:
+        extract_text_isolated("broken.pdf", b"%PDF-1.4 not really a pdf", pool)
+    assert excinfo.value.status == "failed"
+    assert "unreadable file" in str(excinfo.value)
+
+
+def test_timeout_quarantines_file(pool):
+    content = _pdf(2)
+    result = pool.extract("slow.pdf", content, timeout=0)
+    assert result["status"] == "timeout"
+    assert [entry["filename"] for entry in load_quarantine(pool.quarantine_path).values()] == ["slow.pdf"]
+
+    # Skipped without starting a worker from now on
+    assert pool.extract("renamed.pdf", content)["status"] == "quarantined"
+
+
+def test_waiting_for_a_worker_is_not_a_timeout(tmp_path):
+    pool = ExtractionPool(workers=1, timeout=1, queue_timeout=0.2, quarantine_path=str(tmp_path / "q.json"))
+    try:
+        # Another document holds the only worker for longer than the wait limit
+        busy = pool._acquire()
+        result = pool.extract("queued.pdf", _pdf(1))
+        assert result["status"] == "busy" and "busy" in result["error"]
+
+        # Held for longer than the parse timeout: the queued file still gets its full timeout
+        pool.queue_timeout = 5
+        threading.Timer(1.5, pool._release, args=(busy,)).start()
+        result = pool.extract("queued.pdf", _pdf(1))
+        assert result["status"] == "ok" and result["elapsed_ms"] > 1000
+        assert load_quarantine(pool.quarantine_path) == {}
+    finally:
+        pool.close()
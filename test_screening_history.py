@@ -0,0 +1,143 @@
+"""
+Test the historical screening store and its aggregates
+"""
+
+import os
+import sys
+import time
+import random
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+import pytest
+
+from utils import screening_history
+from utils.extract import skills_to_mask
+from utils.screening_history import (
+    record_screening, import_excel_reports, clear_history, period_start, connect,
+    get_totals, get_daily_summary, get_jd_summary, get_skill_summary, get_skill_gaps, get_skill_trends,
+    get_recent_screenings
+)
+
+JD = "Backend Engineer\nPython, SQL and Docker experience."
+
+
+def row(name, score, skills, ats=None, fit="Mid Fit"):
+    return {"candidate_name": name, "hash": name, "overall_score": score, "ats_score": ats, "fit": fit,
+            "skill_mask": skills_to_mask(skills)}
+
+
+def test_records_roll_up_by_day_jd_and_skill(tmp_path):
+    db = str(tmp_path / "history.db")
+    day1 = datetime(2026, 3, 2, 10)
+    rows = [row("a", 80, ["python", "sql"], 90, "Strongly Fit"), row("b", 40, ["java"], None, "Low Fit")]
+    assert record_screening(JD, rows, "bulk", day1, db) == 2
+    assert record_screening(JD, rows, "bulk", day1, db) == 0          # same resumes, same JD, same day
+    assert record_screening(JD, rows[:1], "job", day1 + timedelta(days=1), db) == 1
+    assert record_screening("Frontend\nReact", [row("c", 60, ["react"])], "bulk", day1, db) == 1
+
+    totals = get_totals(db_path=db)
+    assert (totals["candidates"], totals["jds"], totals["days"]) == (4, 2, 2)
+    assert totals["avg_score"] == 65.0 and totals["avg_ats"] == 90.0
+    assert totals["fit_distribution"] == {"Strongly Fit": 2, "Mid Fit": 1, "Low Fit": 1}
+
+    backend = get_jd_summary(db_path=db)[0]
+    assert (backend["title"], backend["candidates"], backend["avg_score"]) == ("Backend Engineer", 3, 66.7)
+    daily = get_daily_summary(db_path=db, jd_id=backend["jd_id"])
+    assert [(d["day"], d["candidates"]) for d in daily] == [("2026-03-02", 2), ("2026-03-03", 1)]
+    assert get_totals(date(2026, 3, 3), db_path=db)["candidates"] == 1
+
+    skills = {s["skill"]: (s["present"], s["missing"]) for s in get_skill_summary(db_path=db)}
+    assert skills["python"] == (2, 1) and skills["sql"] == (2, 1) and skills["java"] == (1, 0)
+    assert get_recent_screenings(limit=1, db_path=db)[0]["candidate_name"] == "c"
+
+    clear_history(db)
+    assert get_totals(db_path=db)["candidates"] == 0
+
+
+def test_skill_demand_gaps_and_trends(tmp_path):
+    db = str(tmp_path / "history.db")
+    monday = datetime(2026, 3, 2, 9)
+    data = "Data role\nPython and SQL"
+    record_screening(data, [row("a", 80, ["python"]), row("b", 50, ["java"])], "bulk", monday, db)
+    record_screening(data, [row("c", 70, ["python", "sql"])], "bulk", monday + timedelta(days=8), db)
+    record_screening("Analyst\nSQL", [row("d", 60, ["python"])], "bulk", monday + timedelta(days=9), db)
+
+    gaps = {g["skill"]: g for g in get_skill_gaps(db_path=db)}
+    assert list(gaps) == ["sql", "python"]
+    assert (gaps["sql"]["jds"], gaps["sql"]["demanded"], gaps["sql"]["supplied"], gaps["sql"]["missing"]) == (2, 4, 1, 3)
+    assert gaps["sql"]["missing_rate"] == 75.0
+    assert (gaps["python"]["jds"], gaps["python"]["supplied"], gaps["python"]["missing"]) == (1, 2, 1)
+
+    weekly = get_skill_trends(["sql", "python"], bucket="week", db_path=db)
+    assert [(t["bucket"], t["skill"], t["demanded"], t["missing"]) for t in weekly] == [
+        ("2026-03-02", "python", 2, 1), ("2026-03-02", "sql", 2, 2),
+        ("2026-03-09", "python", 1, 0), ("2026-03-09", "sql", 2, 1)]
+    assert len(get_skill_trends(bucket="month", db_path=db)) == len(get_skill_summary(db_path=db))
+    with pytest.raises(ValueError):
+        get_skill_trends(bucket="year", db_path=db)
+
+    # A store written before demand was counted gets it rebuilt from its records
+    expected = get_skill_summary(db_path=db)
+    conn = connect(db)
+    conn.execute("ALTER TABLE daily_skills DROP COLUMN demanded")
+    conn.close()
+    screening_history._initialized.clear()
+    assert get_skill_summary(db_path=db) == expected
+
+
+def test_skill_gaps_compare_supply_within_demand(tmp_path):
+    db = str(tmp_path / "history.db")
+    day = datetime(2026, 3, 2, 9)
+    # Python is asked for once and that candidate lacks it; SQL-only screenings are full of Python
+    record_screening("Data role\nPython", [row("a", 40, ["sql"])], "bulk", day, db)
+    record_screening("Analyst\nSQL", [row(f"s{i}", 70, ["python", "sql"]) for i in range(5)], "bulk", day, db)
+
+    gaps = get_skill_gaps(db_path=db)
+    assert [g["skill"] for g in gaps] == ["python", "sql"]
+    assert (gaps[0]["demanded"], gaps[0]["supplied"], gaps[0]["missing"], gaps[0]["missing_rate"]) == (1, 0, 1, 100.0)
+    assert (gaps[1]["demanded"], gaps[1]["supplied"], gaps[1]["missing"]) == (5, 5, 0)
+    assert get_skill_summary(db_path=db)[0]["present"] == 5       # python overall, across both JDs
+
+
+def test_year_of_history_queries_fast(tmp_path):
+    db = str(tmp_path / "history.db")
+    rng = random.Random(5)
+    start = datetime(2025, 1, 1, 9)
+    skills = ["python", "sql", "java", "react", "html", "css", "machine learning"]
+    for day in range(365):
+        jd = f"Role {day % 6}\nPython SQL React"
+        rows = [row(f"d{day}-{i}", rng.randint(0, 100), rng.sample(skills, 3), rng.randint(40, 100))
+                for i in range(40)]
+        record_screening(jd, rows, "bulk", start + timedelta(days=day), db)
+
+    begin = time.perf_counter()
+    since, until = date(2025, 1, 1), date(2025, 12, 31)
+    assert get_totals(since, until, db)["candidates"] == 365 * 40
+    assert len(get_daily_summary(since, until, db_path=db)) == 365
+    assert len(get_jd_summary(since, until, db_path=db)) == 6
+    assert get_skill_summary(since, until, db_path=db)[0]["missing"] > 0
+    assert get_skill_gaps(since, until, db_path=db)[0]["demanded"] == 365 * 40
+    assert len(get_skill_trends(["python", "sql"], since, until, "week", db)) == 53 * 2
+    assert time.perf_counter() - begin < 0.5
+    assert period_start(7, date(2026, 1, 10)) == date(2026, 1, 4) and period_start(None) is None
+
+
+def test_old_excel_reports_are_imported_once(tmp_path):
+    db, reports = str(tmp_path / "history.db"), tmp_path / "admin_reports"
+    reports.mkdir()
+    pd.DataFrame([
+        {"Rank": 1, "Candidate Name": "x", "Overall Score": 70, "ATS Score": 80, "Fit Level": "Mid Fit"},
+        {"Rank": 2, "Candidate Name": "y", "Overall Score": 30, "ATS Score": None, "Fit Level": "Low Fit"},
+    ]).to_excel(reports / "screening_report_bulk_20250110_120000.xlsx", index=False)
+    pd.DataFrame([{"Candidate Name": "z", "Overall Score": 50, "Fit Level": "Mid Fit"}]).to_excel(
+        reports / f"screening_report_auto_{datetime.now() + timedelta(hours=1):%Y%m%d_%H%M%S}.xlsx", index=False)
+
+    assert import_excel_reports(str(reports), db) == 2
+    assert import_excel_reports(str(reports), db) == 0
+    totals = get_totals(db_path=db)
+    assert totals["fit_distribution"] == {"Strongly Fit": 0, "Mid Fit": 1, "Low Fit": 1}
+    assert get_jd_summary(db_path=db)[0]["first_day"] == "2025-01-10"
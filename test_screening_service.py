@@ -0,0 +1,70 @@
+"""
+Test the screening service and its client
+"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from screening_service import create_server
+from utils.screening_client import ScreeningClient, ScreeningServiceError
+from utils.shared_spool import spool_dir
+
+TEST_RESUMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_resumes")
+JD = "Senior Python developer with Django, SQL, AWS and Docker. 5+ years experience."
+
+
+def _files():
+    files = []
+    for name in ("entry_level.txt", "senior_level.txt"):
+        with open(os.path.join(TEST_RESUMES, name), "rb") as f:
+            files.append({"name": name, "content": f.read()})
+    return files
+
+
+def test_service_endpoints():
+    server = create_server(port=0, workers=1, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = ScreeningClient(f"http://127.0.0.1:{server.server_address[1]}")
+        assert client.is_available()
+
+        files = _files()
+        response = client.screen_bulk(JD, files + [{"name": "broken.pdf", "content": b"%PDF-1.4 not a pdf"}])
+        ranked = response["results"]
+        assert [f["name"] for f in response["failed"]] == ["broken.pdf"]
+        assert [row["original_filename"] for row in ranked] == ["senior_level.txt", "entry_level.txt"]
+        assert "file_content" not in ranked[0]
+
+        single = client.screen(files[1]["content"].decode("utf-8"), JD)
+        assert single["success"] and single["final_score"] == ranked[0]["overall_score"]
+
+        multi = client.screen_multi_jd(files, [{"title": "Backend", "text": JD}, {"title": "Design", "text": "Figma"}])
+        assert [len(r["scores"]) for r in multi] == [2, 2]
+
+        # Remote-style base64 uploads rank the same as shared spool references
+        uploaded = ScreeningClient(client.base_url, shared_spool=False).screen_bulk(JD, files)["results"]
+        assert [row["overall_score"] for row in uploaded] == [row["overall_score"] for row in ranked]
+        assert not [n for n in os.listdir(spool_dir()) if n.startswith("batch-")]
+
+        outside = {"path": os.path.join(TEST_RESUMES, "senior_level.txt"), "offset": 0, "length": 10}
+        try:
+            client._request("POST", "/screen/bulk", {"job_description": JD,
+                                                     "resumes": [{"name": "x.txt", "ref": outside}]})
+        except ScreeningServiceError as e:
+            assert "shared spool" in str(e)
+        else:
+            raise AssertionError("references outside the spool must be rejected")
+
+        try:
+            client.screen("", JD)
+        except ScreeningServiceError:
+            pass
+        else:
+            raise AssertionError("empty resume text should be rejected")
+    finally:
+        server.shutdown()
+        server.server_close()
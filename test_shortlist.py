@@ -0,0 +1,64 @@
+"""
+Test skill bitmasks and the covering shortlist builder
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.extract import SKILLS_DB, extract_skills, skills_to_mask, mask_to_skills, match_job_skills
+from utils.analyzer import analyze_resume
+from utils.shortlist import build_shortlist, shortlist_rows
+
+JD = "Python developer with Django, SQL, AWS, Docker and React experience."
+
+
+def test_masks_round_trip_and_match_set_semantics():
+    skills = extract_skills(JD)
+    assert mask_to_skills(skills_to_mask(skills)) == skills
+    assert skills_to_mask(["not-a-skill"]) == 0
+
+    resume = "Built Django REST APIs in Python on AWS. 4 years experience."
+    analysis = analyze_resume(resume, JD)
+    resume_skills = extract_skills(resume)
+    assert analysis["matched_skills"] == sorted(set(resume_skills) & set(skills))
+    assert analysis["missing_skills"] == sorted(set(skills) - set(resume_skills))
+    assert match_job_skills(resume_skills, JD) == len(analysis["matched_skills"]) / len(skills) * 100
+
+
+def test_greedy_cover_prefers_new_skills_then_score():
+    a, b, c, d = 1, 2, 4, 8
+    masks = [a | b, a | b, c, a | b | c, d]
+    scores = [60, 90, 95, 50, 10]
+    result = build_shortlist(masks, scores, a | b | c | d)
+    assert result["picks"] == [3, 4] and result["missing"] == 0
+
+    # Same gain: the higher score wins
+    result = build_shortlist(masks[:3], scores[:3], a | b | c)
+    assert result["picks"] == [1, 2]
+
+    assert build_shortlist(masks, scores, a | b | c | d, max_size=1)["missing"] == d
+    # A rare skill weighted up is taken first
+    assert build_shortlist(masks, scores, a | b | c | d, skill_weights={list(SKILLS_DB)[3]: 5})["picks"][0] == 4
+
+
+def test_shortlist_rows_covers_jd_fast():
+    rng = random.Random(7)
+    skills = list(SKILLS_DB)
+    rows = [
+        {"candidate_name": f"c{i}", "overall_score": rng.randint(0, 100),
+         "skill_mask": skills_to_mask(rng.sample(skills, rng.randint(1, 6)))}
+        for i in range(5000)
+    ]
+    start = time.perf_counter()
+    shortlist = shortlist_rows(rows, JD)
+    assert time.perf_counter() - start < 0.5
+    assert shortlist["covered_skills"] == shortlist["jd_skills"] and not shortlist["missing_skills"]
+    covered = [s for entry in shortlist["slate"] for s in entry["new_skills"]]
+    assert sorted(covered) == shortlist["jd_skills"]
+
+    # Rows without a stored mask fall back to their text
+    assert shortlist_rows([{"candidate_name": "x", "overall_score": 1, "resume_text": JD}], JD)["missing_skills"] == []
@@ -0,0 +1,85 @@
+"""
+Test the persisted candidate similarity index
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+
+from utils import similarity_index
+from utils.similarity_index import add_documents, add_rows, query_similar, compact_index, load_index
+
+TEST_RESUMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_resumes")
+
+DOCS = [
+    ("frontend", "React JavaScript TypeScript HTML CSS frontend developer building web interfaces"),
+    ("data", "Python pandas machine learning SQL data scientist building models and dashboards"),
+    ("devops", "Docker Kubernetes AWS Terraform devops engineer running cloud infrastructure"),
+    ("data2", "Data analyst with Python, SQL, pandas and machine learning; reporting dashboards"),
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    similarity_index._cache.clear()
+    yield
+    similarity_index._cache.clear()
+
+
+def test_nearest_neighbours_and_persistence(tmp_path):
+    index_dir = str(tmp_path / "sim")
+    assert add_documents([{"id": doc_id, "text": text, "name": doc_id} for doc_id, text in DOCS], index_dir) == 4
+    assert add_documents([{"id": "data", "text": "again"}], index_dir) == 0
+
+    similar = query_similar(dict(DOCS)["data"], k=2, exclude_id="data", index_dir=index_dir)
+    assert similar[0]["id"] == "data2"
+    assert [doc["id"] for doc in similar].count("data") == 0
+    assert 0 < similar[0]["similarity"] <= 100
+
+    # A fresh process sees the same index
+    similarity_index._cache.clear()
+    assert query_similar(dict(DOCS)["devops"], k=1, index_dir=index_dir)[0]["id"] == "devops"
+
+
+def test_incremental_segments_are_merged(tmp_path, monkeypatch):
+    monkeypatch.setattr(similarity_index, "MAX_SEGMENTS", 3)
+    index_dir = str(tmp_path / "sim")
+    for doc_id, text in DOCS:
+        add_documents([{"id": doc_id, "text": text}], index_dir)
+        query_similar(text, k=1, index_dir=index_dir)   # warm cache goes stale on each add
+    assert len(similarity_index._segment_names(index_dir)) <= 3
+    assert set(load_index(index_dir)["ids"]) == {doc_id for doc_id, _ in DOCS}
+
+    assert compact_index(index_dir, merge_all=True) == 1
+    assert query_similar(dict(DOCS)["frontend"], k=1, index_dir=index_dir)[0]["id"] == "frontend"
+
+
+def test_screened_rows_are_indexed(tmp_path):
+    from utils.screening import screen_resume_path
+
+    index_dir = str(tmp_path / "sim")
+    rows = [screen_resume_path("Python developer", os.path.join(TEST_RESUMES, name))
+            for name in ("entry_level.txt", "senior_level.txt")]
+    assert add_rows(rows, index_dir=index_dir) == 2
+
+    similar = query_similar(rows[1]["resume_text"], rows[1]["skill_mask"], k=5, exclude_id=rows[1]["hash"],
+                            index_dir=index_dir)
+    assert [doc["name"] for doc in similar] == ["entry_level"]
+    assert similar[0]["source"] == "screened"
+
+
+def test_documents_without_terms(tmp_path):
+    index_dir = str(tmp_path / "sim")
+    docs = [{"id": "a", "text": "python developer building data pipelines"}, {"id": "b", "text": "the and of"}]
+    assert add_documents(docs, index_dir) == 1
+    assert [doc["id"] for doc in query_similar("python pipelines", k=5, index_dir=index_dir)] == ["a"]
+    assert query_similar("of the", skill_mask=0, k=5, index_dir=index_dir) == []
+
+    # A segment written with an empty trailing row still weighs and queries
+    counts = similarity_index._term_counts(["python developer", "the and of"])
+    weighted = similarity_index._weigh(counts, similarity_index._idf(counts))
+    assert np.allclose(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel(), [1, 0])
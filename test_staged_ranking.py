@@ -0,0 +1,96 @@
+"""
+Test staged ranking: quick score for everyone, costly stages for the best
+"""
+
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import staged_ranking
+from utils.checkpoints import CheckpointStore
+from utils.screening import screen_upload, screen_upload_quick, screen_uploads
+from utils.staged_ranking import run_stages, stage_candidates, ensure_stages, row_stages
+
+TEST_RESUMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_resumes")
+JD = "Senior Python developer with Django, SQL, AWS and Docker. 5+ years experience."
+
+
+def read_resume(name):
+    with open(os.path.join(TEST_RESUMES, name), "rb") as f:
+        return f.read()
+
+
+def named(name, content):
+    resume_file = BytesIO(content)
+    resume_file.name = name
+    return resume_file
+
+
+def fake_pool(scores):
+    return [{"overall_score": s, "resume_text": "Python developer, 2019 - 2023", "stages": ["score"]} for s in scores]
+
+
+def test_quick_score_matches_full_screen():
+    content = read_resume("senior_level.txt")
+    quick = screen_upload_quick(JD, "senior_level.txt", content)
+    full = screen_upload(JD, "senior_level.txt", content)
+    for key in ("overall_score", "skill_match", "exp_match", "fit", "email", "hash"):
+        assert quick[key] == full[key]
+    assert quick["ats_score"] is None and quick["stages"] == ["score"]
+
+    ensure_stages(quick, JD, ["ats", "timeline"])
+    assert quick["ats_details"] == full["ats_details"]
+    assert quick["timeline_events"] == full["timeline_events"]
+    assert row_stages(full) == ["score", "ats", "timeline"]
+
+
+def test_stages_admit_top_k_or_threshold_within_budget():
+    ranked = fake_pool([90, 80, 70, 60, 50, 40, 30])
+    assert stage_candidates(ranked, 2, None) == [0, 1]
+    assert stage_candidates(ranked, 2, 60) == [0, 1, 2, 3]
+    assert stage_candidates(ranked, None, None) == []
+
+    stages = {"ats": {"top_k": 5, "min_score": None}, "predictions": {"top_k": 3, "min_score": None}}
+    summary = run_stages(JD, ranked, stages)
+    assert summary["stages"]["ats"]["run"] == 5 and summary["stages"]["predictions"]["run"] == 3
+    assert not summary["out_of_time"] and summary["seconds"] >= 0
+    assert all(r["ats_score"] is not None for r in ranked[:5]) and "ats_score" not in ranked[5]
+    assert "growth_score" in ranked[2] and "growth_score" not in ranked[3]
+
+    # Stages already applied are not run again
+    again = run_stages(JD, ranked, dict(stages, predictions={"top_k": 4, "min_score": None}))
+    assert again["stages"]["ats"]["run"] == 0 and again["stages"]["predictions"]["run"] == 1
+
+
+def test_budget_is_measured_time(monkeypatch):
+    def slow_ats(row, job_desc, context):
+        time.sleep(0.05)
+        row["ats_score"] = 1
+    monkeypatch.setitem(staged_ranking.STAGE_RUNNERS, "ats", slow_ats)
+
+    ranked = fake_pool([90, 80, 70, 60, 50, 40])
+    stages = {"ats": {"top_k": 6, "min_score": None}, "predictions": {"top_k": 6, "min_score": None}}
+    summary = run_stages(JD, ranked, stages, budget=0.12)
+    assert summary["out_of_time"] and 1 <= summary["stages"]["ats"]["run"] < 6
+    assert summary["stages"]["predictions"]["run"] == 0
+    # No row is started after the budget, so the overshoot is at most one row
+    assert 0.12 <= summary["seconds"] < 0.12 + 0.05 + 0.05
+
+
+def test_staged_bulk_screen_checkpoints_later_stages(tmp_path):
+    files = [("entry.txt", read_resume("entry_level.txt")), ("senior.txt", read_resume("senior_level.txt"))]
+    stages = {"ats": {"top_k": 1, "min_score": None}}
+
+    with CheckpointStore.for_screen(JD, "quick", db_path=str(tmp_path / "ck.db")) as checkpoints:
+        response = screen_uploads(JD, [named(n, c) for n, c in files], checkpoints, stages)
+        best, rest = response["results"]
+        assert best["ats_score"] is not None and rest["ats_score"] is None
+        ats = response["stage_summary"]["stages"]["ats"]
+        assert (ats["admitted"], ats["run"]) == (1, 1)
+
+        rerun = screen_uploads(JD, [named(n, c) for n, c in files], checkpoints, stages)
+        assert rerun["stage_summary"]["stages"]["ats"]["run"] == 0
+        assert rerun["results"][0]["ats_score"] == best["ats_score"]
@@ -0,0 +1,16 @@
+"""
+Startup budget check for app.py
+Fails when the landing page starts importing dashboard-only modules again
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from startup_budget import measure_startup, check_budget
+
+
+def test_app_startup_within_budget():
+    report = measure_startup()
+    # Generous budget here: timing varies on CI machines, the module check does not
+    assert check_budget(report, budget_ms=500) == []
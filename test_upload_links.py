@@ -0,0 +1,71 @@
+"""
+Test the SQLite upload-link store
+"""
+
+import os
+import sys
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from utils import upload_links
+from utils.upload_links import UploadLinkError, create_link, get_link, submit_resume, list_submissions
+
+LEGACY_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "upload_links", "upload_links.json")
+FIELDS = {"name": "Sarah Johnson", "email": "sarah@example.com", "phone": "555-123-4567"}
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    shutil.copy(LEGACY_JSON, tmp_path / "upload_links.json")
+    with open(LEGACY_JSON) as f:
+        legacy = json.load(f)
+
+    links = upload_links.list_links(db_path=str(tmp_path / "upload_links.db"))
+    assert {link["token_hash"] for link in links} == set(legacy)
+    assert not (tmp_path / "upload_links.json").exists()
+    assert (tmp_path / "upload_links.json.migrated").exists()
+
+
+def test_submissions_respect_required_fields_and_expiry(tmp_path):
+    db = str(tmp_path / "links.db")
+    link, token = create_link("rec@example.com", "Backend", "Python, Django", max_resumes=3, db_path=db)
+    assert get_link(token, db)["id"] == link["id"]
+    assert get_link("not-a-token", db) is None
+
+    with pytest.raises(UploadLinkError, match="phone"):
+        submit_resume(token, {"name": "A", "email": "a@example.com"}, "cv.txt", b"Python", db)
+
+    submission = submit_resume(token, FIELDS, "../cv.txt", b"Python developer", db)
+    assert submission["filename"] == "cv.txt" and os.path.exists(submission["file_path"])
+    assert get_link(token, db)["resume_count"] == 1
+
+    conn = upload_links.connect(db)
+    conn.execute("UPDATE links SET expires_at = '2000-01-01T00:00:00' WHERE id = ?", (link["id"],))
+    conn.close()
+    with pytest.raises(UploadLinkError, match="expired"):
+        submit_resume(token, FIELDS, "cv.txt", b"Python", db)
+    assert upload_links.expire_links(db) == 1
+
+
+def test_concurrent_submissions_never_exceed_the_limit(tmp_path):
+    db = str(tmp_path / "links.db")
+    link, token = create_link("rec@example.com", "Backend", "Python, Django", max_resumes=5, db_path=db)
+
+    def submit(i):
+        try:
+            submit_resume(token, FIELDS, f"cv{i}.txt", b"Python developer %d" % i, db)
+            return True
+        except UploadLinkError:
+            return False
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        accepted = sum(pool.map(submit, range(20)))
+
+    assert accepted == 5
+    assert get_link(token, db)["resume_count"] == 5
+    assert len(list_submissions(link["id"], db_path=db)) == 5
+    assert len(os.listdir(link["uploads_folder"])) == 5
@@ -0,0 +1,51 @@
+"""
+Test the content-addressed upload spool
+"""
+
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.screening import get_file_hash
+from utils.upload_spool import spool_upload, iter_spooled, spooled_path, prune_upload_spool
+
+
+def _upload(name, content):
+    upload = BytesIO(content)
+    upload.name = name
+    return upload
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    spool = str(tmp_path / "spool")
+    content = b"Python developer " * 200_000   # several chunks
+
+    first = spool_upload(_upload("cv.txt", content), spool)
+    renamed = spool_upload(_upload("cv (1).txt", content), spool)
+
+    assert first["hash"] == renamed["hash"] == get_file_hash(content)
+    assert first["size"] == len(content)
+    stored = [f for _, _, files in os.walk(spool) for f in files]
+    assert stored == [first["hash"]]
+
+    loaded = list(iter_spooled([first, renamed], spool))
+    assert [f.name for f in loaded] == ["cv.txt", "cv (1).txt"]
+    assert loaded[1].getvalue() == content
+
+
+def test_prune_keeps_recent_and_pinned_files(tmp_path):
+    spool = str(tmp_path / "spool")
+    old = spool_upload(_upload("old.txt", b"old"), spool)
+    pinned = spool_upload(_upload("pinned.txt", b"pinned"), spool)
+    fresh = spool_upload(_upload("fresh.txt", b"fresh"), spool)
+    long_ago = time.time() - 30 * 86400
+    for handle in (old, pinned):
+        os.utime(spooled_path(handle["hash"], spool), (long_ago, long_ago))
+
+    assert prune_upload_spool(7, keep={pinned["hash"]}, spool_dir=spool) == 1
+    assert not os.path.exists(spooled_path(old["hash"], spool))
+    assert os.path.exists(spooled_path(pinned["hash"], spool))
+    assert os.path.exists(spooled_path(fresh["hash"], spool))
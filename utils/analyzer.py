@@ -1,7 +1,7 @@
 # utils/analyzer.py
 # analyzer.py  (or existing analyzer file)
 
-from utils.extract import extract_skills
+from utils.extract import extract_skill_mask, mask_to_skills
 from utils.experience import estimate_experience_years, experience_percentage
 from utils.ranking import calculate_final_score
 
@@ -17,15 +17,15 @@ def analyze_resume(resume_text: str, jd_text: str) -> dict:
             "weaknesses": [],
         }
 
-    resume_skills = extract_skills(resume_text)
-    jd_skills = extract_skills(jd_text)
+    resume_mask = extract_skill_mask(resume_text)
+    jd_mask = extract_skill_mask(jd_text)
 
-    matched = sorted(list(set(resume_skills) & set(jd_skills)))
-    missing = sorted(list(set(jd_skills) - set(resume_skills)))
+    matched = mask_to_skills(resume_mask & jd_mask)
+    missing = mask_to_skills(jd_mask & ~resume_mask)
 
     # skill %, experience %, final combined %
-    if jd_skills:
-        skill_match_pct = (len(matched) / len(jd_skills)) * 100
+    if jd_mask:
+        skill_match_pct = (len(matched) / jd_mask.bit_count()) * 100
     else:
         skill_match_pct = 0
 
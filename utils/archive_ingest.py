@@ -0,0 +1,166 @@
+"""
+Archive Ingestion for RecruitNova
+Streams resumes out of .zip and .tar.gz archives (job board dumps) one member
+at a time. Nothing is extracted to disk: each member is decompressed into
+memory, handed to screening and dropped before the next one is read, so
+memory stays bounded by MAX_MEMBER_BYTES whatever the archive size.
+"""
+
+import os
+import zlib
+import tarfile
+import zipfile
+from typing import Dict, Any, Iterator, Optional
+
+ARCHIVE_FORMATS = ('.zip', '.tar.gz', '.tgz')
+MEMBER_FORMATS = ('.pdf', '.docx', '.txt')
+
+MAX_ARCHIVE_MEMBERS = 5000          # resumes read from one archive
+MAX_MEMBER_BYTES = 25 * 1024 * 1024  # larger members are skipped unread
+MAX_ARCHIVE_BYTES = 2 * 1024 ** 3    # total decompressed bytes per archive
+MAX_COMPRESSION_RATIO = 200          # zip members that claim more are treated as bombs
+
+
+class ArchiveError(Exception):
+    """The archive cannot be opened"""
+
+
+def is_archive(name: str) -> bool:
+    return name.lower().endswith(ARCHIVE_FORMATS)
+
+
+def _is_resume_member(path: str) -> bool:
+    base = os.path.basename(path)
+    return (
+        base.lower().endswith(MEMBER_FORMATS)
+        and not base.startswith(('.', '~$'))
+        and '__MACOSX/' not in path
+    )
+
+
+def _read_bounded(f, limit: int) -> Optional[bytes]:
+    """Up to limit bytes, or None when the member turns out to be larger"""
+    data = f.read(limit + 1)
+    return None if len(data) > limit else data
+
+
+def _member(path: str, content: Optional[bytes] = None, error: Optional[str] = None) -> Dict[str, Any]:
+    return {"name": os.path.basename(path), "member": path, "content": content, "error": error}
+
+
+def _iter_zip(fileobj, max_member_bytes: int) -> Iterator[Dict[str, Any]]:
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except (zipfile.BadZipFile, OSError) as e:
+        raise ArchiveError(f"not a readable zip archive: {e}")
+
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir() or not _is_resume_member(info.filename):
+                continue
+            if info.flag_bits & 0x1:
+                yield _member(info.filename, error="encrypted archive member")
+                continue
+            if info.file_size > max_member_bytes:
+                yield _member(info.filename, error=f"larger than {max_member_bytes // (1024 * 1024)} MB")
+                continue
+            if info.compress_size and info.file_size / info.compress_size > MAX_COMPRESSION_RATIO:
+                yield _member(info.filename, error="suspicious compression ratio")
+                continue
+            try:
+                # Header sizes can lie; the read itself is bounded as well
+                with archive.open(info) as f:
+                    content = _read_bounded(f, max_member_bytes)
+            except (zipfile.BadZipFile, OSError, RuntimeError, EOFError) as e:
+                yield _member(info.filename, error=f"unreadable member: {e}")
+                continue
+            if content is None:
+                yield _member(info.filename, error=f"larger than {max_member_bytes // (1024 * 1024)} MB")
+            else:
+                yield _member(info.filename, content)
+
+
+def _iter_tar(fileobj, archive_name: str, max_member_bytes: int) -> Iterator[Dict[str, Any]]:
+    try:
+        # Stream mode: a single forward pass, no seeking or member index
+        archive = tarfile.open(fileobj=fileobj, mode="r|*")
+    except (tarfile.TarError, OSError, EOFError) as e:
+        raise ArchiveError(f"not a readable tar archive: {e}")
+
+    with archive:
+        try:
+            for info in archive:
+                if not info.isfile() or not _is_resume_member(info.name):
+                    continue
+                if info.size > max_member_bytes:
+                    yield _member(info.name, error=f"larger than {max_member_bytes // (1024 * 1024)} MB")
+                    continue
+                content = _read_bounded(archive.extractfile(info), max_member_bytes)
+                if content is None:
+                    yield _member(info.name, error=f"larger than {max_member_bytes // (1024 * 1024)} MB")
+                else:
+                    yield _member(info.name, content)
+        except (tarfile.TarError, OSError, EOFError, zlib.error) as e:
+            yield _member(archive_name, error=f"archive truncated or corrupt: {e}")
+
+
+def iter_archive_members(
+    fileobj,
+    archive_name: str,
+    max_members: int = MAX_ARCHIVE_MEMBERS,
+    max_member_bytes: int = MAX_MEMBER_BYTES,
+    max_total_bytes: int = MAX_ARCHIVE_BYTES
+) -> Iterator[Dict[str, Any]]:
+    """
+    Resumes inside an archive, decompressed one at a time
+
+    Args:
+        fileobj: Binary file object of the archive (zip needs it seekable)
+        archive_name: Archive file name; its extension picks the format
+
+    Yields:
+        {"name", "member", "content", "error"} per resume member; content is
+        None when error says why the member was skipped. Other files,
+        folders and nested archives are ignored.
+
+    Raises:
+        ArchiveError when the archive itself cannot be opened
+    """
+    if archive_name.lower().endswith('.zip'):
+        members = _iter_zip(fileobj, max_member_bytes)
+    else:
+        members = _iter_tar(fileobj, archive_name, max_member_bytes)
+
+    count = 0
+    total = 0
+    for member in members:
+        if count >= max_members:
+            yield _member(archive_name, error=f"more than {max_members} resumes; the rest were skipped")
+            return
+        count += 1
+        if member["content"] is not None:
+            total += len(member["content"])
+            if total > max_total_bytes:
+                yield _member(archive_name, error=f"more than {max_total_bytes // 1024 ** 2} MB of resumes; the rest were skipped")
+                return
+        yield member
+
+
+def iter_archive_file(path: str, **limits) -> Iterator[Dict[str, Any]]:
+    """iter_archive_members for an archive on disk"""
+    with open(path, 'rb') as f:
+        yield from iter_archive_members(f, os.path.basename(path), **limits)
+
+
+def read_archive_member(path: str, member: str, max_member_bytes: int = MAX_MEMBER_BYTES) -> Optional[bytes]:
+    """Bytes of one member of an archive on disk (None if missing, unreadable or too large)"""
+    try:
+        if path.lower().endswith('.zip'):
+            with zipfile.ZipFile(path) as archive, archive.open(member) as f:
+                return _read_bounded(f, max_member_bytes)
+        for item in iter_archive_file(path, max_member_bytes=max_member_bytes):
+            if item["member"] == member:
+                return item["content"]
+    except (KeyError, ArchiveError, zipfile.BadZipFile, OSError):
+        pass
+    return None
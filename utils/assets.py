@@ -0,0 +1,101 @@
+"""
+Asset Layer for RecruitNova
+Serves small, cached data URIs for avatars and the logo instead of
+re-reading and base64-encoding the full images on every rerun
+"""
+
+import os
+import base64
+from typing import Dict, Optional, Tuple
+
+
+PROFILE_PICS_DIR = os.path.join("data", "profile_pics")
+THUMBS_DIR = os.path.join(PROFILE_PICS_DIR, "thumbs")
+
+PROFILE_PIC_SIZE = (300, 300)
+AVATAR_THUMB_SIZE = (96, 96)  # 2x the largest avatar box for sharp rendering
+LOGO_THUMB_SIZE = (64, 64)
+THUMB_QUALITY = 85
+
+# path -> (source mtime, data URI)
+_data_uri_cache: Dict[str, Tuple[float, str]] = {}
+
+
+def profile_pic_path(email: str) -> str:
+    return os.path.join(PROFILE_PICS_DIR, f"{email}.png")
+
+
+def avatar_thumb_path(email: str) -> str:
+    return os.path.join(THUMBS_DIR, f"{email}.jpg")
+
+
+def _write_thumbnail(img, path: str, size: Tuple[int, int]) -> None:
+    thumb = img.convert("RGB")
+    thumb.thumbnail(size)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    thumb.save(path, format="JPEG", quality=THUMB_QUALITY, optimize=True)
+
+
+def save_profile_picture(email: str, uploaded_file, size: Tuple[int, int] = PROFILE_PIC_SIZE) -> str:
+    """
+    Save an uploaded profile photo and its avatar thumbnail
+
+    Args:
+        email: User email (file key)
+        uploaded_file: File-like image upload
+        size: Size of the stored full picture
+
+    Returns:
+        Path of the saved full-size picture
+    """
+    from PIL import Image  # only needed when saving or (re)building thumbnails
+    img = Image.open(uploaded_file).convert("RGB")
+    img = img.resize(size)
+
+    save_path = profile_pic_path(email)
+    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    img.save(save_path, format="PNG")
+
+    _write_thumbnail(img, avatar_thumb_path(email), AVATAR_THUMB_SIZE)
+    return save_path
+
+
+def _cached_thumbnail_uri(source_path: str, thumb_path: str, size: Tuple[int, int]) -> Optional[str]:
+    """
+    Return a JPEG data URI for a thumbnail of source_path
+
+    The thumbnail is (re)built when missing or older than the source, and the
+    encoded URI is reused until the thumbnail file changes.
+    """
+    if not os.path.exists(source_path):
+        return None
+
+    source_mtime = os.path.getmtime(source_path)
+    if not os.path.exists(thumb_path) or os.path.getmtime(thumb_path) < source_mtime:
+        from PIL import Image
+        with Image.open(source_path) as img:
+            _write_thumbnail(img, thumb_path, size)
+
+    thumb_mtime = os.path.getmtime(thumb_path)
+    cached = _data_uri_cache.get(thumb_path)
+    if cached and cached[0] == thumb_mtime:
+        return cached[1]
+
+    with open(thumb_path, "rb") as f:
+        uri = "data:image/jpeg;base64," + base64.b64encode(f.read()).decode("utf-8")
+
+    _data_uri_cache[thumb_path] = (thumb_mtime, uri)
+    return uri
+
+
+def get_avatar_data_uri(email: str) -> Optional[str]:
+    """Data URI of the user's avatar thumbnail, or None if no photo was uploaded"""
+    if not email:
+        return None
+    return _cached_thumbnail_uri(profile_pic_path(email), avatar_thumb_path(email), AVATAR_THUMB_SIZE)
+
+
+def get_logo_data_uri(logo_path: str) -> Optional[str]:
+    """Data URI of a small navbar-sized copy of the logo"""
+    root, _ = os.path.splitext(logo_path)
+    return _cached_thumbnail_uri(logo_path, f"{root}_thumb.jpg", LOGO_THUMB_SIZE)
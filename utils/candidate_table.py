@@ -0,0 +1,327 @@
+"""
+Candidate Table for RecruitNova
+Columnar store for a screened pool: scores are float64 NumPy arrays, fit
+and experience level are int8 category codes, and short strings (names,
+emails, ...) are interned object arrays. Long per-candidate payloads
+(resume text, ATS details, timeline) stay in one small dict per row.
+
+The table still iterates as result rows (CandidateRow, a dict-like view
+onto one position), so code written for lists of dicts keeps working,
+while ranking, filtering, tables, charts and exports read the columns.
+Slices share the parent's arrays; masks and index lists share its
+storage and only hold the selected positions.
+"""
+
+import sys
+from collections.abc import MutableMapping
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.extract import SKILL_MASK_BYTES, pack_skill_masks, packed_to_mask
+
+
+SCORE_COLUMNS = (
+    "overall_score", "skill_match", "exp_match", "ats_score",
+    "exp_years", "growth_score", "performance_score",
+)
+MASK_COLUMNS = ("skill_mask",)
+CATEGORY_COLUMNS = {
+    "fit": ["Strongly Fit", "Mid Fit", "Low Fit"],
+    "experience_level": ["Fresher", "Entry-level", "Mid-level", "Senior"],
+    "ats_rating": [],
+}
+STRING_COLUMNS = ("candidate_name", "email", "contact", "skills", "hash", "original_filename")
+
+_COLUMN_KEYS = SCORE_COLUMNS + MASK_COLUMNS + tuple(CATEGORY_COLUMNS) + STRING_COLUMNS
+_COLUMN_KEY_SET = frozenset(_COLUMN_KEYS)
+_MISSING = object()
+_NUMBERS = (int, float, np.integer, np.floating)
+
+
+def _score_value(value: float) -> Optional[Union[int, float]]:
+    if np.isnan(value):
+        return None
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+class CandidateRow(MutableMapping):
+    """One candidate of a CandidateTable, read and written like a result dict"""
+
+    __slots__ = ("_table", "_pos")
+
+    def __init__(self, table: "CandidateTable", pos: int):
+        self._table = table
+        self._pos = pos
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._table._get(self._pos, key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._table._set(self._pos, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if self._table._get(self._pos, key) is _MISSING:
+            raise KeyError(key)
+        self._table._set(self._pos, key, _MISSING)
+
+    def __iter__(self) -> Iterator[str]:
+        return self._table._keys(self._pos)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CandidateRow):
+            return self._table._store is other._table._store and self._pos == other._pos
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"CandidateRow({self.get('candidate_name')!r})"
+
+
+class _Store:
+    """Column arrays shared by a table and all of its views"""
+
+    def __init__(self, n: int):
+        self.scores = {name: np.full(n, np.nan, dtype=np.float64) for name in SCORE_COLUMNS}
+        self.present = {name: np.zeros(n, dtype=bool) for name in SCORE_COLUMNS + MASK_COLUMNS}
+        self.masks = {name: np.zeros((n, SKILL_MASK_BYTES), dtype=np.uint8) for name in MASK_COLUMNS}
+        self.codes = {name: np.full(n, -1, dtype=np.int8) for name in CATEGORY_COLUMNS}
+        self.categories = {name: list(values) for name, values in CATEGORY_COLUMNS.items()}
+        self.strings = {name: np.full(n, _MISSING, dtype=object) for name in STRING_COLUMNS}
+        self.extras = [{} for _ in range(n)]
+
+    def code(self, name: str, value: Any) -> int:
+        categories = self.categories[name]
+        try:
+            return categories.index(value)
+        except ValueError:
+            if len(categories) >= 127:
+                raise ValueError(f"Too many distinct values for {name}")
+            categories.append(sys.intern(value) if isinstance(value, str) else value)
+            return len(categories) - 1
+
+
+class CandidateTable:
+    """
+    Columnar table of screened candidates
+
+    Build one with CandidateTable.from_rows(results). len(), iteration and
+    integer indexing give CandidateRow views; slices, where() and take()
+    give tables over the same storage.
+    """
+
+    def __init__(self, store: _Store, positions: Union[slice, np.ndarray]):
+        self._store = store
+        self._positions = positions
+
+    # ==================== BUILDING ====================
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "CandidateTable":
+        """
+        Build a table from result rows (dicts, or rows of another table)
+
+        Args:
+            rows: Screened result rows, in rank order
+
+        Returns:
+            CandidateTable holding every key of every row
+        """
+        rows = list(rows)
+        store = _Store(len(rows))
+        # Column keys are filled a column at a time; other keys go to the extras
+        store.extras = [
+            {key: value for key, value in row.items() if key not in _COLUMN_KEY_SET} for row in rows
+        ]
+        for name in _COLUMN_KEYS:
+            values = [row.get(name, _MISSING) for row in rows]
+            if name in store.scores:
+                kept = [value is None or isinstance(value, _NUMBERS) for value in values]
+                store.scores[name][:] = [value if isinstance(value, _NUMBERS) else np.nan for value in values]
+                store.present[name][:] = kept
+            elif name in store.masks:
+                kept = [isinstance(value, (int, np.integer)) for value in values]
+                store.masks[name][:] = pack_skill_masks(value if ok else 0 for value, ok in zip(values, kept))
+                store.present[name][:] = kept
+            elif name in store.codes:
+                kept = [isinstance(value, str) for value in values]
+                store.codes[name][:] = [store.code(name, value) if ok else -1 for value, ok in zip(values, kept)]
+            else:
+                kept = [isinstance(value, str) for value in values]
+                store.strings[name][:] = [sys.intern(value) if ok else _MISSING for value, ok in zip(values, kept)]
+            for pos, (value, ok) in enumerate(zip(values, kept)):
+                if not ok and value is not _MISSING:
+                    store.extras[pos][name] = value
+        return cls(store, slice(0, len(rows)))
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Plain dict copies of the rows (e.g. for JSON)"""
+        return [dict(row) for row in self]
+
+    # ==================== ROW ACCESS ====================
+
+    def _get(self, pos: int, key: str) -> Any:
+        store = self._store
+        if key in store.scores and store.present[key][pos]:
+            return _score_value(store.scores[key][pos])
+        if key in store.masks and store.present[key][pos]:
+            return packed_to_mask(store.masks[key][pos])
+        if key in store.codes and store.codes[key][pos] >= 0:
+            return store.categories[key][store.codes[key][pos]]
+        if key in store.strings and store.strings[key][pos] is not _MISSING:
+            return store.strings[key][pos]
+        # Keys without a column, and column keys holding a value of another type
+        return store.extras[pos].get(key, _MISSING)
+
+    def _set(self, pos: int, key: str, value: Any) -> None:
+        store = self._store
+        if store.extras[pos]:
+            store.extras[pos].pop(key, None)
+        if key in store.scores and (value is None or value is _MISSING or isinstance(value, _NUMBERS)):
+            store.scores[key][pos] = np.nan if value is None or value is _MISSING else value
+            store.present[key][pos] = value is not _MISSING
+        elif key in store.masks and (value is _MISSING or isinstance(value, (int, np.integer))):
+            store.masks[key][pos] = pack_skill_masks([0 if value is _MISSING else value])[0]
+            store.present[key][pos] = value is not _MISSING
+        elif key in store.codes and (value is _MISSING or isinstance(value, str)):
+            store.codes[key][pos] = -1 if value is _MISSING else store.code(key, value)
+        elif key in store.strings and (value is _MISSING or isinstance(value, str)):
+            store.strings[key][pos] = sys.intern(value) if isinstance(value, str) else value
+        else:
+            # A value of an unexpected type keeps its column slot empty and lives with the extras
+            if key in store.present:
+                store.present[key][pos] = False
+            elif key in store.codes:
+                store.codes[key][pos] = -1
+            elif key in store.strings:
+                store.strings[key][pos] = _MISSING
+            if value is not _MISSING:
+                store.extras[pos][key] = value
+
+    def _keys(self, pos: int) -> Iterator[str]:
+        store = self._store
+        for name in SCORE_COLUMNS + MASK_COLUMNS:
+            if store.present[name][pos]:
+                yield name
+        for name in store.codes:
+            if store.codes[name][pos] >= 0:
+                yield name
+        for name in STRING_COLUMNS:
+            if store.strings[name][pos] is not _MISSING:
+                yield name
+        yield from store.extras[pos]
+
+    def _base_positions(self) -> np.ndarray:
+        if isinstance(self._positions, slice):
+            return np.arange(len(self._store.extras))[self._positions]
+        return self._positions
+
+    def __len__(self) -> int:
+        if isinstance(self._positions, slice):
+            return len(range(*self._positions.indices(len(self._store.extras))))
+        return len(self._positions)
+
+    def __iter__(self) -> Iterator[CandidateRow]:
+        for pos in self._base_positions().tolist():
+            yield CandidateRow(self, pos)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[CandidateRow, "CandidateTable"]:
+        if isinstance(key, slice):
+            if isinstance(self._positions, slice):
+                picked = range(*self._positions.indices(len(self._store.extras)))[key]
+                if picked.step > 0:
+                    return CandidateTable(self._store, slice(picked.start, picked.stop, picked.step))
+            return CandidateTable(self._store, self._base_positions()[key])
+        return CandidateRow(self, int(self._base_positions()[key]))
+
+    # ==================== COLUMNS ====================
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        One column for the table's rows
+
+        Score columns are float64 (NaN for None or missing), skill_mask is a
+        packed-bit uint8 matrix (see utils.extract.pack_skill_masks; all
+        zero when missing), fit / experience_level / ats_rating are int8
+        codes into categories(name) (-1 when missing) and string columns are
+        object arrays. Tables built by from_rows or slicing get a view of the
+        stored array, not a copy.
+        """
+        store = self._store
+        for columns in (store.scores, store.masks, store.codes, store.strings):
+            if name in columns:
+                return columns[name][self._positions]
+        raise KeyError(name)
+
+    def present(self, name: str) -> np.ndarray:
+        """Boolean array: which rows have a value for a score or mask column"""
+        return self._store.present[name][self._positions]
+
+    def categories(self, name: str) -> List[str]:
+        """Category labels of a coded column (code i is categories[i])"""
+        return list(self._store.categories[name])
+
+    def counts(self, name: str) -> Dict[str, int]:
+        """Rows per category of a coded column, in category order"""
+        codes = self.column(name)
+        counts = np.bincount(codes[codes >= 0], minlength=len(self._store.categories[name]))
+        return dict(zip(self._store.categories[name], counts.tolist()))
+
+    def has_values(self, name: str) -> bool:
+        """True if any row has a value for the column"""
+        if name in self._store.present:
+            return bool(self.present(name).any())
+        return name in self._store.codes or name in self._store.strings
+
+    # ==================== RANKING & FILTERING ====================
+
+    def order_by(self, name: str, descending: bool = True) -> np.ndarray:
+        """Row indices (into this table) sorted by a score column, missing values last"""
+        values = self.column(name)
+        return np.argsort(-values if descending else values, kind="stable")
+
+    def take(self, indices: Sequence[int]) -> "CandidateTable":
+        """Table of the given rows (indices into this table), in the given order"""
+        return CandidateTable(self._store, self._base_positions()[np.asarray(indices, dtype=np.intp)])
+
+    def where(self, mask: np.ndarray) -> "CandidateTable":
+        """Table of the rows where mask is True"""
+        return CandidateTable(self._store, self._base_positions()[np.asarray(mask, dtype=bool)])
+
+    def is_in(self, name: str, values: Iterable[str]) -> np.ndarray:
+        """Boolean mask: rows whose category column is one of values"""
+        categories = self._store.categories[name]
+        wanted = [categories.index(v) for v in values if v in categories]
+        return np.isin(self.column(name), wanted)
+
+    # ==================== TABLES & EXPORTS ====================
+
+    def frame(self, columns: Sequence[str], rename: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        DataFrame of some columns, straight from the arrays
+
+        Coded columns become pandas Categoricals over the stored codes.
+        """
+        data = {}
+        for name in columns:
+            values = self.column(name)
+            if name in self._store.codes:
+                values = pd.Categorical.from_codes(values, self._store.categories[name])
+            elif name in self._store.strings:
+                values = [None if value is _MISSING else value for value in values]
+            data[(rename or {}).get(name, name)] = values
+        return pd.DataFrame(data, copy=False)
+
+
+def as_table(results: Union[CandidateTable, Iterable[Dict[str, Any]]]) -> CandidateTable:
+    """The results as a CandidateTable (building one only when needed)"""
+    return results if isinstance(results, CandidateTable) else CandidateTable.from_rows(results)
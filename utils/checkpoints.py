@@ -0,0 +1,128 @@
+"""
+Screening Checkpoints for RecruitNova
+Durable per-file screening results keyed by content hash, so a rerun of the
+same screen skips files that already finished and only retries new or failed
+ones.
+"""
+
+import os
+import json
+import hashlib
+import sqlite3
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+
+DB_PATH = os.path.join("data", "screening_checkpoints.db")
+
+# Per-file outcome of a screening run
+STATUS_SCREENED = "screened"   # scored in this run
+STATUS_REUSED = "reused"       # taken from a checkpoint of an earlier run
+STATUS_FAILED = "failed"       # could not be scored (see error)
+
+# Bump when a row format changes so stale checkpoints are not reused
+CHECKPOINT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    profile TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    status TEXT NOT NULL,
+    row TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (profile, content_hash)
+);
+"""
+
+
+def screening_profile(job_desc: str, kind: str, required_years: int = 3) -> str:
+    """
+    Key for "the same screen": row format, JD text and experience requirement
+
+    Any change to the JD produces a new profile, so results are never reused
+    across different job descriptions.
+    """
+    fingerprint = f"{CHECKPOINT_VERSION}|{kind}|{required_years}|{job_desc.strip()}"
+    return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """
+    SQLite checkpoint store for one screening profile
+
+    Every put() commits immediately, so a crash loses at most the file that
+    was being screened.
+    """
+
+    def __init__(self, profile: str, db_path: str = DB_PATH):
+        self.profile = profile
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def for_screen(cls, job_desc: str, kind: str, required_years: int = 3, db_path: str = DB_PATH):
+        return cls(screening_profile(job_desc, kind, required_years), db_path)
+
+    def get(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Checkpoint for a file, or None if it was never screened under this profile"""
+        record = self._conn.execute(
+            "SELECT * FROM checkpoints WHERE profile = ? AND content_hash = ?",
+            (self.profile, content_hash),
+        ).fetchone()
+        if record is None:
+            return None
+        result = dict(record)
+        result["row"] = json.loads(record["row"]) if record["row"] else None
+        return result
+
+    def get_done_row(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Stored row of a successfully screened file (failed files are retried)"""
+        record = self.get(content_hash)
+        if record and record["status"] != STATUS_FAILED and record["row"]:
+            return record["row"]
+        return None
+
+    def put(self, content_hash: str, filename: str, row: Optional[Dict[str, Any]] = None,
+            error: Optional[str] = None) -> None:
+        """Record one file's outcome"""
+        stored_row = None
+        if row is not None:
+            stored_row = json.dumps(row)
+        self._conn.execute(
+            "INSERT INTO checkpoints (profile, content_hash, filename, status, row, error, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(profile, content_hash) DO UPDATE SET "
+            "filename = excluded.filename, status = excluded.status, row = excluded.row, "
+            "error = excluded.error, attempts = attempts + 1, updated_at = excluded.updated_at",
+            (
+                self.profile, content_hash, filename,
+                STATUS_SCREENED if row is not None else STATUS_FAILED,
+                stored_row, error, datetime.now().isoformat(timespec='seconds'),
+            ),
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """Number of checkpointed files per status for this profile"""
+        return {
+            r["status"]: r["n"] for r in self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM checkpoints WHERE profile = ? GROUP BY status",
+                (self.profile,),
+            )
+        }
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,12 +1,19 @@
 """
 Candidate Comparison Engine for RecruitNova
-Enables side-by-side comparison of multiple candidates with visual analytics
+Enables side-by-side comparison of multiple candidates with visual analytics,
+and a matrix mode (one candidate x dimension array) for comparing any number
 """
 
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 import plotly.graph_objects as go
-from utils.radar_chart import parse_skills_to_dimensions, create_comparison_radar, calculate_dimensions_from_text
+from utils.extract import unpack_skill_masks
+from utils.radar_chart import DIMENSIONS, parse_skills_to_dimensions, create_comparison_radar, calculate_dimensions_from_text
+
+
+SCORE_COLUMNS = ['Overall Score', 'Match %', 'ATS Score', 'Skills Count']
+MATRIX_COLUMNS = SCORE_COLUMNS + DIMENSIONS
 
 
 def prepare_comparison_data(candidates: List[Dict[str, Any]]) -> pd.DataFrame:
@@ -125,43 +132,254 @@ def create_comparison_metrics_chart(candidates: List[Dict[str, Any]], light_them
     return fig
 
 
-def get_comparison_insights(candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _candidate_dimensions(candidate: Dict[str, Any]) -> Dict[str, int]:
+    """Radar dimension scores of a candidate: precomputed, from resume text, or from skills"""
+    if candidate.get('dimensions'):
+        return candidate['dimensions']
+    # Prioritize full text scanning
+    if candidate.get('resume_text'):
+        return calculate_dimensions_from_text(candidate['resume_text'])
+    if candidate.get('skills'):
+        return parse_skills_to_dimensions(', '.join(candidate['skills']))
+    return {}
+
+
+def _skills_count(candidate: Dict[str, Any]) -> int:
+    if candidate.get('skill_mask') is not None:
+        return int(candidate['skill_mask']).bit_count()
+    return len([skill for skill in candidate.get('skills', []) if skill])
+
+
+def build_comparison_matrix(candidates: List[Dict[str, Any]], dimensions: bool = True) -> Dict[str, Any]:
     """
-    Generate insights from candidate comparison
+    Build the candidate x dimension matrix used by matrix comparisons
     
     Args:
         candidates: List of candidate dictionaries
+        dimensions: If False, only the score columns are built (no text scanning)
         
     Returns:
-        Dictionary with insights
+        Dictionary with names, columns and matrix (float32, one row per
+        candidate; a missing ATS score is NaN)
     """
-    if not candidates:
-        return {}
+    columns = MATRIX_COLUMNS if dimensions else SCORE_COLUMNS
+    matrix = np.empty((len(candidates), len(columns)), dtype=np.float32)
+    matrix[:, 0] = [c.get('overall_score') or 0 for c in candidates]
+    matrix[:, 1] = [c.get('match_percentage') or 0 for c in candidates]
+    matrix[:, 2] = [np.nan if c.get('ats_score') is None else c['ats_score'] for c in candidates]
+    matrix[:, 3] = [_skills_count(c) for c in candidates]
+    if dimensions and candidates:
+        matrix[:, len(SCORE_COLUMNS):] = [
+            [scores.get(name, 0) for name in DIMENSIONS]
+            for scores in map(_candidate_dimensions, candidates)
+        ]
+    return {
+        'names': [c.get('name', f"Candidate {i+1}") for i, c in enumerate(candidates)],
+        'columns': list(columns),
+        'matrix': matrix
+    }
+
+
+def build_table_matrix(table, dimensions: Optional[Sequence[Dict[str, int]]] = None) -> Dict[str, Any]:
+    """
+    Build the comparison matrix straight from a CandidateTable's columns
     
-    # Find top candidate by overall score
-    top_candidate = max(candidates, key=lambda x: x.get('overall_score', 0))
+    Args:
+        table: CandidateTable (or a view of one) of the candidates to compare
+        dimensions: Radar dimension scores per row; None builds only the score columns
+        
+    Returns:
+        Same as build_comparison_matrix
+    """
+    columns = MATRIX_COLUMNS if dimensions is not None else SCORE_COLUMNS
+    matrix = np.empty((len(table), len(columns)), dtype=np.float32)
+    matrix[:, 0] = np.nan_to_num(table.column('overall_score'))
+    matrix[:, 1] = np.nan_to_num(table.column('skill_match'))
+    matrix[:, 2] = table.column('ats_score')
+    # Popcount of the packed skill masks
+    matrix[:, 3] = unpack_skill_masks(table.column('skill_mask')).sum(axis=1)
+    if dimensions is not None and len(table):
+        matrix[:, len(SCORE_COLUMNS):] = [[scores.get(name, 0) for name in DIMENSIONS] for scores in dimensions]
+    return {
+        'names': table.column('candidate_name').tolist(),
+        'columns': list(columns),
+        'matrix': matrix
+    }
+
+
+def order_matrix(
+    matrix: np.ndarray,
+    sort_column: int = 0,
+    pinned: Sequence[int] = (),
+    descending: bool = True
+) -> np.ndarray:
+    """
+    Row order for displaying a comparison matrix
     
-    # Find candidate with most skills
-    most_skilled = max(candidates, key=lambda x: len(x.get('skills', [])))
+    Args:
+        matrix: Candidate x dimension matrix
+        sort_column: Column index to sort the unpinned rows by (NaN last)
+        pinned: Row indices kept at the top, in the given order
+        descending: Sort highest first
+        
+    Returns:
+        Array of row indices
+    """
+    values = matrix[:, sort_column]
+    order = np.argsort(-values if descending else values, kind='stable')
+    if len(pinned) == 0:
+        return order
+    pinned = np.asarray(pinned, dtype=np.intp)
+    return np.concatenate([pinned, order[~np.isin(order, pinned)]])
+
+
+def _normalize_columns(matrix: np.ndarray) -> np.ndarray:
+    """Scale each column to 0-1 so score columns and counts share one colour scale"""
+    low = np.nanmin(matrix, axis=0) if len(matrix) else 0
+    span = np.nanmax(matrix, axis=0) - low if len(matrix) else 1
+    return (matrix - low) / np.where(span > 0, span, 1)
+
+
+def _theme(light_theme: bool) -> Dict[str, str]:
+    if light_theme:
+        return {'text': 'black', 'bg': 'white'}
+    return {'text': 'white', 'bg': 'rgba(0,0,0,0)'}
+
+
+def create_comparison_heatmap(
+    comparison: Dict[str, Any],
+    order: Optional[np.ndarray] = None,
+    pinned: Sequence[int] = (),
+    light_theme: bool = False
+) -> go.Figure:
+    """
+    Create a single heatmap of the candidate x dimension matrix
     
-    # Find candidate with highest ATS score
-    best_ats = max(candidates, key=lambda x: x.get('ats_score', 0))
+    Colours are scaled per column; cells and hover show the raw values.
     
-    # Calculate averages
-    avg_ats = sum(c.get('ats_score', 0) for c in candidates) / len(candidates)
-    avg_match = sum(c.get('match_percentage', 0) for c in candidates) / len(candidates)
+    Args:
+        comparison: Output of build_comparison_matrix
+        order: Row order (see order_matrix); None keeps the input order
+        pinned: Row indices to mark as pinned
+        light_theme: If True, use light theme for PDF export
+        
+    Returns:
+        Plotly Figure object
+    """
+    matrix = comparison['matrix']
+    order = np.arange(len(matrix)) if order is None else order
+    rows = matrix[order]
+    pinned_set = set(int(i) for i in pinned)
+    names = [('📌 ' if i in pinned_set else '') + comparison['names'][i] for i in order.tolist()]
+    theme = _theme(light_theme)
     
-    return {
-        'top_candidate': top_candidate.get('name', 'Unknown'),
-        'top_score': top_candidate.get('overall_score', 0),
-        'most_skilled': most_skilled.get('name', 'Unknown'),
-        'skill_count': len(most_skilled.get('skills', [])),
-        'best_ats': best_ats.get('name', 'Unknown'),
-        'best_ats_score': best_ats.get('ats_score', 0),
-        'avg_ats': round(avg_ats, 1),
-        'avg_match': round(avg_match, 1),
+    fig = go.Figure(go.Heatmap(
+        z=_normalize_columns(rows),
+        x=comparison['columns'],
+        y=names,
+        customdata=rows,
+        text=np.where(np.isnan(rows), '–', np.round(rows).astype(int).astype(str)) if len(rows) else None,
+        texttemplate='%{text}' if len(rows) <= 60 else None,
+        hovertemplate='%{y}<br>%{x}: %{customdata:.0f}<extra></extra>',
+        colorscale='Viridis',
+        showscale=False,
+    ))
+    fig.update_layout(
+        title=dict(text=f'Candidate Matrix ({len(rows)} candidates)', font=dict(color=theme['text'])),
+        xaxis=dict(side='top', tickfont=dict(color=theme['text'])),
+        yaxis=dict(autorange='reversed', tickfont=dict(color=theme['text'])),
+        paper_bgcolor=theme['bg'],
+        plot_bgcolor=theme['bg'],
+        font=dict(color=theme['text']),
+        height=max(400, 22 * len(rows) + 150),
+        margin=dict(l=10, r=10, t=110, b=10)
+    )
+    return fig
+
+
+def create_parallel_coordinates(
+    comparison: Dict[str, Any],
+    order: Optional[np.ndarray] = None,
+    light_theme: bool = False
+) -> go.Figure:
+    """
+    Create a parallel-coordinates figure of the candidate x dimension matrix
+    
+    Args:
+        comparison: Output of build_comparison_matrix
+        order: Row subset/order (see order_matrix); None keeps all rows
+        light_theme: If True, use light theme for PDF export
+        
+    Returns:
+        Plotly Figure object, lines coloured by overall score
+    """
+    matrix = comparison['matrix']
+    rows = matrix if order is None else matrix[order]
+    theme = _theme(light_theme)
+    # Parcoords cannot draw NaN; a missing ATS score sits at the bottom of its axis
+    values = np.nan_to_num(rows, nan=0.0)
+    
+    fig = go.Figure(go.Parcoords(
+        line=dict(color=values[:, 0], colorscale='Viridis', showscale=True, cmin=0, cmax=100),
+        dimensions=[
+            dict(label=column, values=values[:, j],
+                 range=[0, max(1.0, float(values[:, j].max()))] if column == 'Skills Count' else [0, 100])
+            for j, column in enumerate(comparison['columns'])
+        ]
+    ))
+    fig.update_layout(
+        title=dict(text=f'Candidate Profiles ({len(rows)} candidates)', font=dict(color=theme['text'])),
+        paper_bgcolor=theme['bg'],
+        plot_bgcolor=theme['bg'],
+        font=dict(color=theme['text']),
+        height=500
+    )
+    return fig
+
+
+def get_comparison_insights(
+    candidates: List[Dict[str, Any]],
+    comparison: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Generate insights from candidate comparison
+    
+    Args:
+        candidates: List of candidate dictionaries
+        comparison: Prebuilt build_comparison_matrix output for these candidates
+        
+    Returns:
+        Dictionary with insights (plus dimension_leaders when the matrix
+        has dimension columns)
+    """
+    if not candidates:
+        return {}
+    comparison = comparison or build_comparison_matrix(candidates, dimensions=False)
+    names, matrix = comparison['names'], comparison['matrix']
+    
+    top = int(np.argmax(matrix[:, 0]))
+    most_skilled = int(np.argmax(matrix[:, 3]))
+    ats = matrix[:, 2]
+    has_ats = not np.isnan(ats).all()
+    best_ats = int(np.nanargmax(ats)) if has_ats else None
+    
+    insights = {
+        'top_candidate': names[top],
+        'top_score': candidates[top].get('overall_score', 0),
+        'most_skilled': names[most_skilled],
+        'skill_count': int(matrix[most_skilled, 3]),
+        'best_ats': names[best_ats] if has_ats else 'N/A',
+        'best_ats_score': candidates[best_ats].get('ats_score', 0) if has_ats else 0,
+        'avg_ats': round(float(np.nanmean(ats)), 1) if has_ats else 0,
+        'avg_match': round(float(matrix[:, 1].mean()), 1),
         'total_candidates': len(candidates)
     }
+    if matrix.shape[1] > len(SCORE_COLUMNS):
+        leaders = np.argmax(matrix[:, len(SCORE_COLUMNS):], axis=0)
+        insights['dimension_leaders'] = {
+            name: names[i] for name, i in zip(comparison['columns'][len(SCORE_COLUMNS):], leaders.tolist())
+        }
+    return insights
 
 
 def create_skills_comparison_radar(candidates: List[Dict[str, Any]], light_theme: bool = False) -> go.Figure:
@@ -178,19 +396,6 @@ def create_skills_comparison_radar(candidates: List[Dict[str, Any]], light_theme
     candidates_data = []
     
     for candidate in candidates[:5]:  # Max 5 candidates for readability
-        name = candidate.get('name', 'Unknown')
-        resume_text = candidate.get('resume_text', '')
-        skills = candidate.get('skills', [])
-        
-        # Prioritize full text scanning
-        if resume_text:
-            dimensions = calculate_dimensions_from_text(resume_text)
-        elif skills:
-            skills_text = ', '.join(skills)
-            dimensions = parse_skills_to_dimensions(skills_text)
-        else:
-            dimensions = {}
-            
-        candidates_data.append((name, dimensions))
+        candidates_data.append((candidate.get('name', 'Unknown'), _candidate_dimensions(candidate)))
     
     return create_comparison_radar(candidates_data, title="Skills Comparison", light_theme=light_theme)
@@ -1,8 +1,12 @@
 # utils/extract.py
-import PyPDF2
-import docx
 import re
 
+import numpy as np
+
+from utils.extract_backends import get_backend, EncryptedDocument
+
+NO_TEXT_ERROR = "no extractable text (scanned or empty document?)"
+
 SKILLS_DB = {
 
     # PROGRAMMING LANGUAGES
@@ -495,18 +499,53 @@ SKILLS_DB = {
 
 
 
-def extract_text_from_file(file_like):
+def extract_text_with_status(file_like, max_pages=None, first_page=0):
+    """
+    Extract text and report why extraction failed instead of hiding it
+
+    Args:
+        file_like: Named file-like object (.pdf, .docx or text)
+        max_pages: Only read N PDF pages from first_page (None = all)
+        first_page: First PDF page to read (0-based)
+
+    Returns:
+        Dictionary with text, error (None on success), pages (total),
+        truncated and backend
+    """
     name = getattr(file_like, 'name', '')
+    result = {"text": "", "error": None, "pages": 0, "truncated": False, "backend": None}
     try:
+        content = file_like.getvalue() if hasattr(file_like, 'getvalue') else file_like.read()
         if name.lower().endswith('.pdf'):
-            reader = PyPDF2.PdfReader(file_like)
-            return '\n'.join([page.extract_text() or '' for page in reader.pages])
+            result["backend"], extract_pdf = get_backend("pdf")
+            result["text"], result["pages"] = extract_pdf(content, first_page, max_pages)
+            result["truncated"] = max_pages is not None and result["pages"] > first_page + max_pages
         elif name.lower().endswith('.docx'):
-            doc = docx.Document(file_like)
-            return '\n'.join([p.text for p in doc.paragraphs])
-        return file_like.getvalue().decode('utf-8')
-    except:
-        return ''
+            result["backend"], extract_docx = get_backend("docx")
+            result["text"] = extract_docx(content)
+        else:
+            try:
+                result["text"] = content.decode('utf-8')
+            except UnicodeDecodeError:
+                result["error"] = "not UTF-8 text"
+                return result
+    except EncryptedDocument as e:
+        result["error"] = str(e)
+        return result
+    except MemoryError:
+        result["error"] = "memory limit exceeded"
+        return result
+    except Exception as e:
+        result["error"] = f"unreadable file: {type(e).__name__}: {e}"
+        return result
+
+    if not result["text"].strip():
+        result["error"] = NO_TEXT_ERROR
+    return result
+
+
+def extract_text_from_file(file_like):
+    return extract_text_with_status(file_like)["text"]
 
 def extract_skills(text):
     """Return canonical skill names found in the text using SKILLS_DB."""
@@ -527,13 +566,65 @@ def extract_skills(text):
     return sorted(found)
 
 
+# ==================== SKILL BITMASKS ====================
+# Each canonical skill is one bit (position = SKILLS_DB order), so a skill
+# set is an int and overlap / missing are single AND / AND-NOT operations.
+SKILL_BITS = {skill: 1 << i for i, skill in enumerate(SKILLS_DB)}
+_BIT_SKILLS = list(SKILLS_DB)
+
+
+def skills_to_mask(skills):
+    """Bitmask of canonical skill names (unknown names are ignored)"""
+    mask = 0
+    for skill in skills:
+        mask |= SKILL_BITS.get(skill, 0)
+    return mask
+
+
+def mask_to_skills(mask):
+    """Canonical skill names in a bitmask, sorted like extract_skills"""
+    skills = []
+    while mask:
+        low = mask & -mask
+        skills.append(_BIT_SKILLS[low.bit_length() - 1])
+        mask ^= low
+    return sorted(skills)
+
+
+def extract_skill_mask(text):
+    """extract_skills as a bitmask"""
+    return skills_to_mask(extract_skills(text))
+
+
+# Arrays of masks hold packed bits: one uint8 row of SKILL_MASK_BYTES per mask,
+# bit i of the mask in bit i % 8 of byte i // 8 (np.packbits, little bit order).
+# Unlike an int64 column this has room for any number of skills.
+SKILL_MASK_BYTES = (len(SKILLS_DB) + 7) // 8
+
+
+def pack_skill_masks(masks):
+    """Packed-bit matrix (uint8, SKILL_MASK_BYTES columns) of skill bitmasks"""
+    data = bytearray().join(int(mask).to_bytes(SKILL_MASK_BYTES, "little") for mask in masks)
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, SKILL_MASK_BYTES)
+
+
+def unpack_skill_masks(packed):
+    """0/1 matrix (uint8, one column per skill in SKILLS_DB order) of packed masks"""
+    return np.unpackbits(packed, axis=1, count=len(SKILLS_DB), bitorder="little")
+
+
+def packed_to_mask(packed_row):
+    """Skill bitmask of one row of a packed-bit matrix"""
+    return int.from_bytes(packed_row.tobytes(), "little")
+
+
 def match_job_skills(resume_skills, job_text):
     if not job_text or not resume_skills:
         return 0
 
-    job_skills = extract_skills(job_text)  # will now use SKILLS_DB correctly
-    if not job_skills:
+    job_mask = extract_skill_mask(job_text)  # will now use SKILLS_DB correctly
+    if not job_mask:
         return 0
 
-    common = len(set(resume_skills) & set(job_skills))
-    return min(100, (common / len(job_skills)) * 100)
+    common = (skills_to_mask(resume_skills) & job_mask).bit_count()
+    return min(100, (common / job_mask.bit_count()) * 100)
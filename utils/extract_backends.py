@@ -0,0 +1,317 @@
+"""
+Text Extraction Backends for RecruitNova
+Registry of interchangeable PDF and DOCX text extractors behind
+extract_text_from_file, plus a benchmark that picks the fastest backend
+whose text is still correct on a corpus.
+
+PDF backends take (content, first_page, max_pages) and return
+(text, total_pages) so long documents can be split into page ranges.
+DOCX backends take content and return text.
+"""
+
+import os
+import re
+import json
+import time
+import zipfile
+from io import BytesIO, StringIO
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+
+BACKEND_CONFIG_PATH = os.path.join("data", "extract_backends.json")
+DEFAULT_BACKENDS = {"pdf": "pypdf2", "docx": "docx-xml"}
+MIN_SKILL_RECALL = 0.95   # share of the reference skills a backend must find
+
+_config_cache: Dict[str, Tuple[float, Dict[str, str]]] = {}
+
+
+class EncryptedDocument(Exception):
+    """The document needs a password before its text can be read"""
+
+
+# ==================== PDF BACKENDS ====================
+
+def _page_range(total: int, first_page: int, max_pages: Optional[int]) -> Tuple[int, int]:
+    stop = total if max_pages is None else min(total, first_page + max_pages)
+    return min(first_page, stop), stop
+
+
+def extract_pdf_pypdf2(content: bytes, first_page: int = 0, max_pages: Optional[int] = None) -> Tuple[str, int]:
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(BytesIO(content))
+    if reader.is_encrypted:
+        raise EncryptedDocument("encrypted PDF")
+    total = len(reader.pages)
+    start, stop = _page_range(total, first_page, max_pages)
+    return '\n'.join([reader.pages[i].extract_text() or '' for i in range(start, stop)]), total
+
+
+def extract_pdf_pdfminer(content: bytes, first_page: int = 0, max_pages: Optional[int] = None) -> Tuple[str, int]:
+    from pdfminer3.pdfparser import PDFParser
+    from pdfminer3.pdfdocument import PDFDocument, PDFPasswordIncorrect, PDFEncryptionError
+    from pdfminer3.pdfpage import PDFPage
+    from pdfminer3.pdfinterp import PDFResourceManager, PDFPageInterpreter
+    from pdfminer3.converter import TextConverter
+    from pdfminer3.layout import LAParams
+
+    try:
+        document = PDFDocument(PDFParser(BytesIO(content)))
+    except (PDFPasswordIncorrect, PDFEncryptionError):
+        raise EncryptedDocument("encrypted PDF")
+
+    # Walking the page tree is cheap; only the requested pages are laid out
+    pages = list(PDFPage.create_pages(document))
+    start, stop = _page_range(len(pages), first_page, max_pages)
+
+    output = StringIO()
+    resources = PDFResourceManager(caching=True)
+    device = TextConverter(resources, output, laparams=LAParams())
+    interpreter = PDFPageInterpreter(resources, device)
+    try:
+        for page in pages[start:stop]:
+            interpreter.process_page(page)
+    finally:
+        device.close()
+    return output.getvalue(), len(pages)
+
+
+# ==================== DOCX BACKENDS ====================
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_BREAKS = {_W_NS + "tab": "\t", _W_NS + "br": "\n", _W_NS + "cr": "\n"}
+
+
+def _docx_part_text(archive: zipfile.ZipFile, part: str) -> str:
+    """Stream the text runs of one WordprocessingML part without building a tree"""
+    chunks = []
+    with archive.open(part) as f:
+        for _event, elem in iterparse(f, events=("end",)):
+            tag = elem.tag
+            if tag == _W_NS + "t":
+                chunks.append(elem.text or "")
+            elif tag in _DOCX_BREAKS:
+                chunks.append(_DOCX_BREAKS[tag])
+            elif tag == _W_NS + "p":
+                chunks.append("\n")
+            elif tag == _W_NS + "tc":
+                chunks.append("\t")
+            else:
+                continue
+            elem.clear()
+    return "".join(chunks)
+
+
+def extract_docx_xml(content: bytes) -> str:
+    """Headers, body (including tables) and footers straight from the zip"""
+    with zipfile.ZipFile(BytesIO(content)) as archive:
+        names = archive.namelist()
+        if "word/document.xml" not in names:
+            raise ValueError("not a Word document (word/document.xml missing)")
+        headers = sorted(n for n in names if re.fullmatch(r"word/header\d*\.xml", n))
+        footers = sorted(n for n in names if re.fullmatch(r"word/footer\d*\.xml", n))
+        return "\n".join(_docx_part_text(archive, part) for part in headers + ["word/document.xml"] + footers)
+
+
+def extract_docx_python_docx(content: bytes) -> str:
+    """Body paragraphs only (the original python-docx extraction)"""
+    import docx
+
+    document = docx.Document(BytesIO(content))
+    return '\n'.join([p.text for p in document.paragraphs])
+
+
+PDF_BACKENDS: Dict[str, Callable] = {
+    "pypdf2": extract_pdf_pypdf2,
+    "pdfminer": extract_pdf_pdfminer,
+}
+
+DOCX_BACKENDS: Dict[str, Callable] = {
+    "docx-xml": extract_docx_xml,
+    "python-docx": extract_docx_python_docx,
+}
+
+_REGISTRIES = {"pdf": PDF_BACKENDS, "docx": DOCX_BACKENDS}
+
+
+# ==================== SELECTION ====================
+
+def register_backend(kind: str, name: str, func: Callable) -> None:
+    """Add an extractor for "pdf" or "docx" documents"""
+    _REGISTRIES[kind][name] = func
+
+
+def load_backend_config(path: str = BACKEND_CONFIG_PATH) -> Dict[str, str]:
+    """Backend names chosen by the last saved benchmark"""
+    if not os.path.exists(path):
+        return {}
+    mtime = os.path.getmtime(path)
+    cached = _config_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f).get("backends", {})
+    except (OSError, ValueError, AttributeError):
+        config = {}
+    _config_cache[path] = (mtime, config)
+    return config
+
+
+def save_backend_config(backends: Dict[str, str], results: List[Dict[str, Any]],
+                        path: str = BACKEND_CONFIG_PATH) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"backends": backends, "benchmark": results}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def get_backend(kind: str) -> Tuple[str, Callable]:
+    """
+    Extractor to use for "pdf" or "docx"
+
+    Order: RECRUITNOVA_PDF_BACKEND / RECRUITNOVA_DOCX_BACKEND, then the saved
+    benchmark choice, then DEFAULT_BACKENDS. Unknown names are ignored.
+    """
+    registry = _REGISTRIES[kind]
+    for name in (os.environ.get(f"RECRUITNOVA_{kind.upper()}_BACKEND"),
+                 load_backend_config().get(kind),
+                 DEFAULT_BACKENDS[kind]):
+        if name in registry:
+            return name, registry[name]
+    name = next(iter(registry))
+    return name, registry[name]
+
+
+# ==================== BENCHMARK ====================
+
+def build_benchmark_corpus(text_files: List[str]) -> List[Dict[str, Any]]:
+    """
+    Render plain-text resumes as PDF and DOCX documents with known text
+
+    The DOCX copies put the contact line in a page header and the skills in
+    a table, the places a paragraph-only extractor misses.
+    """
+    import docx
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    corpus = []
+    for filepath in text_files:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            lines = [line.rstrip() for line in f.read().splitlines()]
+        stem = os.path.splitext(os.path.basename(filepath))[0]
+        reference = "\n".join(lines)
+
+        pdf_buffer = BytesIO()
+        pdf = canvas.Canvas(pdf_buffer, pagesize=letter)
+        y = 750
+        for line in lines:
+            if y < 60:
+                pdf.showPage()
+                y = 750
+            pdf.drawString(50, y, line)
+            y -= 14
+        pdf.save()
+        corpus.append({"name": f"{stem}.pdf", "kind": "pdf", "content": pdf_buffer.getvalue(), "reference": reference})
+
+        document = docx.Document()
+        header_lines = [line for line in lines if "@" in line][:1]
+        if header_lines:
+            document.sections[0].header.paragraphs[0].text = header_lines[0]
+        split = len(lines) // 2
+        for line in lines[:split]:
+            if line not in header_lines:
+                document.add_paragraph(line)
+        table = document.add_table(rows=0, cols=1)
+        for line in lines[split:]:
+            if line not in header_lines:
+                table.add_row().cells[0].text = line
+        docx_buffer = BytesIO()
+        document.save(docx_buffer)
+        corpus.append({"name": f"{stem}.docx", "kind": "docx", "content": docx_buffer.getvalue(), "reference": reference})
+
+    return corpus
+
+
+def load_document_corpus(folder: str) -> List[Dict[str, Any]]:
+    """Real .pdf/.docx files; their reference is what all backends find together"""
+    corpus = []
+    for filename in sorted(os.listdir(folder)):
+        kind = os.path.splitext(filename)[1].lower().lstrip(".")
+        if kind in _REGISTRIES:
+            with open(os.path.join(folder, filename), 'rb') as f:
+                corpus.append({"name": filename, "kind": kind, "content": f.read(), "reference": None})
+    return corpus
+
+
+def _run_backend(kind: str, func: Callable, content: bytes) -> Tuple[str, int]:
+    if kind == "pdf":
+        return func(content)
+    return func(content), 1
+
+
+def benchmark_backends(corpus: List[Dict[str, Any]], repeats: int = 3) -> Dict[str, Any]:
+    """
+    Time every registered backend on the corpus and pick the fastest correct one
+
+    A backend is correct when, on every document, it finds at least
+    MIN_SKILL_RECALL of the reference skills (from the known text, or the
+    union over all backends for documents without one).
+
+    Returns:
+        Dictionary with the chosen backend per kind and per-backend results
+    """
+    from utils.extract import extract_skills
+
+    results = []
+    chosen = {}
+    for kind, registry in _REGISTRIES.items():
+        documents = [doc for doc in corpus if doc["kind"] == kind]
+        if not documents:
+            continue
+
+        outputs = {}
+        for name, func in registry.items():
+            texts, errors, pages = [], [], 0
+            started = time.perf_counter()
+            for _ in range(repeats):
+                texts, pages = [], 0
+                for doc in documents:
+                    try:
+                        text, page_count = _run_backend(kind, func, doc["content"])
+                    except Exception as e:
+                        text, page_count = "", 0
+                        errors.append(f"{doc['name']}: {type(e).__name__}: {e}")
+                    texts.append(text)
+                    pages += page_count
+            elapsed = (time.perf_counter() - started) / repeats
+            outputs[name] = [set(extract_skills(text)) for text in texts]
+            results.append({
+                "kind": kind,
+                "backend": name,
+                "files": len(documents),
+                "ms_per_file": round(elapsed * 1000 / len(documents), 2),
+                "pages_per_s": round(pages / elapsed, 1) if elapsed else 0.0,
+                "errors": sorted(set(errors)),
+            })
+
+        for row in (r for r in results if r["kind"] == kind):
+            recalls = []
+            for i, doc in enumerate(documents):
+                if doc["reference"] is not None:
+                    expected = set(extract_skills(doc["reference"]))
+                else:
+                    expected = set().union(*(found[i] for found in outputs.values()))
+                found = outputs[row["backend"]][i]
+                recalls.append(len(found & expected) / len(expected) if expected else 1.0)
+            row["skill_recall"] = round(min(recalls), 3)
+            row["correct"] = not row["errors"] and row["skill_recall"] >= MIN_SKILL_RECALL
+
+        correct = [r for r in results if r["kind"] == kind and r["correct"]]
+        if correct:
+            chosen[kind] = min(correct, key=lambda r: r["ms_per_file"])["backend"]
+
+    return {"backends": chosen, "results": results}
@@ -0,0 +1,370 @@
+"""
+Folder Watches for RecruitNova
+A watch binds a resume folder to a saved job description. folder_watcher.py
+screens only files that arrived or changed since the last look (reported by
+inotify on Linux, found by comparing mtime and size otherwise) and writes
+their rows into a persisted result set indexed by score, so the leaderboard
+is read back already ranked.
+"""
+
+import os
+import sys
+import json
+import time
+import select
+import struct
+import sqlite3
+import ctypes
+import ctypes.util
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+from utils.checkpoints import STATUS_FAILED
+
+
+DB_PATH = os.path.join("data", "folder_watches.db")
+
+# Files modified this recently may still be being written; polling waits
+SETTLE_SECONDS = 2.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    folder TEXT NOT NULL,
+    job_desc TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    created_by TEXT,
+    created_at TEXT NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    last_scan_at TEXT,
+    error TEXT,
+    UNIQUE (folder, job_desc)
+);
+
+CREATE TABLE IF NOT EXISTS watch_files (
+    watch_id INTEGER NOT NULL REFERENCES watches(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (watch_id, path)
+);
+
+CREATE TABLE IF NOT EXISTS watch_results (
+    watch_id INTEGER NOT NULL REFERENCES watches(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    member TEXT NOT NULL DEFAULT '',
+    filename TEXT NOT NULL,
+    status TEXT NOT NULL,
+    overall_score REAL,
+    row TEXT,
+    error TEXT,
+    screened_at TEXT NOT NULL,
+    PRIMARY KEY (watch_id, path, member)
+);
+CREATE INDEX IF NOT EXISTS idx_watch_results_rank ON watch_results(watch_id, overall_score DESC);
+"""
+
+# Databases whose schema was already created by this process
+_initialized = set()
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def connect(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """Open the watch database (created on first use)"""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    if db_path not in _initialized:
+        conn.executescript(_SCHEMA)
+        _initialized.add(db_path)
+    return conn
+
+
+# ==================== WATCHES ====================
+
+def add_watch(folder: str, job_desc: str, title: str = "", created_by: str = "", db_path: str = DB_PATH) -> int:
+    """
+    Watch a folder for one job description (re-activates an existing watch)
+
+    Returns:
+        Watch id
+    """
+    if not job_desc or not job_desc.strip():
+        raise ValueError("Job description is required")
+    if not folder or not os.path.isdir(folder):
+        raise ValueError(f"Folder not found: {folder}")
+    folder = os.path.abspath(folder)
+
+    conn = connect(db_path)
+    try:
+        conn.execute(
+            "INSERT INTO watches (folder, job_desc, title, created_by, created_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(folder, job_desc) DO UPDATE SET active = 1, title = excluded.title",
+            (folder, job_desc, title.strip(), created_by, _now()),
+        )
+        return conn.execute(
+            "SELECT id FROM watches WHERE folder = ? AND job_desc = ?", (folder, job_desc)
+        ).fetchone()["id"]
+    finally:
+        conn.close()
+
+
+def list_watches(active_only: bool = False, db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """Watches with their result counts, oldest first"""
+    query = (
+        "SELECT w.*, "
+        "(SELECT COUNT(*) FROM watch_results r WHERE r.watch_id = w.id AND r.status != 'failed') AS ranked, "
+        "(SELECT COUNT(*) FROM watch_results r WHERE r.watch_id = w.id AND r.status = 'failed') AS failed "
+        "FROM watches w"
+    )
+    if active_only:
+        query += " WHERE w.active = 1"
+    conn = connect(db_path)
+    try:
+        return [dict(r) for r in conn.execute(query + " ORDER BY w.id")]
+    finally:
+        conn.close()
+
+
+def set_watch_active(watch_id: int, active: bool, db_path: str = DB_PATH) -> None:
+    conn = connect(db_path)
+    try:
+        conn.execute("UPDATE watches SET active = ? WHERE id = ?", (1 if active else 0, watch_id))
+    finally:
+        conn.close()
+
+
+def delete_watch(watch_id: int, db_path: str = DB_PATH) -> None:
+    conn = connect(db_path)
+    try:
+        conn.execute("DELETE FROM watches WHERE id = ?", (watch_id,))
+    finally:
+        conn.close()
+
+
+def finish_scan(watch_id: int, error: Optional[str] = None, db_path: str = DB_PATH) -> None:
+    conn = connect(db_path)
+    try:
+        conn.execute("UPDATE watches SET last_scan_at = ?, error = ? WHERE id = ?", (_now(), error, watch_id))
+    finally:
+        conn.close()
+
+
+# ==================== FILES AND RESULTS ====================
+
+def _stat(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size) if os.path.isfile(path) else None
+
+
+def changed_files(
+    watch_id: int,
+    folder: str,
+    formats: Tuple[str, ...],
+    paths: Optional[List[str]] = None,
+    settle: bool = True,
+    db_path: str = DB_PATH
+) -> Tuple[List[Tuple[str, int, int]], List[str]]:
+    """
+    Files of a watch that are new or changed, and files that went away
+
+    Args:
+        formats: File extensions the watch screens
+        paths: Only look at these paths (from inotify); None compares the whole folder
+        settle: Skip files modified in the last SETTLE_SECONDS (not needed
+            for inotify, which reports files once they are closed)
+
+    Returns:
+        ([(path, mtime_ns, size)] to screen, [paths] to drop)
+    """
+    conn = connect(db_path)
+    try:
+        known = {
+            r["path"]: (r["mtime_ns"], r["size"])
+            for r in conn.execute("SELECT path, mtime_ns, size FROM watch_files WHERE watch_id = ?", (watch_id,))
+        }
+    finally:
+        conn.close()
+
+    if paths is None:
+        paths = [entry.path for entry in os.scandir(folder)] if os.path.isdir(folder) else []
+        removed = [p for p in known if not os.path.exists(p)]
+    else:
+        removed = [p for p in paths if p in known and not os.path.exists(p)]
+
+    settled_before = time.time_ns() - int(SETTLE_SECONDS * 1e9)
+    changed = []
+    for path in sorted(set(paths)):
+        if not path.lower().endswith(formats):
+            continue
+        stat = _stat(path)
+        if stat is None or stat == known.get(path) or (settle and stat[0] > settled_before):
+            continue
+        changed.append((path, stat[0], stat[1]))
+    return changed, removed
+
+
+def record_file(
+    watch_id: int,
+    path: str,
+    mtime_ns: int,
+    size: int,
+    results: List[Dict[str, Any]],
+    db_path: str = DB_PATH
+) -> None:
+    """
+    Replace the results of one file (archives have one per member)
+
+    Args:
+        results: {"member", "filename", "status", "row", "error"} dicts
+    """
+    conn = connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM watch_results WHERE watch_id = ? AND path = ?", (watch_id, path))
+        conn.executemany(
+            "INSERT OR REPLACE INTO watch_results "
+            "(watch_id, path, member, filename, status, overall_score, row, error, screened_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (watch_id, path, r.get("member") or "", r["filename"], r["status"],
+                 r["row"].get("overall_score") if r["row"] else None,
+                 json.dumps(r["row"]) if r["row"] else None, r["error"], _now())
+                for r in results
+            ),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO watch_files (watch_id, path, mtime_ns, size) VALUES (?, ?, ?, ?)",
+            (watch_id, path, mtime_ns, size),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def forget_files(watch_id: int, paths: List[str], db_path: str = DB_PATH) -> None:
+    """Drop deleted files and their results"""
+    conn = connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for path in paths:
+            conn.execute("DELETE FROM watch_results WHERE watch_id = ? AND path = ?", (watch_id, path))
+            conn.execute("DELETE FROM watch_files WHERE watch_id = ? AND path = ?", (watch_id, path))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def get_leaderboard(watch_id: int, limit: Optional[int] = None, offset: int = 0,
+                    db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """Ranked rows of a watch, best score first (read in index order, no sort)"""
+    query = ("SELECT row FROM watch_results WHERE watch_id = ? AND status != ? "
+             "ORDER BY overall_score DESC LIMIT ? OFFSET ?")
+    conn = connect(db_path)
+    try:
+        return [
+            json.loads(r["row"])
+            for r in conn.execute(query, (watch_id, STATUS_FAILED, limit if limit else -1, offset))
+        ]
+    finally:
+        conn.close()
+
+
+def get_watch_failures(watch_id: int, db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    conn = connect(db_path)
+    try:
+        return [
+            dict(r) for r in conn.execute(
+                "SELECT filename, error FROM watch_results WHERE watch_id = ? AND status = ? ORDER BY filename",
+                (watch_id, STATUS_FAILED),
+            )
+        ]
+    finally:
+        conn.close()
+
+
+# ==================== INOTIFY ====================
+
+class Inotify:
+    """
+    Minimal inotify binding (Linux) reporting files written, moved or deleted
+
+    Usage:
+        notifier = Inotify()
+        notifier.add("/path/to/folder")
+        for path in notifier.read(timeout=5.0): ...
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._folders: Dict[int, str] = {}
+        self.overflowed = False
+
+    def add(self, folder: str) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(folder), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"cannot watch {folder}")
+        self._folders[wd] = folder
+
+    def read(self, timeout: float) -> List[str]:
+        """Paths with events within timeout seconds; sets overflowed if events were lost"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        paths = []
+        pos = 0
+        while pos + self._EVENT.size <= len(data):
+            wd, mask, _cookie, length = self._EVENT.unpack_from(data, pos)
+            pos += self._EVENT.size
+            name = data[pos:pos + length].rstrip(b"\0")
+            pos += length
+            if mask & self.IN_Q_OVERFLOW:
+                self.overflowed = True
+            elif wd in self._folders and name:
+                paths.append(os.path.join(self._folders[wd], os.fsdecode(name)))
+        return paths
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def open_notifier() -> Optional[Inotify]:
+    """An Inotify instance, or None where inotify is unavailable (then poll)"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return Inotify()
+    except (OSError, AttributeError):
+        return None
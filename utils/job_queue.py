@@ -0,0 +1,479 @@
+"""
+Background Job Queue for RecruitNova
+SQLite-backed queue for bulk and folder screening jobs. The dashboard
+enqueues jobs and polls them; job_worker.py processes consume them and write
+progress and per-file results back, so work survives reruns and restarts.
+"""
+
+import os
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from utils.checkpoints import STATUS_SCREENED, STATUS_FAILED
+from utils.archive_ingest import read_archive_member
+
+
+DB_PATH = os.path.join("data", "jobs.db")
+
+# A running job whose worker has not sent a heartbeat for this long is
+# assumed dead and handed to the next worker that asks for work
+STALE_AFTER_SECONDS = 120
+
+JOB_KINDS = ("bulk", "folder")
+ACTIVE_STATUSES = ("queued", "running")
+FINAL_STATUSES = ("done", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    job_desc TEXT NOT NULL,
+    folder TEXT,
+    created_by TEXT,
+    created_at TEXT NOT NULL,
+    scheduled_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    worker TEXT,
+    heartbeat_at TEXT,
+    total INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_scheduled ON jobs(status, scheduled_at);
+
+CREATE TABLE IF NOT EXISTS job_files (
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    content BLOB NOT NULL,
+    error TEXT,
+    PRIMARY KEY (job_id, seq)
+);
+
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    status TEXT NOT NULL,
+    overall_score REAL,
+    row TEXT,
+    error TEXT,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+# Columns added after the first release: (table, column, definition)
+_ADDED_COLUMNS = {
+    "job_files": [("error", "TEXT")],
+}
+
+
+# Databases whose schema was already created by this process
+_initialized = set()
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def connect(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """Open the queue database (created on first use)"""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    if db_path not in _initialized:
+        conn.executescript(_SCHEMA)
+        _add_missing_columns(conn)
+        _initialized.add(db_path)
+    return conn
+
+
+def _add_missing_columns(conn: sqlite3.Connection) -> None:
+    for table, columns in _ADDED_COLUMNS.items():
+        existing = {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+        for column, definition in columns:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _upload_bytes(f: Dict[str, Any]) -> bytes:
+    if f.get("error") is not None:
+        return b""
+    if "content" in f:
+        return f["content"]
+    with open(f["path"], 'rb') as fh:
+        return fh.read()
+
+
+def enqueue_job(
+    job_desc: str,
+    files: Optional[List[Dict[str, Any]]] = None,
+    folder: Optional[str] = None,
+    scheduled_at: Optional[datetime] = None,
+    created_by: str = "",
+    db_path: str = DB_PATH
+) -> int:
+    """
+    Add a screening job to the queue
+
+    Args:
+        job_desc: Job description text
+        files: Uploads as {"name", "content"} dicts, or {"name", "path"} for
+            spooled files; any iterable, consumed one file at a time (bulk job).
+            {"name", "error"} entries (unreadable archive members) are kept
+            and reported as failed files when the job runs
+        folder: Folder path to screen (folder job); listed when the job starts
+        scheduled_at: Earliest start time, e.g. off-hours (default: now)
+        created_by: Email of the recruiter who queued the job
+
+    Returns:
+        New job id
+    """
+    if not job_desc or not job_desc.strip():
+        raise ValueError("Job description is required")
+    has_files = files is not None and files != []
+    if has_files == bool(folder):
+        raise ValueError("Provide either uploaded files or a folder")
+
+    kind = "bulk" if files else "folder"
+    scheduled = (scheduled_at or datetime.now()).isoformat(timespec='seconds')
+
+    conn = connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        cur = conn.execute(
+            "INSERT INTO jobs (kind, job_desc, folder, created_by, created_at, scheduled_at, total) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (kind, job_desc, folder, created_by, _now(), scheduled, 0),
+        )
+        job_id = cur.lastrowid
+        if files:
+            conn.executemany(
+                "INSERT INTO job_files (job_id, seq, name, content, error) VALUES (?, ?, ?, ?, ?)",
+                ((job_id, seq, f["name"], sqlite3.Binary(_upload_bytes(f)), f.get("error"))
+                 for seq, f in enumerate(files)),
+            )
+            conn.execute(
+                "UPDATE jobs SET total = (SELECT COUNT(*) FROM job_files WHERE job_id = ?) WHERE id = ?",
+                (job_id, job_id),
+            )
+        conn.execute("COMMIT")
+        return job_id
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def claim_next_job(worker: str, db_path: str = DB_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Atomically take the oldest due job (or a job whose worker went silent)
+
+    Returns:
+        The claimed job as a dict, or None if nothing is due
+    """
+    now = datetime.now()
+    stale_before = (now - timedelta(seconds=STALE_AFTER_SECONDS)).isoformat(timespec='seconds')
+
+    conn = connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT * FROM jobs "
+            "WHERE (status = 'queued' AND scheduled_at <= ?) "
+            "   OR (status = 'running' AND heartbeat_at < ?) "
+            "ORDER BY scheduled_at, id LIMIT 1",
+            (now.isoformat(timespec='seconds'), stale_before),
+        ).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+
+        if row["cancel_requested"]:
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ?",
+                (_now(), row["id"]),
+            )
+            conn.execute("COMMIT")
+            return claim_next_job(worker, db_path)
+
+        # Results are rebuilt on every run; files finished earlier come back
+        # from their checkpoints instead of being screened again
+        conn.execute("DELETE FROM job_results WHERE job_id = ?", (row["id"],))
+        conn.execute(
+            "UPDATE jobs SET status = 'running', worker = ?, started_at = ?, heartbeat_at = ?, "
+            "processed = 0, failed = 0, error = NULL WHERE id = ?",
+            (worker, _now(), _now(), row["id"]),
+        )
+        conn.execute("COMMIT")
+        job = dict(row)
+        job.update(status="running", worker=worker)
+        return job
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def load_job_files(job_id: int, db_path: str = DB_PATH) -> List[Tuple[int, str, bytes, Optional[str]]]:
+    """Uploaded files of a bulk job as (seq, name, content, error); error is set for unreadable ones"""
+    conn = connect(db_path)
+    try:
+        return [
+            (r["seq"], r["name"], bytes(r["content"]), r["error"])
+            for r in conn.execute(
+                "SELECT seq, name, content, error FROM job_files WHERE job_id = ? ORDER BY seq", (job_id,)
+            )
+        ]
+    finally:
+        conn.close()
+
+
+def iter_job_files(job_id: int, db_path: str = DB_PATH) -> Iterator[Tuple[int, str, bytes, Optional[str]]]:
+    """Like load_job_files, but reads one upload at a time"""
+    conn = connect(db_path)
+    try:
+        seqs = [r["seq"] for r in conn.execute("SELECT seq FROM job_files WHERE job_id = ? ORDER BY seq", (job_id,))]
+        for seq in seqs:
+            r = conn.execute(
+                "SELECT name, content, error FROM job_files WHERE job_id = ? AND seq = ?", (job_id, seq)
+            ).fetchone()
+            yield seq, r["name"], bytes(r["content"]), r["error"]
+    finally:
+        conn.close()
+
+
+def _owned(worker: Optional[str]) -> Tuple[str, Tuple]:
+    """WHERE clause suffix restricting an update to the worker that holds the job (any worker for None)"""
+    return (" AND worker = ?", (worker,)) if worker is not None else ("", ())
+
+
+def set_job_total(job_id: int, total: int, worker: Optional[str] = None, db_path: str = DB_PATH) -> None:
+    owned, params = _owned(worker)
+    conn = connect(db_path)
+    try:
+        conn.execute(f"UPDATE jobs SET total = ? WHERE id = ?{owned}", (total, job_id, *params))
+    finally:
+        conn.close()
+
+
+def record_result(
+    job_id: int,
+    seq: int,
+    filename: str,
+    row: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+    status: Optional[str] = None,
+    worker: Optional[str] = None,
+    db_path: str = DB_PATH
+) -> bool:
+    """
+    Store one file's result, bump progress and heartbeat
+
+    Args:
+        status: Per-file status (screened, reused or failed); derived from row if omitted
+        worker: Worker that claimed the job; nothing is written once another
+            worker has taken the job over
+
+    Returns:
+        True if the job should keep going, False if cancellation was
+        requested or the job now belongs to another worker
+    """
+    owned, params = _owned(worker)
+    conn = connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        cur = conn.execute(
+            f"UPDATE jobs SET processed = processed + 1, failed = failed + ?, heartbeat_at = ? WHERE id = ?{owned}",
+            (0 if row else 1, _now(), job_id, *params),
+        )
+        if cur.rowcount == 0:
+            conn.execute("ROLLBACK")
+            return False
+        conn.execute(
+            "INSERT OR REPLACE INTO job_results (job_id, seq, filename, status, overall_score, row, error) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                job_id, seq, filename,
+                status or (STATUS_SCREENED if row else STATUS_FAILED),
+                row.get("overall_score") if row else None,
+                json.dumps(row) if row else None,
+                error,
+            ),
+        )
+        cancel = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        conn.execute("COMMIT")
+        return not (cancel and cancel["cancel_requested"])
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def finish_job(job_id: int, status: str = "done", error: Optional[str] = None, worker: Optional[str] = None,
+               db_path: str = DB_PATH) -> bool:
+    """
+    Mark a job as done, failed or cancelled
+
+    Args:
+        worker: Worker that claimed the job; the job is left alone once
+            another worker has taken it over
+
+    Returns:
+        True if the job was updated
+    """
+    if status not in FINAL_STATUSES:
+        raise ValueError(f"Unknown final status: {status}")
+    owned, params = _owned(worker)
+    conn = connect(db_path)
+    try:
+        cur = conn.execute(
+            f"UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?{owned}",
+            (status, _now(), error, job_id, *params),
+        )
+        return cur.rowcount > 0
+    finally:
+        conn.close()
+
+
+def cancel_job(job_id: int, db_path: str = DB_PATH) -> bool:
+    """
+    Cancel a job: queued jobs stop immediately, running jobs after the current file
+
+    Returns:
+        True if the job was still active
+    """
+    conn = connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        cur = conn.execute(
+            "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status IN ('queued', 'running')",
+            (job_id,),
+        )
+        conn.execute(
+            "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+            (_now(), job_id),
+        )
+        conn.execute("COMMIT")
+        return cur.rowcount > 0
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def get_job(job_id: int, db_path: str = DB_PATH) -> Optional[Dict[str, Any]]:
+    conn = connect(db_path)
+    try:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def list_jobs(limit: int = 20, db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """Most recent jobs first"""
+    conn = connect(db_path)
+    try:
+        return [dict(r) for r in conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))]
+    finally:
+        conn.close()
+
+
+def get_job_results(job_id: int, with_content: bool = False, limit: Optional[int] = None,
+                    db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """
+    Successful result rows of a job, best score first
+
+    Works on partial results while the job is still running. With
+    with_content, file_content is re-attached from the stored upload or the
+    file on disk so the rows match screen_bulk_resumes output.
+    """
+    conn = connect(db_path)
+    try:
+        query = ("SELECT seq, row FROM job_results WHERE job_id = ? AND status != 'failed' "
+                 "ORDER BY overall_score DESC, seq")
+        params: Tuple = (job_id,)
+        if limit:
+            query += " LIMIT ?"
+            params += (limit,)
+        records = conn.execute(query, params).fetchall()
+
+        rows = []
+        for record in records:
+            row = json.loads(record["row"])
+            if with_content:
+                if row.get("archive_member") and row.get("source_archive") and os.path.isfile(row["source_archive"]):
+                    row["file_content"] = read_archive_member(row["source_archive"], row["archive_member"]) or b""
+                elif row.get("resume_path"):
+                    try:
+                        with open(row["resume_path"], 'rb') as f:
+                            row["file_content"] = f.read()
+                    except OSError:
+                        row["file_content"] = b""
+                else:
+                    blob = conn.execute(
+                        "SELECT content FROM job_files WHERE job_id = ? AND seq = ?", (job_id, record["seq"])
+                    ).fetchone()
+                    row["file_content"] = bytes(blob["content"]) if blob else b""
+            rows.append(row)
+        return rows
+    finally:
+        conn.close()
+
+
+def get_job_file_counts(job_id: int, db_path: str = DB_PATH) -> Dict[str, int]:
+    """Number of files per status (screened, reused, failed) for a job"""
+    conn = connect(db_path)
+    try:
+        return {
+            r["status"]: r["n"] for r in conn.execute(
+                "SELECT status, COUNT(*) AS n FROM job_results WHERE job_id = ? GROUP BY status", (job_id,)
+            )
+        }
+    finally:
+        conn.close()
+
+
+def requeue_job(job_id: int, db_path: str = DB_PATH) -> bool:
+    """
+    Queue a finished job again; checkpointed files are skipped on the rerun
+
+    Returns:
+        True if the job was finished and is now queued
+    """
+    conn = connect(db_path)
+    try:
+        cur = conn.execute(
+            "UPDATE jobs SET status = 'queued', scheduled_at = ?, cancel_requested = 0, "
+            "finished_at = NULL, error = NULL WHERE id = ? AND status IN ('done', 'failed', 'cancelled')",
+            (_now(), job_id),
+        )
+        return cur.rowcount > 0
+    finally:
+        conn.close()
+
+
+def get_job_failures(job_id: int, db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    conn = connect(db_path)
+    try:
+        return [
+            dict(r) for r in conn.execute(
+                "SELECT filename, error FROM job_results WHERE job_id = ? AND status = 'failed' ORDER BY seq",
+                (job_id,),
+            )
+        ]
+    finally:
+        conn.close()
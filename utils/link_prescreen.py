@@ -0,0 +1,145 @@
+"""
+Upload Link Pre-Screening for RecruitNova
+Screens resumes submitted through upload links as they arrive, against the
+JD of their link, and stores the result next to the submission
+(utils/upload_links.py). The JD is parsed once per link into a job profile
+that is cached in memory and in the link record. The recruiter view then
+reads an already ranked list instead of screening on open.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+
+from utils import upload_links, screening_history
+from utils.checkpoints import CheckpointStore, STATUS_FAILED, DB_PATH as CHECKPOINT_DB
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_scheduled = set()   # db paths with a drain already queued
+_profiles: Dict[str, Dict[str, Any]] = {}   # link id -> parsed job profile
+
+
+def link_profile(link: Dict[str, Any], db_path: str = upload_links.DB_PATH) -> Dict[str, Any]:
+    """
+    Parsed job profile of a link's JD, built and stored on first use
+
+    Returns:
+        Profile from screening.build_job_profile
+    """
+    from utils.screening import build_job_profile
+
+    profile = _profiles.get(link["id"]) or link.get("job_profile")
+    if profile is None:
+        profile = build_job_profile(link["job_description"], link.get("required_years") or 3)
+        upload_links.set_job_profile(link["id"], profile, db_path)
+    _profiles[link["id"]] = profile
+    return profile
+
+
+def prescreen_submission(submission: Dict[str, Any], db_path: str = upload_links.DB_PATH,
+                         checkpoint_db: str = CHECKPOINT_DB, history_db: str = screening_history.DB_PATH) -> str:
+    """
+    Screen one claimed submission and record the result on it
+
+    The same file sent twice to a link is screened once (checkpoints are
+    shared with folder screens of the same JD and required years).
+
+    Returns:
+        Status recorded for the submission
+    """
+    from utils.screening import screen_resume_path, screen_checkpointed
+
+    link = upload_links.get_link_by_id(submission["link_id"], db_path)
+    if link is None:
+        upload_links.record_prescreen(submission["id"], error="Upload link no longer exists", db_path=db_path)
+        return STATUS_FAILED
+
+    try:
+        profile = link_profile(link, db_path)
+        with open(submission["file_path"], "rb") as f:
+            content = f.read()
+        with CheckpointStore.for_screen(link["job_description"], "folder", profile["required_years"],
+                                        db_path=checkpoint_db) as checkpoints:
+            row, status, error = screen_checkpointed(
+                checkpoints, submission["filename"], content,
+                lambda: screen_resume_path(link["job_description"], submission["file_path"],
+                                           file_content=content, profile=profile),
+                resume_path=submission["file_path"]
+            )
+    except Exception as e:
+        row, status, error = None, STATUS_FAILED, str(e)
+
+    if row:
+        # The form values beat whatever was guessed from the file
+        row.update({
+            "candidate_name": submission["candidate_name"] or row["candidate_name"],
+            "email": submission["candidate_email"] or row["email"],
+            "contact": submission["candidate_phone"] or row["contact"],
+            "original_filename": submission["filename"],
+        })
+    upload_links.record_prescreen(submission["id"], row, error, db_path)
+    if row:
+        screening_history.record_screening(link["job_description"], [row], "link", db_path=history_db)
+    return status
+
+
+def prescreen_pending(link_id: Optional[str] = None, limit: Optional[int] = None,
+                      db_path: str = upload_links.DB_PATH, checkpoint_db: str = CHECKPOINT_DB,
+                      history_db: str = screening_history.DB_PATH) -> int:
+    """
+    Pre-screen waiting submissions, oldest first
+
+    Submissions are claimed one at a time, so several processes can drain
+    the same store without screening anything twice.
+
+    Returns:
+        Number of submissions processed
+    """
+    done = 0
+    while limit is None or done < limit:
+        submission = upload_links.claim_submission(link_id, db_path)
+        if submission is None:
+            break
+        prescreen_submission(submission, db_path, checkpoint_db, history_db)
+        done += 1
+    return done
+
+
+def _drain(db_path: str) -> None:
+    with _executor_lock:
+        _scheduled.discard(db_path)
+    prescreen_pending(db_path=db_path)
+
+
+def prescreen_async(db_path: str = upload_links.DB_PATH) -> None:
+    """
+    Drain waiting submissions in a background thread
+
+    Calls while a drain is already queued are folded into it.
+    """
+    global _executor
+    with _executor_lock:
+        if db_path in _scheduled:
+            return
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="link-prescreen")
+        _scheduled.add(db_path)
+        _executor.submit(_drain, db_path)
+
+
+def submit_and_prescreen(token: str, fields: Dict[str, Any], filename: str, content: bytes,
+                         db_path: str = upload_links.DB_PATH) -> Dict[str, Any]:
+    """
+    Store a submission and queue its pre-screen without waiting for it
+
+    Returns:
+        The stored submission (status pending)
+
+    Raises:
+        UploadLinkError when the link refuses the submission
+    """
+    submission = upload_links.submit_resume(token, fields, filename, content, db_path)
+    prescreen_async(db_path)
+    return submission
@@ -0,0 +1,464 @@
+"""
+Mailbox Ingestion for RecruitNova
+Reads resume attachments out of a local mbox file or Maildir export. Messages
+are parsed one at a time, and a per-mailbox high-water mark (the byte offset
+after the last processed message for mbox, the processed message keys for
+Maildir) lets later scans read only mail that arrived since. Attachments
+that failed to screen are remembered and retried on the next scan. The
+sender's email address is the candidate key.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+from email import policy
+from email.header import decode_header, make_header
+from email.parser import BytesParser
+from email.utils import parseaddr, parsedate_to_datetime
+from typing import Dict, List, Any, Iterator, Optional, Set, Tuple
+
+DB_PATH = os.path.join("data", "mailbox_state.db")
+
+ATTACHMENT_FORMATS = ('.pdf', '.docx', '.txt')
+MAX_MESSAGE_BYTES = 50 * 1024 * 1024     # larger messages are skipped unparsed
+MAX_ATTACHMENT_BYTES = 25 * 1024 * 1024
+MARK_EVERY = 500                         # messages between high-water mark commits
+HEAD_BYTES = 4096                        # mbox prefix hashed to notice a rewritten file
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mbox_marks (
+    mailbox TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    head TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (mailbox, profile)
+);
+CREATE TABLE IF NOT EXISTS maildir_seen (
+    mailbox TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    msg_key TEXT NOT NULL,
+    PRIMARY KEY (mailbox, profile, msg_key)
+);
+CREATE TABLE IF NOT EXISTS mailbox_attachments (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    mailbox TEXT NOT NULL,
+    sender_email TEXT NOT NULL,
+    sender_name TEXT,
+    content_hash TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    location TEXT NOT NULL,
+    message_id TEXT,
+    subject TEXT,
+    received_at TEXT,
+    UNIQUE (mailbox, sender_email, content_hash)
+);
+CREATE TABLE IF NOT EXISTS mailbox_failures (
+    mailbox TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    location TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    error TEXT,
+    failed_at TEXT NOT NULL,
+    PRIMARY KEY (mailbox, profile, location, filename)
+);
+"""
+
+
+def is_maildir(path: str) -> bool:
+    return os.path.isdir(os.path.join(path, "cur")) and os.path.isdir(os.path.join(path, "new"))
+
+
+def is_mailbox(path: str) -> bool:
+    """True for a Maildir directory or an mbox file"""
+    if not path:
+        return False
+    if is_maildir(path):
+        return True
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(5) == b"From "
+
+
+def mailbox_id(path: str) -> str:
+    return os.path.realpath(path)
+
+
+class MailboxState:
+    """
+    SQLite store of high-water marks and the attachments seen per sender
+
+    Marks are kept per screening profile, so a new JD rescans the mailbox
+    while reruns of the same JD only read new mail.
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def mbox_mark(self, mailbox: str, profile: str) -> Tuple[int, str]:
+        """(offset, head hash) of the last processed mbox message, (0, "") if none"""
+        record = self._conn.execute(
+            "SELECT offset, head FROM mbox_marks WHERE mailbox = ? AND profile = ?", (mailbox, profile)
+        ).fetchone()
+        return (record["offset"], record["head"]) if record else (0, "")
+
+    def set_mbox_mark(self, mailbox: str, profile: str, offset: int, head: str) -> None:
+        self._conn.execute(
+            "INSERT INTO mbox_marks (mailbox, profile, offset, head, updated_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(mailbox, profile) DO UPDATE SET offset = excluded.offset, head = excluded.head, "
+            "updated_at = excluded.updated_at",
+            (mailbox, profile, offset, head, datetime.now().isoformat(timespec='seconds')),
+        )
+        self._conn.commit()
+
+    def seen_keys(self, mailbox: str, profile: str) -> Set[str]:
+        return {
+            r["msg_key"] for r in self._conn.execute(
+                "SELECT msg_key FROM maildir_seen WHERE mailbox = ? AND profile = ?", (mailbox, profile)
+            )
+        }
+
+    def mark_seen(self, mailbox: str, profile: str, keys: List[str]) -> None:
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO maildir_seen (mailbox, profile, msg_key) VALUES (?, ?, ?)",
+            ((mailbox, profile, key) for key in keys),
+        )
+        self._conn.commit()
+
+    def add_attachment(self, mailbox: str, message: Dict[str, Any], content_hash: str, filename: str) -> None:
+        """Remember that a sender sent this attachment (JD-independent)"""
+        self._conn.execute(
+            "INSERT INTO mailbox_attachments (mailbox, sender_email, sender_name, content_hash, filename, "
+            "location, message_id, subject, received_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(mailbox, sender_email, content_hash) DO UPDATE SET "
+            "sender_name = excluded.sender_name, filename = excluded.filename, location = excluded.location, "
+            "message_id = excluded.message_id, subject = excluded.subject, received_at = excluded.received_at",
+            (mailbox, message["sender_email"], message["sender_name"], content_hash, filename,
+             json.dumps(message["location"]), message["message_id"], message["subject"], message["received_at"]),
+        )
+
+    def add_failure(self, mailbox: str, profile: str, location: Dict[str, Any], filename: str,
+                    error: Optional[str]) -> None:
+        """Remember an attachment that failed to screen, so the next scan retries it"""
+        self._conn.execute(
+            "INSERT INTO mailbox_failures (mailbox, profile, location, filename, error, failed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(mailbox, profile, location, filename) DO UPDATE SET "
+            "error = excluded.error, failed_at = excluded.failed_at",
+            (mailbox, profile, json.dumps(location, sort_keys=True), filename, error,
+             datetime.now().isoformat(timespec='seconds')),
+        )
+        self._conn.commit()
+
+    def clear_failure(self, mailbox: str, profile: str, location: Dict[str, Any], filename: str) -> None:
+        self._conn.execute(
+            "DELETE FROM mailbox_failures WHERE mailbox = ? AND profile = ? AND location = ? AND filename = ?",
+            (mailbox, profile, json.dumps(location, sort_keys=True), filename),
+        )
+        self._conn.commit()
+
+    def clear_failures(self, mailbox: str, profile: str) -> None:
+        self._conn.execute("DELETE FROM mailbox_failures WHERE mailbox = ? AND profile = ?", (mailbox, profile))
+        self._conn.commit()
+
+    def failures(self, mailbox: str, profile: str) -> List[Dict[str, Any]]:
+        """Attachments waiting to be retried, as {"location", "filename", "error"}, oldest first"""
+        return [
+            {"location": json.loads(r["location"]), "filename": r["filename"], "error": r["error"]}
+            for r in self._conn.execute(
+                "SELECT location, filename, error FROM mailbox_failures WHERE mailbox = ? AND profile = ? "
+                "ORDER BY failed_at, location, filename", (mailbox, profile)
+            )
+        ]
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def attachments(self, mailbox: str) -> List[Dict[str, Any]]:
+        """Every attachment recorded for a mailbox, newest first"""
+        records = []
+        for r in self._conn.execute(
+            "SELECT * FROM mailbox_attachments WHERE mailbox = ? ORDER BY seq DESC", (mailbox,)
+        ):
+            record = dict(r)
+            record["location"] = json.loads(record["location"])
+            records.append(record)
+        return records
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ==================== MESSAGE PARSING ====================
+
+def _is_resume_attachment(filename: Optional[str]) -> bool:
+    return bool(filename) and filename.lower().endswith(ATTACHMENT_FORMATS)
+
+
+def _header_text(value) -> str:
+    """Header decoded from RFC 2047 encoded words (left as-is if malformed)"""
+    try:
+        return str(make_header(decode_header(str(value))))
+    except (UnicodeError, LookupError, ValueError):
+        return str(value)
+
+
+def parse_message(raw: bytes) -> Dict[str, Any]:
+    """
+    Sender, headers and resume attachments of one raw message
+
+    Returns:
+        {"sender_email", "sender_name", "subject", "message_id",
+        "received_at", "attachments", "error"} with one {"name", "content", "error"}
+        per .pdf/.docx/.txt attachment
+    """
+    msg = BytesParser(policy=policy.compat32).parsebytes(raw)
+    sender_name, sender_email = parseaddr(msg.get("From", ""))
+    try:
+        received_at = parsedate_to_datetime(msg["Date"]).isoformat() if msg["Date"] else None
+    except (TypeError, ValueError, IndexError):
+        received_at = None
+
+    attachments = []
+    for part in msg.walk():
+        if part.is_multipart():
+            continue
+        filename = part.get_filename()
+        if not _is_resume_attachment(filename):
+            continue
+        filename = os.path.basename(_header_text(filename).replace("\\", "/"))
+        content = part.get_payload(decode=True) or b""
+        if len(content) > MAX_ATTACHMENT_BYTES:
+            attachments.append({"name": filename, "content": None,
+                                "error": f"larger than {MAX_ATTACHMENT_BYTES // (1024 * 1024)} MB"})
+        else:
+            attachments.append({"name": filename, "content": content, "error": None})
+
+    return {
+        "sender_email": sender_email.strip().lower(),
+        "sender_name": sender_name.strip(),
+        "subject": _header_text(msg.get("Subject", "")),
+        "message_id": str(msg.get("Message-ID", "")).strip() or None,
+        "received_at": received_at,
+        "attachments": attachments,
+        "error": None,
+    }
+
+
+def _oversize_message() -> Dict[str, Any]:
+    return {"sender_email": "", "sender_name": "", "subject": "", "message_id": None, "received_at": None,
+            "attachments": [], "error": f"message larger than {MAX_MESSAGE_BYTES // (1024 * 1024)} MB"}
+
+
+def _located(message: Dict[str, Any], location: Dict[str, Any]) -> Dict[str, Any]:
+    message["location"] = location
+    return message
+
+
+# ==================== MBOX ====================
+
+def _mbox_head(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read(HEAD_BYTES)).hexdigest()
+
+
+def _iter_mbox(path: str, offset: int) -> Iterator[Tuple[int, int, Optional[bytes]]]:
+    """(start, end offset, raw message or None if oversize) per message from offset on"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        pos = start = offset
+        lines: List[bytes] = []
+        size = 0
+        started = False
+        for line in f:
+            if line.startswith(b"From ") and started:
+                yield start, pos, (None if size > MAX_MESSAGE_BYTES else b"".join(lines))
+                start, lines, size = pos, [], 0
+            started = True
+            pos += len(line)
+            size += len(line)
+            if size <= MAX_MESSAGE_BYTES:
+                lines.append(line)
+            elif lines:
+                lines = []   # stop buffering; the message is reported as oversize
+        if started:
+            yield start, pos, (None if size > MAX_MESSAGE_BYTES else b"".join(lines))
+
+
+def _mbox_start(path: str, mark: Tuple[int, str]) -> int:
+    """Offset to resume from, or 0 when the file was rewritten since the mark"""
+    offset, head = mark
+    if not offset or head != _mbox_head(path) or offset > os.path.getsize(path):
+        return 0
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        following = f.read(5)
+    return offset if following in (b"", b"From ") else 0
+
+
+def _scan_mbox(path: str, state: Optional[MailboxState], profile: Optional[str]) -> Iterator[Dict[str, Any]]:
+    mailbox = mailbox_id(path)
+    offset = _mbox_start(path, state.mbox_mark(mailbox, profile)) if state and profile else 0
+    head = _mbox_head(path)
+    done = offset
+    pending = 0
+    try:
+        for start, end, raw in _iter_mbox(path, offset):
+            message = parse_message(raw) if raw is not None else _oversize_message()
+            yield _located(message, {"offset": start})
+            done = end
+            pending += 1
+            if state and profile and pending >= MARK_EVERY:
+                state.set_mbox_mark(mailbox, profile, done, head)
+                pending = 0
+    finally:
+        if state and profile and pending:
+            state.set_mbox_mark(mailbox, profile, done, head)
+
+
+# ==================== MAILDIR ====================
+
+def _maildir_messages(path: str) -> List[Tuple[str, str]]:
+    """(key, file path) of every message, oldest delivery first (names start with a timestamp)"""
+    messages = []
+    for subdir in ("new", "cur"):
+        folder = os.path.join(path, subdir)
+        for name in os.listdir(folder):
+            if not name.startswith('.'):
+                # Flags after ':' change when mail is read; the key before it does not
+                messages.append((name.split(':', 1)[0], os.path.join(folder, name)))
+    messages.sort()
+    return messages
+
+
+def _scan_maildir(path: str, state: Optional[MailboxState], profile: Optional[str]) -> Iterator[Dict[str, Any]]:
+    mailbox = mailbox_id(path)
+    seen = state.seen_keys(mailbox, profile) if state and profile else set()
+    done: List[str] = []
+    try:
+        for key, filepath in _maildir_messages(path):
+            if key in seen:
+                continue
+            try:
+                if os.path.getsize(filepath) > MAX_MESSAGE_BYTES:
+                    message = _oversize_message()
+                else:
+                    with open(filepath, 'rb') as f:
+                        message = parse_message(f.read())
+            except FileNotFoundError:
+                continue   # moved between new/ and cur/ while scanning; picked up next time
+            yield _located(message, {"key": key})
+            done.append(key)
+            if state and profile and len(done) >= MARK_EVERY:
+                state.mark_seen(mailbox, profile, done)
+                done = []
+    finally:
+        if state and profile and done:
+            state.mark_seen(mailbox, profile, done)
+
+
+def iter_new_messages(path: str, state: Optional[MailboxState] = None,
+                      profile: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Messages of an mbox file or Maildir that arrived since the last scan
+
+    Args:
+        path: mbox file or Maildir directory
+        state: MailboxState holding the high-water marks (None: read everything)
+        profile: Screening profile the marks belong to
+
+    Yields:
+        parse_message() dicts plus "location" (for read_attachment), oldest
+        first. A message counts as processed
+        once the next one is requested, so a crash re-reads at most the
+        messages since the last mark commit.
+    """
+    if is_maildir(path):
+        yield from _scan_maildir(path, state, profile)
+    else:
+        yield from _scan_mbox(path, state, profile)
+
+
+def iter_failed_messages(path: str, state: MailboxState, profile: str) -> Iterator[Dict[str, Any]]:
+    """
+    Messages with attachments that failed to screen in earlier scans
+
+    Yields:
+        parse_message() dicts with "location", "retry" set and only the
+        failed attachments. Failures whose message or attachment is gone
+        are dropped; so are all of them when an mbox was rewritten (it is
+        read again from the start anyway).
+    """
+    mailbox = mailbox_id(path)
+    failures = state.failures(mailbox, profile)
+    if not failures:
+        return
+    if not is_maildir(path) and _mbox_start(path, state.mbox_mark(mailbox, profile)) == 0:
+        state.clear_failures(mailbox, profile)
+        return
+
+    by_message: Dict[str, Set[str]] = {}
+    for failure in failures:
+        by_message.setdefault(json.dumps(failure["location"], sort_keys=True), set()).add(failure["filename"])
+    for location_key, names in by_message.items():
+        location = json.loads(location_key)
+        message = read_message(path, location)
+        attachments = [a for a in message["attachments"] if a["name"] in names] if message else []
+        for name in names - {a["name"] for a in attachments}:
+            state.clear_failure(mailbox, profile, location, name)
+        if attachments:
+            message.update(attachments=attachments, retry=True)
+            yield message
+
+
+def read_message(path: str, location: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    One message re-read from its location, parsed as by iter_new_messages
+
+    Returns:
+        None when the message is gone (or the mbox no longer has one there)
+    """
+    try:
+        if "offset" in location:
+            _start, _end, raw = next(_iter_mbox(path, location["offset"]), (0, 0, None))
+            if raw is not None and not raw.startswith(b"From "):
+                raw = None
+        else:
+            raw = None
+            for key, filepath in _maildir_messages(path):
+                if key == location["key"]:
+                    with open(filepath, 'rb') as f:
+                        raw = f.read()
+                    break
+    except OSError:
+        return None
+    return _located(parse_message(raw), location) if raw is not None else None
+
+
+def read_attachment(path: str, location: Dict[str, Any], filename: str) -> Optional[bytes]:
+    """
+    Bytes of one attachment, re-read from its message (for downloads)
+
+    Returns:
+        None when the message is gone or no longer has that attachment
+    """
+    message = read_message(path, location)
+    for attachment in message["attachments"] if message else []:
+        if attachment["name"] == filename:
+            return attachment["content"]
+    return None
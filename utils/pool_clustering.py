@@ -0,0 +1,129 @@
+"""
+Pool Clustering for RecruitNova
+Groups a screened pool into profile segments (e.g. data-heavy, frontend,
+DevOps-leaning) with MiniBatch k-means over each candidate's SKILLS_DB
+bits and radar dimension scores. Memory and time grow linearly with the
+pool; no pairwise similarity matrix is ever built.
+"""
+
+import math
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+
+from utils.extract import SKILLS_DB, pack_skill_masks, unpack_skill_masks
+from utils.radar_chart import DIMENSIONS, calculate_dimensions_from_text, parse_skills_to_dimensions
+from utils.shortlist import row_skill_mask
+
+
+DIMENSION_WEIGHT = 0.5   # a dimension at 100 weighs half a skill
+MAX_AUTO_CLUSTERS = 10
+SKILL_SHARE = 0.4        # a skill describes a cluster when this share of its members have it
+TOP_MEMBERS = 5
+BATCH_SIZE = 1024
+
+_SKILLS = list(SKILLS_DB)
+
+
+def row_dimensions(row: Dict[str, Any]) -> Dict[str, int]:
+    """Radar dimension scores of a result row, computed once and kept on the row"""
+    if row.get("dimensions") is None:
+        if row.get("resume_text"):
+            row["dimensions"] = calculate_dimensions_from_text(row["resume_text"])
+        else:
+            row["dimensions"] = parse_skills_to_dimensions(row.get("skills") or "")
+    return row["dimensions"]
+
+
+def candidate_features(rows: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Feature matrix of a pool: one 0/1 column per skill, then the dimensions
+
+    Returns:
+        float32 array of shape (len(rows), len(SKILLS_DB) + len(DIMENSIONS))
+    """
+    skills = unpack_skill_masks(pack_skill_masks(row_skill_mask(row) for row in rows)).astype(np.float32)
+    dimensions = np.array(
+        [[row_dimensions(row).get(name, 0) for name in DIMENSIONS] for row in rows], dtype=np.float32
+    ).reshape(len(rows), len(DIMENSIONS))
+    return np.hstack([skills, dimensions * (DIMENSION_WEIGHT / 100)])
+
+
+def auto_cluster_count(n: int) -> int:
+    """Rule-of-thumb k for a pool of n: sqrt(n / 2), between 2 and MAX_AUTO_CLUSTERS"""
+    return max(2, min(MAX_AUTO_CLUSTERS, round(math.sqrt(n / 2))))
+
+
+def _summary(members: np.ndarray, features: np.ndarray, pool_share: np.ndarray, scores: np.ndarray,
+             rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Exact member means (mini-batch centres are only approximate)
+    centroid = features[members].mean(axis=0)
+    skill_share = centroid[:len(_SKILLS)]
+    top = np.argsort(-skill_share, kind="stable")
+    skills = [(_SKILLS[i], round(float(skill_share[i]) * 100)) for i in top if skill_share[i] >= SKILL_SHARE]
+    # Named after what sets it apart: skills common here but not pool-wide
+    lift = skill_share - pool_share
+    distinctive = [_SKILLS[i] for i in np.argsort(-lift, kind="stable")[:3]
+                   if lift[i] > 0 and skill_share[i] >= SKILL_SHARE]
+    dimension_means = {
+        name: round(float(v) * 100 / DIMENSION_WEIGHT) for name, v in zip(DIMENSIONS, centroid[len(_SKILLS):])
+    }
+    lean = max(dimension_means, key=dimension_means.get)
+    member_scores = scores[members]
+    ranked = members[np.argsort(-member_scores, kind="stable")]
+    fit_counts = {}
+    for i in members:
+        fit_counts[rows[i].get("fit", "")] = fit_counts.get(rows[i].get("fit", ""), 0) + 1
+
+    return {
+        "label": " · ".join(distinctive) or f"{lean}-leaning",
+        "size": int(len(members)),
+        "skills": skills,
+        "dimensions": dimension_means,
+        "lean": lean,
+        "score_min": float(member_scores.min()),
+        "score_median": float(np.median(member_scores)),
+        "score_max": float(member_scores.max()),
+        "fit_counts": fit_counts,
+        "members": ranked.tolist(),
+        "top_members": [rows[i]["candidate_name"] for i in ranked[:TOP_MEMBERS]],
+    }
+
+
+def cluster_pool(
+    rows: List[Dict[str, Any]],
+    n_clusters: Optional[int] = None,
+    random_state: int = 0
+) -> Dict[str, Any]:
+    """
+    Segment a screened pool by skills and profile dimensions
+
+    Args:
+        rows: Screened result rows
+        n_clusters: Number of segments; None picks one from the pool size
+
+    Returns:
+        Dictionary with labels (segment per row) and clusters (summaries,
+        largest first: label, size, centroid skills with member share,
+        dimension means, score range, fit counts and members by score)
+    """
+    if len(rows) < 2:
+        raise ValueError("Need at least 2 candidates to cluster")
+    features = candidate_features(rows)
+    k = min(n_clusters or auto_cluster_count(len(rows)), len(rows))
+
+    model = MiniBatchKMeans(
+        n_clusters=k, batch_size=BATCH_SIZE, n_init=3, random_state=random_state
+    ).fit(features)
+
+    labels = model.labels_
+    scores = np.array([row.get("overall_score") or 0 for row in rows], dtype=np.float32)
+    pool_share = features[:, :len(_SKILLS)].mean(axis=0)
+    clusters = []
+    for c in range(k):
+        members = np.flatnonzero(labels == c)
+        if len(members):
+            clusters.append(dict(_summary(members, features, pool_share, scores, rows), id=c))
+    clusters.sort(key=lambda cluster: -cluster["size"])
+    return {"labels": labels.tolist(), "clusters": clusters}
@@ -7,6 +7,9 @@ import plotly.graph_objects as go
 import re
 from typing import Dict, List, Tuple
 
+# Dimensions scored by calculate_dimensions_from_text, in display order
+DIMENSIONS = ['Technical Skills', 'Communication', 'Leadership', 'Problem Solving', 'Domain Knowledge', 'Adaptability']
+
 
 def parse_skills_to_dimensions(skills_text: str) -> Dict[str, int]:
     """
@@ -0,0 +1,236 @@
+"""
+Stored Resume Index for RecruitNova
+Keeps a metadata index of the stored resumes folder so the browser can page,
+filter and sort without opening every file on each rerun
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Any, Tuple
+
+from utils.extract import extract_skills
+from utils.safe_extract import extract_text_isolated, ExtractionError
+
+
+# The index lives outside the resumes folder, so it is never listed as a resume
+INDEX_DIR = "data"
+SUPPORTED_FORMATS = ('.pdf', '.docx', '.txt')
+TOP_SKILLS_COUNT = 5
+HASH_CHUNK_SIZE = 1024 * 1024
+
+SORT_FIELDS = {
+    "Upload time": "uploaded_at",
+    "Name": "name",
+    "Size": "size",
+    "Last score": "last_score",
+}
+
+# In-process cache: resumes_dir -> (index file mtime, index dict)
+_index_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _index_path(resumes_dir: str) -> str:
+    folder_name = os.path.basename(os.path.abspath(resumes_dir))
+    return os.path.join(INDEX_DIR, f"{folder_name}_index.json")
+
+
+def _hash_file(filepath: str) -> str:
+    """MD5 of a file, read in chunks (same digest as get_file_hash on the full bytes)"""
+    digest = hashlib.md5()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _top_skills(filepath: str, filename: str) -> List[str]:
+    """Extract the first few skills of a resume (runs once per new or changed file)"""
+    with open(filepath, 'rb') as f:
+        content = f.read()
+    try:
+        text = extract_text_isolated(filename, content)
+    except ExtractionError:
+        return []
+    return extract_skills(text)[:TOP_SKILLS_COUNT]
+
+
+def load_index(resumes_dir: str) -> Dict[str, Any]:
+    """Load the index from disk, reusing the cached copy while the file is unchanged"""
+    path = _index_path(resumes_dir)
+    if not os.path.exists(path):
+        return {"entries": {}}
+
+    mtime = os.path.getmtime(path)
+    cached = _index_cache.get(resumes_dir)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with open(path, 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {"entries": {}}
+
+    _index_cache[resumes_dir] = (mtime, index)
+    return index
+
+
+def save_index(resumes_dir: str, index: Dict[str, Any]) -> None:
+    """Write the index atomically so a crash never leaves a half-written file"""
+    path = _index_path(resumes_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, path)
+    _index_cache[resumes_dir] = (os.path.getmtime(path), index)
+
+
+def refresh_index(resumes_dir: str, force: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Bring the index in line with the folder contents
+
+    Every scan stats the folder entries (one cheap scandir); files are hashed
+    and parsed only when they are new or their size or mtime changed, which
+    also catches a resume overwritten in place under the same name. With
+    force, every file is read again.
+
+    Returns:
+        Dictionary mapping filename to metadata entry
+    """
+    if not os.path.isdir(resumes_dir):
+        return {}
+
+    index = load_index(resumes_dir)
+    old_entries = index.get("entries", {})
+    entries = {}
+    changed = False
+
+    with os.scandir(resumes_dir) as it:
+        for item in it:
+            if not item.is_file() or not item.name.lower().endswith(SUPPORTED_FORMATS):
+                continue
+
+            stat = item.stat()
+            old = old_entries.get(item.name)
+            if (not force and old and old.get("size") == stat.st_size
+                    and old.get("mtime_ns") == stat.st_mtime_ns):
+                entries[item.name] = old
+                continue
+
+            changed = True
+            try:
+                top_skills = _top_skills(item.path, item.name)
+                file_hash = _hash_file(item.path)
+            except OSError:
+                continue
+
+            same_content = old is not None and old.get("hash") == file_hash
+            entries[item.name] = {
+                "name": item.name,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "hash": file_hash,
+                "uploaded_at": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec='seconds'),
+                "top_skills": top_skills,
+                # Keep the score if only the timestamp moved but the content is the same
+                "last_score": old.get("last_score") if same_content else None,
+                "last_screened_at": old.get("last_screened_at") if same_content else None,
+            }
+
+    if changed or entries.keys() != old_entries.keys():
+        index = {"entries": entries}
+        save_index(resumes_dir, index)
+
+    return index["entries"]
+
+
+def query_index(
+    entries: Dict[str, Dict[str, Any]],
+    search: str = "",
+    skill: str = "",
+    sort_by: str = "uploaded_at",
+    descending: bool = True,
+    page: int = 1,
+    page_size: int = 25
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Filter, sort and paginate index entries
+
+    Args:
+        entries: Index entries from refresh_index
+        search: Case-insensitive filename substring
+        skill: Canonical skill that must be among the top skills
+        sort_by: Entry field to sort on
+        descending: Sort direction
+        page: 1-based page number
+        page_size: Rows per page
+
+    Returns:
+        Tuple of (rows for the page, total number of matching rows)
+    """
+    search = search.strip().lower()
+    skill = skill.strip().lower()
+
+    rows = [
+        entry for entry in entries.values()
+        if (not search or search in entry["name"].lower())
+        and (not skill or skill in entry.get("top_skills", []))
+    ]
+
+    if sort_by == "last_score":
+        # Unscored resumes always sort last
+        scored = [e for e in rows if e.get("last_score") is not None]
+        unscored = [e for e in rows if e.get("last_score") is None]
+        scored.sort(key=lambda e: e["last_score"], reverse=descending)
+        rows = scored + unscored
+    elif sort_by == "size":
+        rows.sort(key=lambda e: e.get("size", 0), reverse=descending)
+    else:
+        rows.sort(key=lambda e: str(e.get(sort_by, "")).lower(), reverse=descending)
+
+    start = max(0, (page - 1) * page_size)
+    return rows[start:start + page_size], len(rows)
+
+
+def record_scores(resumes_dir: str, results: List[Dict[str, Any]]) -> int:
+    """
+    Store the latest screening score on index entries with matching content hash
+
+    Returns:
+        Number of entries updated
+    """
+    scores = {r.get("hash"): r.get("overall_score") for r in results if r.get("hash")}
+    if not scores:
+        return 0
+
+    index = load_index(resumes_dir)
+    entries = index.get("entries", {})
+    now = datetime.now().isoformat(timespec='seconds')
+    updated = 0
+
+    for entry in entries.values():
+        if entry.get("hash") in scores:
+            entry["last_score"] = scores[entry["hash"]]
+            entry["last_screened_at"] = now
+            updated += 1
+
+    if updated:
+        save_index(resumes_dir, index)
+    return updated
+
+
+def read_resume_bytes(resumes_dir: str, name: str) -> bytes:
+    """Read one stored resume; only called when a download is requested"""
+    with open(os.path.join(resumes_dir, os.path.basename(name)), 'rb') as f:
+        return f.read()
+
+
+def delete_resume(resumes_dir: str, name: str) -> None:
+    """Delete a stored resume and drop it from the index"""
+    os.remove(os.path.join(resumes_dir, os.path.basename(name)))
+    index = load_index(resumes_dir)
+    if index.get("entries", {}).pop(name, None) is not None:
+        save_index(resumes_dir, index)
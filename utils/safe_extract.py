@@ -0,0 +1,361 @@
+"""
+Isolated Text Extraction for RecruitNova
+Parses PDF and DOCX files in separate worker processes with a wall-clock
+timeout, a memory cap and a page cap, so one malformed or huge upload cannot
+stall or bloat a whole screening run. Files that hang or crash a worker are
+quarantined by content hash and skipped on later runs. Long PDFs are split
+into page ranges that the workers read in parallel.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from utils.extract import NO_TEXT_ERROR, extract_text_with_status
+from utils.shared_spool import is_blob_ref, read_blob, blob_md5
+
+try:
+    import resource  # POSIX only
+except ImportError:
+    resource = None
+
+
+EXTRACT_TIMEOUT_SECONDS = 30
+EXTRACT_QUEUE_TIMEOUT_SECONDS = 300   # longest wait for a free worker before giving up as busy
+EXTRACT_MEMORY_LIMIT_MB = 512   # address space a worker may add while parsing
+MAX_SCORING_PAGES = 15   # resumes are short; later pages add nothing to scoring
+EXTRACT_WORKERS = 2
+PAGES_PER_TASK = 5   # longer PDFs are split into page ranges across the workers
+
+QUARANTINE_PATH = os.path.join("data", "extraction_quarantine.json")
+
+# Only these formats run a parser worth isolating; text is decoded inline
+ISOLATED_FORMATS = ('.pdf', '.docx')
+
+_CPU_COUNT = os.cpu_count() or 1
+_quarantine_lock = threading.Lock()
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+class ExtractionError(Exception):
+    """Extraction failed; status is one of failed, timeout, crashed, quarantined, busy"""
+
+    def __init__(self, message, status="failed"):
+        super().__init__(message)
+        self.status = status
+
+
+# ==================== QUARANTINE ====================
+
+def load_quarantine(path: str = QUARANTINE_PATH) -> Dict[str, Dict[str, Any]]:
+    """Quarantined files keyed by content hash"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_quarantine(entries: Dict[str, Dict[str, Any]], path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(entries, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def quarantine_file(content_hash: str, filename: str, reason: str, path: str = QUARANTINE_PATH) -> None:
+    with _quarantine_lock:
+        entries = load_quarantine(path)
+        entries[content_hash] = {
+            "filename": filename,
+            "reason": reason,
+            "quarantined_at": datetime.now().isoformat(timespec='seconds'),
+        }
+        _save_quarantine(entries, path)
+
+
+def release_from_quarantine(content_hash: str, path: str = QUARANTINE_PATH) -> bool:
+    """Allow a quarantined file to be extracted again"""
+    with _quarantine_lock:
+        entries = load_quarantine(path)
+        if entries.pop(content_hash, None) is None:
+            return False
+        _save_quarantine(entries, path)
+        return True
+
+
+# ==================== WORKER PROCESS ====================
+
+def _address_space_bytes() -> int:
+    """Current virtual memory size of this process (0 where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _worker_main(conn, memory_limit_mb):
+    """Extraction loop run in the child process"""
+    if resource is not None and memory_limit_mb:
+        # Forked workers inherit the parent's mappings (large for a Streamlit
+        # server), so the cap is headroom on top of what is already mapped
+        limit = _address_space_bytes() + memory_limit_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        name, content, first_page, max_pages = task
+        if is_blob_ref(content):
+            content = read_blob(content)
+        file_like = BytesIO(content)
+        file_like.name = name
+        try:
+            result = extract_text_with_status(file_like, max_pages=max_pages, first_page=first_page)
+        except MemoryError:
+            result = {"text": "", "error": "memory limit exceeded", "pages": 0, "truncated": False}
+        conn.send(result)
+
+
+class _Worker:
+    def __init__(self, ctx, memory_limit_mb):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, memory_limit_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        try:
+            self.process.kill()
+            self.process.join(timeout=5)
+        finally:
+            self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+            self.process.join(timeout=2)
+        except (OSError, ValueError):
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+class ExtractionPool:
+    """
+    Fixed-size set of extraction processes, safe to share between threads
+
+    A worker that times out or dies is killed and replaced; the document that
+    caused it is quarantined. The timeout covers the parse only: time spent
+    waiting for a free worker does not count, and a document that could not
+    get one within queue_timeout fails as busy (and is not quarantined).
+    """
+
+    def __init__(
+        self,
+        workers: int = EXTRACT_WORKERS,
+        timeout: float = EXTRACT_TIMEOUT_SECONDS,
+        memory_limit_mb: int = EXTRACT_MEMORY_LIMIT_MB,
+        max_pages: Optional[int] = MAX_SCORING_PAGES,
+        quarantine_path: str = QUARANTINE_PATH,
+        queue_timeout: float = EXTRACT_QUEUE_TIMEOUT_SECONDS
+    ):
+        self.size = max(1, workers)
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_pages = max_pages
+        self.quarantine_path = quarantine_path
+        self._ctx = multiprocessing.get_context()
+        self._idle = []
+        self._started = 0
+        self._cond = threading.Condition()
+
+    def _acquire(self, wait: Optional[float] = None) -> Optional[_Worker]:
+        """A free worker, or None when none became free within wait seconds"""
+        give_up = None if wait is None else time.perf_counter() + wait
+        with self._cond:
+            while not self._idle and self._started >= self.size:
+                remaining = None if give_up is None else give_up - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            if self._idle:
+                return self._idle.pop()
+            self._started += 1
+        try:
+            return _Worker(self._ctx, self.memory_limit_mb)
+        except Exception:
+            with self._cond:
+                self._started -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, worker: Optional[_Worker]) -> None:
+        with self._cond:
+            if worker is None:
+                self._started -= 1  # a replacement starts lazily on the next request
+            else:
+                self._idle.append(worker)
+            self._cond.notify()
+
+    def extract(self, name: str, content, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Extract one document in a worker process
+
+        Args:
+            name: File name (its extension picks the parser)
+            content: File bytes, or a shared spool reference; workers read
+                a reference themselves so the bytes are not piped to them
+            timeout: Seconds a worker may parse before it is killed (default
+                self.timeout); counted from when the worker was acquired
+
+        Returns:
+            Dictionary with text, pages, truncated, elapsed_ms and status
+            ("ok", or the failure status with error set)
+        """
+        started = time.perf_counter()
+        content_hash = blob_md5(content) if is_blob_ref(content) else hashlib.md5(content).hexdigest()
+
+        def finish(result, status):
+            result.update(status=status, elapsed_ms=round((time.perf_counter() - started) * 1000, 1))
+            return result
+
+        quarantined = load_quarantine(self.quarantine_path).get(content_hash)
+        if quarantined:
+            return finish(
+                {"text": "", "error": f"quarantined: {quarantined['reason']}", "pages": 0, "truncated": False},
+                "quarantined",
+            )
+
+        if not name.lower().endswith(ISOLATED_FORMATS):
+            file_like = BytesIO(read_blob(content) if is_blob_ref(content) else content)
+            file_like.name = name
+            result = extract_text_with_status(file_like)
+            return finish(result, "failed" if result["error"] else "ok")
+
+        timeout = self.timeout if timeout is None else timeout
+
+        first_pages = self.max_pages
+        if self.size > 1 and _CPU_COUNT > 1 and name.lower().endswith('.pdf'):
+            first_pages = PAGES_PER_TASK if self.max_pages is None else min(PAGES_PER_TASK, self.max_pages)
+
+        result, reason, status = self._run(name, content, 0, first_pages, timeout)
+        if result is not None and first_pages != self.max_pages and not _is_hard_error(result):
+            # The first range reported the page count; read the rest in parallel
+            stop = result["pages"] if self.max_pages is None else min(result["pages"], self.max_pages)
+            ranges = [(first, min(PAGES_PER_TASK, stop - first)) for first in range(first_pages, stop, PAGES_PER_TASK)]
+            if ranges:
+                with ThreadPoolExecutor(max_workers=min(self.size, len(ranges))) as threads:
+                    parts = list(threads.map(lambda r: self._run(name, content, r[0], r[1], timeout), ranges))
+                for part, part_reason, part_status in parts:
+                    if part is None:
+                        result, reason, status = None, part_reason, part_status
+                        break
+                    if _is_hard_error(part):
+                        result = part
+                        break
+                    result["text"] += "\n" + part["text"]
+                else:
+                    result["truncated"] = self.max_pages is not None and result["pages"] > self.max_pages
+                    result["error"] = None if result["text"].strip() else NO_TEXT_ERROR
+
+        if result is not None:
+            return finish(result, "failed" if result["error"] else "ok")
+
+        if status != "busy":
+            # Only a parse that used up its own timeout (or crashed) marks the file
+            quarantine_file(content_hash, name, reason, self.quarantine_path)
+        return finish({"text": "", "error": reason, "pages": 0, "truncated": False}, status)
+
+    def _run(self, name: str, content: bytes, first_page: int, max_pages: Optional[int], timeout: float):
+        """
+        Run one page range in one worker, with timeout seconds from when the worker is free
+
+        Returns:
+            Tuple of (result, None, None), or (None, reason, status) after the
+            worker timed out or died and was killed, or no worker was free
+        """
+        worker = self._acquire(self.queue_timeout)
+        if worker is None:
+            return None, f"extraction workers busy for {self.queue_timeout:g}s", "busy"
+        deadline = time.perf_counter() + timeout
+        try:
+            worker.conn.send((name, content, first_page, max_pages))
+            remaining = max(0.0, deadline - time.perf_counter())
+            if worker.conn.poll(remaining):
+                result = worker.conn.recv()
+                self._release(worker)
+                return result, None, None
+            reason, status = f"timed out after {timeout:g}s", "timeout"
+        except (EOFError, OSError):
+            reason, status = "extractor crashed (memory limit or malformed file)", "crashed"
+
+        worker.kill()
+        self._release(None)
+        return None, reason, status
+
+    def close(self) -> None:
+        with self._cond:
+            workers, self._idle = self._idle, []
+            self._started -= len(workers)
+        for worker in workers:
+            worker.stop()
+
+
+def _is_hard_error(result: Dict[str, Any]) -> bool:
+    """A failure other than a blank page range (those are judged on the whole document)"""
+    return bool(result["error"]) and result["error"] != NO_TEXT_ERROR
+
+
+def configure_extraction_pool(**kwargs) -> ExtractionPool:
+    """Replace the process-wide pool, e.g. with fewer workers or a shorter timeout"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is not None:
+            _default_pool.close()
+        _default_pool = ExtractionPool(**kwargs)
+        return _default_pool
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Process-wide pool, started on first use"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ExtractionPool()
+        return _default_pool
+
+
+def extract_text_isolated(name: str, content, pool: Optional[ExtractionPool] = None) -> str:
+    """
+    Text of a resume for scoring, extracted with isolation and limits
+
+    Raises:
+        ExtractionError with the per-file reason when no text is available
+    """
+    result = (pool or get_extraction_pool()).extract(name, content)
+    if result["error"]:
+        raise ExtractionError(result["error"], result["status"])
+    return result["text"]
@@ -0,0 +1,755 @@
+"""
+Screening Core for RecruitNova
+Streamlit-free resume screening shared by the admin dashboard and the
+headless CLI (recruitnova.py)
+"""
+
+import os
+import re
+import hashlib
+from io import BytesIO
+from itertools import chain
+from typing import Callable, Dict, Any, Optional
+
+from utils.extract import extract_skills, match_job_skills, skills_to_mask
+from utils.experience import estimate_experience_years, experience_percentage, classify_experience_level
+from utils.ranking import calculate_final_score
+from utils.analyzer import analyze_resume
+from utils.checkpoints import STATUS_SCREENED, STATUS_REUSED, STATUS_FAILED
+from utils.safe_extract import extract_text_isolated
+from utils.shared_spool import is_blob_ref, blob_md5
+from utils.archive_ingest import (
+    ARCHIVE_FORMATS, ArchiveError, is_archive, iter_archive_members, iter_archive_file
+)
+from utils.mailbox_ingest import (
+    DB_PATH as MAILBOX_DB, MailboxState, is_mailbox, mailbox_id, iter_new_messages, iter_failed_messages
+)
+
+
+SUPPORTED_FORMATS = ('.pdf', '.docx', '.txt')
+
+
+# ==================== JOB PROFILE ====================
+def jd_keyword_set(job_desc):
+    """Words longer than 3 characters in a JD, as matched by the ATS keyword score"""
+    return {kw for kw in job_desc.lower().split() if len(kw) > 3}
+
+
+def build_job_profile(job_desc, required_years=3):
+    """
+    Parse a JD once into what screening compares every resume against
+
+    Returns:
+        JSON-serialisable dict: skills, keywords and required_years
+    """
+    return {
+        "skills": extract_skills(job_desc),
+        "keywords": sorted(jd_keyword_set(job_desc)),
+        "required_years": required_years,
+    }
+
+
+def match_profile_skills(resume_skills, profile):
+    """match_job_skills against the skills of a parsed job profile"""
+    job_mask = skills_to_mask(profile["skills"])
+    if not resume_skills or not job_mask:
+        return 0
+    common = (skills_to_mask(resume_skills) & job_mask).bit_count()
+    return min(100, (common / job_mask.bit_count()) * 100)
+
+
+# ==================== ATS SCORE CALCULATION ====================
+def calculate_ats_score(resume_text, job_desc, jd_keywords=None):
+    """
+    Calculate ATS (Applicant Tracking System) score
+    ATS evaluates resume format, keywords, and structure
+
+    Args:
+        jd_keywords: Keywords already taken from job_desc (see build_job_profile)
+    """
+    ats_score = 0
+    ats_details = {
+        "format_score": 0,
+        "keyword_score": 0,
+        "structure_score": 0,
+        "content_score": 0,
+        "issues": []
+    }
+    
+    # 1. FORMAT SCORE (25 points max)
+    format_score = 0
+    if len(resume_text) < 500:
+        ats_details["issues"].append("❗️ Resume too short (ATS may not parse)")
+    else:
+        format_score += 10
+    
+    if '\n' in resume_text and len(resume_text.split('\n')) > 20:
+        format_score += 10
+    else:
+        ats_details["issues"].append("❗️ Poor formatting/structure")
+    
+    if not any(char in resume_text for char in ['@', '.']):
+        ats_details["issues"].append("❗️ No contact information found")
+    else:
+        format_score += 5
+    
+    ats_details["format_score"] = format_score
+    ats_score += format_score
+    
+    # 2. KEYWORD SCORE (35 points max)
+    keyword_score = 0
+    resume_lower = resume_text.lower()
+    
+    # Extract keywords from JD
+    if jd_keywords is None:
+        jd_keywords = jd_keyword_set(job_desc)
+    
+    # Count matching keywords
+    matching_keywords = 0
+    for keyword in jd_keywords:
+        if keyword in resume_lower:
+            matching_keywords += 1
+    
+    if jd_keywords:
+        keyword_match_percent = (matching_keywords / len(jd_keywords)) * 100
+        keyword_score = min(35, int(keyword_match_percent * 0.35))  # Max 35 points
+    else:
+        keyword_score = 20
+    
+    if matching_keywords == 0:
+        ats_details["issues"].append("❗️ Very few keywords match job description")
+    
+    ats_details["keyword_score"] = keyword_score
+    ats_score += keyword_score
+    
+    # 3. STRUCTURE SCORE (20 points max)
+    structure_score = 0
+    sections = ["experience", "education", "skill", "project", "summary"]
+    found_sections = sum(1 for section in sections if section in resume_lower)
+    
+    structure_score = min(20, found_sections * 4)
+    
+    if found_sections < 2:
+        ats_details["issues"].append("âš ï¸ Missing important sections (Experience/Education)")
+    
+    ats_details["structure_score"] = structure_score
+    ats_score += structure_score
+    
+    # 4. CONTENT SCORE (20 points max)
+    content_score = 0
+    
+    # Check for numbers/metrics (indicates quantified achievements)
+    if any(char.isdigit() for char in resume_text):
+        content_score += 7
+    else:
+        ats_details["issues"].append("âš ï¸ No quantified achievements/metrics")
+    
+    # Check for action verbs
+    action_verbs = ["developed", "managed", "led", "created", "implemented", "designed", 
+                    "achieved", "increased", "improved", "reduced", "built"]
+    action_count = sum(1 for verb in action_verbs if verb in resume_lower)
+    content_score += min(8, action_count)
+    
+    # Check for relevant experience keywords
+    if "year" in resume_lower or "month" in resume_lower:
+        content_score += 5
+    else:
+        ats_details["issues"].append("❗️ Duration of experience not clearly mentioned")
+    
+    ats_details["content_score"] = content_score
+    ats_score += content_score
+    
+    # Final ATS Score (0-100)
+    ats_score = min(100, ats_score)
+    
+    # Determine ATS Rating
+    if ats_score >= 80:
+        ats_rating = "👏 Excellent"
+    elif ats_score >= 60:
+        ats_rating = "👌 Good"
+    elif ats_score >= 40:
+        ats_rating = "👍🏻  Fair"
+    else:
+        ats_rating = "👎🏻 Poor"
+    
+    return {
+        "ats_score": round(ats_score, 2),
+        "ats_rating": ats_rating,
+        "format_score": format_score,
+        "keyword_score": keyword_score,
+        "structure_score": structure_score,
+        "content_score": content_score,
+        "issues": ats_details["issues"]
+    }
+
+
+def get_file_hash(file_content):
+    """Get hash of file for duplicate detection"""
+    return hashlib.md5(file_content).hexdigest()
+
+def detect_duplicates(resumes_data):
+    """Detect duplicate resumes"""
+    hashes = {}
+    duplicates = []
+    
+    for idx, resume in enumerate(resumes_data):
+        file_hash = resume.get("hash")
+        if file_hash in hashes:
+            duplicates.append((idx, hashes[file_hash]))
+            resume["is_duplicate"] = True
+        else:
+            hashes[file_hash] = idx
+            resume["is_duplicate"] = False
+    
+    return resumes_data
+
+def extract_contact_from_resume(resume_text):
+    """Extract email and contact from resume"""
+    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+    phone_pattern = r'(\+\d{1,3}[-.\\s]?)?\d{3}[-.\\s]?\d{3}[-.\\s]?\d{4}'
+    
+    email = re.search(email_pattern, resume_text)
+    phone = re.search(phone_pattern, resume_text)
+    
+    return {
+        "email": email.group(0) if email else "Not provided",
+        "contact": phone.group(0) if phone else "Not provided"
+    }
+
+def screen_single_resume(job_desc, resume_file):
+    """Screen a single resume against JD - USES YOUR ORIGINAL LOGIC + ATS"""
+    try:
+        # Parsed in an isolated worker with time/memory/page limits;
+        # raises with the failure reason instead of returning ''
+        # A spool reference goes to the extractor as-is so the bytes are not piped
+        if is_blob_ref(resume_file):
+            resume_text = extract_text_isolated(resume_file["name"], resume_file)
+        else:
+            resume_text = extract_text_isolated(resume_file.name, resume_file.getvalue())
+        skills = extract_skills(resume_text)
+        exp_years = estimate_experience_years(resume_text)
+        skill_match = match_job_skills(skills, job_desc)
+        exp_match = experience_percentage(exp_years, 3)
+        final_score = calculate_final_score(skill_match, exp_match)
+        exp_label = classify_experience_level(exp_years)
+        analysis = analyze_resume(resume_text, job_desc)
+        contact_info = extract_contact_from_resume(resume_text)
+        
+        # NEW: Calculate ATS Score
+        ats_data = calculate_ats_score(resume_text, job_desc)
+        
+        return {
+            "status": "success",
+            "text": resume_text,
+            "skills": skills,
+            "exp_years": exp_years,
+            "skill_match": skill_match,
+            "exp_match": exp_match,
+            "final_score": final_score,
+            "exp_label": exp_label,
+            "analysis": analysis,
+            "email": contact_info["email"],
+            "contact": contact_info["contact"],
+            "ats_score": ats_data["ats_score"],
+            "ats_rating": ats_data["ats_rating"],
+            "ats_details": ats_data
+        }
+    
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+def classify_fit(score):
+    """Fit bucket used in every ranked result table"""
+    if score >= 75:
+        return "Strongly Fit"
+    elif score >= 50:
+        return "Mid Fit"
+    return "Low Fit"
+
+
+def candidate_name_from_filename(filename):
+    return filename.replace('.pdf', '').replace('.docx', '').replace('.txt', '')
+
+
+def screen_upload(job_desc, name, file_content):
+    """
+    Screen one uploaded resume given its name and bytes
+
+    file_content may also be a shared spool reference (workers of the
+    screening service get those); the row then carries the reference.
+
+    Returns:
+        Result row in the ranked-table format
+
+    Raises:
+        ValueError with the reason when the resume cannot be screened
+    """
+    # plotly is only needed once there is a timeline to build
+    from utils.timeline_generator import extract_timeline_from_resume
+
+    if is_blob_ref(file_content):
+        resume_file = dict(file_content, name=name)
+        file_hash = blob_md5(file_content)
+    else:
+        resume_file = BytesIO(file_content)
+        resume_file.name = name
+        file_hash = get_file_hash(file_content)
+    result = screen_single_resume(job_desc, resume_file)
+    if result["status"] != "success":
+        raise ValueError(result["message"])
+
+    # Extract timeline events
+    timeline_events = extract_timeline_from_resume(result.get("text", ""))
+
+    return {
+        "candidate_name": candidate_name_from_filename(name),
+        "email": result.get("email", "Not provided"),
+        "contact": result.get("contact", "Not provided"),
+        "skills": ", ".join(result["skills"][:5]),
+        "skill_mask": skills_to_mask(result["skills"]),
+        "experience_level": result["exp_label"],
+        "skill_match": round(result["skill_match"], 2),
+        "exp_match": round(result["exp_match"], 2),
+        "overall_score": round(result["final_score"], 2),
+        "ats_score": result.get("ats_score", 0),
+        "ats_rating": result.get("ats_rating", "N/A"),
+        "fit": classify_fit(result["final_score"]),
+        "hash": file_hash,
+        "resume_path": None,
+        "original_filename": name,
+        "ats_details": result.get("ats_details", {}),
+        "resume_text": result.get("text", ""),  # Store full text
+        "timeline_events": timeline_events      # Store extracted timeline
+    }
+
+
+def screen_upload_quick(job_desc, name, file_content, required_years=3):
+    """
+    First ranking stage for one upload: skill and experience score only
+
+    ATS, timeline and predictions are left to staged_ranking.run_stages for
+    the rows that rank high enough; the row keeps the text and skills they need.
+
+    Returns:
+        Result row in the ranked-table format, with stages == ["score"]
+
+    Raises:
+        ValueError with the reason when the resume cannot be screened
+    """
+    if is_blob_ref(file_content):
+        resume_text = extract_text_isolated(name, dict(file_content, name=name))
+        file_hash = blob_md5(file_content)
+    else:
+        resume_text = extract_text_isolated(name, file_content)
+        file_hash = get_file_hash(file_content)
+
+    skills = extract_skills(resume_text)
+    exp_years = estimate_experience_years(resume_text)
+    skill_match = match_job_skills(skills, job_desc)
+    exp_match = experience_percentage(exp_years, required_years)
+    final_score = calculate_final_score(skill_match, exp_match)
+    contact_info = extract_contact_from_resume(resume_text)
+
+    return {
+        "candidate_name": candidate_name_from_filename(name),
+        "email": contact_info["email"],
+        "contact": contact_info["contact"],
+        "skills": ", ".join(skills[:5]),
+        "skill_mask": skills_to_mask(skills),
+        "experience_level": classify_experience_level(exp_years),
+        "skill_match": round(skill_match, 2),
+        "exp_match": round(exp_match, 2),
+        "overall_score": round(final_score, 2),
+        "ats_score": None,
+        "ats_rating": "Not analysed",
+        "fit": classify_fit(final_score),
+        "hash": file_hash,
+        "resume_path": None,
+        "original_filename": name,
+        "ats_details": {},
+        "resume_text": resume_text,
+        "timeline_events": [],
+        "skill_list": skills,
+        "exp_years": exp_years,
+        "stages": ["score"],
+    }
+
+
+def screen_checkpointed(checkpoints, name, file_content, screen, resume_path=None):
+    """
+    Screen one file unless a checkpoint already holds its result
+
+    Args:
+        checkpoints: CheckpointStore for this JD, or None to always screen
+        name: Original filename
+        file_content: File bytes (the checkpoint key is their hash)
+        screen: Zero-argument callable returning the row (or None on failure)
+        resume_path: Path on disk for folder screens
+
+    Returns:
+        Tuple of (row or None, per-file status, error message)
+    """
+    file_hash = get_file_hash(file_content)
+
+    if checkpoints is not None:
+        row = checkpoints.get_done_row(file_hash)
+        if row is not None:
+            # Same content may have been screened under another name
+            row.update({
+                "candidate_name": candidate_name_from_filename(name),
+                "original_filename": name,
+                "resume_path": resume_path,
+                "hash": file_hash,
+                        "screen_status": STATUS_REUSED,
+            })
+            return row, STATUS_REUSED, None
+
+    try:
+        row = screen()
+        error = None if row else "screening failed"
+    except Exception as e:
+        row, error = None, str(e) or type(e).__name__
+
+    if row is not None:
+        row["screen_status"] = STATUS_SCREENED
+    if checkpoints is not None:
+        checkpoints.put(file_hash, name, row, error)
+
+    return row, (STATUS_SCREENED if row else STATUS_FAILED), error
+
+
+def screen_uploads(job_desc, resume_files, checkpoints=None, stages=None, budget=None) -> Dict[str, Any]:
+    """
+    Screen uploaded resumes, reusing checkpointed results
+
+    .zip/.tar.gz uploads are expanded member by member; their rows carry
+    source_archive and archive_member.
+
+    Args:
+        stages: Staged ranking settings (see staged_ranking.DEFAULT_STAGES);
+            when given, everyone gets the quick score and only the best go
+            through the later stages. Checkpoints must then use the "quick" kind.
+        budget: Seconds the later stages may take (staged ranking only)
+
+    Returns:
+        Dictionary with status, ranked results, a per-file status list and,
+        when staged, the per-stage summary
+    """
+    screen = screen_upload if stages is None else screen_upload_quick
+    results = []
+    file_status = []
+
+    for resume_file in resume_files:
+        for name, file_content, error, source in iter_upload_sources(resume_file):
+            if error is None:
+                row, status, error = screen_checkpointed(
+                    checkpoints, name, file_content,
+                    lambda: screen(job_desc, name, file_content)
+                )
+            else:
+                row, status = None, STATUS_FAILED
+            if row:
+                row.update(source)
+                results.append(row)
+            file_status.append({"filename": source_label(name, source), "status": status, "error": error})
+
+    results.sort(key=lambda x: x["overall_score"], reverse=True)
+    response = {"status": "success", "results": detect_duplicates(results), "file_status": file_status}
+
+    if stages is not None:
+        from utils.staged_ranking import run_stages
+
+        # Rows that went further are checkpointed again so a rerun skips those stages too
+        on_row = (lambda row: checkpoints.put(row["hash"], row["original_filename"], row)) if checkpoints else None
+        response["stage_summary"] = run_stages(job_desc, results, stages, budget, on_row)
+    return response
+
+
+def screen_bulk_resumes(job_desc, resume_files, checkpoints=None, stages=None, budget=None):
+    """Screen multiple resumes and return ranked results (staged when stages is given)"""
+    return screen_uploads(job_desc, resume_files, checkpoints, stages, budget)["results"]
+
+
+def load_resume_file(filepath):
+    """
+    Read a resume from disk into a named in-memory file
+
+    The bytes are read once and reused for extraction and hashing. Extraction
+    dispatches on the name, so .txt files are decoded like uploads are.
+    """
+    with open(filepath, 'rb') as f:
+        resume_file = BytesIO(f.read())
+    resume_file.name = os.path.basename(filepath)
+    return resume_file
+
+
+def screen_resume_path(job_desc, filepath, required_years=3, file_content=None, profile=None):
+    """
+    Screen one resume file from disk (no timeline or AI analysis)
+
+    Args:
+        file_content: Bytes already read from filepath, to avoid a second read
+        profile: Parsed job profile from build_job_profile; skips re-parsing
+            the JD for every resume and takes precedence over required_years
+
+    Returns:
+        Result row in the ranked-table format
+    """
+    if file_content is None:
+        with open(filepath, 'rb') as f:
+            file_content = f.read()
+    filename = os.path.basename(filepath)
+    resume_text = extract_text_isolated(filename, file_content)
+
+    skills = extract_skills(resume_text)
+    exp_years = estimate_experience_years(resume_text)
+    if profile is None:
+        skill_match = match_job_skills(skills, job_desc)
+        jd_keywords = None
+    else:
+        skill_match = match_profile_skills(skills, profile)
+        jd_keywords = set(profile["keywords"])
+        required_years = profile["required_years"]
+    exp_match = experience_percentage(exp_years, required_years)
+    final_score = calculate_final_score(skill_match, exp_match)
+    contact_info = extract_contact_from_resume(resume_text)
+    ats_data = calculate_ats_score(resume_text, job_desc, jd_keywords)
+
+    return {
+        "candidate_name": candidate_name_from_filename(filename),
+        "email": contact_info.get("email", "Not provided"),
+        "contact": contact_info.get("contact", "Not provided"),
+        "skills": ", ".join(skills[:5]) if skills else "None",
+        "skill_mask": skills_to_mask(skills),
+        "experience_level": classify_experience_level(exp_years),
+        "skill_match": round(skill_match, 2),
+        "exp_match": round(exp_match, 2),
+        "overall_score": round(final_score, 2),
+        "ats_score": ats_data["ats_score"],
+        "ats_rating": ats_data["ats_rating"],
+        "fit": classify_fit(final_score),
+        "hash": get_file_hash(file_content),
+        "resume_path": filepath,
+        "original_filename": filename,
+        "ats_details": ats_data,
+        "resume_text": resume_text,
+    }
+
+
+def list_resume_files(folder, include_archives=False):
+    """Supported resume files (and optionally .zip/.tar.gz archives) in a folder, sorted by name"""
+    formats = SUPPORTED_FORMATS + ARCHIVE_FORMATS if include_archives else SUPPORTED_FORMATS
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.lower().endswith(formats) and os.path.isfile(os.path.join(folder, name))
+    )
+
+
+def _archive_sources(members, archive):
+    try:
+        for member in members:
+            source = {"source_archive": archive, "archive_member": member["member"]}
+            yield member["name"], member["content"], member["error"], source
+    except ArchiveError as e:
+        yield os.path.basename(archive), None, str(e), {}
+
+
+def iter_upload_sources(resume_file):
+    """
+    Resumes in one upload: the file itself, or each member of an archive
+
+    Yields:
+        (name, content, error, source) with content None when error is set;
+        source is {} for plain uploads or {"source_archive", "archive_member"}
+    """
+    if not is_archive(resume_file.name):
+        file_content = resume_file.read()
+        resume_file.seek(0)
+        yield resume_file.name, file_content, None, {}
+        return
+    yield from _archive_sources(iter_archive_members(resume_file, resume_file.name), resume_file.name)
+
+
+def iter_folder_sources(folder):
+    """
+    Resumes in a folder, read one at a time; archives are expanded in place
+
+    Yields:
+        (name, content, error, source) with source {"resume_path"} for files
+        or {"source_archive", "archive_member"} for archive members
+    """
+    for filepath in list_resume_files(folder, include_archives=True):
+        yield from iter_path_sources(filepath)
+
+
+def iter_path_sources(filepath):
+    """Resumes in one file on disk (an archive yields each member), as iter_folder_sources"""
+    if is_archive(filepath):
+        yield from _archive_sources(iter_archive_file(filepath), filepath)
+        return
+    try:
+        with open(filepath, 'rb') as f:
+            file_content = f.read()
+    except OSError as e:
+        yield os.path.basename(filepath), None, str(e), {"resume_path": filepath}
+    else:
+        yield os.path.basename(filepath), file_content, None, {"resume_path": filepath}
+
+
+def source_label(name, source):
+    """File name shown in per-file status lists (archive members keep their archive)"""
+    if source.get("archive_member"):
+        return f"{os.path.basename(source['source_archive'])}/{source['archive_member']}"
+    return name
+
+
+def screen_folder(
+    job_desc: str,
+    folder: str,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    checkpoints=None
+) -> Dict[str, Any]:
+    """
+    Screen every resume in a folder against a JD
+
+    Args:
+        job_desc: Job description text
+        folder: Folder containing .pdf/.docx/.txt resumes and .zip/.tar.gz archives of them
+        on_error: Called with (filename, exception) for files that fail
+        checkpoints: CheckpointStore; files it already screened are skipped
+
+    Returns:
+        Dictionary with status, ranked results and a per-file status list
+    """
+    if not folder or not os.path.exists(folder):
+        return {"status": "error", "message": "Invalid folder path"}
+
+    results = []
+    file_status = []
+    for name, file_content, error, source in iter_folder_sources(folder):
+        if error is None:
+            row, status, error = screen_checkpointed(
+                checkpoints, name, file_content,
+                lambda: screen_resume_path(job_desc, source.get("resume_path", name), file_content=file_content),
+                resume_path=source.get("resume_path")
+            )
+        else:
+            row, status = None, STATUS_FAILED
+
+        label = source_label(name, source)
+        if row:
+            row.update({"resume_path": None, **source})
+            results.append(row)
+        elif on_error:
+            on_error(label, Exception(error))
+        file_status.append({"filename": label, "status": status, "error": error})
+
+    results.sort(key=lambda x: x["overall_score"], reverse=True)
+    return {"status": "success", "results": detect_duplicates(results), "file_status": file_status}
+
+
+def _mail_row(row, record, path):
+    """Screened row of an attachment, keyed and named by its sender"""
+    row = dict(row)
+    key = record["sender_email"] or record["content_hash"]
+    if record["sender_name"]:
+        row["candidate_name"] = record["sender_name"]
+    if record["sender_email"] and row.get("email") in (None, "", "Not provided"):
+        row["email"] = record["sender_email"]
+    row.update({
+        "candidate_key": key,
+        "sender_email": record["sender_email"],
+        "subject": record["subject"],
+        "message_id": record["message_id"],
+        "received_at": record["received_at"],
+        "original_filename": record["filename"],
+        "source_mailbox": path,
+        "mail_location": record["location"],
+        "resume_path": None,
+    })
+    return row
+
+
+def screen_mailbox(
+    job_desc: str,
+    path: str,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    checkpoints=None,
+    state_db: str = MAILBOX_DB
+) -> Dict[str, Any]:
+    """
+    Screen the resume attachments of an mbox file or Maildir against a JD
+
+    With checkpoints, only mail that arrived since the last scan for this JD
+    is read, plus attachments that failed to screen last time; candidates
+    from earlier scans come back from their checkpoints.
+    Each sender is one candidate: the best attachment of their latest
+    message that could be screened.
+
+    Args:
+        path: mbox file or Maildir directory
+        on_error: Called with (label, exception) for attachments that fail
+        checkpoints: CheckpointStore for this JD (enables incremental scans)
+        state_db: Mailbox state database (high-water marks, senders)
+
+    Returns:
+        Dictionary with status, ranked results, a per-attachment status list
+        and the number of new messages read (retried ones not included)
+    """
+    if not is_mailbox(path):
+        return {"status": "error", "message": "Not an mbox file or Maildir folder"}
+
+    mailbox = mailbox_id(path)
+    profile = checkpoints.profile if checkpoints is not None else None
+    screened = {}   # content hash -> row screened in this scan
+    file_status = []
+    messages = 0
+
+    with MailboxState(state_db) as state:
+        retries = iter_failed_messages(path, state, profile) if profile else iter(())
+        for message in chain(retries, iter_new_messages(path, state, profile)):
+            if not message.get("retry"):
+                messages += 1
+            sender = message["sender_email"] or "unknown sender"
+            if message["error"]:
+                file_status.append({"filename": f"message from {sender}", "status": STATUS_FAILED,
+                                    "error": message["error"]})
+            for attachment in message["attachments"]:
+                name, file_content, error = attachment["name"], attachment["content"], attachment["error"]
+                if error is None:
+                    row, status, error = screen_checkpointed(
+                        checkpoints, name, file_content, lambda: screen_upload(job_desc, name, file_content)
+                    )
+                    # Recorded before the mark moves past this message, so the next scan retries it
+                    if profile and row is None:
+                        state.add_failure(mailbox, profile, message["location"], name, error)
+                else:
+                    row, status = None, STATUS_FAILED
+
+                label = f"{sender}/{name}"
+                if row:
+                    screened[row["hash"]] = row
+                    state.add_attachment(mailbox, message, row["hash"], name)
+                    if message.get("retry"):
+                        state.clear_failure(mailbox, profile, message["location"], name)
+                elif on_error:
+                    on_error(label, Exception(error))
+                file_status.append({"filename": label, "status": status, "error": error})
+
+        # Latest message per sender wins; within it, the best-scoring attachment
+        chosen = {}
+        for record in state.attachments(mailbox):
+            key = record["sender_email"] or record["content_hash"]
+            if key in chosen and chosen[key][0] != record["message_id"]:
+                continue
+            row = screened.get(record["content_hash"])
+            if row is None and checkpoints is not None:
+                row = checkpoints.get_done_row(record["content_hash"])
+            if row is None:
+                continue
+            if key not in chosen or row["overall_score"] > chosen[key][1]["overall_score"]:
+                chosen[key] = (record["message_id"], _mail_row(row, record, path))
+
+    results = sorted((row for _, row in chosen.values()), key=lambda x: x["overall_score"], reverse=True)
+    return {"status": "success", "results": detect_duplicates(results), "file_status": file_status,
+            "messages": messages}
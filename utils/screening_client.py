@@ -0,0 +1,142 @@
+"""
+Screening Service Client for RecruitNova
+Submits screening work to screening_service.py over HTTP. Used by the
+dashboard when a service is running and by external tools.
+"""
+
+import os
+import json
+import base64
+import urllib.error
+import urllib.parse
+import urllib.request
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional
+
+from utils.shared_spool import SpoolBatch
+
+DEFAULT_SERVICE_URL = "http://127.0.0.1:8765"
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+class ScreeningServiceError(Exception):
+    """The service is unreachable or rejected the request"""
+
+
+def _file_bytes(f: Dict[str, Any]) -> bytes:
+    if "content" in f:
+        return f["content"]
+    with open(f["path"], 'rb') as fh:
+        return fh.read()
+
+
+def _encode_files(files: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    return [
+        {"name": f["name"], "content_b64": base64.b64encode(_file_bytes(f)).decode("ascii")}
+        for f in files
+    ]
+
+
+class ScreeningClient:
+    """
+    Minimal JSON client for the screening service
+
+    The URL defaults to RECRUITNOVA_SCREENING_URL, then the local default.
+    A service on this machine is handed files through the shared spool
+    (only references go over HTTP); remote services get base64 uploads.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, timeout: float = 300, shared_spool: Optional[bool] = None):
+        self.base_url = (base_url or os.environ.get("RECRUITNOVA_SCREENING_URL") or DEFAULT_SERVICE_URL).rstrip("/")
+        self.timeout = timeout
+        if shared_spool is None:
+            shared_spool = urllib.parse.urlsplit(self.base_url).hostname in LOCAL_HOSTS
+        self.shared_spool = shared_spool
+
+    @contextmanager
+    def _resumes(self, files: List[Dict[str, Any]]):
+        """Request entries for the files, spooled for the duration of the request when local"""
+        if not self.shared_spool:
+            yield _encode_files(files)
+            return
+        with SpoolBatch() as batch:
+            yield [
+                {"name": f["name"], "ref": {"path": f["path"], "offset": 0, "length": f["size"]}}
+                if "path" in f else {"name": f["name"], "ref": batch.add(f["name"], f["content"])}
+                for f in files
+            ]
+
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+                body = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("message", str(e))
+            except ValueError:
+                message = str(e)
+            raise ScreeningServiceError(message) from e
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise ScreeningServiceError(f"Screening service unavailable at {self.base_url}: {e}") from e
+
+        if body.get("status") == "error":
+            raise ScreeningServiceError(body.get("message", "Unknown error"))
+        return body
+
+    def health(self, timeout: float = 1.0) -> Dict[str, Any]:
+        return self._request("GET", "/health", timeout=timeout)
+
+    def is_available(self, timeout: float = 1.0) -> bool:
+        try:
+            return self.health(timeout).get("status") == "ok"
+        except ScreeningServiceError:
+            return False
+
+    def screen(self, resume_text: str, job_description: str, job_title: str = "",
+               required_years: int = 3, predictions: bool = False) -> Dict[str, Any]:
+        """ResumeScreener result for one resume text, plus "ats" (and predictor output if requested)"""
+        return self._request("POST", "/screen", {
+            "resume_text": resume_text,
+            "job_description": job_description,
+            "job_title": job_title,
+            "required_years": required_years,
+            "predictions": predictions,
+        })["result"]
+
+    def screen_bulk(self, job_description: str, files: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Screen uploads against one JD on the service
+
+        Args:
+            job_description: Job description text
+            files: List of {"name", "content"} with content as bytes, or
+                {"name", "path", "size"} for files already spooled on disk
+
+        Returns:
+            Dictionary with results (ranked rows in the same format as
+            screen_bulk_resumes) and failed ({"name", "error"} per file that
+            could not be screened)
+        """
+        with self._resumes(files) as resumes:
+            response = self._request("POST", "/screen/bulk", {
+                "job_description": job_description,
+                "resumes": resumes,
+            })
+        return {"results": response["results"], "failed": response.get("failed", [])}
+
+    def screen_multi_jd(self, files: List[Dict[str, Any]], job_descriptions: List[Dict[str, str]],
+                        required_years: int = 3) -> List[Dict[str, Any]]:
+        """Score every file against each {"title", "text"} JD"""
+        with self._resumes(files) as resumes:
+            return self._request("POST", "/screen/multi-jd", {
+                "resumes": resumes,
+                "job_descriptions": job_descriptions,
+                "required_years": required_years,
+            })["results"]
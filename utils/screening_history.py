@@ -0,0 +1,574 @@
+"""
+Screening History for RecruitNova
+Append-only SQLite record of every screened candidate (score, ATS, fit,
+skills and the JD skills they were missing), with aggregates by day x JD
+and day x skill updated in the same transaction as the records. Period
+questions ("average score by role last quarter", "most missed skills this
+month", "is demand for SQL outgrowing supply") read the aggregates, so a
+year of history is a few thousand rows.
+"""
+
+import os
+import re
+import sqlite3
+import hashlib
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from utils.extract import extract_skill_mask, mask_to_skills
+from utils.shortlist import row_skill_mask
+
+
+DB_PATH = os.path.join("data", "screening_history.db")
+
+FIT_COLUMNS = {"Strongly Fit": "strongly_fit", "Mid Fit": "mid_fit", "Low Fit": "low_fit"}
+# Excel reports written by save_bulk_report before history was recorded
+REPORT_PATTERN = re.compile(r"screening_report_(\w+?)_(\d{8}_\d{6})\.xlsx$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS jds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    jd_hash TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    job_desc TEXT NOT NULL,
+    skill_mask INTEGER,
+    first_seen TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS screenings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day TEXT NOT NULL,
+    screened_at TEXT NOT NULL,
+    jd_id INTEGER NOT NULL REFERENCES jds(id),
+    source TEXT NOT NULL,
+    candidate_name TEXT,
+    email TEXT,
+    resume_hash TEXT,
+    overall_score REAL,
+    ats_score REAL,
+    skill_match REAL,
+    exp_match REAL,
+    fit TEXT,
+    experience_level TEXT,
+    skill_mask INTEGER,
+    missing_mask INTEGER
+);
+-- The same resume screened for the same JD twice in a day is one record
+CREATE UNIQUE INDEX IF NOT EXISTS idx_screenings_once ON screenings(jd_id, resume_hash, day);
+CREATE INDEX IF NOT EXISTS idx_screenings_day ON screenings(day);
+
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day TEXT NOT NULL,
+    jd_id INTEGER NOT NULL,
+    candidates INTEGER NOT NULL DEFAULT 0,
+    score_sum REAL NOT NULL DEFAULT 0,
+    ats_sum REAL NOT NULL DEFAULT 0,
+    ats_count INTEGER NOT NULL DEFAULT 0,
+    strongly_fit INTEGER NOT NULL DEFAULT 0,
+    mid_fit INTEGER NOT NULL DEFAULT 0,
+    low_fit INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, jd_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS daily_skills (
+    day TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    demanded INTEGER NOT NULL DEFAULT 0,
+    present INTEGER NOT NULL DEFAULT 0,
+    missing INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, skill)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS imported_reports (
+    name TEXT PRIMARY KEY,
+    imported_at TEXT NOT NULL,
+    records INTEGER NOT NULL
+);
+"""
+
+# Columns added after the first release: (table, column, definition)
+_ADDED_COLUMNS = {
+    "daily_skills": [("demanded", "INTEGER NOT NULL DEFAULT 0")],
+}
+
+# Trend buckets: SQL expression giving the first day of a day's bucket
+BUCKETS = {
+    "day": "day",
+    "week": "date(day, '-6 days', 'weekday 1')",
+    "month": "date(day, 'start of month')",
+}
+
+
+# Databases whose schema was already created by this process
+_initialized = set()
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def connect(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """Open the history database (created on first use)"""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    if db_path not in _initialized:
+        conn.executescript(_SCHEMA)
+        _add_missing_columns(conn)
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('started_at', ?)", (_now(),))
+        _initialized.add(db_path)
+    return conn
+
+
+def _add_missing_columns(conn: sqlite3.Connection) -> None:
+    for table, columns in _ADDED_COLUMNS.items():
+        existing = {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+        for column, definition in columns:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                if (table, column) == ("daily_skills", "demanded"):
+                    _backfill_demand(conn)
+
+
+def _backfill_demand(conn: sqlite3.Connection) -> None:
+    """One-off: derive per-day skill demand from the records kept before it was counted"""
+    demand = {}
+    rows = conn.execute(
+        "SELECT s.day, j.skill_mask, COUNT(*) AS n FROM screenings s JOIN jds j ON j.id = s.jd_id "
+        "WHERE j.skill_mask IS NOT NULL GROUP BY s.day, j.skill_mask"
+    )
+    for row in rows:
+        for skill in mask_to_skills(row["skill_mask"]):
+            demand[(row["day"], skill)] = demand.get((row["day"], skill), 0) + row["n"]
+    _add_skill_counts(conn, {key: (n, 0, 0) for key, n in demand.items()})
+
+
+def _add_skill_counts(conn: sqlite3.Connection, counts: Dict[Tuple[str, str], Tuple[int, int, int]]) -> None:
+    """Add (demanded, present, missing) deltas to the (day, skill) counters"""
+    conn.executemany(
+        "INSERT INTO daily_skills (day, skill, demanded, present, missing) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (day, skill) DO UPDATE SET demanded = demanded + excluded.demanded, "
+        "present = present + excluded.present, missing = missing + excluded.missing",
+        [(day, skill, *deltas) for (day, skill), deltas in counts.items()],
+    )
+
+
+# ==================== RECORDING ====================
+
+def jd_title(job_desc: str) -> str:
+    """Short label for a JD: its first non-empty line"""
+    for line in job_desc.splitlines():
+        if line.strip():
+            return line.strip()[:80]
+    return "Untitled JD"
+
+
+def _jd_id(conn: sqlite3.Connection, jd_hash: str, title: str, job_desc: str, skill_mask: Optional[int]) -> int:
+    conn.execute(
+        "INSERT OR IGNORE INTO jds (jd_hash, title, job_desc, skill_mask, first_seen) VALUES (?, ?, ?, ?, ?)",
+        (jd_hash, title, job_desc, skill_mask, _now()),
+    )
+    return conn.execute("SELECT id FROM jds WHERE jd_hash = ?", (jd_hash,)).fetchone()["id"]
+
+
+def _text(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) else None
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return None if value is None or pd.isna(value) else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _append(conn: sqlite3.Connection, jd_id: int, jd_mask: Optional[int], screened_at: datetime, source: str,
+            records: Iterable[Dict[str, Any]]) -> int:
+    """Insert records and fold the new ones into the aggregates (caller holds the transaction)"""
+    day = screened_at.date().isoformat()
+    stamp = screened_at.isoformat(timespec='seconds')
+    stats = {"candidates": 0, "score_sum": 0.0, "ats_sum": 0.0, "ats_count": 0,
+             "strongly_fit": 0, "mid_fit": 0, "low_fit": 0}
+    skills = {}
+    added = 0
+
+    for record in records:
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO screenings (day, screened_at, jd_id, source, candidate_name, email, resume_hash, "
+            "overall_score, ats_score, skill_match, exp_match, fit, experience_level, skill_mask, missing_mask) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                day, stamp, jd_id, source, record.get("candidate_name"), record.get("email"), record.get("hash"),
+                record.get("overall_score"), record.get("ats_score"), record.get("skill_match"),
+                record.get("exp_match"), record.get("fit"), record.get("experience_level"),
+                record.get("skill_mask"), record.get("missing_mask"),
+            ),
+        )
+        if cur.rowcount == 0:
+            continue
+        added += 1
+        stats["candidates"] += 1
+        stats["score_sum"] += record.get("overall_score") or 0
+        if record.get("ats_score") is not None:
+            stats["ats_sum"] += record["ats_score"]
+            stats["ats_count"] += 1
+        if record.get("fit") in FIT_COLUMNS:
+            stats[FIT_COLUMNS[record["fit"]]] += 1
+        for column in ("skill_mask", "missing_mask"):
+            for skill in mask_to_skills(record.get(column) or 0):
+                counts = skills.setdefault(skill, [0, 0])
+                counts[column == "missing_mask"] += 1
+
+    if added:
+        conn.execute(
+            "INSERT INTO daily_stats (day, jd_id, candidates, score_sum, ats_sum, ats_count, strongly_fit, mid_fit, "
+            "low_fit) VALUES (:day, :jd_id, :candidates, :score_sum, :ats_sum, :ats_count, :strongly_fit, :mid_fit, "
+            ":low_fit) ON CONFLICT (day, jd_id) DO UPDATE SET "
+            "candidates = candidates + excluded.candidates, score_sum = score_sum + excluded.score_sum, "
+            "ats_sum = ats_sum + excluded.ats_sum, ats_count = ats_count + excluded.ats_count, "
+            "strongly_fit = strongly_fit + excluded.strongly_fit, mid_fit = mid_fit + excluded.mid_fit, "
+            "low_fit = low_fit + excluded.low_fit",
+            dict(stats, day=day, jd_id=jd_id),
+        )
+        # Each new record was screened against the JD, so every JD skill was demanded once per record
+        demanded = mask_to_skills(jd_mask or 0)
+        for skill in demanded:
+            skills.setdefault(skill, [0, 0])
+        _add_skill_counts(conn, {
+            (day, skill): (added if skill in demanded else 0, present, missing)
+            for skill, (present, missing) in skills.items()
+        })
+    return added
+
+
+def record_screening(
+    job_desc: str,
+    rows: Iterable[Dict[str, Any]],
+    source: str,
+    screened_at: Optional[datetime] = None,
+    db_path: str = DB_PATH
+) -> int:
+    """
+    Append screened result rows to the history
+
+    Args:
+        job_desc: JD the rows were screened against
+        rows: Result rows (any iterable; rows without a score are skipped)
+        source: Where the screening ran (bulk, folder, job, watch, link, single)
+        screened_at: Time to record (default: now)
+
+    Returns:
+        Number of new records (repeats of a resume for the same JD on the
+        same day are not recorded again)
+    """
+    jd_mask = extract_skill_mask(job_desc)
+    records = []
+    for row in rows:
+        if row is None or row.get("overall_score") is None:
+            continue
+        skill_mask = row_skill_mask(row)
+        records.append({
+            "candidate_name": row.get("candidate_name"),
+            "email": row.get("email"),
+            "hash": row.get("hash"),
+            "overall_score": _number(row.get("overall_score")),
+            "ats_score": _number(row.get("ats_score")),
+            "skill_match": _number(row.get("skill_match")),
+            "exp_match": _number(row.get("exp_match")),
+            "fit": row.get("fit"),
+            "experience_level": row.get("experience_level"),
+            "skill_mask": skill_mask,
+            "missing_mask": jd_mask & ~skill_mask,
+        })
+    if not records:
+        return 0
+
+    jd_hash = hashlib.sha1(" ".join(job_desc.lower().split()).encode("utf-8")).hexdigest()
+    conn = connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        jd_id = _jd_id(conn, jd_hash, jd_title(job_desc), job_desc, jd_mask)
+        added = _append(conn, jd_id, jd_mask, screened_at or datetime.now(), source, records)
+        conn.execute("COMMIT")
+        return added
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def import_excel_reports(reports_dir: str, db_path: str = DB_PATH) -> int:
+    """
+    Import Excel reports written before the history was recorded
+
+    Each report is imported once, as its own JD (reports do not keep the
+    JD text or skills, so they add to the day and JD aggregates only).
+    Reports from after the history started are already in it and skipped.
+
+    Returns:
+        Number of records imported
+    """
+    if not os.path.isdir(reports_dir):
+        return 0
+    conn = connect(db_path)
+    try:
+        started_at = conn.execute("SELECT value FROM meta WHERE key = 'started_at'").fetchone()["value"]
+        done = {r["name"] for r in conn.execute("SELECT name FROM imported_reports")}
+        imported = 0
+        for name in sorted(os.listdir(reports_dir)):
+            match = REPORT_PATTERN.match(name)
+            if not match or name in done:
+                continue
+            written_at = datetime.strptime(match.group(2), "%Y%m%d_%H%M%S")
+            if written_at.isoformat() >= started_at:
+                continue
+            try:
+                df = pd.read_excel(os.path.join(reports_dir, name))
+            except Exception:
+                continue
+            records = [{
+                "candidate_name": _text(r.get("Candidate Name")),
+                "email": _text(r.get("Email")),
+                "overall_score": _number(r.get("Overall Score")),
+                "ats_score": _number(r.get("ATS Score")),
+                "skill_match": _number(r.get("Skill Match %")),
+                "exp_match": _number(r.get("Experience Match %")),
+                "fit": _text(r.get("Fit Level")),
+                "experience_level": _text(r.get("Experience Level")),
+            } for r in df.to_dict("records") if _number(r.get("Overall Score")) is not None]
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                title = f"{match.group(1).title()} report {written_at:%Y-%m-%d %H:%M}"
+                jd_id = _jd_id(conn, f"report:{name}", title, "", None)
+                count = _append(conn, jd_id, None, written_at, "report", records)
+                conn.execute("INSERT INTO imported_reports (name, imported_at, records) VALUES (?, ?, ?)",
+                             (name, _now(), count))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            imported += count
+        return imported
+    finally:
+        conn.close()
+
+
+def clear_history(db_path: str = DB_PATH) -> None:
+    """Delete every record and aggregate; history restarts from now"""
+    conn = connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for table in ("daily_skills", "daily_stats", "screenings", "jds", "imported_reports"):
+            conn.execute(f"DELETE FROM {table}")
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'started_at'", (_now(),))
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+# ==================== QUERIES ====================
+
+def _period(since: Optional[date], until: Optional[date]) -> Tuple[str, str]:
+    return (since or date.min).isoformat(), (until or date.max).isoformat()
+
+
+def period_start(days: Optional[int], today: Optional[date] = None) -> Optional[date]:
+    """First day of the last `days` days (None for all time)"""
+    if days is None:
+        return None
+    return (today or date.today()) - timedelta(days=days - 1)
+
+
+def _averages(row: sqlite3.Row) -> Dict[str, Any]:
+    candidates = row["candidates"] or 0
+    return {
+        "candidates": candidates,
+        "avg_score": round(row["score_sum"] / candidates, 1) if candidates else None,
+        "avg_ats": round(row["ats_sum"] / row["ats_count"], 1) if row["ats_count"] else None,
+        "fit_distribution": {
+            fit: row[column] or 0 for fit, column in FIT_COLUMNS.items()
+        },
+    }
+
+
+_SUMS = ("SUM(candidates) AS candidates, SUM(score_sum) AS score_sum, SUM(ats_sum) AS ats_sum, "
+         "SUM(ats_count) AS ats_count, SUM(strongly_fit) AS strongly_fit, SUM(mid_fit) AS mid_fit, "
+         "SUM(low_fit) AS low_fit")
+
+
+def get_totals(since: Optional[date] = None, until: Optional[date] = None,
+               db_path: str = DB_PATH) -> Dict[str, Any]:
+    """
+    Totals over a period (inclusive days; None = open-ended)
+
+    Returns:
+        Dictionary with candidates, avg_score, avg_ats, fit_distribution,
+        jds (distinct JDs screened) and days (days with screenings)
+    """
+    conn = connect(db_path)
+    try:
+        row = conn.execute(
+            f"SELECT {_SUMS}, COUNT(DISTINCT jd_id) AS jds, COUNT(DISTINCT day) AS days "
+            "FROM daily_stats WHERE day BETWEEN ? AND ?", _period(since, until)
+        ).fetchone()
+        return dict(_averages(row), jds=row["jds"], days=row["days"])
+    finally:
+        conn.close()
+
+
+def get_daily_summary(since: Optional[date] = None, until: Optional[date] = None, jd_id: Optional[int] = None,
+                      db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """Per-day candidates, average score / ATS and fit counts, oldest first"""
+    query = f"SELECT day, {_SUMS} FROM daily_stats WHERE day BETWEEN ? AND ?"
+    params = list(_period(since, until))
+    if jd_id is not None:
+        query += " AND jd_id = ?"
+        params.append(jd_id)
+    conn = connect(db_path)
+    try:
+        return [dict(_averages(r), day=r["day"]) for r in conn.execute(query + " GROUP BY day ORDER BY day", params)]
+    finally:
+        conn.close()
+
+
+def get_jd_summary(since: Optional[date] = None, until: Optional[date] = None, limit: int = 50,
+                   db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """Per-JD candidates, averages and fit counts over a period, most screened first"""
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            f"SELECT s.jd_id, j.title, MIN(s.day) AS first_day, MAX(s.day) AS last_day, {_SUMS} "
+            "FROM daily_stats s JOIN jds j ON j.id = s.jd_id WHERE s.day BETWEEN ? AND ? "
+            "GROUP BY s.jd_id ORDER BY candidates DESC LIMIT ?", (*_period(since, until), limit)
+        ).fetchall()
+        return [dict(_averages(r), jd_id=r["jd_id"], title=r["title"], first_day=r["first_day"],
+                     last_day=r["last_day"]) for r in rows]
+    finally:
+        conn.close()
+
+
+def get_skill_summary(since: Optional[date] = None, until: Optional[date] = None, limit: int = 20,
+                      db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """
+    Per-skill counts over a period, most missed first
+
+    Returns:
+        List of dictionaries with skill, demanded (candidates screened
+        against a JD asking for it), present (candidates who had it) and
+        missing (candidates who lacked it although their JD asked for it)
+    """
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT skill, SUM(demanded) AS demanded, SUM(present) AS present, SUM(missing) AS missing "
+            "FROM daily_skills WHERE day BETWEEN ? AND ? GROUP BY skill ORDER BY missing DESC, present DESC LIMIT ?",
+            (*_period(since, until), limit)
+        ).fetchall()
+        return [dict(r) for r in rows]
+    finally:
+        conn.close()
+
+
+def get_skill_gaps(since: Optional[date] = None, until: Optional[date] = None, limit: int = 15,
+                   db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """
+    Skills whose demand most outruns supply over a period
+
+    Supply is counted only among the candidates screened against a JD that
+    asked for the skill, so demand and supply cover the same screenings.
+
+    Args:
+        since: First day (None = open-ended)
+        until: Last day (None = open-ended)
+        limit: Number of skills to return
+
+    Returns:
+        List of dictionaries with skill, jds (JDs screened in the period
+        that ask for it), demanded, supplied (of those, candidates who have
+        it), missing (demanded minus supplied) and missing_rate (% of demand
+        left unmet), most unmet demand first
+    """
+    period = _period(since, until)
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT skill, SUM(demanded) AS demanded, SUM(demanded) - SUM(missing) AS supplied, "
+            "SUM(missing) AS missing FROM daily_skills WHERE day BETWEEN ? AND ? "
+            "GROUP BY skill HAVING SUM(demanded) > 0", period
+        ).fetchall()
+        jd_masks = conn.execute(
+            "SELECT skill_mask FROM jds WHERE skill_mask IS NOT NULL AND id IN "
+            "(SELECT DISTINCT jd_id FROM daily_stats WHERE day BETWEEN ? AND ?)", period
+        ).fetchall()
+    finally:
+        conn.close()
+
+    jds = {}
+    for row in jd_masks:
+        for skill in mask_to_skills(row["skill_mask"]):
+            jds[skill] = jds.get(skill, 0) + 1
+    gaps = [dict(r, jds=jds.get(r["skill"], 0), missing_rate=round(r["missing"] * 100 / r["demanded"], 1))
+            for r in rows]
+    gaps.sort(key=lambda g: (-g["missing"], -g["missing_rate"], g["skill"]))
+    return gaps[:limit]
+
+
+def get_skill_trends(skills: Optional[List[str]] = None, since: Optional[date] = None,
+                     until: Optional[date] = None, bucket: str = "week",
+                     db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """
+    Demand, supply and unmet demand per skill per time bucket
+
+    Args:
+        skills: Skills to include (None for all)
+        since: First day (None = open-ended)
+        until: Last day (None = open-ended)
+        bucket: day, week (starting Monday) or month
+
+    Returns:
+        List of dictionaries with bucket (first day), skill, demanded,
+        supplied, missing and missing_rate (None without demand), oldest first
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket: {bucket}")
+    query = (f"SELECT {BUCKETS[bucket]} AS bucket, skill, SUM(demanded) AS demanded, "
+             "SUM(demanded) - SUM(missing) AS supplied, SUM(missing) AS missing "
+             "FROM daily_skills WHERE day BETWEEN ? AND ?")
+    params = list(_period(since, until))
+    if skills is not None:
+        query += f" AND skill IN ({', '.join('?' * len(skills))})"
+        params.extend(skills)
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(query + " GROUP BY bucket, skill ORDER BY bucket, skill", params).fetchall()
+    finally:
+        conn.close()
+    return [dict(r, missing_rate=round(r["missing"] * 100 / r["demanded"], 1) if r["demanded"] else None)
+            for r in rows]
+
+
+def get_recent_screenings(limit: int = 50, jd_id: Optional[int] = None,
+                          db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """Latest individual records, newest first"""
+    query = ("SELECT s.screened_at, s.source, s.candidate_name, s.email, s.overall_score, s.ats_score, s.fit, "
+             "j.title FROM screenings s JOIN jds j ON j.id = s.jd_id")
+    params = []
+    if jd_id is not None:
+        query += " WHERE s.jd_id = ?"
+        params.append(jd_id)
+    conn = connect(db_path)
+    try:
+        return [dict(r) for r in conn.execute(query + " ORDER BY s.id DESC LIMIT ?", (*params, limit))]
+    finally:
+        conn.close()
@@ -0,0 +1,111 @@
+"""
+Shared Spool for RecruitNova
+Hands resume bytes to worker processes without pickling them. A batch of
+files is appended to one spool file (on the /dev/shm tmpfs where available)
+and workers receive only {"path", "offset", "length"} references, which they
+read back through mmap. The page cache holds the bytes once for every process.
+"""
+
+import os
+import mmap
+import uuid
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Union
+
+SHM_DIR = "/dev/shm"
+SPOOL_SUBDIR = "recruitnova_spool"
+
+# A reference to bytes in a spool file: {"path", "offset", "length"}
+BlobRef = Dict[str, Any]
+
+
+def spool_dir() -> str:
+    """Directory for batch spool files: tmpfs when available, else the temp dir"""
+    base = SHM_DIR if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK) else tempfile.gettempdir()
+    path = os.path.join(base, SPOOL_SUBDIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, dict) and {"path", "offset", "length"} <= value.keys()
+
+
+def is_spooled(ref: BlobRef, roots: Optional[List[str]] = None) -> bool:
+    """True when a reference points into a spool directory (safe to read for a client)"""
+    path = os.path.realpath(ref["path"])
+    allowed = [os.path.realpath(root) for root in (roots or [spool_dir()])]
+    return os.path.isfile(path) and any(os.path.commonpath([path, root]) == root for root in allowed)
+
+
+class SpoolBatch:
+    """
+    One spool file holding a batch of uploads, removed on close
+
+    Usage:
+        with SpoolBatch() as batch:
+            refs = [batch.add(f["name"], f["content"]) for f in files]
+            ...submit refs to workers...
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.path = os.path.join(directory or spool_dir(), f"batch-{uuid.uuid4().hex}.spool")
+        self._file = open(self.path, 'wb')
+        self.size = 0
+
+    def add(self, name: str, content: Union[bytes, memoryview]) -> BlobRef:
+        """Append one file and return its reference (flushed, so workers can read it)"""
+        offset = self.size
+        self._file.write(content)
+        self._file.flush()
+        self.size += len(content)
+        return {"name": name, "path": self.path, "offset": offset, "length": len(content)}
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def _mapped(ref: BlobRef):
+    """Read-only mapping of just the referenced window (not the whole batch file)"""
+    start = ref["offset"] - ref["offset"] % mmap.ALLOCATIONGRANULARITY
+    skip = ref["offset"] - start
+    with open(ref["path"], 'rb') as f:
+        with mmap.mmap(f.fileno(), skip + ref["length"], access=mmap.ACCESS_READ, offset=start) as view:
+            yield view, skip
+
+
+def read_blob(ref: BlobRef) -> bytes:
+    """Bytes behind a reference (one copy, of this file only)"""
+    if not ref["length"]:
+        return b""
+    with _mapped(ref) as (view, skip):
+        return view[skip:skip + ref["length"]]
+
+
+def blob_md5(ref: BlobRef) -> str:
+    """MD5 of the referenced bytes without copying them"""
+    digest = hashlib.md5()
+    if ref["length"]:
+        with _mapped(ref) as (view, skip):
+            with memoryview(view) as whole, whole[skip:skip + ref["length"]] as data:
+                digest.update(data)
+    return digest.hexdigest()
+
+
+def spool_files(batch: SpoolBatch, files: List[Dict[str, Any]]) -> List[BlobRef]:
+    """Add {"name", "content"} uploads to a batch"""
+    return [batch.add(f["name"], f["content"]) for f in files]
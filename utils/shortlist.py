@@ -0,0 +1,127 @@
+"""
+Shortlist Builder for RecruitNova
+Picks a small slate of candidates that together cover a JD's skills:
+greedy weighted set cover over skill bitmasks (utils/extract.py), with the
+overall score breaking ties. Candidates with the same JD-relevant skills are
+collapsed to their best-scored one first, and gains are re-evaluated lazily
+(a gain can only shrink as the slate grows), so thousands of candidates
+take milliseconds.
+"""
+
+import heapq
+from typing import Dict, List, Any, Optional
+
+from utils.extract import SKILL_BITS, extract_skill_mask, skills_to_mask, mask_to_skills
+
+
+def row_skill_mask(row: Dict[str, Any]) -> int:
+    """
+    Skill bitmask of a result row, derived once and kept on the row
+
+    Rows screened before masks were stored fall back to their skill list or text.
+    """
+    if row.get("skill_mask") is None:
+        if row.get("skill_list") is not None:
+            row["skill_mask"] = skills_to_mask(row["skill_list"])
+        elif row.get("resume_text"):
+            row["skill_mask"] = extract_skill_mask(row["resume_text"])
+        else:
+            row["skill_mask"] = skills_to_mask((row.get("skills") or "").split(", "))
+    return row["skill_mask"]
+
+
+def _gain(mask: int, weights: Optional[Dict[int, float]]) -> float:
+    if weights is None:
+        return mask.bit_count()
+    gain = 0.0
+    while mask:
+        low = mask & -mask
+        gain += weights.get(low, 1.0)
+        mask ^= low
+    return gain
+
+
+def build_shortlist(
+    masks: List[int],
+    scores: List[float],
+    target_mask: int,
+    max_size: Optional[int] = None,
+    skill_weights: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Greedy weighted set cover of target_mask by candidate skill masks
+
+    Each step adds the candidate covering the most (weighted) still-missing
+    target skills; among equal gains the higher score wins, then the
+    earlier candidate.
+
+    Args:
+        masks: Skill bitmask per candidate
+        scores: Overall score per candidate (tiebreak)
+        target_mask: Skills to cover (usually the JD's)
+        max_size: Stop after this many picks; None covers as much as possible
+        skill_weights: Skill name -> weight (default 1 each)
+
+    Returns:
+        Dictionary with picks (candidate positions in pick order), gains
+        (mask each pick newly covered), covered and missing masks
+    """
+    weights = None
+    if skill_weights:
+        weights = {SKILL_BITS[name]: w for name, w in skill_weights.items() if name in SKILL_BITS}
+
+    # Best candidate per distinct target-relevant mask
+    best = {}
+    for i, mask in enumerate(masks):
+        relevant = mask & target_mask
+        if relevant and (relevant not in best or scores[i] > scores[best[relevant]]):
+            best[relevant] = i
+
+    heap = [(-_gain(relevant, weights), -scores[i], i, relevant) for relevant, i in best.items()]
+    heapq.heapify(heap)
+
+    picks, gains = [], []
+    covered = 0
+    while heap and covered != target_mask and (max_size is None or len(picks) < max_size):
+        neg_gain, neg_score, i, relevant = heapq.heappop(heap)
+        new = relevant & ~covered
+        gain = _gain(new, weights)
+        if gain <= 0:
+            continue
+        if gain != -neg_gain and heap and (-gain, neg_score, i) > heap[0][:3]:
+            # Stale gain and no longer the best: re-queue with the current one
+            heapq.heappush(heap, (-gain, neg_score, i, relevant))
+            continue
+        picks.append(i)
+        gains.append(new)
+        covered |= new
+
+    return {"picks": picks, "gains": gains, "covered": covered, "missing": target_mask & ~covered}
+
+
+def shortlist_rows(
+    rows: List[Dict[str, Any]],
+    job_desc: str,
+    max_size: Optional[int] = None,
+    skill_weights: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Shortlist of screened result rows that covers the JD's skills
+
+    Returns:
+        Dictionary with slate (rows with the skills each newly covers),
+        jd_skills, covered_skills and missing_skills
+    """
+    target = extract_skill_mask(job_desc)
+    result = build_shortlist(
+        [row_skill_mask(r) for r in rows], [r.get("overall_score") or 0 for r in rows],
+        target, max_size, skill_weights
+    )
+    return {
+        "slate": [
+            {"row": rows[i], "new_skills": mask_to_skills(new)} for i, new in zip(result["picks"], result["gains"])
+        ],
+        "jd_skills": mask_to_skills(target),
+        "covered_skills": mask_to_skills(result["covered"]),
+        "missing_skills": mask_to_skills(result["missing"]),
+    }
@@ -0,0 +1,328 @@
+"""
+Candidate Similarity Index for RecruitNova
+Persisted nearest-neighbour index over every resume that was screened or
+stored, for "more like this" searches. A resume is a hashed bag of words
+(TF-IDF weighted at query time) plus its packed SKILLS_DB bits; similarity is a
+blend of the text and skill cosines.
+
+The index is a set of append-only segments in data/similarity_index/: each
+batch of new resumes is one .npz file, so adding never rewrites what is
+already there. Once there are too many, the smaller half is merged. Queries
+are one sparse matrix-vector product over the cached, weighted matrix.
+"""
+
+import os
+import json
+import uuid
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from utils.extract import extract_skill_mask, SKILL_MASK_BYTES, pack_skill_masks, unpack_skill_masks
+
+
+INDEX_DIR = os.path.join("data", "similarity_index")
+N_FEATURES = 2 ** 18
+SKILL_WEIGHT = 0.3    # share of the skill cosine in the blended similarity
+MAX_SEGMENTS = 16     # the smaller half is merged beyond this
+MAX_TEXT_CHARS = 20000
+
+_vectorizer = HashingVectorizer(
+    n_features=N_FEATURES, alternate_sign=False, norm=None, stop_words="english", dtype=np.float32
+)
+
+# index_dir -> loaded index (segment names, ids, metadata, counts, masks, weighted matrix cache)
+_cache: Dict[str, Dict[str, Any]] = {}
+
+
+# ==================== FEATURES ====================
+
+def _term_counts(texts: List[str]) -> sp.csr_matrix:
+    return _vectorizer.transform([(t or "")[:MAX_TEXT_CHARS] for t in texts]).tocsr()
+
+
+def _skill_matrix(masks: np.ndarray) -> np.ndarray:
+    """Row-normalised 0/1 skill vectors from packed skill masks"""
+    bits = unpack_skill_masks(masks).astype(np.float32)
+    norms = np.sqrt(bits.sum(axis=1, keepdims=True))
+    return np.divide(bits, norms, out=np.zeros_like(bits), where=norms > 0)
+
+
+def _idf(counts: sp.csr_matrix) -> np.ndarray:
+    """Smoothed IDF as in sklearn's TfidfTransformer, from the indexed documents"""
+    df = np.bincount(counts.indices, minlength=N_FEATURES)
+    n = counts.shape[0]
+    return (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+
+
+def _weigh(counts: sp.csr_matrix, idf: np.ndarray) -> sp.csr_matrix:
+    """Sublinear TF * IDF, L2-normalised per row"""
+    data = (1 + np.log(counts.data)) * idf[counts.indices]
+    # Row of each stored value; empty rows (no terms) simply get no entries
+    row_ids = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+    norms = np.sqrt(np.bincount(row_ids, weights=data * data, minlength=counts.shape[0]))
+    data /= norms[row_ids].astype(np.float32)
+    return sp.csr_matrix((data, counts.indices, counts.indptr), shape=counts.shape)
+
+
+# ==================== SEGMENTS ====================
+
+def _segment_names(index_dir: str) -> List[str]:
+    if not os.path.isdir(index_dir):
+        return []
+    return sorted(name for name in os.listdir(index_dir) if name.startswith("seg_") and name.endswith(".npz"))
+
+
+def _write_segment(index_dir: str, counts: sp.csr_matrix, masks: np.ndarray, meta: List[Dict[str, Any]]) -> str:
+    os.makedirs(index_dir, exist_ok=True)
+    # Sortable by creation time; the suffix keeps concurrent writers apart
+    name = f"seg_{time.time_ns():020d}_{uuid.uuid4().hex[:8]}.npz"
+    tmp_path = os.path.join(index_dir, f".{name}.tmp")
+    with open(tmp_path, "wb") as f:
+        # Term counts are small integers; uint16 halves the data on disk
+        np.savez(
+            f, data=np.minimum(counts.data, 65535).astype(np.uint16), indices=counts.indices,
+            indptr=counts.indptr, masks=masks, meta=np.array(json.dumps(meta))
+        )
+    os.replace(tmp_path, os.path.join(index_dir, name))
+    return name
+
+
+def _read_segment(index_dir: str, name: str) -> Dict[str, Any]:
+    with np.load(os.path.join(index_dir, name)) as seg:
+        meta = json.loads(str(seg["meta"]))
+        counts = sp.csr_matrix(
+            (seg["data"].astype(np.float32), seg["indices"], seg["indptr"]), shape=(len(meta), N_FEATURES)
+        )
+        masks = seg["masks"]
+        if masks.ndim == 1:
+            # Segments written before masks were packed hold int64 bitmasks
+            masks = pack_skill_masks(masks.tolist())
+        elif masks.shape[1] < SKILL_MASK_BYTES:
+            # Written when SKILLS_DB was shorter; the skills added since are unset
+            masks = np.pad(masks, ((0, 0), (0, SKILL_MASK_BYTES - masks.shape[1])))
+        return {"name": name, "counts": counts, "masks": masks, "meta": meta}
+
+
+def load_index(index_dir: str = INDEX_DIR) -> Dict[str, Any]:
+    """
+    The index as currently on disk, reading only segments not seen before
+
+    Returns:
+        Dictionary with segments (name, counts, masks, meta each), ids
+        (document id -> (segment name, row)) and the query matrix cache
+    """
+    for _attempt in range(3):
+        names = _segment_names(index_dir)
+        index = _cache.get(index_dir)
+        loaded = {seg["name"] for seg in index["segments"]} if index else set()
+        if index is None or not loaded <= set(names):
+            # First load, or segments were merged by another process
+            index, loaded = {"segments": [], "ids": {}, "matrix": None}, set()
+        try:
+            new_segments = [_read_segment(index_dir, name) for name in names if name not in loaded]
+        except FileNotFoundError:
+            continue   # merged away while listing; list again
+        break
+    else:
+        index, new_segments = {"segments": [], "ids": {}, "matrix": None}, []
+
+    for seg in new_segments:
+        for row, doc in enumerate(seg["meta"]):
+            # Two processes may have indexed the same resume; the first one counts
+            index["ids"].setdefault(doc["id"], (seg["name"], row))
+        index["segments"].append(seg)
+    if new_segments:
+        index["matrix"] = None
+    _cache[index_dir] = index
+    return index
+
+
+def _merge_candidates(segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The smaller half of the segments (merging those keeps rewrites logarithmic per document)"""
+    by_size = sorted(segments, key=lambda seg: len(seg["meta"]))
+    return by_size[:len(by_size) // 2 + 1]
+
+
+def compact_index(index_dir: str = INDEX_DIR, merge_all: bool = False) -> int:
+    """
+    Merge segments into one: the smaller half of them, or all with merge_all
+
+    Duplicate documents are dropped in the merged segment.
+
+    Returns:
+        Number of segments left
+    """
+    index = load_index(index_dir)
+    merging = index["segments"] if merge_all else _merge_candidates(index["segments"])
+    if len(merging) <= 1:
+        return len(index["segments"])
+
+    merged_names = {seg["name"] for seg in merging}
+    counts, masks, meta = [], [], []
+    for seg in merging:
+        keep = [row for row, doc in enumerate(seg["meta"]) if index["ids"][doc["id"]] == (seg["name"], row)]
+        counts.append(seg["counts"][keep])
+        masks.append(seg["masks"][keep])
+        meta.extend(seg["meta"][row] for row in keep)
+    _write_segment(index_dir, sp.vstack(counts).tocsr(), np.concatenate(masks), meta)
+    for name in merged_names:
+        try:
+            os.remove(os.path.join(index_dir, name))
+        except FileNotFoundError:
+            pass
+
+    _cache.pop(index_dir, None)
+    return len(load_index(index_dir)["segments"])
+
+
+# ==================== ADDING ====================
+
+def add_documents(docs: List[Dict[str, Any]], index_dir: str = INDEX_DIR) -> int:
+    """
+    Index resumes not indexed yet
+
+    Args:
+        docs: Dicts with id (content hash), text and optional skill_mask,
+            name, filename and source ("screened" / "stored")
+
+    Returns:
+        Number of documents added
+    """
+    index = load_index(index_dir)
+    seen = set(index["ids"])
+    new_docs = []
+    for doc in docs:
+        if doc.get("id") and doc.get("text") and doc["id"] not in seen:
+            seen.add(doc["id"])
+            new_docs.append(doc)
+    if not new_docs:
+        return 0
+
+    counts = _term_counts([doc["text"] for doc in new_docs])
+    # Stop-word-only texts (or scans that yielded only page numbers) have nothing to compare
+    has_terms = np.diff(counts.indptr) > 0
+    if not has_terms.all():
+        new_docs = [doc for doc, keep in zip(new_docs, has_terms) if keep]
+        counts = counts[has_terms]
+        if not new_docs:
+            return 0
+    masks = pack_skill_masks(
+        doc["skill_mask"] if doc.get("skill_mask") is not None else extract_skill_mask(doc["text"])
+        for doc in new_docs
+    )
+    meta = [{
+        "id": doc["id"],
+        "name": doc.get("name") or "",
+        "filename": doc.get("filename") or "",
+        "source": doc.get("source") or "screened",
+        "added_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    } for doc in new_docs]
+    _write_segment(index_dir, counts, masks, meta)
+
+    if len(_segment_names(index_dir)) > MAX_SEGMENTS:
+        compact_index(index_dir)
+    return len(new_docs)
+
+
+def add_rows(rows: List[Dict[str, Any]], source: str = "screened", index_dir: str = INDEX_DIR) -> int:
+    """Index screened result rows that carry their resume text"""
+    return add_documents([{
+        "id": row.get("hash"),
+        "text": row.get("resume_text"),
+        "skill_mask": row.get("skill_mask"),
+        "name": row.get("candidate_name"),
+        "filename": row.get("original_filename"),
+        "source": source,
+    } for row in rows], index_dir)
+
+
+def add_stored_resumes(resumes_dir: str, index_dir: str = INDEX_DIR) -> int:
+    """
+    Index the stored resumes folder (only files whose content is not indexed yet)
+
+    Returns:
+        Number of resumes added
+    """
+    from utils.resume_index import refresh_index, read_resume_bytes
+    from utils.safe_extract import extract_text_isolated, ExtractionError
+
+    known = load_index(index_dir)["ids"]
+    docs = []
+    for name, entry in refresh_index(resumes_dir).items():
+        if entry["hash"] in known:
+            continue
+        try:
+            text = extract_text_isolated(name, read_resume_bytes(resumes_dir, name))
+        except (OSError, ExtractionError):
+            continue
+        docs.append({"id": entry["hash"], "text": text, "name": os.path.splitext(name)[0],
+                     "filename": name, "source": "stored"})
+    return add_documents(docs, index_dir)
+
+
+# ==================== QUERIES ====================
+
+def _query_matrix(index: Dict[str, Any]) -> Tuple:
+    """Weighted text matrix, skill matrix, IDF, metadata and id -> row over all segments"""
+    counts, masks, meta = [], [], []
+    for seg in index["segments"]:
+        keep = [row for row, doc in enumerate(seg["meta"]) if index["ids"][doc["id"]] == (seg["name"], row)]
+        counts.append(seg["counts"][keep] if len(keep) < len(seg["meta"]) else seg["counts"])
+        masks.append(seg["masks"][keep])
+        meta.extend(seg["meta"][row] for row in keep)
+    counts = sp.vstack(counts).tocsr()
+    idf = _idf(counts)
+    rows = {doc["id"]: i for i, doc in enumerate(meta)}
+    return _weigh(counts, idf), _skill_matrix(np.concatenate(masks)), idf, meta, rows
+
+
+def query_similar(
+    text: str,
+    skill_mask: Optional[int] = None,
+    k: int = 10,
+    exclude_id: Optional[str] = None,
+    index_dir: str = INDEX_DIR
+) -> List[Dict[str, Any]]:
+    """
+    Indexed resumes most similar to a resume
+
+    Args:
+        text: Resume text of the query candidate
+        skill_mask: Its skill bitmask (derived from text when None)
+        exclude_id: Document id to leave out (usually the query's own hash)
+
+    Returns:
+        Up to k metadata dicts, most similar first, with similarity,
+        text_similarity and skill_similarity (0-100)
+    """
+    index = load_index(index_dir)
+    if not index["ids"] or not text:
+        return []
+
+    if index["matrix"] is None:
+        index["matrix"] = _query_matrix(index)
+    weighted, skills, idf, meta, rows = index["matrix"]
+    n = len(meta)
+
+    query_text = _weigh(_term_counts([text]), idf)
+    text_sim = np.asarray(weighted.dot(query_text.T).todense()).ravel()
+    mask = extract_skill_mask(text) if skill_mask is None else skill_mask
+    skill_sim = skills.dot(_skill_matrix(pack_skill_masks([mask]))[0])
+    similarity = (1 - SKILL_WEIGHT) * text_sim + SKILL_WEIGHT * skill_sim
+
+    if exclude_id in rows:
+        similarity[rows[exclude_id]] = -1
+    top = min(k, n)
+    best = np.argpartition(-similarity, top - 1)[:top]
+    best = best[np.argsort(-similarity[best], kind="stable")]
+
+    return [
+        dict(meta[i], similarity=round(float(similarity[i]) * 100, 1),
+             text_similarity=round(float(text_sim[i]) * 100, 1),
+             skill_similarity=round(float(skill_sim[i]) * 100, 1))
+        for i in best if similarity[i] > 0
+    ]
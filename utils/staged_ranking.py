@@ -0,0 +1,164 @@
+"""
+Staged Ranking for RecruitNova
+Ranks a pool in stages: every resume gets the cheap skill/experience score
+(screening.screen_upload_quick), and only the best of them go on to the
+costlier analyzers (ATS, career timeline, growth and performance
+prediction). Each stage admits the top-K by overall score plus anyone at or
+above its threshold. An optional time budget, measured with a wall clock
+and shared by all stages, stops the run once it is used up.
+"""
+
+import time
+from typing import Callable, Dict, List, Any, Optional
+
+from utils.experience import estimate_experience_years
+from utils.screening import calculate_ats_score, jd_keyword_set
+
+
+# Stage name -> settings; top_k / min_score of None admit no one by that rule
+DEFAULT_STAGES = {
+    "ats": {"top_k": 100, "min_score": 50},
+    "timeline": {"top_k": 50, "min_score": 75},
+    "predictions": {"top_k": 20, "min_score": None},
+}
+STAGE_LABELS = {
+    "ats": "ATS score",
+    "timeline": "Career timeline",
+    "predictions": "Growth & performance",
+}
+# Stages run by a full (unstaged) screen; rows without a "stages" list have all of these
+FULL_SCREEN_STAGES = ("score", "ats", "timeline")
+
+
+def _run_ats(row: Dict[str, Any], job_desc: str, context: Dict[str, Any]) -> None:
+    ats_data = calculate_ats_score(row["resume_text"], job_desc, context["jd_keywords"])
+    row.update({"ats_score": ats_data["ats_score"], "ats_rating": ats_data["ats_rating"], "ats_details": ats_data})
+
+
+def _run_timeline(row: Dict[str, Any], job_desc: str, context: Dict[str, Any]) -> None:
+    # plotly is only needed once there is a timeline to build
+    from utils.timeline_generator import extract_timeline_from_resume
+
+    row["timeline_events"] = extract_timeline_from_resume(row["resume_text"])
+
+
+def _run_predictions(row: Dict[str, Any], job_desc: str, context: Dict[str, Any]) -> None:
+    from utils.growth_predictor import predict_growth
+    from utils.performance_predictor import predict_performance
+
+    # Rows from a full screen only carry the joined top skills
+    skills = row.get("skill_list") or [s for s in (row.get("skills") or "").split(", ") if s and s != "None"]
+    exp_years = row.get("exp_years")
+    if exp_years is None:
+        exp_years = estimate_experience_years(row["resume_text"])
+    growth = predict_growth(row["resume_text"], exp_years, skills)
+    performance = predict_performance(row["resume_text"], exp_years, skills)
+    row.update({
+        "growth_score": growth["overall_score"],
+        "growth_rating": growth["rating"],
+        "performance_score": performance["overall_score"],
+        "performance_rating": performance["rating"],
+    })
+
+
+STAGE_RUNNERS: Dict[str, Callable[[Dict[str, Any], str, Dict[str, Any]], None]] = {
+    "ats": _run_ats,
+    "timeline": _run_timeline,
+    "predictions": _run_predictions,
+}
+
+
+def row_stages(row: Dict[str, Any]) -> List[str]:
+    """Stages already applied to a result row"""
+    return row.get("stages") or list(FULL_SCREEN_STAGES)
+
+
+def stage_candidates(ranked: List[Dict[str, Any]], top_k: Optional[int], min_score: Optional[float]) -> List[int]:
+    """
+    Positions of the rows a stage admits
+
+    Args:
+        ranked: Rows sorted by overall_score, best first
+
+    Returns:
+        Positions in ranked order: the first top_k plus every row scoring
+        at least min_score (both sets are prefixes, so this is one prefix)
+    """
+    count = min(top_k or 0, len(ranked))
+    if min_score is not None:
+        while count < len(ranked) and ranked[count]["overall_score"] >= min_score:
+            count += 1
+    return list(range(count))
+
+
+def run_stages(
+    job_desc: str,
+    ranked: List[Dict[str, Any]],
+    stages: Optional[Dict[str, Dict[str, Any]]] = None,
+    budget: Optional[float] = None,
+    on_row: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Apply the costly stages to the best rows of a ranked pool, in place
+
+    Rows that already went through a stage (e.g. reused from a checkpoint)
+    are not run again. Stages run in order, best rows first; once the
+    measured time reaches the budget no further row is started, so the run
+    overshoots by at most one row's stage.
+
+    Args:
+        ranked: Rows sorted by overall_score, best first; each needs resume_text
+        stages: Stage name -> {"top_k", "min_score"}; DEFAULT_STAGES when None
+        budget: Seconds all stages together may take; None for no limit
+        on_row: Called with each row a stage changed (e.g. to checkpoint it)
+
+    Returns:
+        Dictionary with per-stage counts (admitted, run) and seconds, the
+        total seconds and out_of_time (True when the budget cut a stage short)
+    """
+    stages = DEFAULT_STAGES if stages is None else stages
+    context = {"jd_keywords": jd_keyword_set(job_desc)}
+    summary = {"stages": {}, "seconds": 0.0, "out_of_time": False}
+    started = time.perf_counter()
+
+    for name, settings in stages.items():
+        runner = STAGE_RUNNERS[name]
+        admitted = stage_candidates(ranked, settings.get("top_k"), settings.get("min_score"))
+        todo = [i for i in admitted if name not in row_stages(ranked[i])]
+        stage_started = time.perf_counter()
+        run = 0
+
+        for i in todo:
+            if budget is not None and time.perf_counter() - started >= budget:
+                summary["out_of_time"] = True
+                break
+            row = ranked[i]
+            runner(row, job_desc, context)
+            row["stages"] = row_stages(row) + [name]
+            run += 1
+            if on_row:
+                on_row(row)
+
+        summary["stages"][name] = {
+            "admitted": len(admitted), "run": run, "seconds": round(time.perf_counter() - stage_started, 3)
+        }
+
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def ensure_stages(row: Dict[str, Any], job_desc: str, names: List[str]) -> Dict[str, Any]:
+    """
+    Run the given stages on one row if it skipped them (e.g. a low-ranked
+    candidate opened in the comparison or analytics views)
+
+    Returns:
+        The same row, updated in place
+    """
+    missing = [name for name in names if name not in row_stages(row)]
+    if missing and row.get("resume_text"):
+        context = {"jd_keywords": jd_keyword_set(job_desc)}
+        for name in missing:
+            STAGE_RUNNERS[name](row, job_desc, context)
+        row["stages"] = row_stages(row) + missing
+    return row
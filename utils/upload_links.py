@@ -0,0 +1,529 @@
+"""
+Upload Link Store for RecruitNova
+Recruiter upload links and the resumes candidates submit through them, in
+SQLite. Links are found by token hash through a unique index, submissions
+live in their own table, and the resume counter is checked and incremented
+in the same transaction, so concurrent submissions can never exceed
+max_resumes. The legacy data/upload_links/upload_links.json file is imported
+on first use.
+"""
+
+import os
+import json
+import uuid
+import sqlite3
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+from utils.checkpoints import STATUS_SCREENED, STATUS_FAILED
+
+
+LINKS_DIR = os.path.join("data", "upload_links")
+DB_PATH = os.path.join(LINKS_DIR, "upload_links.db")
+LEGACY_JSON = os.path.join(LINKS_DIR, "upload_links.json")
+
+DEFAULT_VALID_DAYS = 30
+DEFAULT_MAX_RESUMES = 30
+DEFAULT_REQUIRED_FIELDS = ["email", "phone", "name"]
+
+# Pre-screening state of a submission (besides screened/failed)
+STATUS_PENDING = "pending"
+STATUS_SCREENING = "screening"
+# A submission claimed this long ago by a process that never finished is retried
+STALE_CLAIM_SECONDS = 600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    id TEXT PRIMARY KEY,
+    token_hash TEXT NOT NULL UNIQUE,
+    recruiter_email TEXT NOT NULL,
+    recruiter_name TEXT,
+    company_name TEXT,
+    job_title TEXT,
+    job_description TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    max_resumes INTEGER NOT NULL,
+    resume_count INTEGER NOT NULL DEFAULT 0,
+    required_fields TEXT NOT NULL DEFAULT '[]',
+    required_years INTEGER,
+    active INTEGER NOT NULL DEFAULT 1,
+    uploads_folder TEXT NOT NULL,
+    job_profile TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_links_expires ON links(active, expires_at);
+CREATE INDEX IF NOT EXISTS idx_links_recruiter ON links(recruiter_email);
+
+CREATE TABLE IF NOT EXISTS submissions (
+    id TEXT PRIMARY KEY,
+    link_id TEXT NOT NULL REFERENCES links(id) ON DELETE CASCADE,
+    candidate_name TEXT,
+    candidate_email TEXT,
+    candidate_phone TEXT,
+    fields TEXT NOT NULL DEFAULT '{}',
+    filename TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT,
+    submitted_at TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    overall_score REAL,
+    row TEXT,
+    error TEXT,
+    claimed_at TEXT,
+    screened_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_link ON submissions(link_id, submitted_at);
+"""
+
+# Indexes on columns that databases created before pre-screening lack
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_submissions_rank ON submissions(link_id, overall_score DESC);
+CREATE INDEX IF NOT EXISTS idx_submissions_status ON submissions(status, claimed_at);
+"""
+
+# Columns added after the first release: table -> [(column, definition)]
+_ADDED_COLUMNS = {
+    "links": [("job_profile", "TEXT")],
+    "submissions": [
+        ("status", "TEXT NOT NULL DEFAULT 'pending'"),
+        ("overall_score", "REAL"),
+        ("row", "TEXT"),
+        ("error", "TEXT"),
+        ("claimed_at", "TEXT"),
+        ("screened_at", "TEXT"),
+    ],
+}
+
+# Databases whose schema was already created by this process
+_initialized = set()
+
+
+class UploadLinkError(Exception):
+    """A submission was refused (unknown, inactive, expired or full link, or missing fields)"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def hash_token(token: str) -> str:
+    """Links are stored by the SHA-256 of their token; the token itself is never kept"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def connect(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """Open the link database (created, and a legacy JSON file beside it imported, on first use)"""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    if db_path not in _initialized:
+        conn.executescript(_SCHEMA)
+        _add_missing_columns(conn)
+        conn.executescript(_INDEXES)
+        legacy_json = os.path.join(os.path.dirname(db_path) or ".", os.path.basename(LEGACY_JSON))
+        if os.path.exists(legacy_json):
+            migrate_legacy_json(conn, legacy_json)
+        _initialized.add(db_path)
+    return conn
+
+
+def _add_missing_columns(conn: sqlite3.Connection) -> None:
+    for table, columns in _ADDED_COLUMNS.items():
+        existing = {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+        for column, definition in columns:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _link(record: sqlite3.Row) -> Dict[str, Any]:
+    link = dict(record)
+    link["required_fields"] = json.loads(link["required_fields"])
+    link["active"] = bool(link["active"])
+    link["job_profile"] = json.loads(link["job_profile"]) if link["job_profile"] else None
+    return link
+
+
+def _submission(record: sqlite3.Row) -> Dict[str, Any]:
+    submission = dict(record)
+    submission["fields"] = json.loads(submission["fields"])
+    submission["row"] = json.loads(submission["row"]) if submission["row"] else None
+    return submission
+
+
+# ==================== MIGRATION ====================
+
+def migrate_legacy_json(conn: sqlite3.Connection, json_path: str = LEGACY_JSON) -> int:
+    """
+    Import links (and their embedded resumes) from the old JSON file
+
+    The file is renamed to *.migrated afterwards so it is read only once.
+
+    Returns:
+        Number of links imported
+    """
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+    except FileNotFoundError:
+        return 0   # another process migrated it first
+
+    imported = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for token_hash, link in legacy.items():
+            link_id = link.get("id") or str(uuid.uuid4())
+            resumes = link.get("resumes") or []
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO links (id, token_hash, recruiter_email, recruiter_name, company_name, "
+                "job_title, job_description, created_at, expires_at, max_resumes, resume_count, required_fields, "
+                "required_years, active, uploads_folder) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    link_id, link.get("token_hash") or token_hash, link.get("recruiter_email", ""),
+                    link.get("recruiter_name"), link.get("company_name"), link.get("job_title"),
+                    link.get("job_description", ""), link.get("created_at") or _now(),
+                    link.get("expires_at") or _now(), link.get("max_resumes") or DEFAULT_MAX_RESUMES,
+                    max(link.get("resume_count") or 0, len(resumes)),
+                    json.dumps(link.get("required_fields") or []), link.get("required_years"),
+                    1 if link.get("active", True) else 0,
+                    link.get("uploads_folder") or os.path.join(LINKS_DIR, "uploads", link_id),
+                ),
+            )
+            if not cur.rowcount:
+                continue
+            imported += 1
+            for resume in resumes:
+                conn.execute(
+                    "INSERT OR IGNORE INTO submissions (id, link_id, candidate_name, candidate_email, "
+                    "candidate_phone, fields, filename, file_path, size, content_hash, submitted_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        resume.get("id") or str(uuid.uuid4()), link_id,
+                        resume.get("name") or resume.get("candidate_name"),
+                        resume.get("email") or resume.get("candidate_email"),
+                        resume.get("phone") or resume.get("candidate_phone"),
+                        json.dumps(resume), resume.get("filename") or os.path.basename(resume.get("file_path", "")),
+                        resume.get("file_path", ""), resume.get("size") or 0, resume.get("hash"),
+                        resume.get("submitted_at") or resume.get("uploaded_at") or _now(),
+                    ),
+                )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    try:
+        os.replace(json_path, json_path + ".migrated")
+    except FileNotFoundError:
+        pass
+    return imported
+
+
+# ==================== LINKS ====================
+
+def create_link(
+    recruiter_email: str,
+    job_title: str,
+    job_description: str,
+    recruiter_name: str = "",
+    company_name: str = "",
+    valid_days: int = DEFAULT_VALID_DAYS,
+    max_resumes: int = DEFAULT_MAX_RESUMES,
+    required_fields: Optional[List[str]] = None,
+    required_years: Optional[int] = None,
+    db_path: str = DB_PATH
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Create an upload link for a job
+
+    Returns:
+        Tuple of (link, token); the token goes into the URL shared with candidates
+    """
+    if not job_description or not job_description.strip():
+        raise ValueError("Job description is required")
+    if max_resumes < 1:
+        raise ValueError("max_resumes must be at least 1")
+
+    token = secrets.token_urlsafe(32)
+    link_id = str(uuid.uuid4())
+    now = datetime.now()
+    conn = connect(db_path)
+    try:
+        conn.execute(
+            "INSERT INTO links (id, token_hash, recruiter_email, recruiter_name, company_name, job_title, "
+            "job_description, created_at, expires_at, max_resumes, required_fields, required_years, "
+            "uploads_folder) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                link_id, hash_token(token), recruiter_email, recruiter_name, company_name, job_title,
+                job_description, now.isoformat(), (now + timedelta(days=valid_days)).isoformat(), max_resumes,
+                json.dumps(DEFAULT_REQUIRED_FIELDS if required_fields is None else required_fields),
+                required_years, os.path.join(os.path.dirname(db_path) or ".", "uploads", link_id),
+            ),
+        )
+        return _link(conn.execute("SELECT * FROM links WHERE id = ?", (link_id,)).fetchone()), token
+    finally:
+        conn.close()
+
+
+def get_link(token: str, db_path: str = DB_PATH) -> Optional[Dict[str, Any]]:
+    """Link for a token (index lookup on its hash), or None"""
+    conn = connect(db_path)
+    try:
+        record = conn.execute("SELECT * FROM links WHERE token_hash = ?", (hash_token(token),)).fetchone()
+        return _link(record) if record else None
+    finally:
+        conn.close()
+
+
+def get_link_by_id(link_id: str, db_path: str = DB_PATH) -> Optional[Dict[str, Any]]:
+    conn = connect(db_path)
+    try:
+        record = conn.execute("SELECT * FROM links WHERE id = ?", (link_id,)).fetchone()
+        return _link(record) if record else None
+    finally:
+        conn.close()
+
+
+def link_status(link: Optional[Dict[str, Any]]) -> str:
+    """State of a link: open, unknown, inactive, expired or full"""
+    if link is None:
+        return "unknown"
+    if not link["active"]:
+        return "inactive"
+    if link["expires_at"] <= _now():
+        return "expired"
+    if link["resume_count"] >= link["max_resumes"]:
+        return "full"
+    return "open"
+
+
+def list_links(recruiter_email: Optional[str] = None, db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """Links (of one recruiter), newest first"""
+    conn = connect(db_path)
+    try:
+        if recruiter_email:
+            records = conn.execute(
+                "SELECT * FROM links WHERE recruiter_email = ? ORDER BY created_at DESC", (recruiter_email,)
+            )
+        else:
+            records = conn.execute("SELECT * FROM links ORDER BY created_at DESC")
+        return [_link(r) for r in records]
+    finally:
+        conn.close()
+
+
+def deactivate_link(link_id: str, db_path: str = DB_PATH) -> bool:
+    conn = connect(db_path)
+    try:
+        return conn.execute("UPDATE links SET active = 0 WHERE id = ? AND active = 1", (link_id,)).rowcount > 0
+    finally:
+        conn.close()
+
+
+def expire_links(db_path: str = DB_PATH) -> int:
+    """
+    Deactivate links past their expiry (a range scan on the expiry index)
+
+    Returns:
+        Number of links deactivated
+    """
+    conn = connect(db_path)
+    try:
+        return conn.execute(
+            "UPDATE links SET active = 0 WHERE active = 1 AND expires_at <= ?", (_now(),)
+        ).rowcount
+    finally:
+        conn.close()
+
+
+# ==================== SUBMISSIONS ====================
+
+def _missing_fields(required: List[str], fields: Dict[str, Any]) -> List[str]:
+    return [name for name in required if not str(fields.get(name) or "").strip()]
+
+
+def submit_resume(
+    token: str,
+    fields: Dict[str, Any],
+    filename: str,
+    content: bytes,
+    db_path: str = DB_PATH
+) -> Dict[str, Any]:
+    """
+    Store a candidate's resume submitted through an upload link
+
+    The counter check and increment and the submission insert are one
+    transaction, so a link never takes more than max_resumes resumes.
+
+    Args:
+        fields: Candidate form values (name, email, phone, ...)
+
+    Returns:
+        The stored submission
+
+    Raises:
+        UploadLinkError with the reason when the submission is refused
+    """
+    token_hash = hash_token(token)
+    submission_id = str(uuid.uuid4())
+    filename = os.path.basename(filename) or "resume"
+
+    conn = connect(db_path)
+    file_path = None
+    try:
+        record = conn.execute("SELECT * FROM links WHERE token_hash = ?", (token_hash,)).fetchone()
+        link = _link(record) if record else None
+        status = link_status(link)
+        if status != "open":
+            raise UploadLinkError(f"Upload link is {status}")
+        missing = _missing_fields(link["required_fields"], fields)
+        if missing:
+            raise UploadLinkError(f"Missing required fields: {', '.join(missing)}")
+
+        # Written before the transaction so the write lock is held only for the counter
+        os.makedirs(link["uploads_folder"], exist_ok=True)
+        file_path = os.path.join(link["uploads_folder"], f"{submission_id}_{filename}")
+        with open(file_path, "wb") as f:
+            f.write(content)
+
+        conn.execute("BEGIN IMMEDIATE")
+        cur = conn.execute(
+            "UPDATE links SET resume_count = resume_count + 1 "
+            "WHERE id = ? AND active = 1 AND expires_at > ? AND resume_count < max_resumes",
+            (link["id"], _now()),
+        )
+        if cur.rowcount == 0:
+            conn.execute("ROLLBACK")
+            raise UploadLinkError(f"Upload link is {link_status(get_link_by_id(link['id'], db_path))}")
+        conn.execute(
+            "INSERT INTO submissions (id, link_id, candidate_name, candidate_email, candidate_phone, fields, "
+            "filename, file_path, size, content_hash, submitted_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                submission_id, link["id"], fields.get("name"), fields.get("email"), fields.get("phone"),
+                json.dumps(fields), filename, file_path, len(content), hashlib.md5(content).hexdigest(), _now(),
+            ),
+        )
+        conn.execute("COMMIT")
+        file_path = None   # kept
+        return _submission(conn.execute("SELECT * FROM submissions WHERE id = ?", (submission_id,)).fetchone())
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def list_submissions(link_id: str, limit: Optional[int] = None, offset: int = 0,
+                     db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """Submissions of one link, oldest first"""
+    conn = connect(db_path)
+    try:
+        return [
+            _submission(r) for r in conn.execute(
+                "SELECT * FROM submissions WHERE link_id = ? ORDER BY submitted_at LIMIT ? OFFSET ?",
+                (link_id, limit if limit else -1, offset),
+            )
+        ]
+    finally:
+        conn.close()
+
+
+# ==================== PRE-SCREENING ====================
+
+def set_job_profile(link_id: str, profile: Dict[str, Any], db_path: str = DB_PATH) -> None:
+    """Cache the parsed job profile of a link's JD"""
+    conn = connect(db_path)
+    try:
+        conn.execute("UPDATE links SET job_profile = ? WHERE id = ?", (json.dumps(profile), link_id))
+    finally:
+        conn.close()
+
+
+def claim_submission(link_id: Optional[str] = None, db_path: str = DB_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Atomically take the oldest submission waiting to be pre-screened
+
+    Submissions claimed by a process that went away are taken over after
+    STALE_CLAIM_SECONDS.
+
+    Returns:
+        The claimed submission, or None if nothing is waiting
+    """
+    stale_before = (datetime.now() - timedelta(seconds=STALE_CLAIM_SECONDS)).isoformat()
+    query = ("SELECT id FROM submissions WHERE (status = ? OR (status = ? AND claimed_at < ?))"
+             + (" AND link_id = ?" if link_id else "") + " ORDER BY submitted_at LIMIT 1")
+    params: Tuple = (STATUS_PENDING, STATUS_SCREENING, stale_before) + ((link_id,) if link_id else ())
+
+    conn = connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        record = conn.execute(query, params).fetchone()
+        if record is None:
+            conn.execute("COMMIT")
+            return None
+        conn.execute(
+            "UPDATE submissions SET status = ?, claimed_at = ? WHERE id = ?",
+            (STATUS_SCREENING, _now(), record["id"]),
+        )
+        conn.execute("COMMIT")
+        return _submission(conn.execute("SELECT * FROM submissions WHERE id = ?", (record["id"],)).fetchone())
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def record_prescreen(submission_id: str, row: Optional[Dict[str, Any]] = None, error: Optional[str] = None,
+                     db_path: str = DB_PATH) -> None:
+    """Store the screening result of a submission next to it"""
+    conn = connect(db_path)
+    try:
+        conn.execute(
+            "UPDATE submissions SET status = ?, overall_score = ?, row = ?, error = ?, screened_at = ? WHERE id = ?",
+            (
+                STATUS_SCREENED if row else STATUS_FAILED,
+                row.get("overall_score") if row else None,
+                json.dumps(row) if row else None,
+                error, _now(), submission_id,
+            ),
+        )
+    finally:
+        conn.close()
+
+
+def get_ranked_submissions(link_id: str, limit: Optional[int] = None, offset: int = 0,
+                           db_path: str = DB_PATH) -> List[Dict[str, Any]]:
+    """Pre-screened submissions of a link, best score first (read in index order)"""
+    conn = connect(db_path)
+    try:
+        return [
+            _submission(r) for r in conn.execute(
+                "SELECT * FROM submissions WHERE link_id = ? AND status = ? "
+                "ORDER BY overall_score DESC LIMIT ? OFFSET ?",
+                (link_id, STATUS_SCREENED, limit if limit else -1, offset),
+            )
+        ]
+    finally:
+        conn.close()
+
+
+def get_submission_counts(link_id: str, db_path: str = DB_PATH) -> Dict[str, int]:
+    """Number of submissions per pre-screening status for a link"""
+    conn = connect(db_path)
+    try:
+        return {
+            r["status"]: r["n"] for r in conn.execute(
+                "SELECT status, COUNT(*) AS n FROM submissions WHERE link_id = ? GROUP BY status", (link_id,)
+            )
+        }
+    finally:
+        conn.close()
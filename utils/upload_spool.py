@@ -0,0 +1,171 @@
+"""
+Upload Spool for RecruitNova
+Content-addressed store for bulk uploads. Files are streamed to disk in
+chunks while being hashed, stored once per distinct content under their MD5
+(the same digest as get_file_hash, so it doubles as the checkpoint and
+duplicate key) and read back from disk only when screened or downloaded.
+Session state keeps small {"name", "hash", "size"} handles instead of bytes.
+"""
+
+import io
+import os
+import time
+import uuid
+import hashlib
+from io import BytesIO
+from typing import Dict, List, Any, Iterator, Optional
+
+from utils.archive_ingest import ArchiveError, is_archive, iter_archive_members
+
+UPLOAD_SPOOL_DIR = os.path.join("data", "upload_spool")
+CHUNK_SIZE = 1024 * 1024
+MAX_AGE_DAYS = 7   # spooled files untouched for this long are pruned
+
+_pruned_dirs = set()
+
+
+def upload_spool_dir(spool_dir: str = UPLOAD_SPOOL_DIR) -> str:
+    path = os.path.abspath(spool_dir)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def spooled_path(content_hash: str, spool_dir: str = UPLOAD_SPOOL_DIR) -> str:
+    """Location of a spooled file (two-level fan-out keeps directories small)"""
+    return os.path.join(upload_spool_dir(spool_dir), content_hash[:2], content_hash)
+
+
+def spool_upload(upload, spool_dir: str = UPLOAD_SPOOL_DIR) -> Dict[str, Any]:
+    """
+    Stream one uploaded file into the spool
+
+    Args:
+        upload: Readable file object with a name (e.g. a Streamlit UploadedFile)
+
+    Returns:
+        Handle {"name", "hash", "size"}; identical content is stored once
+    """
+    tmp_path = os.path.join(upload_spool_dir(spool_dir), f".incoming-{uuid.uuid4().hex}")
+    digest = hashlib.md5()
+    size = 0
+    try:
+        if hasattr(upload, "seek"):
+            upload.seek(0)
+        with open(tmp_path, 'wb') as f:
+            for chunk in iter(lambda: upload.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+
+        content_hash = digest.hexdigest()
+        path = spooled_path(content_hash, spool_dir)
+        if os.path.exists(path):
+            os.utime(path)
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return {"name": os.path.basename(upload.name), "hash": content_hash, "size": size}
+
+
+def read_spooled(handle: Dict[str, Any], spool_dir: str = UPLOAD_SPOOL_DIR) -> bytes:
+    with open(spooled_path(handle["hash"], spool_dir), 'rb') as f:
+        return f.read()
+
+
+def load_spooled(handle: Dict[str, Any], spool_dir: str = UPLOAD_SPOOL_DIR) -> BytesIO:
+    """Named in-memory file for one handle (read when needed, not kept)"""
+    resume_file = BytesIO(read_spooled(handle, spool_dir))
+    resume_file.name = handle["name"]
+    return resume_file
+
+
+def open_spooled(handle: Dict[str, Any], spool_dir: str = UPLOAD_SPOOL_DIR) -> io.BufferedReader:
+    """Spooled file opened from disk, named after the upload (for streaming readers)"""
+    raw = io.FileIO(spooled_path(handle["hash"], spool_dir), 'rb')
+    raw.name = handle["name"]
+    return io.BufferedReader(raw)
+
+
+def iter_spooled(handles: List[Dict[str, Any]], spool_dir: str = UPLOAD_SPOOL_DIR) -> Iterator[Any]:
+    """
+    Load handles one at a time so only one file is in memory
+
+    Archives are not loaded at all: they are opened from disk so their
+    members can be streamed out one by one.
+    """
+    for handle in handles:
+        if is_archive(handle["name"]):
+            with open_spooled(handle, spool_dir) as f:
+                yield f
+        else:
+            yield load_spooled(handle, spool_dir)
+
+
+def iter_expanded_files(handles: List[Dict[str, Any]], spool_dir: str = UPLOAD_SPOOL_DIR) -> Iterator[Dict[str, Any]]:
+    """
+    {"name", "path"} per spooled resume and {"name", "content"} per archive
+    member, produced lazily (for background jobs, which store each resume)
+
+    Members that could not be read, and archives that could not be opened,
+    come out as {"name", "error"} so the job reports them as failed files.
+    """
+    for handle in handles:
+        if not is_archive(handle["name"]):
+            yield {"name": handle["name"], "path": spooled_path(handle["hash"], spool_dir)}
+            continue
+        with open_spooled(handle, spool_dir) as f:
+            try:
+                for member in iter_archive_members(f, handle["name"]):
+                    if member["content"] is not None:
+                        yield {"name": member["name"], "content": member["content"]}
+                    else:
+                        yield {"name": member["name"], "error": member["error"]}
+            except ArchiveError as e:
+                yield {"name": handle["name"], "error": str(e)}
+
+
+def spooled_files(handles: List[Dict[str, Any]], spool_dir: str = UPLOAD_SPOOL_DIR) -> List[Dict[str, Any]]:
+    """{"name", "path", "size"} entries for consumers that read from disk themselves"""
+    return [
+        {"name": h["name"], "path": spooled_path(h["hash"], spool_dir), "size": h["size"]}
+        for h in handles
+    ]
+
+
+def prune_upload_spool(max_age_days: float = MAX_AGE_DAYS, keep: Optional[set] = None,
+                       spool_dir: str = UPLOAD_SPOOL_DIR) -> int:
+    """
+    Delete spooled files not touched for max_age_days (except hashes in keep)
+
+    Returns:
+        Number of files removed
+    """
+    root = upload_spool_dir(spool_dir)
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            if keep and filename in keep:
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def prune_upload_spool_once(spool_dir: str = UPLOAD_SPOOL_DIR) -> int:
+    """Prune at most once per process (called from the upload page)"""
+    if spool_dir in _pruned_dirs:
+        return 0
+    _pruned_dirs.add(spool_dir)
+    return prune_upload_spool(spool_dir=spool_dir)